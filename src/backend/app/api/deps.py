@@ -1,30 +1,133 @@
 """API dependencies for FastAPI."""
 
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Cookie, Depends, HTTPException, status
+import httpx
+from fastapi import Cookie, Depends, HTTPException, Query, Request, status
 from sqlmodel import Session
 
-from app.db.engine import get_session
+from app.config import Settings, get_settings
+from app.db.engine import (
+    AnySession,
+    get_async_read_session,
+    get_async_session,
+    get_read_session,
+    get_session,
+    is_async_url,
+)
 from app.db.models.user import User
 from app.services.auth import AuthService
+from app.services.event_writer import EventWriter, get_event_writer
+from app.services.github_api import GitHubAPIClient
+from app.services.http_client import create_http_client
+from app.services.ingest_queue import IngestQueue, get_ingest_queue
+from app.services.pagination import EventCursor
+
+
+async def get_db(
+    session: Annotated[Session, Depends(get_session)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> AsyncGenerator[AnySession, None]:
+    """Get the database session for the configured engine mode.
+
+    Yields an ``AsyncSession`` when ``DATABASE_URL`` selects an async driver,
+    otherwise the sync session (which does not connect until first used).
+
+    Args:
+        session: The sync database session.
+        settings: Application settings.
+
+    Yields:
+        The database session.
+    """
+    if not is_async_url(settings.database_url):
+        yield session
+        return
+
+    async for async_session in get_async_session():
+        yield async_session
+
+
+async def get_read_db(
+    session: Annotated[Session, Depends(get_read_session)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> AsyncGenerator[AnySession, None]:
+    """Get a read-only database session for the configured engine mode.
+
+    Uses ``DATABASE_READ_URL`` when set (otherwise the primary), for
+    endpoints that never write.
+
+    Args:
+        session: The sync read-only database session.
+        settings: Application settings.
+
+    Yields:
+        The database session.
+    """
+    if not is_async_url(settings.database_url):
+        yield session
+        return
+
+    async for async_session in get_async_read_session():
+        yield async_session
+
+
+def get_http_client(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> httpx.AsyncClient:
+    """Get the application's shared HTTP client.
+
+    The lifespan handler opens it; when the lifespan did not run (e.g. under
+    a test transport) it is opened on first use.
+
+    Args:
+        request: The incoming request.
+        settings: Application settings.
+
+    Returns:
+        The pooled HTTP client.
+    """
+    client = getattr(request.app.state, "http_client", None)
+    if client is None:
+        client = request.app.state.http_client = create_http_client(settings)
+    return client
 
 
 def get_auth_service(
-    db: Annotated[Session, Depends(get_session)],
+    db: Annotated[AnySession, Depends(get_db)],
+    http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
 ) -> AuthService:
     """Get an AuthService instance.
 
     Args:
         db: The database session.
+        http_client: The shared HTTP client.
 
     Returns:
         An AuthService instance.
     """
-    return AuthService(db)
+    return AuthService(db, http_client)
+
+
+def get_github_api_client(
+    settings: Annotated[Settings, Depends(get_settings)],
+    http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
+) -> GitHubAPIClient:
+    """Get a GitHubAPIClient instance.
+
+    Args:
+        settings: Application settings.
+        http_client: The shared HTTP client.
+
+    Returns:
+        A GitHubAPIClient instance.
+    """
+    return GitHubAPIClient(settings, http_client)
 
 
-def get_current_user(
+async def get_current_user(
     session_token: Annotated[str | None, Cookie(alias="session_token")] = None,
     auth_service: Annotated[AuthService | None, Depends(get_auth_service)] = None,
 ) -> User:
@@ -47,7 +150,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = auth_service.get_user_by_session_token(session_token)
+    user = await auth_service.get_user_by_session_token(session_token)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,7 +161,7 @@ def get_current_user(
     return user
 
 
-def get_optional_user(
+async def get_optional_user(
     session_token: Annotated[str | None, Cookie(alias="session_token")] = None,
     auth_service: Annotated[AuthService | None, Depends(get_auth_service)] = None,
 ) -> User | None:
@@ -74,4 +177,66 @@ def get_optional_user(
     if not session_token:
         return None
 
-    return auth_service.get_user_by_session_token(session_token)
+    return await auth_service.get_user_by_session_token(session_token)
+
+
+def get_optional_ingest_queue(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> IngestQueue | None:
+    """Get the ingest queue if queue ingest mode is enabled.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        The durable ingest queue, or None in inline ingest mode.
+    """
+    if settings.webhook_ingest_mode != "queue":
+        return None
+
+    return get_ingest_queue()
+
+
+def get_optional_event_writer(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> EventWriter | None:
+    """Get the group-commit event writer if it is enabled.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        The event writer, or None to insert each event on the request session.
+    """
+    if not settings.event_writer_enabled:
+        return None
+
+    return get_event_writer()
+
+
+def get_event_cursor(
+    cursor: Annotated[
+        str | None,
+        Query(description="Keyset cursor from next_cursor/prev_cursor"),
+    ] = None,
+) -> EventCursor | None:
+    """Parse the keyset pagination cursor of an event listing.
+
+    Args:
+        cursor: The opaque cursor token, if any.
+
+    Returns:
+        The cursor, or None for offset pagination.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    if cursor is None:
+        return None
+    try:
+        return EventCursor.decode(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
@@ -6,12 +6,17 @@ from typing import Annotated
 
 from fastapi import APIRouter, Cookie, Depends, HTTPException, Query, Request, status
 from fastapi.responses import RedirectResponse
-from sqlmodel import Session
 
-from app.api.deps import get_auth_service, get_current_user, get_optional_user
+from app.api.deps import (
+    get_auth_service,
+    get_current_user,
+    get_db,
+    get_github_api_client,
+    get_optional_user,
+)
 from app.api.schemas import UserResponse
 from app.config import get_settings
-from app.db.engine import get_session
+from app.db.engine import AnySession
 from app.db.models.user import User
 from app.services.auth import AuthService
 from app.services.github import GitHubService
@@ -51,8 +56,9 @@ async def login(
 @router.get("/callback")
 async def oauth_callback(
     request: Request,
-    db: Annotated[Session, Depends(get_session)],
+    db: Annotated[AnySession, Depends(get_db)],
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
+    api_client: Annotated[GitHubAPIClient, Depends(get_github_api_client)],
     existing_user: Annotated[User | None, Depends(get_optional_user)],
     code: Annotated[str | None, Query(description="GitHub OAuth authorization code")] = None,
     state: Annotated[str | None, Query(description="OAuth state parameter")] = None,
@@ -76,6 +82,7 @@ async def oauth_callback(
         request: The incoming request.
         db: The database session.
         auth_service: The auth service.
+        api_client: The GitHub API client.
         existing_user: The currently authenticated user, if any.
         code: The authorization code from GitHub.
         state: The state parameter for CSRF validation (OAuth login flow).
@@ -95,6 +102,7 @@ async def oauth_callback(
         # Create or update the installation record
         await _create_or_update_installation(
             db=db,
+            api_client=api_client,
             user=existing_user,
             installation_id=installation_id,
         )
@@ -126,7 +134,7 @@ async def oauth_callback(
         )
 
     # Create or update user
-    user = auth_service.get_or_create_user(
+    user = await auth_service.get_or_create_user(
         github_id=github_user["id"],
         github_login=github_user["login"],
         github_name=github_user.get("name"),
@@ -138,7 +146,7 @@ async def oauth_callback(
     # Create session
     user_agent = request.headers.get("user-agent")
     client_ip = request.client.host if request.client else None
-    session, token = auth_service.create_session(
+    session, token = await auth_service.create_session(
         user=user,
         user_agent=user_agent,
         ip_address=client_ip,
@@ -152,6 +160,7 @@ async def oauth_callback(
         # For GitHub App installation, create installation record and redirect to repositories page
         await _create_or_update_installation(
             db=db,
+            api_client=api_client,
             user=user,
             installation_id=installation_id,
         )
@@ -212,7 +221,7 @@ async def logout(
         Redirect to login page with session cookie cleared.
     """
     if session_token and auth_service:
-        auth_service.invalidate_session(session_token)
+        await auth_service.invalidate_session(session_token)
 
     settings = get_settings()
     response = RedirectResponse(
@@ -230,7 +239,8 @@ async def logout(
 
 
 async def _create_or_update_installation(
-    db: Session,
+    db: AnySession,
+    api_client: GitHubAPIClient,
     user: User,
     installation_id: int,
 ) -> None:
@@ -241,15 +251,14 @@ async def _create_or_update_installation(
 
     Args:
         db: The database session.
+        api_client: The GitHub API client.
         user: The user who owns the installation.
         installation_id: The GitHub installation ID.
     """
-    settings = get_settings()
     github_service = GitHubService(db)
-    api_client = GitHubAPIClient(settings)
 
     # Check if installation already exists
-    existing = github_service.get_installation_by_github_id(installation_id)
+    existing = await github_service.get_installation_by_github_id(installation_id)
     if existing:
         # Installation already exists, no need to create
         logger.info("Installation %s already exists for user %s", installation_id, user.id)
@@ -260,7 +269,7 @@ async def _create_or_update_installation(
         installation_data = await api_client.get_installation(installation_id)
 
         # Create the installation record
-        github_service.create_installation(
+        await github_service.create_installation(
             user=user,
             github_installation_id=installation_id,
             account_type=installation_data.get("account", {}).get("type", "User"),
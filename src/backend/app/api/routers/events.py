@@ -1,15 +1,18 @@
 """Events router for webhook event retrieval."""
 
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_event_cursor, get_read_db
 from app.api.schemas import EventListResponse, EventResponse
-from app.db.engine import get_session
+from app.db.engine import AnySession
 from app.db.models.user import User
-from app.services.github import GitHubService
+from app.services.event_export import export_events
+from app.services.github import EventFilters, GitHubService
+from app.services.pagination import EventCursor
 
 router = APIRouter(prefix="/events", tags=["events"])
 
@@ -17,42 +20,109 @@ router = APIRouter(prefix="/events", tags=["events"])
 @router.get("", response_model=EventListResponse)
 async def list_events(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_session)],
+    db: Annotated[AnySession, Depends(get_read_db)],
+    cursor: Annotated[EventCursor | None, Depends(get_event_cursor)],
     event_type: Annotated[str | None, Query(description="Filter by event type")] = None,
     repository_id: Annotated[
         int | None, Query(description="Filter by repository ID")
     ] = None,
+    actor_login: Annotated[
+        str | None, Query(description="Filter by the login that triggered it")
+    ] = None,
+    target_kind: Annotated[
+        str | None, Query(description="Filter by kind of object acted on")
+    ] = None,
+    target_number: Annotated[
+        int | None, Query(description="Filter by pull request, issue or run number")
+    ] = None,
+    head_sha: Annotated[str | None, Query(description="Filter by head SHA")] = None,
+    ref: Annotated[str | None, Query(description="Filter by Git ref")] = None,
+    source_created_after: Annotated[
+        datetime | None, Query(description="Only events that happened since")
+    ] = None,
+    source_created_before: Annotated[
+        datetime | None, Query(description="Only events that happened before")
+    ] = None,
+    q: Annotated[
+        str | None,
+        Query(description="Full-text search; results are ranked by relevance"),
+    ] = None,
     limit: Annotated[int, Query(ge=1, le=100, description="Maximum results")] = 50,
     offset: Annotated[int, Query(ge=0, description="Results offset")] = 0,
 ) -> EventListResponse:
     """List events for the current user.
 
+    Pages by keyset when a ``cursor`` is given and by ``offset`` otherwise;
+    every page returns cursors to continue from. With ``q``, only events
+    matching every search term are listed, best match first.
+
     Args:
         current_user: The authenticated user.
         db: The database session.
+        cursor: Keyset position to continue from, if any.
         event_type: Optional event type filter.
         repository_id: Optional repository ID filter.
+        actor_login: Optional filter on the triggering login.
+        target_kind: Optional filter on the kind of object acted on.
+        target_number: Optional pull request, issue or run number filter.
+        head_sha: Optional head commit SHA filter.
+        ref: Optional Git ref filter.
+        source_created_after: Optional lower bound on when it happened.
+        source_created_before: Optional upper bound on when it happened.
+        q: Optional full-text search query.
         limit: Maximum number of events to return.
-        offset: Number of events to skip.
+        offset: Number of events to skip (ignored with a cursor).
 
     Returns:
         Paginated list of events.
+
+    Raises:
+        HTTPException: If a search is continued with a listing cursor.
     """
     github_service = GitHubService(db)
+    installation_ids = await github_service.get_user_installation_ids(current_user.id)
+    filters: EventFilters = {
+        "actor_login": actor_login,
+        "target_kind": target_kind,
+        "target_number": target_number,
+        "head_sha": head_sha,
+        "ref": ref,
+        "source_created_after": source_created_after,
+        "source_created_before": source_created_before,
+    }
 
-    events = github_service.get_events_by_user(
-        user_id=current_user.id,
-        event_type=event_type,
-        repository_id=repository_id,
-        limit=limit,
-        offset=offset,
-    )
-
-    total = github_service.count_events_by_user(
-        user_id=current_user.id,
-        event_type=event_type,
-        repository_id=repository_id,
-    )
+    if q:
+        try:
+            page = await github_service.search_event_page(
+                installation_ids,
+                q,
+                event_type,
+                repository_id,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                **filters,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+        total = await github_service.count_search_results(
+            installation_ids, q, event_type, repository_id, **filters
+        )
+    else:
+        page = await github_service.get_event_page(
+            installation_ids,
+            event_type,
+            repository_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            **filters,
+        )
+        total = await github_service.count_event_listing(
+            installation_ids, event_type, repository_id, **filters
+        )
 
     return EventListResponse(
         events=[
@@ -64,12 +134,91 @@ async def list_events(
                 repository_id=event.repository_id,
                 processed=event.processed,
                 created_at=event.created_at,
+                payload_ref=event.payload_ref,
+                actor_login=event.actor_login,
+                target_kind=event.target_kind,
+                target_number=event.target_number,
+                head_sha=event.head_sha,
+                ref=event.ref,
+                source_created_at=event.source_created_at,
             )
-            for event in events
+            for event in page.events
         ],
         total=total,
         limit=limit,
-        offset=offset,
+        offset=0 if cursor else offset,
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor,
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "application/gzip": {}}}},
+)
+async def export_event_range(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AnySession, Depends(get_read_db)],
+    installation_id: Annotated[
+        int | None, Query(description="Export only this installation's events")
+    ] = None,
+    repository_id: Annotated[
+        int | None, Query(description="Filter by repository ID")
+    ] = None,
+    event_type: Annotated[str | None, Query(description="Filter by event type")] = None,
+    created_after: Annotated[
+        datetime | None, Query(description="Only events stored since")
+    ] = None,
+    created_before: Annotated[
+        datetime | None, Query(description="Only events stored before")
+    ] = None,
+    gzip: Annotated[bool, Query(description="Gzip the export")] = False,
+) -> StreamingResponse:
+    """Stream the current user's events as NDJSON, oldest first.
+
+    Each line holds an event's metadata and its webhook body under
+    ``payload``. Events are read in batches and written as they are read,
+    so exports of any size use constant memory and are never counted.
+
+    Args:
+        current_user: The authenticated user.
+        db: The database session.
+        installation_id: Optional installation filter.
+        repository_id: Optional repository ID filter.
+        event_type: Optional event type filter.
+        created_after: Optional lower bound on when events were stored.
+        created_before: Optional upper bound on when events were stored.
+        gzip: Whether to compress the export.
+
+    Returns:
+        The NDJSON stream, gzipped if requested.
+
+    Raises:
+        HTTPException: If the installation is not the user's.
+    """
+    github_service = GitHubService(db)
+    installation_ids = await github_service.get_user_installation_ids(current_user.id)
+    if installation_id is not None:
+        if installation_id not in installation_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Installation not found",
+            )
+        installation_ids = [installation_id]
+
+    events = github_service.iter_events(
+        installation_ids,
+        event_type=event_type,
+        repository_id=repository_id,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    filename = "events.ndjson.gz" if gzip else "events.ndjson"
+    return StreamingResponse(
+        export_events(github_service, events, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
@@ -77,7 +226,7 @@ async def list_events(
 async def get_event(
     event_id: int,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_session)],
+    db: Annotated[AnySession, Depends(get_read_db)],
 ) -> EventResponse:
     """Get a specific event by ID.
 
@@ -93,15 +242,7 @@ async def get_event(
         HTTPException: If event not found or access denied.
     """
     github_service = GitHubService(db)
-
-    # Get event from user's events
-    events = github_service.get_events_by_user(
-        user_id=current_user.id,
-        limit=1000,  # Reasonable limit for search
-        offset=0,
-    )
-
-    event = next((e for e in events if e.id == event_id), None)
+    event = await github_service.get_user_event(current_user.id, event_id)
 
     if not event:
         raise HTTPException(
@@ -117,4 +258,60 @@ async def get_event(
         repository_id=event.repository_id,
         processed=event.processed,
         created_at=event.created_at,
+        payload_ref=event.payload_ref,
+        actor_login=event.actor_login,
+        target_kind=event.target_kind,
+        target_number=event.target_number,
+        head_sha=event.head_sha,
+        ref=event.ref,
+        source_created_at=event.source_created_at,
+    )
+
+
+@router.get(
+    "/{event_id}/payload",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/json": {}}}},
+)
+async def get_event_payload(
+    event_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AnySession, Depends(get_read_db)],
+) -> StreamingResponse:
+    """Stream the webhook body of an event exactly as it was received.
+
+    The body is decompressed chunk by chunk and never parsed, so the bytes
+    match the delivery (and its signature) and large payloads are not held
+    in memory as a whole.
+
+    Args:
+        event_id: The event ID.
+        current_user: The authenticated user.
+        db: The database session.
+
+    Returns:
+        The raw webhook body.
+
+    Raises:
+        HTTPException: If event not found or access denied.
+    """
+    github_service = GitHubService(db)
+    event = await github_service.get_user_event(
+        current_user.id, event_id, with_payload=True
+    )
+
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found",
+        )
+
+    headers = {}
+    if event.payload_sha256:
+        headers["ETag"] = f'"{event.payload_sha256}"'
+
+    return StreamingResponse(
+        await github_service.open_event_body_stream(event),
+        media_type="application/json",
+        headers=headers,
     )
@@ -1,10 +1,11 @@
 """Health check router."""
 
 from datetime import UTC, datetime
+from typing import Any
 
 from fastapi import APIRouter
 
-from app import __version__
+from app import __version__, metrics
 from app.api.schemas import HealthResponse
 
 router = APIRouter(tags=["health"])
@@ -21,3 +22,12 @@ async def health_check() -> HealthResponse:
         version=__version__,
         timestamp=datetime.now(UTC),
     )
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict[str, dict[str, Any]]:
+    """In-process metrics endpoint.
+
+    Returns every registered counter and histogram as JSON.
+    """
+    return metrics.snapshot()
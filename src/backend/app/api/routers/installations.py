@@ -5,9 +5,13 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import RedirectResponse
-from sqlmodel import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import (
+    get_current_user,
+    get_db,
+    get_github_api_client,
+    get_read_db,
+)
 from app.api.schemas import (
     InstallationListResponse,
     InstallationResponse,
@@ -15,7 +19,7 @@ from app.api.schemas import (
     RepositoryResponse,
 )
 from app.config import get_settings
-from app.db.engine import get_session
+from app.db.engine import AnySession
 from app.db.models.user import User
 from app.services.github import GitHubService
 from app.services.github_api import GitHubAPIClient, GitHubAPIError
@@ -57,7 +61,7 @@ async def connect_installation(
 @router.get("", response_model=InstallationListResponse)
 async def list_installations(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_session)],
+    db: Annotated[AnySession, Depends(get_read_db)],
 ) -> InstallationListResponse:
     """List all installations for the current user.
 
@@ -69,7 +73,7 @@ async def list_installations(
         List of installations.
     """
     github_service = GitHubService(db)
-    installation = github_service.get_user_installation(current_user.id)
+    installation = await github_service.get_user_installation(current_user.id)
 
     if installation:
         installations = [
@@ -90,7 +94,8 @@ async def list_installations(
 @router.get("/repositories", response_model=RepositoryListResponse)
 async def list_repositories(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_session)],
+    db: Annotated[AnySession, Depends(get_read_db)],
+    api_client: Annotated[GitHubAPIClient, Depends(get_github_api_client)],
     page: Annotated[int, Query(ge=1, description="Page number")] = 1,
     per_page: Annotated[int, Query(ge=1, le=100, description="Items per page")] = 12,
     search: Annotated[str | None, Query(description="Search filter")] = None,
@@ -102,6 +107,7 @@ async def list_repositories(
     Args:
         current_user: The authenticated user.
         db: The database session.
+        api_client: The GitHub API client.
         page: Page number (1-indexed).
         per_page: Number of items per page.
         search: Optional search filter for repository name.
@@ -113,7 +119,7 @@ async def list_repositories(
         HTTPException: If no installation found or GitHub API error.
     """
     github_service = GitHubService(db)
-    installation = github_service.get_user_installation(current_user.id)
+    installation = await github_service.get_user_installation(current_user.id)
 
     if not installation:
         return RepositoryListResponse(
@@ -124,9 +130,6 @@ async def list_repositories(
             pages=1,
         )
 
-    settings = get_settings()
-    api_client = GitHubAPIClient(settings)
-
     try:
         result = await api_client.list_installation_repositories(
             installation_id=installation.github_installation_id,
@@ -157,7 +160,7 @@ async def list_repositories(
 
     # Get last event timestamps for all repositories
     repo_ids = [repo.get("id") for repo in repositories if repo.get("id")]
-    last_event_map = github_service.get_last_event_at_for_repositories(repo_ids)
+    last_event_map = await github_service.get_last_event_at_for_repositories(repo_ids)
 
     return RepositoryListResponse(
         items=[
@@ -188,7 +191,7 @@ async def installation_callback(
     installation_id: Annotated[int, Query(description="GitHub installation ID")],
     setup_action: Annotated[str, Query(description="Setup action type")] = "install",
     current_user: Annotated[User | None, Depends(get_current_user)] = None,
-    db: Annotated[Session | None, Depends(get_session)] = None,
+    db: Annotated[AnySession | None, Depends(get_db)] = None,
 ) -> dict:
     """Handle GitHub App installation callback.
 
@@ -215,7 +218,7 @@ async def installation_callback(
     github_service = GitHubService(db)
 
     # Check if user already has an installation
-    existing = github_service.get_user_installation(current_user.id)
+    existing = await github_service.get_user_installation(current_user.id)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -224,7 +227,7 @@ async def installation_callback(
 
     # Note: In production, we would fetch installation details from GitHub API
     # For now, we create a placeholder that will be updated by the webhook
-    installation = github_service.create_installation(
+    installation = await github_service.create_installation(
         user=current_user,
         github_installation_id=installation_id,
         account_type="User",
@@ -243,7 +246,7 @@ async def installation_callback(
 async def get_installation(
     installation_id: int,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_session)],
+    db: Annotated[AnySession, Depends(get_read_db)],
 ) -> InstallationResponse:
     """Get a specific installation.
 
@@ -259,7 +262,7 @@ async def get_installation(
         HTTPException: If installation not found or access denied.
     """
     github_service = GitHubService(db)
-    installation = github_service.get_user_installation(current_user.id)
+    installation = await github_service.get_user_installation(current_user.id)
 
     if not installation or installation.id != installation_id:
         raise HTTPException(
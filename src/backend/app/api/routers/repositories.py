@@ -4,19 +4,23 @@ import logging
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import (
+    get_current_user,
+    get_event_cursor,
+    get_github_api_client,
+    get_read_db,
+)
 from app.api.schemas import (
     EventListResponse,
     EventResponse,
     RepositoryResponse,
 )
-from app.config import get_settings
-from app.db.engine import get_session
+from app.db.engine import AnySession
 from app.db.models.user import User
 from app.services.github import GitHubService
 from app.services.github_api import GitHubAPIClient, GitHubAPIError
+from app.services.pagination import EventCursor, EventPage
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +31,8 @@ router = APIRouter(prefix="/repositories", tags=["repositories"])
 async def get_repository(
     repository_id: int,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_session)],
+    db: Annotated[AnySession, Depends(get_read_db)],
+    api_client: Annotated[GitHubAPIClient, Depends(get_github_api_client)],
 ) -> RepositoryResponse:
     """Get a single repository by its GitHub ID.
 
@@ -37,6 +42,7 @@ async def get_repository(
         repository_id: The GitHub repository ID.
         current_user: The authenticated user.
         db: The database session.
+        api_client: The GitHub API client.
 
     Returns:
         Repository details.
@@ -45,7 +51,7 @@ async def get_repository(
         HTTPException: If repository not found or access denied.
     """
     github_service = GitHubService(db)
-    installation = github_service.get_user_installation(current_user.id)
+    installation = await github_service.get_user_installation(current_user.id)
 
     if not installation:
         raise HTTPException(
@@ -53,9 +59,6 @@ async def get_repository(
             detail="No installation found",
         )
 
-    settings = get_settings()
-    api_client = GitHubAPIClient(settings)
-
     try:
         # Get all repositories and find the one with matching ID
         result = await api_client.list_installation_repositories(
@@ -75,10 +78,16 @@ async def get_repository(
     # Find the repository with matching ID
     for repo in repositories:
         if repo.get("id") == repository_id:
-            # Get last event time for this repository
-            last_event_map = github_service.get_last_event_at_for_repositories(
+            # Get last event times for this repository
+            last_event_map = await github_service.get_last_event_at_for_repositories(
                 [repository_id]
             )
+            local_repo = await github_service.get_repository_by_github_id(repository_id)
+            markers = (
+                await github_service.get_repository_event_markers(local_repo.id)
+                if local_repo
+                else {}
+            )
             return RepositoryResponse(
                 id=repo.get("id"),
                 github_repo_id=repo.get("id"),
@@ -91,6 +100,7 @@ async def get_repository(
                 created_at=repo.get("created_at"),
                 updated_at=repo.get("pushed_at") or repo.get("updated_at"),
                 last_event_at=last_event_map.get(repository_id),
+                last_event_at_by_type=markers,
             )
 
     raise HTTPException(
@@ -103,18 +113,22 @@ async def get_repository(
 async def get_repository_events(
     repository_id: int,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_session)],
+    db: Annotated[AnySession, Depends(get_read_db)],
+    cursor: Annotated[EventCursor | None, Depends(get_event_cursor)],
     limit: Annotated[int, Query(ge=1, le=100, description="Max events")] = 20,
     offset: Annotated[int, Query(ge=0, description="Offset")] = 0,
 ) -> EventListResponse:
     """Get events for a specific repository.
 
+    Pages by keyset when a ``cursor`` is given and by ``offset`` otherwise.
+
     Args:
         repository_id: The GitHub repository ID.
         current_user: The authenticated user.
         db: The database session.
+        cursor: Keyset position to continue from, if any.
         limit: Maximum number of events to return.
-        offset: Number of events to skip.
+        offset: Number of events to skip (ignored with a cursor).
 
     Returns:
         List of events for the repository.
@@ -122,23 +136,27 @@ async def get_repository_events(
     github_service = GitHubService(db)
 
     # Get the repository from the local database to get its internal ID
-    repo = github_service.get_repository_by_github_id(repository_id)
+    repo = await github_service.get_repository_by_github_id(repository_id)
 
     if repo:
         # Get events for this repository
-        events = github_service.get_events_by_user(
-            user_id=current_user.id,
+        installation_ids = await github_service.get_user_installation_ids(
+            current_user.id
+        )
+        page = await github_service.get_event_page(
+            installation_ids,
             repository_id=repo.id,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
-        total = github_service.count_events_by_user(
-            user_id=current_user.id,
+        total = await github_service.count_events(
+            installation_id=installation_ids,
             repository_id=repo.id,
         )
     else:
         # No local repository record, return empty
-        events = []
+        page = EventPage(events=[])
         total = 0
 
     return EventListResponse(
@@ -151,10 +169,19 @@ async def get_repository_events(
                 repository_id=event.repository_id,
                 processed=event.processed,
                 created_at=event.created_at,
+                payload_ref=event.payload_ref,
+                actor_login=event.actor_login,
+                target_kind=event.target_kind,
+                target_number=event.target_number,
+                head_sha=event.head_sha,
+                ref=event.ref,
+                source_created_at=event.source_created_at,
             )
-            for event in events
+            for event in page.events
         ],
         total=total,
         limit=limit,
-        offset=offset,
+        offset=0 if cursor else offset,
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor,
     )
@@ -1,16 +1,31 @@
 """Webhook router for GitHub webhook handling."""
 
-import json
+import asyncio
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
-from sqlmodel import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
 
+from app.api.deps import (
+    get_db,
+    get_optional_event_writer,
+    get_optional_ingest_queue,
+)
 from app.api.schemas import WebhookErrorResponse, WebhookResponse
 from app.config import Settings, get_settings
-from app.db.engine import get_session
+from app.db.engine import AnySession
 from app.services.crypto import verify_webhook_signature
+from app.services.event_writer import EventWriter
 from app.services.github import GitHubService
+from app.services.ingest import WebhookDelivery, process_webhook
+from app.services.ingest_queue import IngestQueue
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
@@ -19,14 +34,18 @@ router = APIRouter(prefix="/webhooks", tags=["webhooks"])
     "/github",
     response_model=WebhookResponse,
     responses={
+        202: {"model": WebhookResponse},
         400: {"model": WebhookErrorResponse},
         401: {"model": WebhookErrorResponse},
     },
 )
 async def handle_github_webhook(
     request: Request,
-    db: Annotated[Session, Depends(get_session)],
+    response: Response,
+    db: Annotated[AnySession, Depends(get_db)],
     settings: Annotated[Settings, Depends(get_settings)],
+    queue: Annotated[IngestQueue | None, Depends(get_optional_ingest_queue)],
+    event_writer: Annotated[EventWriter | None, Depends(get_optional_event_writer)],
     x_github_event: Annotated[str, Header(description="GitHub event type")],
     x_github_delivery: Annotated[str, Header(description="GitHub delivery ID")],
     x_hub_signature_256: Annotated[
@@ -36,12 +55,17 @@ async def handle_github_webhook(
     """Handle incoming GitHub webhooks.
 
     Validates the webhook signature, checks for duplicate delivery IDs,
-    and stores the event for processing.
+    and stores the event for processing. In queue ingest mode the verified
+    delivery is appended to the durable ingest queue and acknowledged with
+    202; the ingest workers store it.
 
     Args:
         request: The incoming request.
+        response: The outgoing response (used to set the status code).
         db: The database session.
         settings: Application settings.
+        queue: The durable ingest queue, if queue ingest mode is enabled.
+        event_writer: The group-commit event writer, if enabled.
         x_github_event: The GitHub event type header.
         x_github_delivery: The GitHub delivery ID header.
         x_hub_signature_256: The HMAC-SHA256 signature header.
@@ -71,125 +95,33 @@ async def handle_github_webhook(
                 detail="Invalid webhook signature",
             )
 
-    # Parse payload
+    # Ack-first: persist the raw delivery and leave storage to the workers
+    if queue is not None:
+        queued = await asyncio.to_thread(
+            queue.enqueue, x_github_delivery, x_github_event, body
+        )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return WebhookResponse(
+            status="queued" if queued else "duplicate",
+            delivery_id=x_github_delivery,
+            event_type=x_github_event,
+        )
+
+    # The body is stored verbatim; it is parsed once, for routing fields
+    delivery = WebhookDelivery(x_github_delivery, x_github_event, body)
     try:
-        payload = json.loads(body)
-    except json.JSONDecodeError as e:
+        delivery.payload  # noqa: B018
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid JSON payload: {e}",
         ) from e
 
-    # Check for duplicate delivery (idempotency)
     github_service = GitHubService(db)
-    if github_service.event_exists(x_github_delivery):
-        return WebhookResponse(
-            status="duplicate",
-            delivery_id=x_github_delivery,
-            event_type=x_github_event,
-        )
-
-    # Extract action if present
-    action = payload.get("action")
-
-    # Extract installation ID if present
-    installation_id = None
-    installation_data = payload.get("installation")
-    if installation_data:
-        github_installation_id = installation_data.get("id")
-        if github_installation_id:
-            installation = github_service.get_installation_by_github_id(
-                github_installation_id
-            )
-            if installation:
-                installation_id = installation.id
-
-    # Extract repository ID if present
-    repository_id = None
-    repo_data = payload.get("repository")
-    if repo_data:
-        github_repo_id = repo_data.get("id")
-        if github_repo_id:
-            repo = github_service.get_repository_by_github_id(github_repo_id)
-            if repo:
-                repository_id = repo.id
-
-    # Store the event
-    github_service.create_event(
-        delivery_id=x_github_delivery,
-        event_type=x_github_event,
-        payload=payload,
-        action=action,
-        repository_id=repository_id,
-        installation_id=installation_id,
-    )
-
-    # Handle specific event types
-    if x_github_event == "installation":
-        await _handle_installation_event(payload, github_service)
-    elif x_github_event == "installation_repositories":
-        await _handle_installation_repositories_event(payload, github_service)
+    result = await process_webhook(github_service, delivery, event_writer=event_writer)
 
     return WebhookResponse(
-        status="accepted",
+        status=result,
         delivery_id=x_github_delivery,
         event_type=x_github_event,
     )
-
-
-async def _handle_installation_event(
-    payload: dict, github_service: GitHubService
-) -> None:
-    """Handle installation webhook events.
-
-    Args:
-        payload: The webhook payload.
-        github_service: The GitHub service.
-    """
-    action = payload.get("action")
-    installation = payload.get("installation", {})
-    github_installation_id = installation.get("id")
-
-    if not github_installation_id:
-        return
-
-    if action == "suspend":
-        sender = payload.get("sender", {}).get("login", "unknown")
-        github_service.suspend_installation(github_installation_id, sender)
-    elif action == "unsuspend":
-        github_service.unsuspend_installation(github_installation_id)
-    elif action == "deleted":
-        github_service.delete_installation(github_installation_id)
-
-
-async def _handle_installation_repositories_event(
-    payload: dict, github_service: GitHubService
-) -> None:
-    """Handle installation_repositories webhook events.
-
-    Args:
-        payload: The webhook payload.
-        github_service: The GitHub service.
-    """
-    action = payload.get("action")
-    installation_data = payload.get("installation", {})
-    github_installation_id = installation_data.get("id")
-
-    if not github_installation_id:
-        return
-
-    installation = github_service.get_installation_by_github_id(github_installation_id)
-    if not installation:
-        return
-
-    if action == "added":
-        repos_added = payload.get("repositories_added", [])
-        for repo_data in repos_added:
-            github_service.create_or_update_repository(
-                installation=installation,
-                github_repo_id=repo_data["id"],
-                full_name=repo_data["full_name"],
-                owner=repo_data["full_name"].split("/")[0],
-                name=repo_data["name"],
-                private=repo_data.get("private", False),
-            )
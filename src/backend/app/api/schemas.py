@@ -77,6 +77,9 @@ class RepositoryResponse(BaseModel):
     created_at: datetime | None = None
     updated_at: datetime | None = None
     last_event_at: datetime | None = None
+    last_event_at_by_type: dict[str, datetime] | None = Field(
+        default=None, description="Last event time per event type (detail only)"
+    )
 
 
 class RepositoryListResponse(BaseModel):
@@ -100,6 +103,23 @@ class EventResponse(BaseModel):
     repository_id: int | None
     processed: bool
     created_at: datetime
+    payload_ref: str | None = Field(
+        default=None, description="Content hash of the payload (sha256:<hex>)"
+    )
+    actor_login: str | None = Field(
+        default=None, description="Login of the user who triggered the event"
+    )
+    target_kind: str | None = Field(
+        default=None, description="Kind of object acted on (pull_request, issue, ...)"
+    )
+    target_number: int | None = Field(
+        default=None, description="Number of the pull request, issue or run"
+    )
+    head_sha: str | None = Field(default=None, description="Head commit SHA")
+    ref: str | None = Field(default=None, description="Git ref or tag name")
+    source_created_at: datetime | None = Field(
+        default=None, description="When the object changed on GitHub"
+    )
 
 
 class EventListResponse(BaseModel):
@@ -109,6 +129,12 @@ class EventListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: str | None = Field(
+        default=None, description="Cursor for the next (older) page"
+    )
+    prev_cursor: str | None = Field(
+        default=None, description="Cursor for the previous (newer) page"
+    )
 
 
 class EventQueryParams(BaseModel):
@@ -118,6 +144,7 @@ class EventQueryParams(BaseModel):
     repository_id: int | None = None
     limit: int = Field(default=50, ge=1, le=100)
     offset: int = Field(default=0, ge=0)
+    cursor: str | None = None
 
 
 # Webhook schemas
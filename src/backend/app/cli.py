@@ -1,11 +1,23 @@
 """CLI application for the Copilot Webhook Orchestrator."""
 
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from contextlib import nullcontext
+from datetime import datetime
+
 import typer
 import uvicorn
 
 from app import __version__
 from app.config import get_settings
-from app.db.engine import init_db
+from app.db.engine import init_db, session_scope
+from app.db.migrations import SCHEMA_VERSION
+from app.db.models.event import Event
+from app.services.event_archive import EventArchive
+from app.services.event_export import export_events
+from app.services.github import GitHubService
+from app.services.payload_store import PayloadStore
 
 cli_app = typer.Typer(
     name="copilot-orchestrator",
@@ -38,12 +50,201 @@ def serve(
 
 @cli_app.command()
 def init_database() -> None:
-    """Initialize the database (create tables)."""
+    """Initialize the database (create or migrate tables)."""
     typer.echo("Initializing database...")
     init_db()
     typer.echo("Database initialized successfully.")
 
 
+@cli_app.command()
+def migrate() -> None:
+    """Apply pending schema migrations."""
+    applied = init_db()
+    for revision in applied:
+        typer.echo(f"Applied migration {revision}.")
+    typer.echo(f"Database schema is at revision {SCHEMA_VERSION}.")
+
+
+@cli_app.command()
+def train_dictionaries(
+    event_type: list[str] = typer.Option(
+        [], "--event-type", "-e", help="Event type to train (default: all)"
+    ),
+    recompress: bool = typer.Option(
+        False, "--recompress", help="Re-encode stored events with the new dictionary"
+    ),
+) -> None:
+    """Train payload compression dictionaries from stored events."""
+    asyncio.run(_train_dictionaries(event_type, recompress))
+
+
+async def _train_dictionaries(event_types: list[str], recompress: bool) -> None:
+    """Train a dictionary per event type, optionally recompressing events."""
+    async with session_scope() as session:
+        store = PayloadStore(session)
+        for event_type in event_types or await store.get_event_types():
+            try:
+                dictionary = await store.train_dictionary(event_type)
+            except ValueError as e:
+                typer.echo(f"{event_type}: skipped ({e})")
+                continue
+
+            typer.echo(
+                f"{event_type}: {dictionary.codec} dictionary "
+                f"v{dictionary.version} ({len(dictionary.data)} bytes, "
+                f"{dictionary.sample_count} samples)"
+            )
+            if recompress:
+                rewritten = await store.recompress(event_type)
+                typer.echo(f"{event_type}: recompressed {rewritten} events")
+
+
+@cli_app.command()
+def rebuild_counters() -> None:
+    """Recompute event counters and repository last-event markers."""
+    asyncio.run(_rebuild_counters())
+
+
+async def _rebuild_counters() -> None:
+    """Rebuild the event counters and repository markers."""
+    async with session_scope() as session:
+        github_service = GitHubService(session)
+        rows = await github_service.rebuild_event_counters()
+        repositories = await github_service.rebuild_repository_markers()
+    typer.echo(f"Rebuilt {rows} event counters.")
+    typer.echo(f"Rebuilt last-event markers for {repositories} repositories.")
+
+
+@cli_app.command()
+def rebuild_search_index(
+    batch_size: int = typer.Option(
+        500, "--batch-size", min=1, help="Events indexed per step"
+    ),
+) -> None:
+    """Re-index every stored event for full-text search."""
+    asyncio.run(_rebuild_search_index(batch_size))
+
+
+async def _rebuild_search_index(batch_size: int) -> None:
+    """Rebuild the search index from the stored events."""
+    async with session_scope() as session:
+        indexed = await GitHubService(session).rebuild_search_index(batch_size)
+    typer.echo(f"Indexed {indexed} events for search.")
+
+
+@cli_app.command()
+def backfill_event_columns(
+    batch_size: int = typer.Option(
+        500, "--batch-size", min=1, help="Events updated per transaction"
+    ),
+) -> None:
+    """Extract the actor and target columns of stored events."""
+    asyncio.run(_backfill_event_columns(batch_size))
+
+
+async def _backfill_event_columns(batch_size: int) -> None:
+    """Backfill the extracted columns from the stored payloads."""
+    async with session_scope() as session:
+        updated = await GitHubService(session).backfill_extracted_columns(batch_size)
+    typer.echo(f"Extracted columns for {updated} events.")
+
+
+@cli_app.command()
+def export(
+    output: str = typer.Option(
+        "-", "--output", "-o", help="File to write (default: standard output)"
+    ),
+    installation_id: list[int] = typer.Option(
+        [], "--installation-id", "-i", help="Installation to export (default: all)"
+    ),
+    repository_id: int | None = typer.Option(
+        None, "--repository-id", "-r", help="Export only this repository"
+    ),
+    event_type: str | None = typer.Option(
+        None, "--event-type", "-e", help="Export only this event type"
+    ),
+    since: datetime | None = typer.Option(
+        None, "--since", help="Only events stored at or after this time"
+    ),
+    until: datetime | None = typer.Option(
+        None, "--until", help="Only events stored before this time"
+    ),
+    gzip: bool = typer.Option(False, "--gzip", "-z", help="Gzip the output"),
+    batch_size: int = typer.Option(
+        500, "--batch-size", min=1, help="Events read per round trip"
+    ),
+) -> None:
+    """Export stored events as NDJSON, oldest first."""
+    asyncio.run(
+        _export(
+            output,
+            installation_id or None,
+            repository_id,
+            event_type,
+            since,
+            until,
+            gzip,
+            batch_size,
+        )
+    )
+
+
+async def _export(
+    output: str,
+    installation_ids: list[int] | None,
+    repository_id: int | None,
+    event_type: str | None,
+    since: datetime | None,
+    until: datetime | None,
+    gzip: bool,
+    batch_size: int,
+) -> None:
+    """Stream the matching events to a file or standard output."""
+    exported = 0
+
+    async with session_scope() as session:
+        github_service = GitHubService(session)
+
+        async def counted() -> AsyncIterator[Event]:
+            nonlocal exported
+            async for event in github_service.iter_events(
+                installation_ids,
+                event_type=event_type,
+                repository_id=repository_id,
+                created_after=since,
+                created_before=until,
+                batch_size=batch_size,
+            ):
+                exported += 1
+                yield event
+
+        with (
+            open(output, "wb") if output != "-" else nullcontext(sys.stdout.buffer)
+        ) as stream:
+            async for chunk in export_events(github_service, counted(), compress=gzip):
+                stream.write(chunk)
+    typer.echo(f"Exported {exported} events.", err=True)
+
+
+@cli_app.command()
+def archive(
+    batch_size: int = typer.Option(
+        500, "--batch-size", min=1, help="Events moved per transaction"
+    ),
+) -> None:
+    """Move events past their retention into archive segments."""
+    asyncio.run(_archive(batch_size))
+
+
+async def _archive(batch_size: int) -> None:
+    """Archive expired events and report the segments written."""
+    async with session_scope() as session:
+        archived = await EventArchive(session).archive(batch_size=batch_size)
+    for segment, count in sorted(archived.items()):
+        typer.echo(f"{segment}: archived {count} events")
+    typer.echo(f"Archived {archived.total()} events.")
+
+
 @cli_app.command()
 def show_config() -> None:
     """Show the current configuration (without secrets)."""
@@ -56,6 +257,7 @@ def show_config() -> None:
     typer.echo(f"  Host: {settings.host}")
     typer.echo(f"  Port: {settings.port}")
     typer.echo(f"  Database URL: {_mask_url(settings.database_url)}")
+    typer.echo(f"  Payload Codec: {settings.payload_codec}")
     typer.echo(f"  GitHub App ID: {settings.github_app_id or '(not set)'}")
     typer.echo(f"  GitHub Client ID: {settings.github_client_id or '(not set)'}")
     typer.echo(
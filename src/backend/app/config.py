@@ -1,6 +1,7 @@
 """Application configuration using Pydantic Settings."""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,6 +31,153 @@ class Settings(BaseSettings):
         default="sqlite:///./orchestrator.db",
         description="Database connection URL",
     )
+    database_read_url: str = Field(
+        default="",
+        description=(
+            "Connection URL of a read replica for read-only endpoints; reads "
+            "use the primary if empty"
+        ),
+    )
+    database_pool_size: int = Field(
+        default=10, ge=1, description="Connections kept open per engine"
+    )
+    database_max_overflow: int = Field(
+        default=10, ge=0, description="Connections opened beyond the pool size"
+    )
+    database_pool_timeout_seconds: float = Field(
+        default=30.0, gt=0, description="How long to wait for a free connection"
+    )
+    database_pool_recycle_seconds: int = Field(
+        default=1800,
+        description="Replace connections older than this; -1 never recycles",
+    )
+    database_pool_pre_ping: bool = Field(
+        default=True, description="Check connections are alive before use"
+    )
+
+    # SQLite (file databases only)
+    sqlite_profile: bool = Field(
+        default=True,
+        description=(
+            "Run SQLite in WAL mode with tuned pragmas, one writer connection "
+            "and a reader pool"
+        ),
+    )
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = Field(
+        default="NORMAL", description="PRAGMA synchronous"
+    )
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000, ge=0, description="How long a locked database is retried"
+    )
+    sqlite_mmap_size: int = Field(
+        default=256 * 1024 * 1024, ge=0, description="Bytes of the file memory-mapped"
+    )
+    sqlite_cache_size_kib: int = Field(
+        default=64 * 1024, ge=0, description="Page cache per connection in KiB"
+    )
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = Field(
+        default="MEMORY", description="PRAGMA temp_store"
+    )
+    sqlite_wal_autocheckpoint: int = Field(
+        default=1000,
+        ge=0,
+        description="WAL pages that trigger an automatic checkpoint on commit",
+    )
+    sqlite_reader_pool_size: int = Field(
+        default=4, ge=1, description="Read-only connections for queries"
+    )
+    sqlite_checkpoint_interval_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Interval of background WAL checkpoints (0 disables)",
+    )
+    sqlite_checkpoint_mode: Literal["PASSIVE", "FULL", "RESTART", "TRUNCATE"] = Field(
+        default="PASSIVE", description="Mode of background WAL checkpoints"
+    )
+
+    # Webhook ingest
+    webhook_ingest_mode: Literal["inline", "queue"] = Field(
+        default="inline",
+        description="Webhook ingest mode: 'inline' (store on request) or 'queue'",
+    )
+    ingest_queue_path: str = Field(
+        default="./ingest_queue.db",
+        description="Path of the SQLite file backing the durable ingest queue",
+    )
+    ingest_workers: int = Field(
+        default=4, ge=1, description="Number of async ingest queue workers"
+    )
+    ingest_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        description="Delivery attempts before a queued webhook is dead-lettered",
+    )
+    ingest_poll_interval_seconds: float = Field(
+        default=0.5,
+        gt=0,
+        description="Idle worker poll interval for the ingest queue",
+    )
+    ingest_lease_seconds: float = Field(
+        default=300.0,
+        gt=0,
+        description="How long a claimed delivery is reserved before it is reclaimed",
+    )
+
+    # Event writer (group commit)
+    event_writer_enabled: bool = Field(
+        default=False,
+        description="Batch concurrent event inserts into group commits",
+    )
+    event_writer_batch_size: int = Field(
+        default=100, ge=1, description="Maximum events per group commit"
+    )
+    event_writer_max_linger_ms: float = Field(
+        default=5.0,
+        ge=0,
+        description="Longest a batch waits for more events before writing",
+    )
+    event_writer_queue_size: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum events waiting for a group commit",
+    )
+
+    # Payload storage
+    payload_codec: str = Field(
+        default="auto",
+        description=(
+            "Codec for stored webhook payloads: 'auto' (zstd if installed, "
+            "else zlib), 'zstd', 'zlib' or 'identity'"
+        ),
+    )
+    payload_interned_keys: list[str] = Field(
+        default=["repository", "organization", "sender", "installation"],
+        description="Top-level payload objects stored once as shared blobs",
+    )
+    payload_dictionary_size: int = Field(
+        default=64 * 1024,
+        ge=256,
+        description="Target size of trained payload dictionaries in bytes",
+    )
+    payload_dictionary_samples: int = Field(
+        default=2000,
+        ge=2,
+        description="Most recent payloads per event type used for training",
+    )
+
+    # Event retention and archive
+    event_retention_days: int = Field(
+        default=0,
+        ge=0,
+        description="Days events stay in the database before archiving; 0 keeps them",
+    )
+    event_retention_days_by_type: dict[str, int] = Field(
+        default={},
+        description="Retention in days per event type, overriding the default",
+    )
+    archive_dir: str = Field(
+        default="./archive", description="Directory of archived event segments"
+    )
 
     # GitHub App
     github_app_id: str = Field(default="", description="GitHub App ID")
@@ -47,6 +195,77 @@ class Settings(BaseSettings):
         default="copilot-workflow-orchestrator",
         description="GitHub App slug for installation URL",
     )
+    github_token_refresh_margin_seconds: int = Field(
+        default=300,
+        ge=0,
+        description="Refresh cached installation tokens this long before expiry",
+    )
+
+    # GitHub HTTP client
+    github_http_max_connections: int = Field(
+        default=100, ge=1, description="Connections open to GitHub at once"
+    )
+    github_http_max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Idle connections kept alive for reuse"
+    )
+    github_http_keepalive_expiry_seconds: float = Field(
+        default=30.0, ge=0, description="How long an idle connection is kept"
+    )
+    github_http2: bool = Field(
+        default=False, description="Use HTTP/2 (needs the h2 package)"
+    )
+    github_http_timeout_seconds: float = Field(
+        default=10.0, gt=0, description="Default timeout of GitHub requests"
+    )
+    github_http_connect_timeout_seconds: float = Field(
+        default=5.0, gt=0, description="Timeout for opening a connection"
+    )
+    github_http_timeouts_by_host: dict[str, float] = Field(
+        default={},
+        description="Request timeout in seconds per host, overriding the default",
+    )
+    github_response_cache_ttl_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Serve cached GitHub responses this long without revalidating",
+    )
+    github_response_cache_max_entries: int = Field(
+        default=1024, ge=1, description="GitHub responses cached in memory"
+    )
+    github_response_cache_path: str = Field(
+        default="",
+        description=(
+            "Path of a SQLite file persisting cached GitHub responses; memory "
+            "only if empty"
+        ),
+    )
+    github_response_cache_persistent_entries: int = Field(
+        default=10_000, ge=1, description="GitHub responses kept in the SQLite file"
+    )
+
+    # GitHub rate limits
+    github_max_concurrent_requests: int = Field(
+        default=8, ge=1, description="Requests in flight to GitHub per installation"
+    )
+    github_rate_limit_reserve: float = Field(
+        default=0.1,
+        ge=0,
+        le=1,
+        description="Share of each rate limit background requests leave unspent",
+    )
+    github_rate_limit_max_wait_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Longest a GitHub request waits for its rate budget",
+    )
+    github_rate_limit_max_retries: int = Field(
+        default=2, ge=0, description="Retries of a rate-limited GitHub request"
+    )
+    github_secondary_rate_limit_backoff_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Pause after a secondary rate limit without Retry-After",
+    )
 
     # Session
     session_secret_key: str = Field(
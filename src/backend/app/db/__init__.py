@@ -1,16 +1,30 @@
 """Database models package."""
 
+from app.db.models.archived_event import ArchivedEvent
 from app.db.models.base import TimestampMixin
 from app.db.models.event import Event
+from app.db.models.event_counter import EventCounter
+from app.db.models.event_search import SEARCH_TABLE
 from app.db.models.installation import Installation
+from app.db.models.payload_blob import PayloadBlob
+from app.db.models.payload_dictionary import PayloadDictionary
 from app.db.models.repository import Repository
+from app.db.models.repository_event_marker import RepositoryEventMarker
+from app.db.models.schema_migration import SchemaMigration
 from app.db.models.session import Session
 from app.db.models.user import User
 
 __all__ = [
+    "SEARCH_TABLE",
+    "ArchivedEvent",
     "Event",
+    "EventCounter",
     "Installation",
+    "PayloadBlob",
+    "PayloadDictionary",
     "Repository",
+    "RepositoryEventMarker",
+    "SchemaMigration",
     "Session",
     "TimestampMixin",
     "User",
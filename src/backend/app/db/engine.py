@@ -1,31 +1,219 @@
 """Database engine and session management."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, AsyncIterator, Generator
+from contextlib import asynccontextmanager
+from typing import Any
 
 from sqlalchemy import Engine
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.db.sqlite import RoutingSession, apply_sqlite_profile, is_sqlite_file_url
 
+# A session usable by the services: sync, or native async (aiosqlite/asyncpg)
+AnySession = Session | AsyncSession
+
+# Async driver for each backend, and the sync driver used alongside it
+_ASYNC_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql+psycopg",
+}
+
+
+def is_async_url(url: str) -> bool:
+    """Check whether a database URL selects an async driver.
+
+    Args:
+        url: The database connection URL.
+
+    Returns:
+        True if the URL uses aiosqlite or asyncpg.
+    """
+    scheme = url.split(":", 1)[0]
+    return scheme in _ASYNC_DRIVERS
+
+
+def sync_database_url(url: str) -> str:
+    """Get the sync-driver equivalent of a database URL.
+
+    Used for work that always runs synchronously (table creation, CLI).
+
+    Args:
+        url: The database connection URL.
+
+    Returns:
+        The URL with any async driver replaced by its sync counterpart.
+    """
+    scheme, sep, rest = url.partition(":")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def dialect_insert(dialect_name: str, model: Any) -> Any:
+    """Build a dialect-specific INSERT supporting ON CONFLICT clauses.
+
+    Args:
+        dialect_name: Name of the database dialect.
+        model: The table model to insert into.
+
+    Returns:
+        A SQLite or PostgreSQL insert construct.
+
+    Raises:
+        ValueError: If the database dialect is not supported.
+    """
+    if dialect_name == "sqlite":
+        return sqlite.insert(model)
+    if dialect_name == "postgresql":
+        return postgresql.insert(model)
+    raise ValueError(f"Unsupported database dialect: {dialect_name}")
+
+
+def uses_sqlite_profile(url: str) -> bool:
+    """Check whether the SQLite high-throughput profile applies to a URL.
+
+    Args:
+        url: The database connection URL.
+
+    Returns:
+        True for SQLite file databases with ``SQLITE_PROFILE`` enabled.
+    """
+    return get_settings().sqlite_profile and is_sqlite_file_url(url)
 
-def get_engine() -> Engine:
-    """Create and return the database engine."""
-    settings = get_settings()
-    connect_args = {}
+
+def engine_options(
+    settings: Settings, url: str, read_only: bool = False, async_driver: bool = False
+) -> dict[str, Any]:
+    """Get the pool and connection options of an engine.
+
+    Args:
+        settings: Application settings.
+        url: The database connection URL.
+        read_only: Whether the engine serves read-only queries.
+        async_driver: Whether the engine is an ``AsyncEngine``.
+
+    Returns:
+        Keyword arguments for ``create_engine``/``create_async_engine``.
+    """
+    options: dict[str, Any] = {"echo": settings.debug}
+
+    if uses_sqlite_profile(url):
+        # One writer connection; readers get a pool of their own. Sync
+        # sessions wait for the writer off the event loop (DatabaseService)
+        options["poolclass"] = AsyncAdaptedQueuePool if async_driver else QueuePool
+        options["pool_size"] = settings.sqlite_reader_pool_size if read_only else 1
+        options["max_overflow"] = 0
+    elif not url.startswith("sqlite"):
+        options["pool_size"] = settings.database_pool_size
+        options["max_overflow"] = settings.database_max_overflow
+        options["pool_timeout"] = settings.database_pool_timeout_seconds
+        options["pool_recycle"] = settings.database_pool_recycle_seconds
+        options["pool_pre_ping"] = settings.database_pool_pre_ping
 
     # SQLite-specific configuration
-    if settings.database_url.startswith("sqlite"):
-        connect_args["check_same_thread"] = False
+    if url.startswith("sqlite") and not async_driver:
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
 
-    return create_engine(
-        settings.database_url,
-        echo=settings.debug,
-        connect_args=connect_args,
+def _create_engine(url: str, read_only: bool = False) -> Engine:
+    """Create a sync engine, applying the SQLite profile if it is used."""
+    engine = create_engine(url, **engine_options(get_settings(), url, read_only))
+    if uses_sqlite_profile(url):
+        apply_sqlite_profile(engine, get_settings(), read_only=read_only)
+    return engine
+
+
+def _create_async_engine(url: str, read_only: bool = False) -> AsyncEngine:
+    """Create an async engine, applying the SQLite profile if it is used."""
+    engine = create_async_engine(
+        url, **engine_options(get_settings(), url, read_only, async_driver=True)
     )
+    if uses_sqlite_profile(url):
+        apply_sqlite_profile(engine.sync_engine, get_settings(), read_only=read_only)
+    return engine
+
+
+def get_engine() -> Engine:
+    """Create and return the database engine (the primary).
+
+    With the SQLite profile this is the writer: a pool of one connection.
+    """
+    return _create_engine(sync_database_url(get_settings().database_url))
+
+
+def get_read_engine() -> Engine | None:
+    """Create and return the engine for read-only queries.
+
+    Returns:
+        An engine on ``DATABASE_READ_URL`` if set, else the pool of
+        query-only connections with the SQLite profile, otherwise None
+        (reads share the primary).
+    """
+    settings = get_settings()
+    if settings.database_read_url:
+        return _create_engine(
+            sync_database_url(settings.database_read_url), read_only=True
+        )
+
+    database_url = sync_database_url(settings.database_url)
+    if uses_sqlite_profile(database_url):
+        return _create_engine(database_url, read_only=True)
+    return None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Create and return the async database engine (the primary).
+
+    With the SQLite profile this is the writer: a pool of one connection.
+
+    Raises:
+        ValueError: If the configured database URL has no async driver.
+    """
+    settings = get_settings()
+    if not is_async_url(settings.database_url):
+        raise ValueError(
+            "DATABASE_URL must use sqlite+aiosqlite or postgresql+asyncpg "
+            "for the async database path"
+        )
+
+    return _create_async_engine(settings.database_url)
+
 
+def get_async_read_engine() -> AsyncEngine | None:
+    """Create and return the async engine for read-only queries.
+
+    Returns:
+        An engine on ``DATABASE_READ_URL`` if set, else the pool of
+        query-only connections with the SQLite profile, otherwise None
+        (reads share the primary).
+
+    Raises:
+        ValueError: If ``DATABASE_READ_URL`` has no async driver.
+    """
+    settings = get_settings()
+    if settings.database_read_url:
+        if not is_async_url(settings.database_read_url):
+            raise ValueError(
+                "DATABASE_READ_URL must use an async driver when DATABASE_URL does"
+            )
+        return _create_async_engine(settings.database_read_url, read_only=True)
 
-# Global engine instance (lazy initialization)
+    if is_async_url(settings.database_url) and uses_sqlite_profile(
+        settings.database_url
+    ):
+        return _create_async_engine(settings.database_url, read_only=True)
+    return None
+
+
+# Global engine instances (lazy initialization)
 _engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_read_engine: Engine | None = None
+_async_read_engine: AsyncEngine | None = None
 
 
 def get_global_engine() -> Engine:
@@ -36,14 +224,119 @@ def get_global_engine() -> Engine:
     return _engine
 
 
-def init_db() -> None:
-    """Initialize the database by creating all tables."""
+def get_global_async_engine() -> AsyncEngine:
+    """Get or create the global async engine instance."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = get_async_engine()
+    return _async_engine
+
+
+def get_global_read_engine() -> Engine:
+    """Get the global engine for read-only queries.
+
+    This is the global engine unless reads have a pool of their own.
+    """
+    global _read_engine
+    if _read_engine is None:
+        _read_engine = get_read_engine()
+    return _read_engine or get_global_engine()
+
+
+def get_global_async_read_engine() -> AsyncEngine:
+    """Get the global async engine for read-only queries.
+
+    This is the global async engine unless reads have a pool of their own.
+    """
+    global _async_read_engine
+    if _async_read_engine is None:
+        _async_read_engine = get_async_read_engine()
+    return _async_read_engine or get_global_async_engine()
+
+
+def new_session() -> Session:
+    """Open a sync session on the primary.
+
+    With the SQLite profile, statements that only read are routed to the
+    reader pool of the same database file.
+    """
     engine = get_global_engine()
-    SQLModel.metadata.create_all(engine)
+    if not uses_sqlite_profile(str(engine.url)):
+        return Session(engine)
+    return RoutingSession(writer=engine, reader=get_global_read_engine())
+
+
+def new_async_session() -> AsyncSession:
+    """Open an async session on the primary.
+
+    With the SQLite profile, statements that only read are routed to the
+    reader pool of the same database file. Objects outlive the commit in the
+    routers and workers, so they are not expired on commit (which would
+    lazy-load on async I/O).
+    """
+    engine = get_global_async_engine()
+    if not uses_sqlite_profile(str(engine.url)):
+        return AsyncSession(engine, expire_on_commit=False)
+    return AsyncSession(
+        sync_session_class=RoutingSession,
+        writer=engine.sync_engine,
+        reader=get_global_async_read_engine().sync_engine,
+        expire_on_commit=False,
+    )
+
+
+def new_read_session() -> Session:
+    """Open a sync session for read-only work on the read engine."""
+    return Session(get_global_read_engine())
+
+
+def new_async_read_session() -> AsyncSession:
+    """Open an async session for read-only work on the read engine."""
+    return AsyncSession(get_global_async_read_engine(), expire_on_commit=False)
+
+
+def init_db() -> list[str]:
+    """Migrate the database to the current schema version.
+
+    Returns:
+        The revisions applied.
+    """
+    # Imported here: the migrations import the models, which import this module
+    from app.db.migrations import upgrade
+
+    return upgrade(get_global_engine())
 
 
 def get_session() -> Generator[Session, None, None]:
     """Get a database session (FastAPI dependency)."""
-    engine = get_global_engine()
-    with Session(engine) as session:
+    with new_session() as session:
+        yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session (FastAPI dependency)."""
+    async with new_async_session() as session:
+        yield session
+
+
+def get_read_session() -> Generator[Session, None, None]:
+    """Get a read-only database session (FastAPI dependency)."""
+    with new_read_session() as session:
         yield session
+
+
+async def get_async_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get a read-only async database session (FastAPI dependency)."""
+    async with new_async_read_session() as session:
+        yield session
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AnySession]:
+    """Open a session for background work, async if so configured."""
+    if is_async_url(get_settings().database_url):
+        async with new_async_session() as session:
+            yield session
+    else:
+        with new_session() as session:
+            yield session
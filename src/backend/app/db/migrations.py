@@ -0,0 +1,549 @@
+"""Versioned schema migrations.
+
+The schema version of a database is the newest revision recorded in
+``schema_migrations``. ``upgrade`` (the ``migrate`` CLI command) brings a
+database to ``SCHEMA_VERSION``: an empty database gets every table in its
+current shape and all revisions recorded, while an existing one has its
+pending migrations applied in order, each in its own transaction. Steps are
+idempotent, so a database whose tables already have some of the changes
+migrates cleanly too.
+
+Application startup only calls ``check_schema_version``, a single query,
+and never reflects or creates tables.
+"""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Connection,
+    DateTime,
+    Engine,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    column,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import SQLModel
+
+import app.db.models  # noqa: F401 - registers every table on the metadata
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is not at the version this code expects."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A forward-only schema change."""
+
+    revision: str
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+# Tables in the shape their revision created them. Migrations never use the
+# models, which keep changing after a revision is released.
+_metadata = MetaData()
+
+_schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("revision", String, primary_key=True),
+    Column("description", String, nullable=False),
+    Column(
+        "applied_at",
+        DateTime,
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    ),
+)
+
+# 0002
+_payload_dictionaries = Table(
+    "payload_dictionaries",
+    _metadata,
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("id", Integer, primary_key=True),
+    Column("event_type", String, nullable=False, index=True),
+    Column("codec", String, nullable=False),
+    Column("version", Integer, nullable=False),
+    Column("data", LargeBinary, nullable=False),
+    Column("sample_count", Integer, nullable=False),
+    UniqueConstraint("event_type", "codec", "version"),
+)
+_payload_blobs = Table(
+    "payload_blobs",
+    _metadata,
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("sha256", String, primary_key=True),
+    Column("codec", String, nullable=False),
+    Column("data", LargeBinary, nullable=False),
+    Column("size", Integer, nullable=False),
+)
+
+# 0003
+_counters = Table(
+    "event_counters",
+    _metadata,
+    Column("installation_id", Integer, primary_key=True),
+    Column("repository_id", Integer, primary_key=True),
+    Column("user_id", Integer, primary_key=True),
+    Column("event_type", String, primary_key=True),
+    Column("action", String, primary_key=True),
+    Column("count", Integer, nullable=False),
+)
+
+# 0004
+_repository_event_markers = Table(
+    "repository_event_markers",
+    _metadata,
+    Column("repository_id", Integer, ForeignKey("repositories.id"), primary_key=True),
+    Column("event_type", String, primary_key=True),
+    Column("last_event_at", DateTime, nullable=False),
+)
+
+# 0005
+_archived_events = Table(
+    "archived_events",
+    _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("delivery_id", String, nullable=False, unique=True, index=True),
+    Column("event_type", String, nullable=False),
+    Column("installation_id", Integer),
+    Column("created_at", DateTime, nullable=False, index=True),
+    Column("segment", String, nullable=False),
+    Column("offset", Integer, nullable=False),
+    Column("length", Integer, nullable=False),
+)
+
+# 0008: events as of 0007, rebuilt on SQLite so IDs are never reused
+_events_autoincrement = Table(
+    "events",
+    _metadata,
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("id", Integer, primary_key=True),
+    Column("delivery_id", String, nullable=False, unique=True, index=True),
+    Column("event_type", String, nullable=False, index=True),
+    Column("action", String),
+    Column("repository_id", Integer, ForeignKey("repositories.id")),
+    Column("installation_id", Integer, ForeignKey("installations.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), index=True),
+    Column("actor_login", String, index=True),
+    Column("target_kind", String),
+    Column("target_number", Integer, index=True),
+    Column("head_sha", String, index=True),
+    Column("ref", String, index=True),
+    Column("source_created_at", DateTime, index=True),
+    Column("payload", LargeBinary, nullable=False),
+    Column("payload_codec", String, nullable=False),
+    Column("payload_dictionary_id", Integer, ForeignKey("payload_dictionaries.id")),
+    Column("payload_refs", String),
+    Column("payload_sha256", String, index=True),
+    Column("processed", Boolean, nullable=False),
+    Column("processed_at", DateTime),
+    Column("error", String),
+    Index(
+        "ix_events_installation_id_created_at_desc_id",
+        "installation_id",
+        text("created_at DESC"),
+        text("id DESC"),
+    ),
+    Index(
+        "ix_events_repository_id_created_at_desc_id",
+        "repository_id",
+        text("created_at DESC"),
+        text("id DESC"),
+    ),
+    sqlite_autoincrement=True,
+)
+
+# Columns of existing tables the data migrations read and write
+_events = table(
+    "events",
+    column("installation_id"),
+    column("repository_id"),
+    column("user_id"),
+    column("event_type"),
+    column("action"),
+    column("created_at"),
+)
+# Referenced by foreign keys too; never created from here
+_repositories = Table(
+    "repositories",
+    _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("last_event_at", DateTime),
+    Column("updated_at", DateTime, nullable=False),
+)
+Table("installations", _metadata, Column("id", Integer, primary_key=True))
+Table("users", _metadata, Column("id", Integer, primary_key=True))
+
+
+def _add_column(
+    connection: Connection,
+    table_name: str,
+    new_column: Column[Any],
+    default: str | None = None,
+    references: str | None = None,
+) -> None:
+    """Add a column to an existing table unless already present.
+
+    Args:
+        connection: The migration connection.
+        table_name: The table to add it to.
+        new_column: The column to add; only its name and type are used.
+        default: SQL default for a NOT NULL column; nullable if omitted.
+        references: Referenced ``table (column)``, for a foreign key.
+    """
+    existing = {c["name"] for c in inspect(connection).get_columns(table_name)}
+    if new_column.name in existing:
+        return
+
+    ddl = f"{new_column.name} {new_column.type.compile(dialect=connection.dialect)}"
+    if default is not None:
+        ddl += f" NOT NULL DEFAULT {default}"
+    if references is not None:
+        ddl += f" REFERENCES {references}"
+    connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {ddl}"))
+
+
+def _create_index(connection: Connection, name: str, columns: str) -> None:
+    """Create an index on the events table unless it already exists."""
+    connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON events ({columns})"))
+
+
+def _event_list_indexes(connection: Connection) -> None:
+    """Index event listings by installation and repository, newest first.
+
+    Replaces the user-scoped listing index (events carry no user) and the
+    single-column indexes the new indexes lead with.
+    """
+    for name in (
+        "ix_events_user_id_created_at_id",
+        "ix_events_repository_id_created_at_id",
+        "ix_events_installation_id",
+        "ix_events_repository_id",
+    ):
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    _create_index(
+        connection,
+        "ix_events_installation_id_created_at_desc_id",
+        "installation_id, created_at DESC, id DESC",
+    )
+    _create_index(
+        connection,
+        "ix_events_repository_id_created_at_desc_id",
+        "repository_id, created_at DESC, id DESC",
+    )
+
+
+def _payload_storage(connection: Connection) -> None:
+    """Store payloads as compressed bytes with interned sub-object blobs.
+
+    PostgreSQL payloads written as TEXT are converted to BYTEA in place;
+    SQLite stores either and ``RawPayload`` reads both.
+    """
+    _payload_dictionaries.create(connection, checkfirst=True)
+    _payload_blobs.create(connection, checkfirst=True)
+
+    _add_column(
+        connection, "events", Column("payload_codec", String), default="'identity'"
+    )
+    _add_column(
+        connection,
+        "events",
+        Column("payload_dictionary_id", Integer),
+        references="payload_dictionaries (id)",
+    )
+    _add_column(connection, "events", Column("payload_refs", String))
+    _add_column(connection, "events", Column("payload_sha256", String))
+    _create_index(connection, "ix_events_payload_sha256", "payload_sha256")
+
+    payload_type = next(
+        str(column["type"]).upper()
+        for column in inspect(connection).get_columns("events")
+        if column["name"] == "payload"
+    )
+    if connection.dialect.name == "postgresql" and payload_type != "BYTEA":
+        connection.execute(
+            text(
+                "ALTER TABLE events ALTER COLUMN payload TYPE BYTEA "
+                "USING convert_to(payload, 'UTF8')"
+            )
+        )
+
+
+def _event_counters(connection: Connection) -> None:
+    """Create the event counters and count the events already stored."""
+    _counters.create(connection, checkfirst=True)
+
+    events = _events.c
+    dimensions = (
+        func.coalesce(events.installation_id, 0),
+        func.coalesce(events.repository_id, 0),
+        func.coalesce(events.user_id, 0),
+        events.event_type,
+        func.coalesce(events.action, ""),
+    )
+    connection.execute(delete(_counters))
+    connection.execute(
+        insert(_counters).from_select(
+            [
+                "installation_id",
+                "repository_id",
+                "user_id",
+                "event_type",
+                "action",
+                "count",
+            ],
+            select(*dimensions, func.count()).group_by(*dimensions),
+        )
+    )
+
+
+def _repository_markers(connection: Connection) -> None:
+    """Denormalize repository last-event times from the stored events."""
+    _add_column(connection, "repositories", Column("last_event_at", DateTime))
+    _repository_event_markers.create(connection, checkfirst=True)
+
+    events = _events.c
+    markers = _repository_event_markers.c
+    connection.execute(delete(_repository_event_markers))
+    connection.execute(
+        insert(_repository_event_markers).from_select(
+            ["repository_id", "event_type", "last_event_at"],
+            select(events.repository_id, events.event_type, func.max(events.created_at))
+            .where(events.repository_id.is_not(None))
+            .group_by(events.repository_id, events.event_type),
+        )
+    )
+    newest = (
+        select(func.max(markers.last_event_at))
+        .where(markers.repository_id == _repositories.c.id)
+        .scalar_subquery()
+    )
+    connection.execute(
+        update(_repositories).values(
+            last_event_at=newest, updated_at=_repositories.c.updated_at
+        )
+    )
+
+
+def _event_archive(connection: Connection) -> None:
+    """Index events moved to archive segments."""
+    _archived_events.create(connection, checkfirst=True)
+
+
+def _search_index(connection: Connection) -> None:
+    """Create the full-text search index over event payloads."""
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS event_search ("
+            "event_id INTEGER PRIMARY KEY REFERENCES events (id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        )
+        connection.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_event_search_document "
+            "ON event_search USING GIN (document)"
+        )
+    else:
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS event_search "
+            "USING fts5(document, tokenize='unicode61')"
+        )
+
+
+def _extracted_columns(connection: Connection) -> None:
+    """Add the indexed actor and target columns extracted from payloads."""
+    added = (
+        (Column("actor_login", String), True),
+        (Column("target_kind", String), False),
+        (Column("target_number", Integer), True),
+        (Column("head_sha", String), True),
+        (Column("ref", String), True),
+        (Column("source_created_at", DateTime), True),
+    )
+    for new_column, indexed in added:
+        _add_column(connection, "events", new_column)
+        if indexed:
+            _create_index(connection, f"ix_events_{new_column.name}", new_column.name)
+
+
+def _autoincrement_event_ids(connection: Connection) -> None:
+    """Stop SQLite from handing out the IDs of archived events again.
+
+    Without AUTOINCREMENT SQLite reuses the highest IDs once their rows are
+    deleted, which archiving does; adding it means rebuilding the table.
+    The ID sequence starts past archived events too. PostgreSQL sequences
+    never go back, so only SQLite changes.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    ddl = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'events'"
+    ).scalar_one()
+    if "AUTOINCREMENT" in ddl.upper():
+        return
+
+    connection.exec_driver_sql("ALTER TABLE events RENAME TO events_0007")
+    for index in inspect(connection).get_indexes("events_0007"):
+        connection.exec_driver_sql(f"DROP INDEX {index['name']}")
+    _events_autoincrement.create(connection)
+    columns = _events_autoincrement.c.keys()
+    previous = table("events_0007", *(column(name) for name in columns))
+    connection.execute(
+        insert(_events_autoincrement).from_select(columns, select(previous))
+    )
+    connection.exec_driver_sql("DROP TABLE events_0007")
+
+    connection.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = 'events'")
+    connection.exec_driver_sql(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'events', max("
+        "(SELECT coalesce(max(id), 0) FROM events), "
+        "(SELECT coalesce(max(id), 0) FROM archived_events))"
+    )
+
+
+# Applied in order; never edit or reorder a released migration
+MIGRATIONS = (
+    Migration(
+        "0001",
+        "Installation- and repository-scoped event list indexes",
+        _event_list_indexes,
+    ),
+    Migration(
+        "0002",
+        "Compressed payload storage with dictionaries and interned blobs",
+        _payload_storage,
+    ),
+    Migration("0003", "Incrementally maintained event counters", _event_counters),
+    Migration("0004", "Repository last-event markers", _repository_markers),
+    Migration("0005", "Archived event segment index", _event_archive),
+    Migration(
+        "0006",
+        "Full-text search index (fill with rebuild-search-index)",
+        _search_index,
+    ),
+    Migration(
+        "0007",
+        "Extracted actor and target columns (fill with backfill-event-columns)",
+        _extracted_columns,
+    ),
+    Migration("0008", "Event IDs never reused on SQLite", _autoincrement_event_ids),
+)
+
+# Revision the code expects the database to be at
+SCHEMA_VERSION = MIGRATIONS[-1].revision
+
+
+def get_schema_version(engine: Engine) -> str | None:
+    """Get the schema version of a database with one query.
+
+    Args:
+        engine: The database engine.
+
+    Returns:
+        The newest applied revision, or None if the database has never been
+        migrated.
+    """
+    statement = select(func.max(_schema_migrations.c.revision))
+    try:
+        with engine.connect() as connection:
+            version: str | None = connection.scalar(statement)
+            return version
+    except DBAPIError:
+        # No schema_migrations table yet
+        return None
+
+
+def check_schema_version(engine: Engine) -> None:
+    """Verify the database is migrated to the version this code expects.
+
+    Args:
+        engine: The database engine.
+
+    Raises:
+        SchemaVersionError: If the stored version differs from
+            ``SCHEMA_VERSION``.
+    """
+    version = get_schema_version(engine)
+    if version != SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at revision {version or 'none'}, expected "
+            f"{SCHEMA_VERSION}; run 'copilot-orchestrator migrate'"
+        )
+
+
+def applied_revisions(engine: Engine) -> set[str]:
+    """Get the revisions already applied to a database.
+
+    Args:
+        engine: The database engine.
+
+    Returns:
+        The applied revisions.
+    """
+    _schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        return set(connection.scalars(select(_schema_migrations.c.revision)))
+
+
+def upgrade(engine: Engine) -> list[str]:
+    """Bring a database to ``SCHEMA_VERSION``.
+
+    Args:
+        engine: The database engine.
+
+    Returns:
+        The revisions applied or recorded by this call, in order.
+    """
+    if not inspect(engine).has_table("events"):
+        # Empty database: create the current schema and record it as such
+        with engine.begin() as connection:
+            SQLModel.metadata.create_all(connection)
+            _record(connection, MIGRATIONS)
+        return [migration.revision for migration in MIGRATIONS]
+
+    applied = applied_revisions(engine)
+    upgraded = []
+    for migration in MIGRATIONS:
+        if migration.revision in applied:
+            continue
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            _record(connection, [migration])
+        upgraded.append(migration.revision)
+    return upgraded
+
+
+def _record(connection: Connection, migrations: Sequence[Migration]) -> None:
+    """Record migrations as applied."""
+    connection.execute(
+        insert(_schema_migrations),
+        [
+            {"revision": migration.revision, "description": migration.description}
+            for migration in migrations
+        ],
+    )
@@ -0,0 +1,26 @@
+"""Archived event model indexing events moved to segment files."""
+
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class ArchivedEvent(SQLModel, table=True):
+    """Location of an archived event in a cold segment file.
+
+    Keeps the metadata event lookups filter on; the full record (metadata
+    and webhook body) lives compressed in the segment.
+    """
+
+    __tablename__ = "archived_events"
+
+    id: int = Field(primary_key=True, description="ID the event had when stored")
+    delivery_id: str = Field(
+        unique=True, index=True, description="GitHub delivery ID (X-GitHub-Delivery)"
+    )
+    event_type: str = Field(description="GitHub event type")
+    installation_id: int | None = Field(default=None, description="Installation ID")
+    created_at: datetime = Field(index=True, description="When the event was stored")
+    segment: str = Field(description="Segment file name, one per month")
+    offset: int = Field(description="Byte offset of the record in the segment")
+    length: int = Field(description="Byte length of the record")
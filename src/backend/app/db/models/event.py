@@ -1,16 +1,48 @@
 """Event model for storing webhook events."""
 
 from datetime import datetime
+from typing import Any
 
-from sqlmodel import Field, SQLModel
+from sqlalchemy import Column, Index, LargeBinary
+from sqlalchemy.types import TypeDecorator
+from sqlmodel import Field, SQLModel, col
 
 from app.db.models.base import TimestampMixin
 
 
+class RawPayload(TypeDecorator[bytes]):
+    """Binary column holding a webhook body as bytes.
+
+    Text values are accepted and encoded as UTF-8, and rows written as text
+    before the column became binary are read back as bytes.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(
+        self, value: bytes | str | None, dialect: Any
+    ) -> bytes | None:
+        """Encode text payloads before they are stored."""
+        if isinstance(value, str):
+            return value.encode()
+        return value
+
+    def process_result_value(
+        self, value: bytes | str | None, dialect: Any
+    ) -> bytes | None:
+        """Return stored payloads as bytes."""
+        if isinstance(value, str):
+            return value.encode()
+        return value
+
+
 class Event(SQLModel, TimestampMixin, table=True):
     """Event model for storing GitHub webhook events."""
 
     __tablename__ = "events"
+    # SQLite would reuse the IDs of the newest events once archived
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: int | None = Field(default=None, primary_key=True)
     delivery_id: str = Field(
@@ -18,14 +50,52 @@ class Event(SQLModel, TimestampMixin, table=True):
     )
     event_type: str = Field(index=True, description="GitHub event type")
     action: str | None = Field(default=None, description="Event action (if applicable)")
-    repository_id: int | None = Field(
-        default=None, foreign_key="repositories.id", index=True
+    # Indexed by EVENT_LIST_INDEXES, which lead with these columns
+    repository_id: int | None = Field(default=None, foreign_key="repositories.id")
+    installation_id: int | None = Field(default=None, foreign_key="installations.id")
+    user_id: int | None = Field(default=None, foreign_key="users.id", index=True)
+    # Extracted from the payload at ingest (see app.services.event_extraction)
+    actor_login: str | None = Field(
+        default=None, index=True, description="Login of the user who triggered it"
     )
-    installation_id: int | None = Field(
-        default=None, foreign_key="installations.id", index=True
+    target_kind: str | None = Field(
+        default=None, description="Kind of object acted on (pull_request, issue, …)"
+    )
+    target_number: int | None = Field(
+        default=None, index=True, description="Number of the pull request or issue"
+    )
+    head_sha: str | None = Field(
+        default=None, index=True, description="Commit SHA the event refers to"
+    )
+    ref: str | None = Field(
+        default=None, index=True, description="Git ref or branch the event refers to"
+    )
+    source_created_at: datetime | None = Field(
+        default=None,
+        index=True,
+        description="When the event happened on GitHub, per the payload",
+    )
+    payload: bytes = Field(
+        sa_column=Column(RawPayload, nullable=False),
+        description="Webhook body with shared sub-objects cut out, encoded",
+    )
+    payload_codec: str = Field(
+        default="identity", description="Codec the payload is stored with"
+    )
+    payload_dictionary_id: int | None = Field(
+        default=None,
+        foreign_key="payload_dictionaries.id",
+        description="Compression dictionary the payload was encoded with",
+    )
+    payload_refs: str | None = Field(
+        default=None,
+        description="JSON list of [offset, sha256] blobs spliced into the payload",
+    )
+    payload_sha256: str | None = Field(
+        default=None,
+        index=True,
+        description="SHA-256 of the original webhook body (payload reference)",
     )
-    user_id: int | None = Field(default=None, foreign_key="users.id", index=True)
-    payload: str = Field(description="JSON string of the webhook payload")
     processed: bool = Field(
         default=False, description="Whether event has been processed"
     )
@@ -35,3 +105,27 @@ class Event(SQLModel, TimestampMixin, table=True):
     error: str | None = Field(
         default=None, description="Error message if processing failed"
     )
+
+    @property
+    def payload_ref(self) -> str | None:
+        """Content reference of the original payload, if recorded."""
+        return f"sha256:{self.payload_sha256}" if self.payload_sha256 else None
+
+
+# Event listings: newest first by (created_at, id) per installation or
+# repository, so each scope is read as one ordered index range. They also
+# serve plain lookups by installation_id or repository_id.
+EVENT_LIST_INDEXES = (
+    Index(
+        "ix_events_installation_id_created_at_desc_id",
+        col(Event.installation_id),
+        col(Event.created_at).desc(),
+        col(Event.id).desc(),
+    ),
+    Index(
+        "ix_events_repository_id_created_at_desc_id",
+        col(Event.repository_id),
+        col(Event.created_at).desc(),
+        col(Event.id).desc(),
+    ),
+)
@@ -0,0 +1,113 @@
+"""Event counter model for incrementally maintained event totals."""
+
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from sqlalchemy import Connection, event
+from sqlmodel import Field, SQLModel
+
+from app.db.engine import dialect_insert
+from app.db.models.event import Event
+
+# Dimensions of a counter row, in key order
+COUNTER_DIMENSIONS = (
+    "installation_id",
+    "repository_id",
+    "user_id",
+    "event_type",
+    "action",
+)
+
+CounterKey = tuple[int, int, int, str, str]
+
+
+class EventCounter(SQLModel, table=True):
+    """Number of stored events per installation/repository/type/action.
+
+    Absent dimensions are stored as 0 (IDs) or "" (action) rather than NULL
+    so every combination has exactly one row to upsert. Counters change in
+    the same transaction as the events they count.
+    """
+
+    __tablename__ = "event_counters"
+
+    installation_id: int = Field(default=0, primary_key=True)
+    repository_id: int = Field(default=0, primary_key=True)
+    user_id: int = Field(default=0, primary_key=True)
+    event_type: str = Field(primary_key=True)
+    action: str = Field(default="", primary_key=True)
+    count: int = Field(default=0, description="Number of events")
+
+
+def counter_key(values: Mapping[str, Any]) -> CounterKey:
+    """Get the counter key of an event.
+
+    Args:
+        values: Event column values.
+
+    Returns:
+        The key with absent dimensions replaced by their sentinels.
+    """
+    return (
+        values.get("installation_id") or 0,
+        values.get("repository_id") or 0,
+        values.get("user_id") or 0,
+        values["event_type"],
+        values.get("action") or "",
+    )
+
+
+def counter_increments(rows: Iterable[Mapping[str, Any]]) -> Counter[CounterKey]:
+    """Aggregate event rows into per-key increments.
+
+    Args:
+        rows: Event column values.
+
+    Returns:
+        Increment per counter key.
+    """
+    return Counter(counter_key(row) for row in rows)
+
+
+def upsert_counters_statement(
+    dialect_name: str, increments: Mapping[CounterKey, int]
+) -> Any:
+    """Build one statement adding increments to their counter rows.
+
+    Args:
+        dialect_name: Name of the database dialect.
+        increments: Amount to add per counter key (may be negative).
+
+    Returns:
+        An ``INSERT ... ON CONFLICT DO UPDATE`` statement.
+    """
+    statement = dialect_insert(dialect_name, EventCounter).values(
+        [
+            {**dict(zip(COUNTER_DIMENSIONS, key, strict=True)), "count": amount}
+            for key, amount in increments.items()
+        ]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=list(COUNTER_DIMENSIONS),
+        set_={"count": EventCounter.count + statement.excluded.count},
+    )
+
+
+@event.listens_for(Event, "after_insert")
+def _count_inserted_event(mapper: Any, connection: Connection, target: Event) -> None:
+    """Count events added through the ORM (``session.add``)."""
+    increments = counter_increments([_dimensions(target)])
+    connection.execute(upsert_counters_statement(connection.dialect.name, increments))
+
+
+@event.listens_for(Event, "after_delete")
+def _uncount_deleted_event(mapper: Any, connection: Connection, target: Event) -> None:
+    """Uncount events deleted through the ORM."""
+    increments = dict.fromkeys(counter_increments([_dimensions(target)]), -1)
+    connection.execute(upsert_counters_statement(connection.dialect.name, increments))
+
+
+def _dimensions(target: Event) -> dict[str, Any]:
+    """Read the counter dimensions of an event instance."""
+    return {name: getattr(target, name) for name in COUNTER_DIMENSIONS}
@@ -0,0 +1,158 @@
+"""Full-text search index over event payloads.
+
+SQLite keeps the index in an FTS5 table keyed by event rowid and ranks
+matches with BM25; PostgreSQL keeps a ``tsvector`` per event behind a GIN
+index and ranks with ``ts_rank_cd``. Either way the index is not a model
+table: it is created and dropped alongside the metadata and queried through
+the helpers below, which hide the dialect differences.
+"""
+
+from collections.abc import Collection, Mapping
+from typing import Any
+
+from sqlalchemy import Connection, column, delete, event, func, insert, inspect, table
+from sqlmodel import SQLModel
+
+SEARCH_TABLE = "event_search"
+
+# Text search configuration on PostgreSQL: no stemming or stop words, like
+# FTS5's unicode61 tokenizer
+_PG_CONFIG = "simple"
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the search index unless it already exists.
+
+    Args:
+        connection: A connection to the database.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            "event_id INTEGER PRIMARY KEY REFERENCES events (id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        )
+        connection.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document "
+            f"ON {SEARCH_TABLE} USING GIN (document)"
+        )
+    else:
+        connection.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+            "USING fts5(document, tokenize='unicode61')"
+        )
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _create_search_index(target: Any, connection: Connection, **kwargs: Any) -> None:
+    """Create the search index with the tables, once events exist."""
+    if inspect(connection).has_table("events"):
+        create_search_index(connection)
+
+
+@event.listens_for(SQLModel.metadata, "before_drop")
+def _drop_search_index(target: Any, connection: Connection, **kwargs: Any) -> None:
+    """Drop the search index before the events it references."""
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+# The index as seen by queries; the FTS5 table's own name is its MATCH column
+_SQLITE_INDEX = table(
+    SEARCH_TABLE, column("rowid"), column("document"), column(SEARCH_TABLE)
+)
+_PG_INDEX = table(SEARCH_TABLE, column("event_id"), column("document"))
+
+
+def _index(dialect_name: str) -> Any:
+    """Get the search index table of a dialect."""
+    return _PG_INDEX if dialect_name == "postgresql" else _SQLITE_INDEX
+
+
+def search_key(dialect_name: str) -> Any:
+    """Get the event ID column of the search index.
+
+    Args:
+        dialect_name: Name of the database dialect.
+
+    Returns:
+        The column joined to ``events.id``.
+    """
+    index = _index(dialect_name)
+    return index.c.event_id if dialect_name == "postgresql" else index.c.rowid
+
+
+def index_documents_statement(dialect_name: str, documents: Mapping[int, str]) -> Any:
+    """Build one statement indexing the search documents of new events.
+
+    Args:
+        dialect_name: Name of the database dialect.
+        documents: Search document per event ID.
+
+    Returns:
+        A multi-row INSERT into the search index.
+    """
+    key = search_key(dialect_name)
+    rows = [
+        {
+            key.name: event_id,
+            "document": (
+                func.to_tsvector(_PG_CONFIG, text)
+                if dialect_name == "postgresql"
+                else text
+            ),
+        }
+        for event_id, text in documents.items()
+    ]
+    return insert(_index(dialect_name)).values(rows)
+
+
+def unindex_events_statement(dialect_name: str, event_ids: Collection[int]) -> Any:
+    """Build the statement removing events from the search index.
+
+    Args:
+        dialect_name: Name of the database dialect.
+        event_ids: IDs of the events.
+
+    Returns:
+        A DELETE on the search index.
+    """
+    key = search_key(dialect_name)
+    return delete(_index(dialect_name)).where(key.in_(list(event_ids)))
+
+
+def match_clause(dialect_name: str, terms: list[str]) -> Any:
+    """Build the filter matching documents that contain every term.
+
+    Args:
+        dialect_name: Name of the database dialect.
+        terms: Search terms (word characters only).
+
+    Returns:
+        A filter served by the search index.
+    """
+    index = _index(dialect_name)
+    if dialect_name == "postgresql":
+        return index.c.document.op("@@")(_tsquery(terms))
+    # Quoted terms are matched as plain tokens, never as FTS5 syntax
+    return index.c[SEARCH_TABLE].op("MATCH")(" ".join(f'"{t}"' for t in terms))
+
+
+def rank_expression(dialect_name: str, terms: list[str]) -> Any:
+    """Build the relevance score of a matched document; lower ranks first.
+
+    Args:
+        dialect_name: Name of the database dialect.
+        terms: Search terms (word characters only).
+
+    Returns:
+        BM25 on SQLite, negated ``ts_rank_cd`` on PostgreSQL.
+    """
+    index = _index(dialect_name)
+    if dialect_name == "postgresql":
+        return -func.ts_rank_cd(index.c.document, _tsquery(terms))
+    return func.bm25(index.c[SEARCH_TABLE])
+
+
+def _tsquery(terms: list[str]) -> Any:
+    """Build a PostgreSQL query requiring every term."""
+    return func.plainto_tsquery(_PG_CONFIG, " ".join(terms))
@@ -0,0 +1,24 @@
+"""Payload blob model for content-addressed payload sub-objects."""
+
+from sqlalchemy import Column, LargeBinary
+from sqlmodel import Field, SQLModel
+
+from app.db.models.base import TimestampMixin
+
+
+class PayloadBlob(SQLModel, TimestampMixin, table=True):
+    """A payload sub-object shared by many events, stored once by content hash.
+
+    Events reference blobs from ``Event.payload_refs``; a blob's content
+    never changes, so it is written at most once.
+    """
+
+    __tablename__ = "payload_blobs"
+
+    sha256: str = Field(primary_key=True, description="SHA-256 hex digest of the data")
+    codec: str = Field(description="Codec the data is stored with")
+    data: bytes = Field(
+        sa_column=Column(LargeBinary, nullable=False),
+        description="Encoded blob bytes",
+    )
+    size: int = Field(description="Decoded size in bytes")
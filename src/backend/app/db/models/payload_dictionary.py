@@ -0,0 +1,27 @@
+"""Payload dictionary model for trained compression dictionaries."""
+
+from sqlalchemy import Column, LargeBinary, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+from app.db.models.base import TimestampMixin
+
+
+class PayloadDictionary(SQLModel, TimestampMixin, table=True):
+    """Compression dictionary trained on stored payloads of one event type.
+
+    Dictionaries are immutable; retraining adds a new version, and events
+    keep pointing at the version they were compressed with.
+    """
+
+    __tablename__ = "payload_dictionaries"
+    __table_args__ = (UniqueConstraint("event_type", "codec", "version"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    event_type: str = Field(index=True, description="Event type trained on")
+    codec: str = Field(description="Codec the dictionary is used with")
+    version: int = Field(description="Version, increasing per event type and codec")
+    data: bytes = Field(
+        sa_column=Column(LargeBinary, nullable=False),
+        description="Dictionary bytes",
+    )
+    sample_count: int = Field(description="Number of payloads trained on")
@@ -1,5 +1,7 @@
 """Repository model for repositories with GitHub App installations."""
 
+from datetime import datetime
+
 from sqlmodel import Field, SQLModel
 
 from app.db.models.base import TimestampMixin
@@ -20,3 +22,6 @@ class Repository(SQLModel, TimestampMixin, table=True):
     name: str = Field(description="Repository name")
     private: bool = Field(default=False, description="Whether repo is private")
     default_branch: str = Field(default="main", description="Default branch name")
+    last_event_at: datetime | None = Field(
+        default=None, description="When the newest event for the repo was stored"
+    )
@@ -0,0 +1,104 @@
+"""Repository event marker model for per-type last-event timestamps."""
+
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Connection, case, event, or_, update
+from sqlmodel import Field, SQLModel, col
+
+from app.db.engine import dialect_insert
+from app.db.models.event import Event
+from app.db.models.repository import Repository
+
+
+class RepositoryEventMarker(SQLModel, table=True):
+    """When the newest event of one type was stored for a repository.
+
+    Markers, like ``Repository.last_event_at``, only move forward and are
+    updated in the same transaction as the events they track.
+    """
+
+    __tablename__ = "repository_event_markers"
+
+    repository_id: int = Field(foreign_key="repositories.id", primary_key=True)
+    event_type: str = Field(primary_key=True)
+    last_event_at: datetime = Field(description="When the newest event was stored")
+
+
+def marker_statements(
+    dialect_name: str, rows: Iterable[Mapping[str, Any]]
+) -> list[Any]:
+    """Build the statements advancing markers for newly stored events.
+
+    Args:
+        dialect_name: Name of the database dialect.
+        rows: Column values of the stored events.
+
+    Returns:
+        One UPDATE per repository and one marker upsert; empty if no event
+        belongs to a repository.
+    """
+    latest: dict[int, datetime] = {}
+    latest_by_type: dict[tuple[int, str], datetime] = {}
+    for row in rows:
+        repository_id = row.get("repository_id")
+        if not repository_id:
+            continue
+        created_at = row["created_at"]
+        key = (repository_id, row["event_type"])
+        latest[repository_id] = max(latest.get(repository_id, created_at), created_at)
+        latest_by_type[key] = max(latest_by_type.get(key, created_at), created_at)
+
+    statements: list[Any] = [
+        update(Repository)
+        .where(
+            col(Repository.id) == repository_id,
+            or_(
+                col(Repository.last_event_at).is_(None),
+                col(Repository.last_event_at) < created_at,
+            ),
+        )
+        # Keep updated_at: a new event is not a change to the repository
+        .values(last_event_at=created_at, updated_at=Repository.updated_at)
+        for repository_id, created_at in latest.items()
+    ]
+    if latest_by_type:
+        upsert = dialect_insert(dialect_name, RepositoryEventMarker).values(
+            [
+                {
+                    "repository_id": repository_id,
+                    "event_type": event_type,
+                    "last_event_at": created_at,
+                }
+                for (repository_id, event_type), created_at in latest_by_type.items()
+            ]
+        )
+        statements.append(
+            upsert.on_conflict_do_update(
+                index_elements=["repository_id", "event_type"],
+                set_={
+                    "last_event_at": case(
+                        (
+                            upsert.excluded.last_event_at
+                            > RepositoryEventMarker.last_event_at,
+                            upsert.excluded.last_event_at,
+                        ),
+                        else_=RepositoryEventMarker.last_event_at,
+                    )
+                },
+            )
+        )
+    return statements
+
+
+@event.listens_for(Event, "after_insert")
+def _mark_inserted_event(mapper: Any, connection: Connection, target: Event) -> None:
+    """Advance markers for events added through the ORM (``session.add``)."""
+    row = {
+        "repository_id": target.repository_id,
+        "event_type": target.event_type,
+        "created_at": target.created_at,
+    }
+    for statement in marker_statements(connection.dialect.name, [row]):
+        connection.execute(statement)
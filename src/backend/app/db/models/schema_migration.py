@@ -0,0 +1,18 @@
+"""Schema migration model recording applied database migrations."""
+
+from datetime import UTC, datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class SchemaMigration(SQLModel, table=True):
+    """A migration that has been applied to this database."""
+
+    __tablename__ = "schema_migrations"
+
+    revision: str = Field(primary_key=True, description="Migration revision")
+    description: str = Field(description="What the migration changes")
+    applied_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        description="When the migration was applied",
+    )
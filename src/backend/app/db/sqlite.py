@@ -0,0 +1,211 @@
+"""SQLite high-throughput profile.
+
+File databases run in WAL mode so readers never block the writer, with
+``synchronous=NORMAL`` (WAL stays durable across application crashes and
+only fsyncs at checkpoints), memory-mapped reads, a larger page cache and a
+busy timeout. SQLite allows one writer at a time, so all writes go through
+a single dedicated connection (a pool of one; concurrent writers queue for
+it instead of failing with ``database is locked``), while reads use a pool
+of query-only connections. A background task checkpoints the WAL so it does
+not grow without bound during bursts.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+from sqlmodel import Session
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Session.info key set once a transaction has written
+_WRITING = "sqlite_writing"
+
+
+def is_sqlite_file_url(url: str) -> bool:
+    """Check whether a database URL points at an SQLite database file.
+
+    Args:
+        url: The database connection URL.
+
+    Returns:
+        True for file databases; False for other backends and in-memory
+        databases, which have no WAL.
+    """
+    scheme, _, rest = url.partition(":")
+    if not scheme.startswith("sqlite"):
+        return False
+    path = rest.removeprefix("//").removeprefix("/")
+    return path not in ("", ":memory:") and not path.startswith("file::memory:")
+
+
+def sqlite_pragmas(settings: Settings, read_only: bool = False) -> list[str]:
+    """Build the PRAGMA statements run on every new connection.
+
+    Args:
+        settings: Application settings.
+        read_only: Whether the connection serves reads only.
+
+    Returns:
+        The PRAGMA statements.
+    """
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        # Negative sizes are in KiB rather than pages
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA temp_store={settings.sqlite_temp_store}",
+        f"PRAGMA wal_autocheckpoint={settings.sqlite_wal_autocheckpoint}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def apply_sqlite_profile(
+    engine: Engine, settings: Settings, read_only: bool = False
+) -> None:
+    """Run the profile's PRAGMAs on each connection the engine opens.
+
+    Args:
+        engine: The (sync) engine, or the ``sync_engine`` of an async one.
+        settings: Application settings.
+        read_only: Whether the engine serves reads only.
+    """
+    pragmas = sqlite_pragmas(settings, read_only)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+class RoutingSession(Session):
+    """Session that sends writes to the writer engine and reads to readers.
+
+    Once a transaction has written, it stays on the writer until it ends so
+    it reads its own uncommitted changes.
+    """
+
+    def __init__(self, writer: Engine, reader: Engine, **kwargs: Any) -> None:
+        """Initialize the session.
+
+        Args:
+            writer: Engine holding the single writer connection.
+            reader: Engine with the pool of query-only connections.
+            **kwargs: Passed to ``Session``.
+        """
+        kwargs.pop("bind", None)
+        super().__init__(**kwargs)
+        self.writer = writer
+        self.reader = reader
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        """Choose the engine for a statement."""
+        if clause is None and mapper is None:
+            return self.writer
+        if self.info.get(_WRITING) or self._flushing or _is_write(clause):
+            self.info[_WRITING] = True
+            return self.writer
+        return self.reader
+
+    def commit(self) -> None:
+        """Commit and return to reading from the reader pool."""
+        try:
+            super().commit()
+        finally:
+            self.info.pop(_WRITING, None)
+
+    def rollback(self) -> None:
+        """Roll back and return to reading from the reader pool."""
+        try:
+            super().rollback()
+        finally:
+            self.info.pop(_WRITING, None)
+
+    def close(self) -> None:
+        """Close the session."""
+        self.info.pop(_WRITING, None)
+        super().close()
+
+
+def _is_write(clause: Any) -> bool:
+    """Whether a statement may write (DML, or raw SQL we cannot inspect)."""
+    return isinstance(clause, UpdateBase | TextClause)
+
+
+def checkpoint(engine: Engine, mode: str = "PASSIVE") -> tuple[int, int, int]:
+    """Checkpoint the WAL into the database file.
+
+    Args:
+        engine: The writer engine.
+        mode: PASSIVE (never waits), FULL, RESTART or TRUNCATE.
+
+    Returns:
+        SQLite's (busy, WAL frames, checkpointed frames).
+    """
+    with engine.connect() as connection:
+        row = connection.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").one()
+    return tuple(row)
+
+
+class Checkpointer:
+    """Background task checkpointing the WAL on an interval.
+
+    Passive checkpoints copy what they can without blocking readers or the
+    writer; on shutdown a truncating checkpoint leaves an empty WAL.
+    """
+
+    def __init__(self, engine: Engine, interval: float, mode: str = "PASSIVE") -> None:
+        """Initialize the checkpointer.
+
+        Args:
+            engine: The writer engine.
+            interval: Seconds between checkpoints.
+            mode: Checkpoint mode used on the interval.
+        """
+        self.engine = engine
+        self.interval = interval
+        self.mode = mode
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start checkpointing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the task and truncate the WAL."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await asyncio.to_thread(checkpoint, self.engine, "TRUNCATE")
+
+    async def _run(self) -> None:
+        """Checkpoint until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                busy, frames, done = await asyncio.to_thread(
+                    checkpoint, self.engine, self.mode
+                )
+            except Exception:
+                logger.exception("WAL checkpoint failed")
+                continue
+            logger.debug(
+                "WAL checkpoint: %d of %d frames (busy=%d)", done, frames, busy
+            )
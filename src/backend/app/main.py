@@ -1,5 +1,8 @@
 """FastAPI application factory."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -13,7 +16,14 @@ from app.api.routers import (
     webhooks_router,
 )
 from app.config import get_settings
-from app.db.engine import init_db
+from app.db.engine import get_global_engine, uses_sqlite_profile
+from app.db.migrations import check_schema_version
+from app.db.sqlite import Checkpointer
+from app.services.app_jwt import get_github_app_jwt
+from app.services.event_writer import get_event_writer
+from app.services.http_client import create_http_client
+from app.services.ingest import IngestWorkerPool
+from app.services.ingest_queue import get_ingest_queue
 
 
 def create_app() -> FastAPI:
@@ -24,11 +34,64 @@ def create_app() -> FastAPI:
     """
     settings = get_settings()
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        """Open shared resources and start background workers, then stop them.
+
+        Checks the database schema version, parses the GitHub App private key
+        (a malformed one fails startup) and opens the shared GitHub HTTP
+        client on startup; on shutdown stops the workers, flushes pending
+        event writes and closes the client.
+        """
+        check_schema_version(get_global_engine())
+        if settings.github_app_id and settings.github_private_key:
+            get_github_app_jwt(settings.github_app_id, settings.github_private_key)
+        app.state.http_client = create_http_client(settings)
+
+        if (
+            uses_sqlite_profile(settings.database_url)
+            and settings.sqlite_checkpoint_interval_seconds > 0
+        ):
+            app.state.checkpointer = Checkpointer(
+                get_global_engine(),
+                interval=settings.sqlite_checkpoint_interval_seconds,
+                mode=settings.sqlite_checkpoint_mode,
+            )
+            await app.state.checkpointer.start()
+
+        if settings.webhook_ingest_mode == "queue":
+            app.state.ingest_pool = IngestWorkerPool(
+                get_ingest_queue(),
+                workers=settings.ingest_workers,
+                poll_interval=settings.ingest_poll_interval_seconds,
+                event_writer=(
+                    get_event_writer() if settings.event_writer_enabled else None
+                ),
+            )
+            await app.state.ingest_pool.start()
+
+        try:
+            yield
+        finally:
+            pool = getattr(app.state, "ingest_pool", None)
+            if pool is not None:
+                await pool.stop()
+
+            if settings.event_writer_enabled:
+                await get_event_writer().stop()
+
+            checkpointer = getattr(app.state, "checkpointer", None)
+            if checkpointer is not None:
+                await checkpointer.stop()
+
+            await app.state.http_client.aclose()
+
     app = FastAPI(
         title=settings.app_name,
         description="Webhook-driven automation service for GitHub Copilot workflow management",
         version=__version__,
         debug=settings.debug,
+        lifespan=lifespan,
     )
 
     # Configure CORS
@@ -48,11 +111,6 @@ def create_app() -> FastAPI:
     app.include_router(repositories_router, prefix="/api")
     app.include_router(events_router, prefix="/api")
 
-    @app.on_event("startup")
-    async def on_startup() -> None:
-        """Initialize the database on startup."""
-        init_db()
-
     return app
 
 
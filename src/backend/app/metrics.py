@@ -0,0 +1,127 @@
+"""Lightweight in-process metrics (counters and histograms).
+
+Metrics register themselves in a process-wide registry that the
+``/metrics`` endpoint serializes as JSON.
+"""
+
+import bisect
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+
+class Counter:
+    """Monotonically increasing counter."""
+
+    def __init__(self, name: str, description: str = "") -> None:
+        """Initialize and register the counter.
+
+        Args:
+            name: Unique metric name.
+            description: Human-readable description.
+        """
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+        register(self)
+
+    @property
+    def value(self) -> int:
+        """Current counter value."""
+        return self._value
+
+    def inc(self, amount: int = 1) -> None:
+        """Increment the counter.
+
+        Args:
+            amount: Amount to add.
+        """
+        with self._lock:
+            self._value += amount
+
+    def snapshot(self) -> dict[str, Any]:
+        """Serialize the counter."""
+        return {"type": "counter", "value": self._value}
+
+
+class Histogram:
+    """Histogram with fixed, cumulative upper-bound buckets."""
+
+    def __init__(
+        self, name: str, buckets: Sequence[float], description: str = ""
+    ) -> None:
+        """Initialize and register the histogram.
+
+        Args:
+            name: Unique metric name.
+            buckets: Sorted bucket upper bounds.
+            description: Human-readable description.
+        """
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+        register(self)
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        """Sum of all observed values."""
+        return self._sum
+
+    def observe(self, value: float) -> None:
+        """Record an observation.
+
+        Args:
+            value: The observed value.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Serialize the histogram with cumulative bucket counts."""
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip(
+            [*map(str, self.buckets), "+Inf"], self._counts, strict=True
+        ):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            "type": "histogram",
+            "count": self._count,
+            "sum": self._sum,
+            "buckets": buckets,
+        }
+
+
+_registry: dict[str, Counter | Histogram] = {}
+
+
+def register(metric: Counter | Histogram) -> None:
+    """Add a metric to the registry, replacing any metric of the same name.
+
+    Args:
+        metric: The metric to register.
+    """
+    _registry[metric.name] = metric
+
+
+def snapshot() -> dict[str, dict[str, Any]]:
+    """Serialize every registered metric.
+
+    Returns:
+        Mapping of metric name to its serialized value.
+    """
+    return {name: metric.snapshot() for name, metric in sorted(_registry.items())}
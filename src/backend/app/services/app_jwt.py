@@ -0,0 +1,120 @@
+"""Process-wide cache of the signed GitHub App JWT.
+
+App JWTs authenticate the App itself (installation lookups and token
+minting). Signing one means an RS256 private-key operation, and parsing the
+PEM key on every call adds to it, so the key is parsed once, when the cache
+is created, and each JWT is reused until ``refresh_margin`` before it
+expires. When a new JWT is needed
+it is signed in a worker thread, off the event loop, and concurrent callers
+share that one signing.
+"""
+
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+
+from app.metrics import Counter
+from app.services.crypto import (
+    GITHUB_APP_JWT_LIFETIME,
+    generate_github_app_jwt,
+    load_github_app_key,
+)
+
+APP_JWT_HITS = Counter("github_app_jwt_cache_hits", "App JWTs served from the cache")
+APP_JWT_MISSES = Counter(
+    "github_app_jwt_cache_misses", "App JWTs signed because none was fresh"
+)
+
+
+class GitHubAppJWT:
+    """The App JWT of one GitHub App, re-signed shortly before it expires."""
+
+    def __init__(
+        self,
+        app_id: str,
+        private_key: str,
+        refresh_margin: timedelta = timedelta(minutes=1),
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            app_id: The GitHub App ID.
+            private_key: The GitHub App private key in PEM format.
+            refresh_margin: How long before expiry a JWT is re-signed.
+            clock: Source of the current time.
+
+        Raises:
+            ValueError: If the private key is not a PEM RSA private key.
+        """
+        self.app_id = app_id
+        self.private_key = private_key
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self._key: RSAPrivateKey = load_github_app_key(private_key)
+        self._token: str | None = None
+        self._expires_at = datetime.min.replace(tzinfo=UTC)
+        self._signing: asyncio.Future[str] | None = None
+
+    async def get(self) -> str:
+        """Get a JWT valid for at least ``refresh_margin``.
+
+        Returns:
+            The encoded JWT.
+        """
+        if self._token and self._expires_at - self.refresh_margin > self._clock():
+            APP_JWT_HITS.inc()
+            return self._token
+
+        APP_JWT_MISSES.inc()
+        if self._signing is None:
+            self._signing = asyncio.ensure_future(self._sign())
+            self._signing.add_done_callback(self._signed)
+        return await asyncio.shield(self._signing)
+
+    async def _sign(self) -> str:
+        """Sign a new JWT in a worker thread and cache it."""
+        now = self._clock()
+        token = await asyncio.to_thread(self._encode, now)
+        self._token = token
+        self._expires_at = now + GITHUB_APP_JWT_LIFETIME
+        return token
+
+    def _encode(self, now: datetime) -> str:
+        """Sign a JWT issued at ``now``."""
+        return generate_github_app_jwt(self.app_id, self._key, now=now)
+
+    def _signed(self, signing: asyncio.Future[str]) -> None:
+        """Let the next miss sign again once this signing is done."""
+        if self._signing is signing:
+            self._signing = None
+        if not signing.cancelled():
+            # Waiters re-raise failures; don't warn if there were none
+            signing.exception()
+
+
+_app_jwt: GitHubAppJWT | None = None
+
+
+def get_github_app_jwt(app_id: str, private_key: str) -> GitHubAppJWT:
+    """Get or create the global App JWT cache for a set of App credentials.
+
+    Args:
+        app_id: The GitHub App ID.
+        private_key: The GitHub App private key in PEM format.
+
+    Returns:
+        The cache, replaced if the credentials changed.
+
+    Raises:
+        ValueError: If the private key is not a PEM RSA private key.
+    """
+    global _app_jwt
+    if _app_jwt is None or (_app_jwt.app_id, _app_jwt.private_key) != (
+        app_id,
+        private_key,
+    ):
+        _app_jwt = GitHubAppJWT(app_id, private_key)
+    return _app_jwt
@@ -3,29 +3,33 @@
 from datetime import UTC, datetime, timedelta
 
 import httpx
-from sqlmodel import Session, select
+from sqlmodel import select
 
 from app.config import get_settings
+from app.db.engine import AnySession
 from app.db.models.session import Session as UserSession
 from app.db.models.user import User
+from app.services.base import DatabaseService
 from app.services.crypto import generate_session_token, hash_token
 
 
-class AuthService:
+class AuthService(DatabaseService):
     """Service for handling authentication and session management."""
 
     GITHUB_AUTHORIZE_URL = "https://github.com/login/oauth/authorize"
     GITHUB_TOKEN_URL = "https://github.com/login/oauth/access_token"
     GITHUB_USER_URL = "https://api.github.com/user"
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AnySession, http_client: httpx.AsyncClient) -> None:
         """Initialize the auth service.
 
         Args:
             db: The database session.
+            http_client: The shared HTTP client for calls to GitHub.
         """
-        self.db = db
+        super().__init__(db)
         self.settings = get_settings()
+        self.http_client = http_client
 
     def get_oauth_authorization_url(self, state: str) -> str:
         """Generate the GitHub OAuth authorization URL.
@@ -54,22 +58,21 @@ class AuthService:
         Returns:
             The access token, or None if exchange failed.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.GITHUB_TOKEN_URL,
-                data={
-                    "client_id": self.settings.github_client_id,
-                    "client_secret": self.settings.github_client_secret,
-                    "code": code,
-                },
-                headers={"Accept": "application/json"},
-            )
+        response = await self.http_client.post(
+            self.GITHUB_TOKEN_URL,
+            data={
+                "client_id": self.settings.github_client_id,
+                "client_secret": self.settings.github_client_secret,
+                "code": code,
+            },
+            headers={"Accept": "application/json"},
+        )
 
-            if response.status_code != 200:
-                return None
+        if response.status_code != 200:
+            return None
 
-            data = response.json()
-            return data.get("access_token")
+        data = response.json()
+        return data.get("access_token")
 
     async def get_github_user(self, access_token: str) -> dict | None:
         """Fetch the authenticated user's GitHub profile.
@@ -80,21 +83,20 @@ class AuthService:
         Returns:
             The user profile data, or None if request failed.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.GITHUB_USER_URL,
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                },
-            )
+        response = await self.http_client.get(
+            self.GITHUB_USER_URL,
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/vnd.github+json",
+            },
+        )
 
-            if response.status_code != 200:
-                return None
+        if response.status_code != 200:
+            return None
 
-            return response.json()
+        return response.json()
 
-    def get_or_create_user(
+    async def get_or_create_user(
         self,
         github_id: int,
         github_login: str,
@@ -117,7 +119,7 @@ class AuthService:
             The existing or newly created user.
         """
         statement = select(User).where(User.github_id == github_id)
-        user = self.db.exec(statement).first()
+        user = (await self._exec(statement)).first()
 
         if user:
             # Update existing user
@@ -141,11 +143,11 @@ class AuthService:
             )
             self.db.add(user)
 
-        self.db.commit()
-        self.db.refresh(user)
+        await self._commit()
+        await self._refresh(user)
         return user
 
-    def create_session(
+    async def create_session(
         self,
         user: User,
         user_agent: str | None = None,
@@ -174,12 +176,12 @@ class AuthService:
             ip_address=ip_address,
         )
         self.db.add(session)
-        self.db.commit()
-        self.db.refresh(session)
+        await self._commit()
+        await self._refresh(session)
 
         return session, token
 
-    def get_session_by_token(self, token: str) -> UserSession | None:
+    async def get_session_by_token(self, token: str) -> UserSession | None:
         """Get an active session by its token.
 
         Args:
@@ -194,9 +196,9 @@ class AuthService:
             UserSession.is_active == True,  # noqa: E712
             UserSession.expires_at > datetime.now(UTC),
         )
-        return self.db.exec(statement).first()
+        return (await self._exec(statement)).first()
 
-    def get_user_by_session_token(self, token: str) -> User | None:
+    async def get_user_by_session_token(self, token: str) -> User | None:
         """Get the user associated with a session token.
 
         Args:
@@ -205,14 +207,14 @@ class AuthService:
         Returns:
             The user if session is valid, None otherwise.
         """
-        session = self.get_session_by_token(token)
+        session = await self.get_session_by_token(token)
         if not session:
             return None
 
         statement = select(User).where(User.id == session.user_id)
-        return self.db.exec(statement).first()
+        return (await self._exec(statement)).first()
 
-    def invalidate_session(self, token: str) -> bool:
+    async def invalidate_session(self, token: str) -> bool:
         """Invalidate a session by its token.
 
         Args:
@@ -221,16 +223,16 @@ class AuthService:
         Returns:
             True if session was found and invalidated, False otherwise.
         """
-        session = self.get_session_by_token(token)
+        session = await self.get_session_by_token(token)
         if not session:
             return False
 
         session.is_active = False
         session.updated_at = datetime.now(UTC)
-        self.db.commit()
+        await self._commit()
         return True
 
-    def invalidate_all_user_sessions(self, user_id: int) -> int:
+    async def invalidate_all_user_sessions(self, user_id: int) -> int:
         """Invalidate all sessions for a user.
 
         Args:
@@ -243,12 +245,12 @@ class AuthService:
             UserSession.user_id == user_id,
             UserSession.is_active == True,  # noqa: E712
         )
-        sessions = self.db.exec(statement).all()
+        sessions = (await self._exec(statement)).all()
 
         now = datetime.now(UTC)
         for session in sessions:
             session.is_active = False
             session.updated_at = now
 
-        self.db.commit()
+        await self._commit()
         return len(sessions)
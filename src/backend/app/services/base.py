@@ -0,0 +1,132 @@
+"""Base class for services backed by a sync or async database session."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from typing import Any, TypeVar, overload
+
+from sqlalchemy import ScalarResult
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.db.engine import AnySession, dialect_insert
+from app.db.sqlite import RoutingSession
+
+_T = TypeVar("_T")
+
+
+class DatabaseService:
+    """Service base that runs queries on either kind of session.
+
+    Service methods are coroutines. With an ``AsyncSession`` every round trip
+    awaits the async driver; with a plain ``Session`` the same code runs
+    synchronously, so both engine modes share one implementation.
+
+    Sync sessions of the SQLite profile are the exception: their writer is a
+    pool of one connection, held from a transaction's first write until it
+    ends, across any awaits in between. Waiting for it on the event loop
+    would stop the holder from ever releasing it, so their round trips run
+    in a worker thread.
+    """
+
+    def __init__(self, db: AnySession) -> None:
+        """Initialize the service.
+
+        Args:
+            db: The database session.
+        """
+        self.db = db
+
+    @property
+    def is_async(self) -> bool:
+        """Whether the service runs on an async session."""
+        return isinstance(self.db, AsyncSession)
+
+    @property
+    def dialect_name(self) -> str:
+        """Name of the database dialect behind the session."""
+        return self.db.get_bind().dialect.name
+
+    def _insert(self, model: Any) -> Any:
+        """Build a dialect-specific INSERT supporting ON CONFLICT clauses.
+
+        Args:
+            model: The table model to insert into.
+
+        Returns:
+            A SQLite or PostgreSQL insert construct.
+
+        Raises:
+            ValueError: If the database dialect is not supported.
+        """
+        return dialect_insert(self.dialect_name, model)
+
+    @overload
+    async def _exec(self, statement: SelectOfScalar[_T]) -> ScalarResult[_T]: ...
+
+    @overload
+    async def _exec(self, statement: Any) -> Any: ...
+
+    async def _exec(self, statement: Any) -> Any:
+        """Execute a SQLModel select and return its result."""
+        if isinstance(self.db, AsyncSession):
+            return await self.db.exec(statement)
+        # Autoflush may write pending objects first
+        return await self._run_sync(self.db.exec, statement)
+
+    async def _stream(self, statement: Any, batch_size: int) -> AsyncIterator[Any]:
+        """Iterate a SQLModel select's results through a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time instead of all at once, on
+        drivers that support server-side cursors.
+        """
+        statement = statement.execution_options(yield_per=batch_size)
+        if isinstance(self.db, AsyncSession):
+            async for row in await self.db.stream_scalars(statement):
+                yield row
+        else:
+            for row in await self._run_sync(self.db.exec, statement):
+                yield row
+
+    async def _execute(self, statement: Any, params: Any = None) -> Any:
+        """Execute a Core statement (insert/update/text) and return its result."""
+        if isinstance(self.db, AsyncSession):
+            return await self.db.execute(statement, params)
+        return await self._run_sync(self.db.execute, statement, params)
+
+    async def _flush(self) -> None:
+        """Flush pending changes without committing."""
+        if isinstance(self.db, AsyncSession):
+            await self.db.flush()
+        else:
+            await self._run_sync(self.db.flush)
+
+    async def _commit(self) -> None:
+        """Commit the current transaction."""
+        if isinstance(self.db, AsyncSession):
+            await self.db.commit()
+        else:
+            await self._run_sync(self.db.commit)
+
+    async def _rollback(self) -> None:
+        """Roll back the current transaction."""
+        if isinstance(self.db, AsyncSession):
+            await self.db.rollback()
+        else:
+            await self._run_sync(self.db.rollback)
+
+    async def _refresh(self, instance: Any) -> None:
+        """Reload an instance's attributes from the database."""
+        if isinstance(self.db, AsyncSession):
+            await self.db.refresh(instance)
+        else:
+            await self._run_sync(self.db.refresh, instance)
+
+    async def _run_sync(self, method: Callable[..., _T], *args: Any) -> _T:
+        """Call a sync session method, in a worker thread on the SQLite writer.
+
+        A thread waiting for the writer connection leaves the event loop free
+        to run the coroutine holding it until it commits or rolls back.
+        """
+        if isinstance(self.db, RoutingSession):
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
@@ -7,9 +7,14 @@ from datetime import UTC, datetime, timedelta
 
 import jwt
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
 
 from app.config import get_settings
 
+# Longest lifetime GitHub accepts for an App JWT
+GITHUB_APP_JWT_LIFETIME = timedelta(minutes=10)
+
 
 def generate_session_token() -> str:
     """Generate a cryptographically secure session token.
@@ -166,7 +171,29 @@ def decrypt_token(encrypted_token: str, key: bytes) -> str:
     return f.decrypt(encrypted_token.encode()).decode()
 
 
-def generate_github_app_jwt(app_id: str, private_key: str) -> str:
+def load_github_app_key(private_key: str) -> RSAPrivateKey:
+    """Parse a GitHub App private key once for repeated signing.
+
+    Args:
+        private_key: The GitHub App private key in PEM format.
+
+    Returns:
+        The loaded RSA key.
+
+    Raises:
+        ValueError: If the PEM is not an RSA private key.
+    """
+    key = serialization.load_pem_private_key(private_key.encode(), password=None)
+    if not isinstance(key, RSAPrivateKey):
+        raise ValueError("GitHub App private key is not an RSA key")
+    return key
+
+
+def generate_github_app_jwt(
+    app_id: str,
+    private_key: str | RSAPrivateKey,
+    now: datetime | None = None,
+) -> str:
     """Generate a JWT for GitHub App authentication.
 
     GitHub Apps use RS256 signed JWTs to authenticate and obtain
@@ -174,15 +201,17 @@ def generate_github_app_jwt(app_id: str, private_key: str) -> str:
 
     Args:
         app_id: The GitHub App ID.
-        private_key: The GitHub App private key in PEM format.
+        private_key: The GitHub App private key in PEM format, or loaded
+            with ``load_github_app_key`` to skip parsing it again.
+        now: Issue time; defaults to now.
 
     Returns:
-        The encoded JWT string valid for 10 minutes.
+        The encoded JWT string valid for ``GITHUB_APP_JWT_LIFETIME``.
     """
-    now = datetime.now(UTC)
+    now = now or datetime.now(UTC)
     claims = {
         "iat": int(now.timestamp()) - 60,  # Issued 60 seconds ago to handle clock drift
-        "exp": int((now + timedelta(minutes=10)).timestamp()),
+        "exp": int((now + GITHUB_APP_JWT_LIFETIME).timestamp()),
         "iss": app_id,
     }
     return jwt.encode(claims, private_key, algorithm="RS256")
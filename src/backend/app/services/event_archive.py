@@ -0,0 +1,413 @@
+"""Cold archive of events past their retention.
+
+Events are partitioned by the month they were stored in. Once an event is
+older than the retention of its type, ``EventArchive.archive`` appends it to
+its month's segment file and deletes it from ``events``, so the hot table
+only holds the retention window. Segments are append-only: each record is a
+small header followed by the zlib-compressed event metadata and original
+webhook body. ``archived_events`` indexes every record by event ID,
+delivery ID and time; lookups memory-map the segment and decompress just
+that record.
+
+Each batch writes its index rows and deletes first and appends its records
+only once they succeeded; the segments are fsynced before the transaction
+commits. A failed batch thus leaves no bytes behind, and a crash between the
+fsync and the commit can at worst leave unreferenced bytes at the end of a
+segment.
+
+A delivery GitHub redelivers after its event was archived is stored again.
+Archiving keeps the record already in the segment and just deletes the live
+copy, so the archive holds each delivery ID once.
+"""
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime, timedelta
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, delete, insert, or_
+from sqlmodel import col, select
+
+from app.config import get_settings
+from app.db.engine import AnySession
+from app.db.models.archived_event import ArchivedEvent
+from app.db.models.event import Event
+from app.db.models.event_counter import (
+    COUNTER_DIMENSIONS,
+    counter_increments,
+    upsert_counters_statement,
+)
+from app.db.models.event_search import unindex_events_statement
+from app.db.models.installation import Installation
+from app.services.base import DatabaseService
+from app.services.payload_codec import IDENTITY
+from app.services.payload_store import PayloadStore
+
+# Record header: magic and length of the compressed record that follows
+RECORD_HEADER = struct.Struct(">4sI")
+RECORD_MAGIC = b"EVA1"
+
+# Event columns kept in a record besides the body
+RECORD_FIELDS = (
+    "id",
+    "delivery_id",
+    "event_type",
+    "action",
+    "repository_id",
+    "installation_id",
+    "user_id",
+    "actor_login",
+    "target_kind",
+    "target_number",
+    "head_sha",
+    "ref",
+    "source_created_at",
+    "payload_sha256",
+    "processed",
+    "processed_at",
+    "error",
+    "created_at",
+    "updated_at",
+)
+_DATETIME_FIELDS = ("source_created_at", "processed_at", "created_at", "updated_at")
+
+
+def segment_name(created_at: datetime) -> str:
+    """Get the segment file holding events stored at a time.
+
+    Args:
+        created_at: When the event was stored.
+
+    Returns:
+        The file name of the month's segment.
+    """
+    return f"events-{created_at:%Y-%m}.seg"
+
+
+def encode_record(event: Event, body: bytes) -> bytes:
+    """Encode an event and its webhook body as a segment record.
+
+    Args:
+        event: The event.
+        body: The original webhook body.
+
+    Returns:
+        The record, header included.
+    """
+    fields = {
+        name: value.isoformat() if isinstance(value, datetime) else value
+        for name in RECORD_FIELDS
+        if (value := getattr(event, name)) is not None
+    }
+    # JSON escapes newlines, so the first one ends the metadata
+    data = zlib.compress(json.dumps(fields).encode() + b"\n" + body)
+    return RECORD_HEADER.pack(RECORD_MAGIC, len(data)) + data
+
+
+def decode_record(record: bytes) -> Event:
+    """Decode a segment record into a (detached) event.
+
+    Args:
+        record: The record, header included.
+
+    Returns:
+        An event carrying the original webhook body as an uncompressed
+        payload, readable with the usual payload methods.
+
+    Raises:
+        ValueError: If the bytes are not a valid record.
+    """
+    magic, length = RECORD_HEADER.unpack_from(record)
+    if magic != RECORD_MAGIC or len(record) != RECORD_HEADER.size + length:
+        raise ValueError("Not an archived event record")
+
+    metadata, _, body = zlib.decompress(record[RECORD_HEADER.size :]).partition(b"\n")
+    fields = json.loads(metadata)
+    for name in _DATETIME_FIELDS:
+        if name in fields:
+            fields[name] = datetime.fromisoformat(fields[name])
+    return Event(**fields, payload=body, payload_codec=IDENTITY)
+
+
+def plan_records(path: Path, records: Iterable[bytes]) -> list[tuple[int, int]]:
+    """Compute where records appended to a segment will be written.
+
+    Args:
+        path: The segment file, which need not exist yet.
+        records: The encoded records.
+
+    Returns:
+        The (offset, length) each record will have in the segment.
+    """
+    offset = path.stat().st_size if path.exists() else 0
+    locations = []
+    for record in records:
+        locations.append((offset, len(record)))
+        offset += len(record)
+    return locations
+
+
+def append_records(path: Path, records: Iterable[bytes]) -> list[tuple[int, int]]:
+    """Append records to a segment and flush them to disk.
+
+    Args:
+        path: The segment file, created if missing.
+        records: The encoded records.
+
+    Returns:
+        The (offset, length) of each record in the segment.
+    """
+    locations = []
+    with path.open("ab") as segment:
+        offset = segment.tell()
+        for record in records:
+            segment.write(record)
+            locations.append((offset, len(record)))
+            offset += len(record)
+        segment.flush()
+        os.fsync(segment.fileno())
+    return locations
+
+
+def read_record(path: Path, offset: int, length: int) -> bytes:
+    """Read one record from a segment through a memory map.
+
+    Args:
+        path: The segment file.
+        offset: Byte offset of the record.
+        length: Byte length of the record.
+
+    Returns:
+        The record bytes.
+    """
+    with (
+        path.open("rb") as segment,
+        mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        return mapped[offset : offset + length]
+
+
+class EventArchive(DatabaseService):
+    """Moves expired events into segments and reads them back."""
+
+    def __init__(
+        self,
+        db: AnySession,
+        directory: str | Path | None = None,
+        retention_days: int | None = None,
+        retention_days_by_type: Mapping[str, int] | None = None,
+    ) -> None:
+        """Initialize the archive.
+
+        Args:
+            db: The database session.
+            directory: Directory of the segment files; defaults to the
+                configured directory.
+            retention_days: Days events are kept before archiving (0 keeps
+                them); defaults to the configured retention.
+            retention_days_by_type: Retention overriding the default per
+                event type; defaults to the configured overrides.
+        """
+        super().__init__(db)
+        settings = get_settings()
+        self.directory = Path(directory or settings.archive_dir)
+        self.retention_days = (
+            settings.event_retention_days if retention_days is None else retention_days
+        )
+        self.retention_days_by_type = dict(
+            settings.event_retention_days_by_type
+            if retention_days_by_type is None
+            else retention_days_by_type
+        )
+
+    @cached_property
+    def payloads(self) -> PayloadStore:
+        """Store decoding the payloads of the events being archived."""
+        return PayloadStore(self.db)
+
+    def expired(self, now: datetime) -> ColumnElement[bool] | None:
+        """Build the filter matching events past their retention.
+
+        Args:
+            now: The current time.
+
+        Returns:
+            A filter on ``Event``, or None if nothing ever expires.
+        """
+        conditions: list[ColumnElement[bool]] = [
+            and_(
+                col(Event.event_type) == event_type,
+                col(Event.created_at) < now - timedelta(days=days),
+            )
+            for event_type, days in self.retention_days_by_type.items()
+            if days > 0
+        ]
+        if self.retention_days > 0:
+            condition = col(Event.created_at) < now - timedelta(
+                days=self.retention_days
+            )
+            if self.retention_days_by_type:
+                condition = and_(
+                    col(Event.event_type).not_in(list(self.retention_days_by_type)),
+                    condition,
+                )
+            conditions.append(condition)
+        return or_(*conditions) if conditions else None
+
+    async def archive(
+        self, now: datetime | None = None, batch_size: int = 500
+    ) -> Counter[str]:
+        """Move every event past its retention into its month's segment.
+
+        Each batch is appended to the segments, then indexed, deleted and
+        uncounted in one transaction.
+
+        Args:
+            now: The current time; defaults to now.
+            batch_size: Events moved per transaction.
+
+        Returns:
+            Number of events archived per segment.
+        """
+        archived: Counter[str] = Counter()
+        expired = self.expired(now or datetime.now(UTC))
+        if expired is None:
+            return archived
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        statement = (
+            select(Event)
+            .where(expired)
+            .order_by(col(Event.created_at), col(Event.id))
+            .limit(batch_size)
+        )
+        while events := list((await self._exec(statement)).all()):
+            await self._archive_batch(events)
+            archived.update(segment_name(event.created_at) for event in events)
+        return archived
+
+    async def _archive_batch(self, events: list[Event]) -> None:
+        """Index events, delete them and append them to their segments."""
+        statement = select(ArchivedEvent.delivery_id).where(
+            col(ArchivedEvent.delivery_id).in_([event.delivery_id for event in events])
+        )
+        # Redelivered after being archived; the segment already has them
+        already_archived = set((await self._exec(statement)).all())
+
+        segments: dict[str, list[tuple[Event, bytes]]] = {}
+        for event in events:
+            if event.delivery_id in already_archived:
+                continue
+            record = encode_record(event, await self.payloads.decode(event))
+            segments.setdefault(segment_name(event.created_at), []).append(
+                (event, record)
+            )
+
+        rows: list[dict[str, Any]] = []
+        planned: dict[str, list[tuple[int, int]]] = {}
+        for name, entries in segments.items():
+            planned[name] = plan_records(
+                self.directory / name, [record for _, record in entries]
+            )
+            rows.extend(
+                {
+                    "id": event.id,
+                    "delivery_id": event.delivery_id,
+                    "event_type": event.event_type,
+                    "installation_id": event.installation_id,
+                    "created_at": event.created_at,
+                    "segment": name,
+                    "offset": offset,
+                    "length": length,
+                }
+                for (event, _), (offset, length) in zip(
+                    entries, planned[name], strict=True
+                )
+            )
+
+        # Core deletes bypass the mapper hook, so uncount the events here
+        increments = counter_increments(
+            {name: getattr(event, name) for name in COUNTER_DIMENSIONS}
+            for event in events
+        )
+        event_ids = [event.id for event in events if event.id is not None]
+        if rows:
+            await self._execute(insert(ArchivedEvent), rows)
+        await self._execute(unindex_events_statement(self.dialect_name, event_ids))
+        await self._execute(delete(Event).where(col(Event.id).in_(event_ids)))
+        await self._execute(
+            upsert_counters_statement(
+                self.dialect_name, {key: -count for key, count in increments.items()}
+            )
+        )
+
+        for name, entries in segments.items():
+            locations = append_records(
+                self.directory / name, [record for _, record in entries]
+            )
+            if locations != planned[name]:
+                raise RuntimeError(f"Segment {name} was appended to concurrently")
+        await self._commit()
+
+    async def get_event_by_delivery_id(self, delivery_id: str) -> Event | None:
+        """Get an archived event by its delivery ID.
+
+        Args:
+            delivery_id: The GitHub delivery ID.
+
+        Returns:
+            The event read from its segment if archived, None otherwise.
+        """
+        statement = select(ArchivedEvent).where(
+            ArchivedEvent.delivery_id == delivery_id
+        )
+        return self.load((await self._exec(statement)).first())
+
+    async def get_user_event(self, user_id: int, event_id: int) -> Event | None:
+        """Get an archived event if it belongs to one of a user's installations.
+
+        Args:
+            user_id: The user ID.
+            event_id: The ID the event had when stored.
+
+        Returns:
+            The event read from its segment if archived and accessible, None
+            otherwise.
+        """
+        statement = (
+            select(ArchivedEvent)
+            .join(
+                Installation,
+                col(Installation.id) == col(ArchivedEvent.installation_id),
+            )
+            .where(
+                ArchivedEvent.id == event_id,
+                Installation.user_id == user_id,
+                Installation.status != "deleted",
+            )
+        )
+        return self.load((await self._exec(statement)).first())
+
+    def load(self, archived: ArchivedEvent | None) -> Event | None:
+        """Read an indexed event from its segment.
+
+        Args:
+            archived: The index row, if any.
+
+        Returns:
+            The event, or None without an index row.
+        """
+        if archived is None:
+            return None
+        return decode_record(
+            read_record(
+                self.directory / archived.segment, archived.offset, archived.length
+            )
+        )
@@ -0,0 +1,183 @@
+"""Ingest-time extraction of actor and target columns from payloads.
+
+``EXTRACTION_TABLE`` declares, per event type, where each extracted column
+is found in the webhook payload as JSON pointers (RFC 6901); the first
+pointer that resolves to a value wins. ``DEFAULT_POINTERS`` applies to every
+event type. Extraction runs once when a delivery is stored, so filtering by
+actor, target number, head SHA or ref reads indexed columns instead of
+payloads.
+"""
+
+import json
+from datetime import datetime
+from typing import Any
+
+# Columns filled by extraction, all nullable
+EXTRACTED_COLUMNS = (
+    "actor_login",
+    "target_kind",
+    "target_number",
+    "head_sha",
+    "ref",
+    "source_created_at",
+)
+
+# Pointers tried for every event type
+DEFAULT_POINTERS: dict[str, tuple[str, ...]] = {
+    "actor_login": ("/sender/login",),
+}
+
+# Event type -> column -> JSON pointers, in order of preference; a
+# ``target_kind`` is a constant rather than a pointer
+EXTRACTION_TABLE: dict[str, dict[str, Any]] = {
+    "push": {
+        "target_kind": "commit",
+        "head_sha": ("/after", "/head_commit/id"),
+        "ref": ("/ref",),
+        "source_created_at": ("/head_commit/timestamp",),
+    },
+    "pull_request": {
+        "target_kind": "pull_request",
+        "target_number": ("/pull_request/number", "/number"),
+        "head_sha": ("/pull_request/head/sha",),
+        "ref": ("/pull_request/head/ref",),
+        "source_created_at": ("/pull_request/updated_at",),
+    },
+    "pull_request_review": {
+        "target_kind": "pull_request",
+        "target_number": ("/pull_request/number",),
+        "head_sha": ("/review/commit_id", "/pull_request/head/sha"),
+        "ref": ("/pull_request/head/ref",),
+        "source_created_at": ("/review/submitted_at",),
+    },
+    "pull_request_review_comment": {
+        "target_kind": "pull_request",
+        "target_number": ("/pull_request/number",),
+        "head_sha": ("/comment/commit_id", "/pull_request/head/sha"),
+        "ref": ("/pull_request/head/ref",),
+        "source_created_at": ("/comment/updated_at",),
+    },
+    "issues": {
+        "target_kind": "issue",
+        "target_number": ("/issue/number",),
+        "source_created_at": ("/issue/updated_at",),
+    },
+    "issue_comment": {
+        "target_kind": "issue",
+        "target_number": ("/issue/number",),
+        "source_created_at": ("/comment/updated_at",),
+    },
+    "create": {"target_kind": "ref", "ref": ("/ref",)},
+    "delete": {"target_kind": "ref", "ref": ("/ref",)},
+    "release": {
+        "target_kind": "release",
+        "ref": ("/release/tag_name",),
+        "source_created_at": ("/release/published_at", "/release/created_at"),
+    },
+    "check_run": {
+        "target_kind": "check_run",
+        "head_sha": ("/check_run/head_sha",),
+        "ref": ("/check_run/check_suite/head_branch",),
+        "source_created_at": ("/check_run/completed_at", "/check_run/started_at"),
+    },
+    "check_suite": {
+        "target_kind": "check_suite",
+        "head_sha": ("/check_suite/head_sha",),
+        "ref": ("/check_suite/head_branch",),
+        "source_created_at": ("/check_suite/updated_at",),
+    },
+    "workflow_run": {
+        "target_kind": "workflow_run",
+        "target_number": ("/workflow_run/run_number",),
+        "head_sha": ("/workflow_run/head_sha",),
+        "ref": ("/workflow_run/head_branch",),
+        "source_created_at": ("/workflow_run/updated_at",),
+    },
+    "workflow_job": {
+        "target_kind": "workflow_job",
+        "head_sha": ("/workflow_job/head_sha",),
+        "ref": ("/workflow_job/head_branch",),
+        "source_created_at": ("/workflow_job/completed_at", "/workflow_job/started_at"),
+    },
+    "status": {
+        "target_kind": "commit",
+        "head_sha": ("/sha",),
+        "source_created_at": ("/updated_at",),
+    },
+}
+
+
+def parse_payload(body: bytes) -> dict[str, Any]:
+    """Parse a webhook body for extraction.
+
+    Args:
+        body: The raw webhook body.
+
+    Returns:
+        The payload object; empty if the body is not a JSON object.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def resolve_pointer(payload: Any, pointer: str) -> Any:
+    """Resolve a JSON pointer in a parsed payload.
+
+    Args:
+        payload: The parsed payload.
+        pointer: The pointer, e.g. ``/pull_request/head/sha``.
+
+    Returns:
+        The value, or None if the pointer does not resolve.
+    """
+    value = payload
+    for token in pointer.split("/")[1:]:
+        token = token.replace("~1", "/").replace("~0", "~")
+        if isinstance(value, dict):
+            value = value.get(token)
+        elif isinstance(value, list) and token.isdigit() and int(token) < len(value):
+            value = value[int(token)]
+        else:
+            return None
+    return value
+
+
+def extract_columns(event_type: str, payload: dict[str, Any]) -> dict[str, Any]:
+    """Extract the indexed columns of an event from its payload.
+
+    Args:
+        event_type: The event type, selecting the extraction rules.
+        payload: The parsed payload.
+
+    Returns:
+        A value (or None) for every column in ``EXTRACTED_COLUMNS``.
+    """
+    rules = {**DEFAULT_POINTERS, **EXTRACTION_TABLE.get(event_type, {})}
+    columns: dict[str, Any] = dict.fromkeys(EXTRACTED_COLUMNS)
+    for column, rule in rules.items():
+        if isinstance(rule, str):
+            columns[column] = rule
+            continue
+        for pointer in rule:
+            value = _coerce(column, resolve_pointer(payload, pointer))
+            if value is not None:
+                columns[column] = value
+                break
+    return columns
+
+
+def _coerce(column: str, value: Any) -> Any:
+    """Convert an extracted value to its column type, or None if it has none."""
+    if value is None or isinstance(value, dict | list | bool):
+        return None
+    if column == "target_number":
+        return value if isinstance(value, int) else None
+    if column == "source_created_at":
+        try:
+            return datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+    return str(value)
@@ -0,0 +1,91 @@
+"""Search documents extracted from webhook payloads.
+
+Each event is indexed under a short plain-text document built from the
+payload members people search for (numbers, titles, bodies, logins, refs and
+commit messages) rather than the whole body, which keeps the index small and
+its ranking meaningful.
+"""
+
+import re
+from collections.abc import Iterator
+from typing import Any
+
+# Payload members indexed for search; "*" steps into every list item
+SEARCH_FIELDS: tuple[tuple[str, ...], ...] = (
+    ("number",),
+    ("ref",),
+    ("sender", "login"),
+    ("repository", "full_name"),
+    ("pull_request", "number"),
+    ("pull_request", "title"),
+    ("pull_request", "body"),
+    ("pull_request", "user", "login"),
+    ("pull_request", "head", "ref"),
+    ("issue", "number"),
+    ("issue", "title"),
+    ("issue", "body"),
+    ("issue", "user", "login"),
+    ("comment", "body"),
+    ("comment", "user", "login"),
+    ("review", "body"),
+    ("release", "tag_name"),
+    ("release", "name"),
+    ("head_commit", "message"),
+    ("commits", "*", "message"),
+    ("workflow_run", "name"),
+    ("check_run", "name"),
+)
+
+# Longest document indexed per event; long bodies add little to ranking
+MAX_DOCUMENT_LENGTH = 16 * 1024
+
+_TERM = re.compile(r"\w+")
+
+
+def search_document(
+    event_type: str, action: str | None, payload: dict[str, Any]
+) -> str:
+    """Build the search document of an event.
+
+    Args:
+        event_type: The event type.
+        action: The event action, if any.
+        payload: The parsed payload (see ``parse_payload``).
+
+    Returns:
+        Plain text to index; just the type and action for an empty payload.
+    """
+    parts = [event_type, action or ""]
+    for path in SEARCH_FIELDS:
+        parts.extend(str(value) for value in _values(payload, path))
+    return " ".join(part for part in parts if part)[:MAX_DOCUMENT_LENGTH]
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a free-text query into the terms every match must contain.
+
+    Punctuation is dropped, so ``PR #1234`` searches for ``PR`` and
+    ``1234`` and queries can never inject search-engine syntax.
+
+    Args:
+        query: The query as typed.
+
+    Returns:
+        The search terms.
+    """
+    return _TERM.findall(query)
+
+
+def _values(value: Any, path: tuple[str, ...]) -> Iterator[Any]:
+    """Yield the scalar values at a path in a parsed payload."""
+    if not path:
+        if isinstance(value, str | int) and not isinstance(value, bool):
+            yield value
+        return
+    step, rest = path[0], path[1:]
+    if step == "*":
+        if isinstance(value, list):
+            for item in value:
+                yield from _values(item, rest)
+    elif isinstance(value, dict) and step in value:
+        yield from _values(value[step], rest)
@@ -0,0 +1,186 @@
+"""Group-commit event writer.
+
+Concurrent webhook requests hand their event rows to a single background
+task, which waits a few milliseconds for more rows and then writes the whole
+batch with one multi-row INSERT in one transaction. Each caller's future is
+resolved once the batch is committed, so N deliveries cost one fsync.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from typing import Any
+
+from app.config import get_settings
+from app.db.engine import AnySession, session_scope
+from app.metrics import Histogram
+from app.services.github import GitHubService
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+LINGER_SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+@dataclass
+class _PendingEvent:
+    """An event row waiting for its batch to be committed."""
+
+    values: dict[str, Any]
+    future: asyncio.Future[int | None]
+
+
+class EventWriter:
+    """Collects event inserts from concurrent callers into group commits."""
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AnySession]
+        ] = session_scope,
+        batch_size: int = 100,
+        max_linger_ms: float = 5.0,
+        queue_size: int = 10000,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            session_factory: Callable returning a context manager that opens
+                a database session.
+            batch_size: Maximum rows per INSERT.
+            max_linger_ms: Longest a batch waits for more rows after its first.
+            queue_size: Maximum rows waiting to be written; callers block
+                beyond this bound.
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_linger = max_linger_ms / 1000
+        self.queue_size = queue_size
+        self.batch_sizes = Histogram(
+            "event_writer_batch_size",
+            BATCH_SIZE_BUCKETS,
+            "Rows written per group commit",
+        )
+        self.linger_seconds = Histogram(
+            "event_writer_linger_seconds",
+            LINGER_SECONDS_BUCKETS,
+            "Time a batch waited for rows before being written",
+        )
+        self._queue: asyncio.Queue[_PendingEvent] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> asyncio.Queue[_PendingEvent]:
+        """Start the background batching task if it is not running.
+
+        Returns:
+            The queue feeding the batching task.
+        """
+        if self._queue is None or self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.create_task(
+                self._run(self._queue), name="event-writer"
+            )
+        return self._queue
+
+    async def stop(self) -> None:
+        """Write any queued rows, then stop the background task."""
+        if self._task is None or self._queue is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._queue = None
+
+    async def submit(self, **values: Any) -> int | None:
+        """Queue an event insert and wait until its batch is committed.
+
+        Args:
+            **values: Keyword arguments of ``GitHubService.insert_event``.
+
+        Returns:
+            The new event ID, or None if the delivery was a duplicate.
+        """
+        queue = self.start()
+        future: asyncio.Future[int | None] = asyncio.get_running_loop().create_future()
+        await queue.put(_PendingEvent(values, future))
+        return await future
+
+    async def _run(self, queue: asyncio.Queue[_PendingEvent]) -> None:
+        """Collect rows into batches and write them until cancelled.
+
+        Args:
+            queue: The queue of pending events.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await queue.get()]
+            started = loop.time()
+            deadline = started + self.max_linger
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                except TimeoutError:
+                    break
+
+            self.linger_seconds.observe(loop.time() - started)
+            self.batch_sizes.observe(len(batch))
+
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _write(self, batch: list[_PendingEvent]) -> None:
+        """Insert a batch in one transaction and resolve its callers.
+
+        Args:
+            batch: The pending events to write.
+        """
+        try:
+            async with self.session_factory() as session:
+                inserted = await GitHubService(session).insert_events(
+                    [pending.values for pending in batch]
+                )
+        except Exception as e:
+            logger.exception("Failed to write a batch of %d events", len(batch))
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        # A delivery repeated within one batch is a duplicate after its first
+        resolved: set[str] = set()
+        for pending in batch:
+            delivery_id = pending.values["delivery_id"]
+            event_id = None if delivery_id in resolved else inserted.get(delivery_id)
+            resolved.add(delivery_id)
+            if not pending.future.done():
+                pending.future.set_result(event_id)
+
+
+# Global writer instance (lazy initialization)
+_writer: EventWriter | None = None
+
+
+def get_event_writer() -> EventWriter:
+    """Get or create the global event writer."""
+    global _writer
+    if _writer is None:
+        settings = get_settings()
+        _writer = EventWriter(
+            batch_size=settings.event_writer_batch_size,
+            max_linger_ms=settings.event_writer_max_linger_ms,
+            queue_size=settings.event_writer_queue_size,
+        )
+    return _writer
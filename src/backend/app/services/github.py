@@ -1,31 +1,203 @@
 """GitHub service for API interactions and webhook handling."""
 
 import json
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable, Iterator
 from datetime import UTC, datetime
+from functools import cached_property
+from typing import Any, TypedDict, Unpack, cast
 
-from sqlalchemy import desc
-from sqlmodel import Session, select
+from sqlalchemy import and_, delete, desc, func, or_, tuple_, update
+from sqlalchemy import select as sa_select
+from sqlalchemy.orm import QueryableAttribute, load_only
+from sqlmodel import col, select
 
 from app.db.models.event import Event
+from app.db.models.event_counter import (
+    COUNTER_DIMENSIONS,
+    CounterKey,
+    EventCounter,
+    counter_increments,
+    counter_key,
+    upsert_counters_statement,
+)
+from app.db.models.event_search import (
+    index_documents_statement,
+    match_clause,
+    rank_expression,
+    search_key,
+)
 from app.db.models.installation import Installation
 from app.db.models.repository import Repository
+from app.db.models.repository_event_marker import (
+    RepositoryEventMarker,
+    marker_statements,
+)
 from app.db.models.user import User
+from app.services.base import DatabaseService
+from app.services.event_archive import EventArchive
+from app.services.event_extraction import (
+    EXTRACTED_COLUMNS,
+    extract_columns,
+    parse_payload,
+)
+from app.services.event_search import search_document, search_terms
+from app.services.pagination import NEXT, PREV, EventCursor, EventPage
+from app.services.payload_codec import IDENTITY
+from app.services.payload_store import PayloadStore
+
+# Columns list queries load; payload columns stay in the database
+EVENT_METADATA_COLUMNS = cast(
+    tuple[QueryableAttribute[Any], ...],
+    (
+        Event.id,
+        Event.delivery_id,
+        Event.event_type,
+        Event.action,
+        Event.repository_id,
+        Event.installation_id,
+        Event.user_id,
+        Event.processed,
+        Event.created_at,
+        Event.payload_sha256,
+        Event.actor_login,
+        Event.target_kind,
+        Event.target_number,
+        Event.head_sha,
+        Event.ref,
+        Event.source_created_at,
+    ),
+)
+
+
+class EventFilters(TypedDict, total=False):
+    """Filters of event listings on extracted columns and source time."""
+
+    actor_login: str | None
+    target_kind: str | None
+    target_number: int | None
+    head_sha: str | None
+    ref: str | None
+    source_created_after: datetime | None
+    source_created_before: datetime | None
+
+
+def _event_row(
+    delivery_id: str,
+    event_type: str,
+    payload: bytes,
+    action: str | None = None,
+    repository_id: int | None = None,
+    installation_id: int | None = None,
+    user_id: int | None = None,
+    payload_codec: str = IDENTITY,
+    payload_dictionary_id: int | None = None,
+    payload_refs: str | None = None,
+    payload_sha256: str | None = None,
+    **extracted: Any,
+) -> dict[str, Any]:
+    """Build the column values of a new event row.
+
+    Every row carries the same keys so rows can share a multi-row INSERT.
+    """
+    now = datetime.now(UTC)
+    return {
+        **dict.fromkeys(EXTRACTED_COLUMNS),
+        **extracted,
+        "delivery_id": delivery_id,
+        "event_type": event_type,
+        "action": action,
+        "repository_id": repository_id,
+        "installation_id": installation_id,
+        "user_id": user_id,
+        "payload": payload,
+        "payload_codec": payload_codec,
+        "payload_dictionary_id": payload_dictionary_id,
+        "payload_refs": payload_refs,
+        "payload_sha256": payload_sha256,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _matches(column: Any, value: Any) -> Any:
+    """Build an equality filter, or ``IN`` for a list of values."""
+    if not isinstance(value, list):
+        return column == value
+    if len(value) == 1:
+        return column == value[0]
+    return column.in_(value)
+
+
+def _event_filters(
+    installation_ids: list[int] | None,
+    event_type: str | None = None,
+    repository_id: int | None = None,
+    **filters: Unpack[EventFilters],
+) -> list[Any]:
+    """Build the filters of an event listing.
+
+    Args:
+        installation_ids: IDs of the installations to read; None reads all.
+        event_type: Optional event type filter.
+        repository_id: Optional repository ID filter.
+        **filters: Required values of extracted columns, and bounds on when
+            events happened; None is ignored.
+
+    Returns:
+        The filters, each served by an index.
+
+    Raises:
+        TypeError: If a filter is not an extracted column or time bound.
+    """
+    conditions = []
+    if installation_ids is not None:
+        conditions.append(_matches(col(Event.installation_id), installation_ids))
+    if event_type:
+        conditions.append(col(Event.event_type) == event_type)
+    if repository_id:
+        conditions.append(col(Event.repository_id) == repository_id)
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name == "source_created_after":
+            conditions.append(col(Event.source_created_at) >= value)
+        elif name == "source_created_before":
+            conditions.append(col(Event.source_created_at) < value)
+        elif name in EXTRACTED_COLUMNS:
+            conditions.append(col(getattr(Event, name)) == value)
+        else:
+            raise TypeError(f"Unknown event filter: {name}")
+    return conditions
+
+
+def _stored_id(event: Event) -> int:
+    """Get the ID of an event read from the database.
+
+    Raises:
+        ValueError: If the event was never stored.
+    """
+    if event.id is None:
+        raise ValueError("Event has not been stored")
+    return event.id
 
 
-class GitHubService:
+class GitHubService(DatabaseService):
     """Service for GitHub API and webhook operations."""
 
-    def __init__(self, db: Session) -> None:
-        """Initialize the GitHub service.
+    @cached_property
+    def payloads(self) -> PayloadStore:
+        """Store encoding event payloads for storage and decoding them."""
+        return PayloadStore(self.db)
 
-        Args:
-            db: The database session.
-        """
-        self.db = db
+    @cached_property
+    def archive(self) -> EventArchive:
+        """Archive of events past their retention."""
+        return EventArchive(self.db)
 
     # Installation methods
 
-    def get_installation_by_github_id(
+    async def get_installation_by_github_id(
         self, github_installation_id: int
     ) -> Installation | None:
         """Get an installation by its GitHub installation ID.
@@ -39,9 +211,9 @@ class GitHubService:
         statement = select(Installation).where(
             Installation.github_installation_id == github_installation_id
         )
-        return self.db.exec(statement).first()
+        return (await self._exec(statement)).first()
 
-    def get_user_installation(self, user_id: int) -> Installation | None:
+    async def get_user_installation(self, user_id: int) -> Installation | None:
         """Get the installation for a user.
 
         Args:
@@ -54,9 +226,9 @@ class GitHubService:
             Installation.user_id == user_id,
             Installation.status == "active",
         )
-        return self.db.exec(statement).first()
+        return (await self._exec(statement)).first()
 
-    def create_installation(
+    async def create_installation(
         self,
         user: User,
         github_installation_id: int,
@@ -94,11 +266,11 @@ class GitHubService:
             status="active",
         )
         self.db.add(installation)
-        self.db.commit()
-        self.db.refresh(installation)
+        await self._commit()
+        await self._refresh(installation)
         return installation
 
-    def suspend_installation(
+    async def suspend_installation(
         self, github_installation_id: int, suspended_by: str
     ) -> Installation | None:
         """Suspend an installation.
@@ -110,7 +282,7 @@ class GitHubService:
         Returns:
             The updated installation if found, None otherwise.
         """
-        installation = self.get_installation_by_github_id(github_installation_id)
+        installation = await self.get_installation_by_github_id(github_installation_id)
         if not installation:
             return None
 
@@ -118,11 +290,11 @@ class GitHubService:
         installation.suspended_at = datetime.now(UTC)
         installation.suspended_by = suspended_by
         installation.updated_at = datetime.now(UTC)
-        self.db.commit()
-        self.db.refresh(installation)
+        await self._commit()
+        await self._refresh(installation)
         return installation
 
-    def unsuspend_installation(
+    async def unsuspend_installation(
         self, github_installation_id: int
     ) -> Installation | None:
         """Unsuspend an installation.
@@ -133,7 +305,7 @@ class GitHubService:
         Returns:
             The updated installation if found, None otherwise.
         """
-        installation = self.get_installation_by_github_id(github_installation_id)
+        installation = await self.get_installation_by_github_id(github_installation_id)
         if not installation:
             return None
 
@@ -141,11 +313,11 @@ class GitHubService:
         installation.suspended_at = None
         installation.suspended_by = None
         installation.updated_at = datetime.now(UTC)
-        self.db.commit()
-        self.db.refresh(installation)
+        await self._commit()
+        await self._refresh(installation)
         return installation
 
-    def delete_installation(self, github_installation_id: int) -> bool:
+    async def delete_installation(self, github_installation_id: int) -> bool:
         """Mark an installation as deleted.
 
         Args:
@@ -154,18 +326,18 @@ class GitHubService:
         Returns:
             True if installation was found and deleted, False otherwise.
         """
-        installation = self.get_installation_by_github_id(github_installation_id)
+        installation = await self.get_installation_by_github_id(github_installation_id)
         if not installation:
             return False
 
         installation.status = "deleted"
         installation.updated_at = datetime.now(UTC)
-        self.db.commit()
+        await self._commit()
         return True
 
     # Repository methods
 
-    def get_repositories_for_user(
+    async def get_repositories_for_user(
         self,
         user_id: int,
         page: int = 1,
@@ -184,7 +356,7 @@ class GitHubService:
             Tuple of (list of repositories, total count).
         """
         # Get user's installation
-        installation = self.get_user_installation(user_id)
+        installation = await self.get_user_installation(user_id)
         if not installation:
             return [], 0
 
@@ -195,26 +367,30 @@ class GitHubService:
 
         # Apply search filter if provided
         if search:
-            statement = statement.where(Repository.full_name.ilike(f"%{search}%"))
+            statement = statement.where(col(Repository.full_name).ilike(f"%{search}%"))
 
         # Get total count
-        count_statement = select(Repository).where(
-            Repository.installation_id == installation.id
+        count_statement = (
+            select(func.count())
+            .select_from(Repository)
+            .where(Repository.installation_id == installation.id)
         )
         if search:
             count_statement = count_statement.where(
-                Repository.full_name.ilike(f"%{search}%")
+                col(Repository.full_name).ilike(f"%{search}%")
             )
-        total = len(list(self.db.exec(count_statement)))
+        total = (await self._exec(count_statement)).one()
 
         # Apply pagination
         offset = (page - 1) * per_page
         statement = statement.offset(offset).limit(per_page)
 
-        repositories = list(self.db.exec(statement))
+        repositories = list(await self._exec(statement))
         return repositories, total
 
-    def get_repository_by_github_id(self, github_repo_id: int) -> Repository | None:
+    async def get_repository_by_github_id(
+        self, github_repo_id: int
+    ) -> Repository | None:
         """Get a repository by its GitHub ID.
 
         Args:
@@ -226,9 +402,9 @@ class GitHubService:
         statement = select(Repository).where(
             Repository.github_repo_id == github_repo_id
         )
-        return self.db.exec(statement).first()
+        return (await self._exec(statement)).first()
 
-    def create_or_update_repository(
+    async def create_or_update_repository(
         self,
         installation: Installation,
         github_repo_id: int,
@@ -252,7 +428,7 @@ class GitHubService:
         Returns:
             The created or updated repository.
         """
-        repo = self.get_repository_by_github_id(github_repo_id)
+        repo = await self.get_repository_by_github_id(github_repo_id)
 
         if repo:
             repo.installation_id = installation.id
@@ -274,13 +450,13 @@ class GitHubService:
             )
             self.db.add(repo)
 
-        self.db.commit()
-        self.db.refresh(repo)
+        await self._commit()
+        await self._refresh(repo)
         return repo
 
     # Event methods
 
-    def event_exists(self, delivery_id: str) -> bool:
+    async def event_exists(self, delivery_id: str) -> bool:
         """Check if an event with the given delivery ID exists.
 
         Args:
@@ -290,49 +466,146 @@ class GitHubService:
             True if event exists, False otherwise.
         """
         statement = select(Event).where(Event.delivery_id == delivery_id)
-        return self.db.exec(statement).first() is not None
+        return (await self._exec(statement)).first() is not None
 
-    def create_event(
+    async def insert_event(
         self,
         delivery_id: str,
         event_type: str,
-        payload: dict,
+        payload: bytes,
         action: str | None = None,
         repository_id: int | None = None,
         installation_id: int | None = None,
         user_id: int | None = None,
-    ) -> Event:
-        """Create a new webhook event record.
+    ) -> int | None:
+        """Insert a webhook event unless its delivery ID is already stored.
+
+        Uses a single ``INSERT ... ON CONFLICT (delivery_id) DO NOTHING
+        RETURNING id`` statement, so duplicate detection needs no prior
+        lookup and stays race-free across concurrent workers.
 
         Args:
             delivery_id: The GitHub delivery ID.
             event_type: The event type.
-            payload: The webhook payload.
+            payload: The raw webhook body.
             action: The event action.
             repository_id: The repository ID.
             installation_id: The installation ID.
             user_id: The user ID.
 
         Returns:
-            The created event.
+            The new event ID, or None if the delivery was a duplicate.
         """
-        event = Event(
+        parsed = parse_payload(payload)
+        row = _event_row(
             delivery_id=delivery_id,
             event_type=event_type,
             action=action,
             repository_id=repository_id,
             installation_id=installation_id,
             user_id=user_id,
-            payload=json.dumps(payload),
+            **extract_columns(event_type, parsed),
+            **await self.payloads.encode(event_type, payload),
         )
-        self.db.add(event)
-        self.db.commit()
-        self.db.refresh(event)
-        return event
+        statement = (
+            self._insert(Event)
+            .values(row)
+            .on_conflict_do_nothing(index_elements=["delivery_id"])
+            .returning(Event.id)
+        )
+        event_id: int | None = (await self._execute(statement)).scalar_one_or_none()
+        if event_id is not None:
+            await self._record_inserted([row])
+            await self._index_search(
+                {event_id: search_document(event_type, action, parsed)}
+            )
+        await self._commit()
+        return event_id
+
+    async def insert_events(self, events: list[dict[str, Any]]) -> dict[str, int]:
+        """Insert a batch of webhook events in one statement and transaction.
+
+        Rows whose delivery ID is already stored are skipped.
+
+        Args:
+            events: Keyword arguments of ``insert_event`` for each event.
+
+        Returns:
+            Mapping of delivery ID to new event ID for the inserted rows.
+        """
+        if not events:
+            return {}
+
+        parsed = [parse_payload(event["payload"]) for event in events]
+        rows = [
+            _event_row(
+                **{
+                    **event,
+                    **extract_columns(event["event_type"], payload),
+                    **await self.payloads.encode(event["event_type"], event["payload"]),
+                }
+            )
+            for event, payload in zip(events, parsed, strict=True)
+        ]
+        statement = (
+            self._insert(Event)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["delivery_id"])
+            .returning(Event.delivery_id, Event.id)
+        )
+        inserted = dict((await self._execute(statement)).all())
+
+        # Count each inserted delivery once; later repeats were skipped
+        counted: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            if row["delivery_id"] in inserted:
+                counted.setdefault(row["delivery_id"], row)
+        await self._record_inserted(counted.values())
+        await self._index_search(
+            {
+                inserted[event["delivery_id"]]: search_document(
+                    event["event_type"], event.get("action"), payload
+                )
+                for event, payload in zip(events, parsed, strict=True)
+                if event["delivery_id"] in inserted
+            }
+        )
+
+        await self._commit()
+        return inserted
+
+    async def _record_inserted(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Update counters and repository markers for inserted events.
+
+        Runs in the current transaction, so the bookkeeping commits (or
+        rolls back) together with the events.
+
+        Args:
+            rows: Column values of the inserted events.
+        """
+        rows = list(rows)
+        increments = counter_increments(rows)
+        if increments:
+            await self._execute(
+                upsert_counters_statement(self.dialect_name, increments)
+            )
+        for statement in marker_statements(self.dialect_name, rows):
+            await self._execute(statement)
+
+    async def _index_search(self, documents: dict[int, str]) -> None:
+        """Add the search documents of inserted events to the search index.
+
+        Args:
+            documents: Search document per new event ID.
+        """
+        if documents:
+            await self._execute(index_documents_statement(self.dialect_name, documents))
 
-    def get_event_by_delivery_id(self, delivery_id: str) -> Event | None:
+    async def get_event_by_delivery_id(self, delivery_id: str) -> Event | None:
         """Get an event by its delivery ID.
 
+        Events no longer in the database are read from the archive.
+
         Args:
             delivery_id: The GitHub delivery ID.
 
@@ -340,9 +613,134 @@ class GitHubService:
             The event if found, None otherwise.
         """
         statement = select(Event).where(Event.delivery_id == delivery_id)
-        return self.db.exec(statement).first()
+        event = (await self._exec(statement)).first()
+        if event is None:
+            event = await self.archive.get_event_by_delivery_id(delivery_id)
+        return event
+
+    async def get_user_event(
+        self, user_id: int, event_id: int, with_payload: bool = False
+    ) -> Event | None:
+        """Get an event by ID if it belongs to one of a user's installations.
+
+        The primary-key lookup and the access check are one query. Events
+        no longer in the database are read from the archive, payload
+        included.
+
+        Args:
+            user_id: The user ID.
+            event_id: The event ID.
+            with_payload: Also load the payload columns.
+
+        Returns:
+            The event if found and accessible, None otherwise.
+        """
+        statement = (
+            select(Event)
+            .join(Installation, col(Installation.id) == Event.installation_id)
+            .where(
+                Event.id == event_id,
+                Installation.user_id == user_id,
+                Installation.status != "deleted",
+            )
+        )
+        if not with_payload:
+            statement = statement.options(
+                load_only(*EVENT_METADATA_COLUMNS, raiseload=True)
+            )
+        event = (await self._exec(statement)).first()
+        if event is None:
+            event = await self.archive.get_user_event(user_id, event_id)
+        return event
+
+    async def get_event_body(self, event: Event) -> bytes:
+        """Get the original webhook body of an event.
+
+        Args:
+            event: The event.
+
+        Returns:
+            The webhook body exactly as received, decompressed if needed.
+        """
+        return await self.payloads.decode(event)
+
+    async def open_event_body_stream(self, event: Event) -> Iterator[bytes]:
+        """Prepare a streaming read of the original webhook body of an event.
+
+        Args:
+            event: The event, with its payload columns loaded.
+
+        Returns:
+            An iterator over the body exactly as received; it needs no
+            database access.
+        """
+        return await self.payloads.open_stream(event)
+
+    async def get_event_payload(self, event: Event) -> dict[str, Any]:
+        """Parse the stored webhook body of an event.
+
+        Payloads are stored as raw bytes and only parsed on request.
 
-    def get_events_by_user(
+        Args:
+            event: The event.
+
+        Returns:
+            The parsed webhook payload.
+        """
+        payload: dict[str, Any] = json.loads(await self.get_event_body(event))
+        return payload
+
+    async def get_user_installation_ids(self, user_id: int) -> list[int]:
+        """Get the installations whose events a user may read.
+
+        Events belong to installations, not users, so this is resolved once
+        per request and passed to the event queries.
+
+        Args:
+            user_id: The user ID.
+
+        Returns:
+            IDs of the user's active and suspended installations.
+        """
+        statement = select(Installation.id).where(
+            Installation.user_id == user_id,
+            Installation.status != "deleted",
+        )
+        return list((await self._exec(statement)).all())
+
+    async def get_events(
+        self,
+        installation_ids: list[int],
+        event_type: str | None = None,
+        repository_id: int | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        **filters: Unpack[EventFilters],
+    ) -> list[Event]:
+        """Get events of a set of installations with optional filtering.
+
+        Args:
+            installation_ids: IDs of the installations to read.
+            event_type: Optional event type filter.
+            repository_id: Optional repository ID filter.
+            limit: Maximum number of events to return.
+            offset: Number of events to skip.
+            **filters: Further filters on extracted columns and source time
+                (see ``_event_filters``).
+
+        Returns:
+            List of matching events with only their metadata columns loaded;
+            payload columns raise if accessed.
+        """
+        statement = self._events_statement(
+            installation_ids, event_type, repository_id, **filters
+        )
+        statement = statement.order_by(desc(col(Event.created_at)), desc(col(Event.id)))
+        statement = statement.offset(offset).limit(limit)
+
+        return list((await self._exec(statement)).all())
+
+    async def get_events_by_user(
         self,
         user_id: int,
         event_type: str | None = None,
@@ -350,7 +748,7 @@ class GitHubService:
         limit: int = 50,
         offset: int = 0,
     ) -> list[Event]:
-        """Get events for a user with optional filtering.
+        """Get events of a user's installations with optional filtering.
 
         Args:
             user_id: The user ID.
@@ -360,28 +758,385 @@ class GitHubService:
             offset: Number of events to skip.
 
         Returns:
-            List of matching events.
+            List of matching events (metadata columns only).
         """
-        statement = select(Event).where(Event.user_id == user_id)
+        return await self.get_events(
+            await self.get_user_installation_ids(user_id),
+            event_type=event_type,
+            repository_id=repository_id,
+            limit=limit,
+            offset=offset,
+        )
 
-        if event_type:
-            statement = statement.where(Event.event_type == event_type)
+    async def get_event_page(
+        self,
+        installation_ids: list[int],
+        event_type: str | None = None,
+        repository_id: int | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: EventCursor | None = None,
+        **filters: Unpack[EventFilters],
+    ) -> EventPage:
+        """Get one page of the events of a set of installations, newest first.
 
-        if repository_id:
-            statement = statement.where(Event.repository_id == repository_id)
+        With a cursor the page is read by keyset on ``(created_at, id)`` and
+        ``offset`` is ignored; without one, ``offset`` is applied. Either way
+        the page carries cursors to continue from, so offset clients can
+        switch to keyset paging at any page.
 
-        statement = statement.order_by(desc(Event.created_at))
-        statement = statement.offset(offset).limit(limit)
+        Args:
+            installation_ids: IDs of the installations to read.
+            event_type: Optional event type filter.
+            repository_id: Optional repository ID filter.
+            limit: Maximum number of events to return.
+            offset: Number of events to skip (offset mode only).
+            cursor: Position to continue from (cursor mode).
+            **filters: Further filters on extracted columns and source time
+                (see ``_event_filters``).
 
-        return list(self.db.exec(statement).all())
+        Returns:
+            The page of events (metadata columns only) and its cursors.
+        """
+        statement = self._events_statement(
+            installation_ids, event_type, repository_id, **filters
+        )
+        key = tuple_(Event.created_at, Event.id)
+        newest_first = (desc(col(Event.created_at)), desc(col(Event.id)))
+
+        if cursor is None:
+            statement = statement.order_by(*newest_first).offset(offset)
+        elif cursor.direction == NEXT:
+            statement = statement.where(
+                key < tuple_(cursor.created_at, cursor.id)
+            ).order_by(*newest_first)
+        else:
+            statement = statement.where(
+                key > tuple_(cursor.created_at, cursor.id)
+            ).order_by(Event.created_at, Event.id)
+
+        # One extra row tells whether another page follows
+        events = list((await self._exec(statement.limit(limit + 1))).all())
+        has_more = len(events) > limit
+        events = events[:limit]
+
+        backwards = cursor is not None and cursor.direction == PREV
+        if backwards:
+            events.reverse()
+
+        has_older = has_more if not backwards else True
+        has_newer = has_more if backwards else (cursor is not None or offset > 0)
+
+        page = EventPage(events=events)
+        if events and has_older:
+            last = events[-1]
+            page.next_cursor = EventCursor(last.created_at, last.id, NEXT).encode()
+        if events and has_newer:
+            first = events[0]
+            page.prev_cursor = EventCursor(first.created_at, first.id, PREV).encode()
+        return page
+
+    async def get_event_page_by_user(
+        self,
+        user_id: int,
+        event_type: str | None = None,
+        repository_id: int | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: EventCursor | None = None,
+    ) -> EventPage:
+        """Get one page of the events of a user's installations, newest first.
 
-    def count_events_by_user(
+        Args:
+            user_id: The user ID.
+            event_type: Optional event type filter.
+            repository_id: Optional repository ID filter.
+            limit: Maximum number of events to return.
+            offset: Number of events to skip (offset mode only).
+            cursor: Position to continue from (cursor mode).
+
+        Returns:
+            The page of events (metadata columns only) and its cursors.
+        """
+        return await self.get_event_page(
+            await self.get_user_installation_ids(user_id),
+            event_type=event_type,
+            repository_id=repository_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+
+    async def iter_events(
+        self,
+        installation_ids: list[int] | None,
+        event_type: str | None = None,
+        repository_id: int | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        batch_size: int = 500,
+        **filters: Unpack[EventFilters],
+    ) -> AsyncIterator[Event]:
+        """Iterate over every matching event, oldest first, payloads included.
+
+        PostgreSQL streams the events through a server-side cursor; other
+        databases read keyset batches on ``(created_at, id)``. Events are
+        detached from the session once the caller moves on, so memory stays
+        flat however many events are read.
+
+        Args:
+            installation_ids: IDs of the installations to read; None reads
+                all installations.
+            event_type: Optional event type filter.
+            repository_id: Optional repository ID filter.
+            created_after: Only events stored at or after this time.
+            created_before: Only events stored before this time.
+            batch_size: Events fetched per round trip.
+            **filters: Further filters on extracted columns and source time
+                (see ``_event_filters``).
+
+        Yields:
+            The matching events.
+        """
+        conditions = _event_filters(
+            installation_ids, event_type, repository_id, **filters
+        )
+        if created_after:
+            conditions.append(Event.created_at >= created_after)
+        if created_before:
+            conditions.append(Event.created_at < created_before)
+        statement = (
+            select(Event)
+            .where(*conditions)
+            .order_by(col(Event.created_at), col(Event.id))
+        )
+
+        if self.dialect_name == "postgresql":
+            async for event in self._stream(statement, batch_size):
+                yield event
+                self.db.expunge(event)
+            return
+
+        key = tuple_(Event.created_at, Event.id)
+        batch = statement.limit(batch_size)
+        while events := list((await self._exec(batch)).all()):
+            last = events[-1]
+            batch = statement.where(key > tuple_(last.created_at, last.id))
+            batch = batch.limit(batch_size)
+            for event in events:
+                yield event
+                self.db.expunge(event)
+
+    def _events_statement(
+        self,
+        installation_ids: list[int],
+        event_type: str | None = None,
+        repository_id: int | None = None,
+        **filters: Unpack[EventFilters],
+    ) -> Any:
+        """Build the metadata-only select of a set of installations' events.
+
+        The installation (or repository) filter leads the
+        ``(…, created_at DESC, id)`` list indexes, so listings are index
+        range scans rather than scans of the events table.
+        """
+        return (
+            select(Event)
+            .options(load_only(*EVENT_METADATA_COLUMNS, raiseload=True))
+            .where(
+                *_event_filters(installation_ids, event_type, repository_id, **filters)
+            )
+        )
+
+    async def search_event_page(
+        self,
+        installation_ids: list[int],
+        query: str,
+        event_type: str | None = None,
+        repository_id: int | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: EventCursor | None = None,
+        **filters: Unpack[EventFilters],
+    ) -> EventPage:
+        """Get one page of the events matching a full-text search, best first.
+
+        Matches come from the search index, ranked by relevance (ties newest
+        first) and paged by keyset on ``(rank, id)``, or by ``offset``
+        without a cursor.
+
+        Args:
+            installation_ids: IDs of the installations to read.
+            query: Free-text query; every term must match.
+            event_type: Optional event type filter.
+            repository_id: Optional repository ID filter.
+            limit: Maximum number of events to return.
+            offset: Number of events to skip (offset mode only).
+            cursor: Position to continue from, from a previous search page.
+            **filters: Further filters on extracted columns and source time
+                (see ``_event_filters``).
+
+        Returns:
+            The page of events (metadata columns only) and its next cursor.
+
+        Raises:
+            ValueError: If the cursor does not come from a search.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return EventPage(events=[])
+
+        rank = rank_expression(self.dialect_name, terms).label("rank")
+        statement = (
+            select(Event, rank)
+            .options(load_only(*EVENT_METADATA_COLUMNS, raiseload=True))
+            .join_from(Event, search_key(self.dialect_name).table, self._search_join())
+            .where(
+                match_clause(self.dialect_name, terms),
+                *_event_filters(installation_ids, event_type, repository_id, **filters),
+            )
+            .order_by(rank, desc(col(Event.id)))
+        )
+        if cursor is None:
+            statement = statement.offset(offset)
+        elif cursor.rank is None or cursor.direction != NEXT:
+            raise ValueError("Cursor does not continue a search")
+        else:
+            score = rank_expression(self.dialect_name, terms)
+            statement = statement.where(
+                or_(
+                    score > cursor.rank,
+                    and_(score == cursor.rank, col(Event.id) < cursor.id),
+                )
+            )
+
+        rows = list((await self._execute(statement.limit(limit + 1))).all())
+        page = EventPage(events=[event for event, _ in rows[:limit]])
+        if len(rows) > limit:
+            last, last_rank = rows[limit - 1]
+            page.next_cursor = EventCursor(
+                last.created_at, last.id, NEXT, rank=last_rank
+            ).encode()
+        return page
+
+    async def count_search_results(
+        self,
+        installation_ids: list[int],
+        query: str,
+        event_type: str | None = None,
+        repository_id: int | None = None,
+        **filters: Unpack[EventFilters],
+    ) -> int:
+        """Count the events matching a full-text search.
+
+        Args:
+            installation_ids: IDs of the installations to read.
+            query: Free-text query; every term must match.
+            event_type: Optional event type filter.
+            repository_id: Optional repository ID filter.
+            **filters: Further filters on extracted columns and source time
+                (see ``_event_filters``).
+
+        Returns:
+            Number of matching events.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return 0
+
+        statement = (
+            select(func.count())
+            .select_from(Event)
+            .join(search_key(self.dialect_name).table, self._search_join())
+            .where(
+                match_clause(self.dialect_name, terms),
+                *_event_filters(installation_ids, event_type, repository_id, **filters),
+            )
+        )
+        return (await self._exec(statement)).one()
+
+    def _search_join(self) -> Any:
+        """Build the join condition of events and their search documents."""
+        return search_key(self.dialect_name) == Event.id
+
+    async def rebuild_search_index(self, batch_size: int = 500) -> int:
+        """Re-index every stored event for full-text search.
+
+        Args:
+            batch_size: Events decoded and indexed per step.
+
+        Returns:
+            The number of events indexed.
+        """
+        key = search_key(self.dialect_name)
+        await self._execute(delete(key.table))
+
+        indexed = 0
+        last_id = 0
+        while True:
+            statement = (
+                select(Event).where(col(Event.id) > last_id).order_by(col(Event.id))
+            ).limit(batch_size)
+            events = list((await self._exec(statement)).all())
+            if not events:
+                break
+            documents = {}
+            for event in events:
+                payload = parse_payload(await self.payloads.decode(event))
+                documents[_stored_id(event)] = search_document(
+                    event.event_type, event.action, payload
+                )
+                # Keep memory flat across batches
+                self.db.expunge(event)
+            await self._index_search(documents)
+            indexed += len(events)
+            last_id = _stored_id(events[-1])
+        await self._commit()
+        return indexed
+
+    async def backfill_extracted_columns(self, batch_size: int = 500) -> int:
+        """Extract the indexed actor and target columns of stored events.
+
+        Events stored before extraction existed (or under older extraction
+        rules) are re-extracted from their payloads, one committed batch at
+        a time.
+
+        Args:
+            batch_size: Events decoded and updated per transaction.
+
+        Returns:
+            The number of events updated.
+        """
+        updated = 0
+        last_id = 0
+        while True:
+            statement = (
+                select(Event).where(col(Event.id) > last_id).order_by(col(Event.id))
+            ).limit(batch_size)
+            events = list((await self._exec(statement)).all())
+            if not events:
+                break
+            rows = []
+            for event in events:
+                payload = parse_payload(await self.payloads.decode(event))
+                rows.append(
+                    {"id": event.id, **extract_columns(event.event_type, payload)}
+                )
+                # Keep memory flat across batches
+                self.db.expunge(event)
+            await self._execute(update(Event), rows)
+            await self._commit()
+            updated += len(events)
+            last_id = _stored_id(events[-1])
+        return updated
+
+    async def count_events_by_user(
         self,
         user_id: int,
         event_type: str | None = None,
         repository_id: int | None = None,
     ) -> int:
-        """Count events for a user with optional filtering.
+        """Count events of a user's installations with optional filtering.
 
         Args:
             user_id: The user ID.
@@ -391,17 +1146,102 @@ class GitHubService:
         Returns:
             Number of matching events.
         """
-        statement = select(Event).where(Event.user_id == user_id)
+        return await self.count_events(
+            installation_id=await self.get_user_installation_ids(user_id),
+            event_type=event_type,
+            repository_id=repository_id,
+        )
 
-        if event_type:
-            statement = statement.where(Event.event_type == event_type)
+    async def count_event_listing(
+        self,
+        installation_ids: list[int],
+        event_type: str | None = None,
+        repository_id: int | None = None,
+        **filters: Unpack[EventFilters],
+    ) -> int:
+        """Count the events of a listing.
+
+        Listings filtered only by installation, type and repository are
+        counted from the event counters; other filters count the matching
+        rows.
+
+        Args:
+            installation_ids: IDs of the installations to read.
+            event_type: Optional event type filter.
+            repository_id: Optional repository ID filter.
+            **filters: Further filters on extracted columns and source time
+                (see ``_event_filters``).
+
+        Returns:
+            Number of matching events.
+        """
+        if all(value is None for value in filters.values()):
+            return await self.count_events(
+                installation_id=installation_ids,
+                event_type=event_type,
+                repository_id=repository_id,
+            )
+
+        statement = (
+            select(func.count())
+            .select_from(Event)
+            .where(
+                *_event_filters(installation_ids, event_type, repository_id, **filters)
+            )
+        )
+        return (await self._exec(statement)).one()
 
-        if repository_id:
-            statement = statement.where(Event.repository_id == repository_id)
+    async def count_events(self, **filters: Any) -> int:
+        """Count events matching equality filters on event columns.
 
-        return len(self.db.exec(statement).all())
+        Filters that are all counter dimensions are answered from the
+        ``event_counters`` table; any other combination falls back to
+        ``SELECT COUNT(*)`` over the events.
 
-    def mark_event_processed(
+        Args:
+            **filters: Column name to required value, or to a list of allowed
+                values; None values are ignored.
+
+        Returns:
+            Number of matching events.
+        """
+        filters = {name: value for name, value in filters.items() if value is not None}
+
+        if filters.keys() <= set(COUNTER_DIMENSIONS):
+            statement = select(func.coalesce(func.sum(EventCounter.count), 0))
+            model: Any = EventCounter
+        else:
+            statement = select(func.count()).select_from(Event)
+            model = Event
+
+        for name, value in filters.items():
+            statement = statement.where(_matches(getattr(model, name), value))
+
+        return (await self._exec(statement)).one()
+
+    async def rebuild_event_counters(self) -> int:
+        """Recompute every event counter from the stored events.
+
+        Returns:
+            The number of counter rows written.
+        """
+        dimensions = [getattr(Event, name) for name in COUNTER_DIMENSIONS]
+        statement = sa_select(*dimensions, func.count()).group_by(*dimensions)
+        increments: Counter[CounterKey] = Counter()
+        for *values, count in (await self._exec(statement)).all():
+            increments[
+                counter_key(dict(zip(COUNTER_DIMENSIONS, values, strict=True)))
+            ] += count
+
+        await self._execute(delete(EventCounter))
+        if increments:
+            await self._execute(
+                upsert_counters_statement(self.dialect_name, increments)
+            )
+        await self._commit()
+        return len(increments)
+
+    async def mark_event_processed(
         self, event_id: int, error: str | None = None
     ) -> Event | None:
         """Mark an event as processed.
@@ -414,7 +1254,7 @@ class GitHubService:
             The updated event if found, None otherwise.
         """
         statement = select(Event).where(Event.id == event_id)
-        event = self.db.exec(statement).first()
+        event = (await self._exec(statement)).first()
 
         if not event:
             return None
@@ -423,15 +1263,19 @@ class GitHubService:
         event.processed_at = datetime.now(UTC)
         event.error = error
         event.updated_at = datetime.now(UTC)
-        self.db.commit()
-        self.db.refresh(event)
+        await self._commit()
+        await self._refresh(event)
         return event
 
-    def get_last_event_at_for_repositories(
+    async def get_last_event_at_for_repositories(
         self, repository_github_ids: list[int]
     ) -> dict[int, datetime | None]:
         """Get the last event timestamp for multiple repositories.
 
+        Reads the denormalized ``Repository.last_event_at`` in one query.
+        Repositories without it (e.g. events stored before it existed) fall
+        back to ``MAX(created_at)`` of their events inside the same query.
+
         Args:
             repository_github_ids: List of GitHub repository IDs.
 
@@ -443,31 +1287,59 @@ class GitHubService:
         if not repository_github_ids:
             return result
 
-        # Get all repositories by GitHub IDs
-        repos_statement = select(Repository).where(
-            Repository.github_repo_id.in_(repository_github_ids)
+        latest_event = (
+            select(func.max(Event.created_at))
+            .where(Event.repository_id == Repository.id)
+            .scalar_subquery()
         )
-        repos = list(self.db.exec(repos_statement))
+        statement = select(
+            Repository.github_repo_id,
+            func.coalesce(Repository.last_event_at, latest_event),
+        ).where(col(Repository.github_repo_id).in_(repository_github_ids))
 
-        # Map internal ID to GitHub ID
-        internal_to_github: dict[int, int] = {}
-        for repo in repos:
-            if repo.id is not None:
-                internal_to_github[repo.id] = repo.github_repo_id
+        for github_id, last_event_at in (await self._exec(statement)).all():
+            result[github_id] = last_event_at
+        return result
 
-        if not internal_to_github:
-            return result
+    async def get_repository_event_markers(
+        self, repository_id: int
+    ) -> dict[str, datetime]:
+        """Get when the newest event of each type was stored for a repository.
 
-        # Get the most recent event for each repository
-        for internal_id, github_id in internal_to_github.items():
-            event_statement = (
-                select(Event)
-                .where(Event.repository_id == internal_id)
-                .order_by(desc(Event.created_at))
-                .limit(1)
-            )
-            event = self.db.exec(event_statement).first()
-            if event:
-                result[github_id] = event.created_at
+        Args:
+            repository_id: The internal repository ID.
 
-        return result
+        Returns:
+            Dictionary mapping event type to its last event timestamp.
+        """
+        statement = select(
+            RepositoryEventMarker.event_type, RepositoryEventMarker.last_event_at
+        ).where(RepositoryEventMarker.repository_id == repository_id)
+        return dict((await self._exec(statement)).all())
+
+    async def rebuild_repository_markers(self) -> int:
+        """Recompute repository last-event markers from the stored events.
+
+        Returns:
+            The number of repositories with events.
+        """
+        statement = (
+            select(Event.repository_id, Event.event_type, func.max(Event.created_at))
+            .where(col(Event.repository_id).is_not(None))
+            .group_by(col(Event.repository_id), col(Event.event_type))
+        )
+        rows = [
+            {"repository_id": repository_id, "event_type": event_type, "created_at": at}
+            for repository_id, event_type, at in (await self._exec(statement)).all()
+        ]
+
+        await self._execute(delete(RepositoryEventMarker))
+        await self._execute(
+            update(Repository).values(
+                last_event_at=None, updated_at=Repository.updated_at
+            )
+        )
+        for marker_statement in marker_statements(self.dialect_name, rows):
+            await self._execute(marker_statement)
+        await self._commit()
+        return len({row["repository_id"] for row in rows})
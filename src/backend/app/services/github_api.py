@@ -1,9 +1,34 @@
 """GitHub API client for installation-level operations."""
 
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from datetime import datetime
+from typing import Any
+
 import httpx
 
 from app.config import Settings
-from app.services.crypto import generate_github_app_jwt
+from app.services.app_jwt import get_github_app_jwt
+from app.services.github_scheduler import (
+    PRIORITY_INTERACTIVE,
+    GitHubScheduler,
+    RateLimitExceeded,
+    get_github_scheduler,
+)
+from app.services.response_cache import (
+    RESPONSE_CACHE_HITS,
+    RESPONSE_CACHE_MISSES,
+    RESPONSE_CACHE_REVALIDATIONS,
+    CachedResponse,
+    ResponseCache,
+    cache_key,
+    get_response_cache,
+)
+from app.services.token_cache import (
+    InstallationToken,
+    InstallationTokenCache,
+    get_installation_token_cache,
+)
 
 
 class GitHubAPIError(Exception):
@@ -25,17 +50,40 @@ class GitHubAPIClient:
 
     BASE_URL = "https://api.github.com"
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        http_client: httpx.AsyncClient,
+        token_cache: InstallationTokenCache | None = None,
+        response_cache: ResponseCache | None = None,
+        scheduler: GitHubScheduler | None = None,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> None:
         """Initialize the GitHub API client.
 
         Args:
             settings: Application settings with GitHub App credentials.
+            http_client: The shared HTTP client for calls to GitHub.
+            token_cache: Cache of installation tokens; defaults to the
+                process-wide cache.
+            response_cache: Cache of GET responses; defaults to the
+                process-wide cache.
+            scheduler: Scheduler of requests within rate budgets; defaults to
+                the process-wide scheduler.
+            priority: Priority of this client's requests, interactive unless
+                it serves background work.
         """
         self.settings = settings
-        self._installation_tokens: dict[int, str] = {}
+        self.http_client = http_client
+        self.token_cache = token_cache or get_installation_token_cache()
+        self.response_cache = (
+            get_response_cache() if response_cache is None else response_cache
+        )
+        self.scheduler = scheduler or get_github_scheduler()
+        self.priority = priority
 
-    def _get_app_jwt(self) -> str:
-        """Generate a GitHub App JWT for authentication.
+    async def _get_app_jwt(self) -> str:
+        """Get the (cached) GitHub App JWT for authentication.
 
         Returns:
             The encoded JWT string.
@@ -48,15 +96,121 @@ class GitHubAPIClient:
                 "GitHub App credentials not configured", status_code=500
             )
 
-        return generate_github_app_jwt(
+        return await get_github_app_jwt(
             self.settings.github_app_id,
             self.settings.github_private_key,
+        ).get()
+
+    async def _request(
+        self,
+        budget: int | None,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        params: dict[str, Any] | None = None,
+    ) -> httpx.Response:
+        """Send a request through the rate-limit scheduler.
+
+        Args:
+            budget: The rate budget charged: the installation whose token
+                authenticates the request, or None for the App JWT.
+            method: The HTTP method.
+            url: The URL.
+            headers: The request headers.
+            params: Query parameters.
+
+        Returns:
+            The response.
+
+        Raises:
+            GitHubAPIError: If the rate budget stays exhausted for longer
+                than requests wait.
+        """
+        try:
+            return await self.scheduler.request(
+                budget,
+                lambda: self.http_client.request(
+                    method, url, headers=headers, params=params
+                ),
+                self.priority,
+            )
+        except RateLimitExceeded as e:
+            raise GitHubAPIError(str(e), status_code=429) from e
+
+    async def _cached_get(
+        self,
+        installation_id: int,
+        url: str,
+        credentials: Callable[[], Awaitable[str]],
+        params: dict[str, Any] | None = None,
+        budget: int | None = None,
+    ) -> httpx.Response:
+        """GET a URL through the response cache.
+
+        A fresh cached response is returned without a request; a stale one
+        is revalidated with its ETag and Last-Modified date, and returned
+        again if GitHub answers 304 Not Modified. Credentials are only
+        fetched for requests that reach GitHub.
+
+        Args:
+            installation_id: The installation the request is made for.
+            url: The URL.
+            credentials: Gets the bearer token authorizing the request.
+            params: Query parameters.
+            budget: The rate budget charged, None for App-authenticated
+                requests.
+
+        Returns:
+            GitHub's response, or the cached one rebuilt as a 200 response.
+        """
+        key = cache_key(installation_id, url, params or {})
+        entry = await self.response_cache.get(key)
+        if entry and self.response_cache.is_fresh(entry):
+            RESPONSE_CACHE_HITS.inc()
+            return httpx.Response(200, content=entry.body)
+
+        response = await self._request(
+            budget,
+            "GET",
+            url,
+            params=params,
+            headers={
+                "Accept": "application/vnd.github+json",
+                "Authorization": f"Bearer {await credentials()}",
+                "X-GitHub-Api-Version": "2022-11-28",
+                **(entry.conditional_headers() if entry else {}),
+            },
         )
 
-    async def get_installation_access_token(
-        self, installation_id: int
-    ) -> str:
-        """Get an installation access token from GitHub.
+        if entry and response.status_code == 304:
+            RESPONSE_CACHE_REVALIDATIONS.inc()
+            # GitHub may send a new ETag with a 304
+            await self.response_cache.put(
+                key,
+                replace(
+                    entry,
+                    etag=response.headers.get("ETag", entry.etag),
+                    stored_at=self.response_cache.now(),
+                ),
+            )
+            return httpx.Response(200, content=entry.body)
+
+        RESPONSE_CACHE_MISSES.inc()
+        if response.status_code == 200:
+            await self.response_cache.put(
+                key,
+                CachedResponse(
+                    installation_id=installation_id,
+                    body=response.content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    stored_at=self.response_cache.now(),
+                ),
+            )
+        return response
+
+    async def get_installation_access_token(self, installation_id: int) -> str:
+        """Get an installation access token, minting one only if none is cached.
 
         Args:
             installation_id: The GitHub installation ID.
@@ -67,26 +221,46 @@ class GitHubAPIClient:
         Raises:
             GitHubAPIError: If token request fails.
         """
-        app_jwt = self._get_app_jwt()
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.BASE_URL}/app/installations/{installation_id}/access_tokens",
-                headers={
-                    "Accept": "application/vnd.github+json",
-                    "Authorization": f"Bearer {app_jwt}",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        return await self.token_cache.get(
+            installation_id, lambda: self._mint_installation_token(installation_id)
+        )
+
+    async def _mint_installation_token(self, installation_id: int) -> InstallationToken:
+        """Request a new installation access token from GitHub.
+
+        Args:
+            installation_id: The GitHub installation ID.
+
+        Returns:
+            The token and its expiry.
+
+        Raises:
+            GitHubAPIError: If token request fails.
+        """
+        app_jwt = await self._get_app_jwt()
+
+        response = await self._request(
+            None,
+            "POST",
+            f"{self.BASE_URL}/app/installations/{installation_id}/access_tokens",
+            headers={
+                "Accept": "application/vnd.github+json",
+                "Authorization": f"Bearer {app_jwt}",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+        )
 
-            if response.status_code != 201:
-                raise GitHubAPIError(
-                    f"Failed to get installation token: {response.text}",
-                    status_code=response.status_code,
-                )
+        if response.status_code != 201:
+            raise GitHubAPIError(
+                f"Failed to get installation token: {response.text}",
+                status_code=response.status_code,
+            )
 
-            data = response.json()
-            return data["token"]
+        data = response.json()
+        return InstallationToken(
+            token=data["token"],
+            expires_at=datetime.fromisoformat(data["expires_at"]),
+        )
 
     async def list_installation_repositories(
         self,
@@ -107,26 +281,24 @@ class GitHubAPIClient:
         Raises:
             GitHubAPIError: If API request fails.
         """
-        token = await self.get_installation_access_token(installation_id)
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/installation/repositories",
-                params={"page": page, "per_page": min(per_page, 100)},
-                headers={
-                    "Accept": "application/vnd.github+json",
-                    "Authorization": f"Bearer {token}",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        response = await self._cached_get(
+            installation_id,
+            f"{self.BASE_URL}/installation/repositories",
+            lambda: self.get_installation_access_token(installation_id),
+            params={"page": page, "per_page": min(per_page, 100)},
+            budget=installation_id,
+        )
 
-            if response.status_code != 200:
-                raise GitHubAPIError(
-                    f"Failed to list repositories: {response.text}",
-                    status_code=response.status_code,
-                )
+        if response.status_code == 401:
+            # Revoked before it expired; mint a new one next time
+            self.token_cache.invalidate(installation_id)
+        if response.status_code != 200:
+            raise GitHubAPIError(
+                f"Failed to list repositories: {response.text}",
+                status_code=response.status_code,
+            )
 
-            return response.json()
+        return response.json()
 
     async def get_installation(self, installation_id: int) -> dict:
         """Get installation details from GitHub.
@@ -140,22 +312,16 @@ class GitHubAPIClient:
         Raises:
             GitHubAPIError: If API request fails.
         """
-        app_jwt = self._get_app_jwt()
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/app/installations/{installation_id}",
-                headers={
-                    "Accept": "application/vnd.github+json",
-                    "Authorization": f"Bearer {app_jwt}",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
-            )
+        response = await self._cached_get(
+            installation_id,
+            f"{self.BASE_URL}/app/installations/{installation_id}",
+            self._get_app_jwt,
+        )
 
-            if response.status_code != 200:
-                raise GitHubAPIError(
-                    f"Failed to get installation: {response.text}",
-                    status_code=response.status_code,
-                )
+        if response.status_code != 200:
+            raise GitHubAPIError(
+                f"Failed to get installation: {response.text}",
+                status_code=response.status_code,
+            )
 
-            return response.json()
+        return response.json()
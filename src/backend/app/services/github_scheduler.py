@@ -0,0 +1,294 @@
+"""Rate-limit-aware scheduling of outbound GitHub requests.
+
+Every request to GitHub is charged to a rate budget: the installation whose
+token it carries, or the App itself for App-authenticated calls. Each budget
+tracks GitHub's ``X-RateLimit-Remaining`` and ``X-RateLimit-Reset`` headers
+as a token bucket refilled at the reset time, caps the requests in flight,
+and orders waiting requests by priority so interactive reads go before
+background work. Background requests also leave a share of the budget
+unspent for interactive ones.
+
+A request that would exceed the budget waits for it instead of failing, and
+a response rate limited anyway (a primary limit, ``Retry-After`` or a
+secondary limit) blocks the budget for the time GitHub asks and is retried.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.config import get_settings
+from app.metrics import Counter
+
+# Request priorities, most urgent first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+GITHUB_REQUESTS_DELAYED = Counter(
+    "github_requests_delayed",
+    "GitHub requests that waited for a concurrency slot or rate budget",
+)
+GITHUB_REQUESTS_RATE_LIMITED = Counter(
+    "github_requests_rate_limited", "GitHub responses refused by a rate limit"
+)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a rate budget is exhausted for longer than callers wait."""
+
+    def __init__(self, retry_at: float) -> None:
+        """Initialize the exception.
+
+        Args:
+            retry_at: When the budget is available again, in epoch seconds.
+        """
+        super().__init__(f"GitHub rate limit exceeded until {retry_at:.0f}")
+        self.retry_at = retry_at
+
+
+@dataclass
+class RateBudget:
+    """Rate limit state of one installation (or of the App)."""
+
+    limit: int | None = None
+    # Requests left in the current window; None until GitHub reports it
+    remaining: int | None = None
+    reset_at: float = 0.0
+    blocked_until: float = 0.0
+    in_flight: int = 0
+    waiters: list[tuple[int, int, asyncio.Future[None]]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class GitHubScheduler:
+    """Dispatches GitHub requests within per-installation budgets."""
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        reserve: float = 0.1,
+        max_wait: float = 60.0,
+        max_retries: int = 2,
+        secondary_backoff: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrent: Requests in flight per budget.
+            reserve: Share of a budget's limit background requests leave for
+                interactive ones.
+            max_wait: Longest a request waits for its budget, in seconds;
+                waiting longer fails it with ``RateLimitExceeded``.
+            max_retries: Retries of a rate-limited request.
+            secondary_backoff: Seconds a budget pauses after a secondary rate
+                limit without ``Retry-After``.
+            clock: Source of the current time, in epoch seconds.
+        """
+        self.max_concurrent = max_concurrent
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.secondary_backoff = secondary_backoff
+        self._clock = clock
+        self._budgets: dict[int | None, RateBudget] = {}
+        self._order = itertools.count()
+
+    def budget(self, installation_id: int | None) -> RateBudget:
+        """Get the rate budget of an installation.
+
+        Args:
+            installation_id: The GitHub installation ID, or None for the App.
+
+        Returns:
+            The budget, created empty on first use.
+        """
+        return self._budgets.setdefault(installation_id, RateBudget())
+
+    async def request(
+        self,
+        installation_id: int | None,
+        send: Callable[[], Awaitable[httpx.Response]],
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> httpx.Response:
+        """Send a request once its budget allows, retrying rate limits.
+
+        Args:
+            installation_id: The budget charged: a GitHub installation ID, or
+                None for App-authenticated calls.
+            send: Sends the request.
+            priority: ``PRIORITY_INTERACTIVE`` or ``PRIORITY_BACKGROUND``.
+
+        Returns:
+            The response; still rate limited only if retries ran out or the
+            budget would not recover within ``max_wait``.
+
+        Raises:
+            RateLimitExceeded: If the request waited for its budget for
+                longer than ``max_wait`` before being sent.
+        """
+        budget = self.budget(installation_id)
+        attempt = 0
+        while True:
+            await self._acquire(budget, priority)
+            try:
+                response = await send()
+                limited = self._record(budget, response)
+            finally:
+                self._release(budget)
+            if (
+                not limited
+                or attempt == self.max_retries
+                or self._delay(budget, priority, self._clock()) > self.max_wait
+            ):
+                return response
+            attempt += 1
+
+    async def _acquire(self, budget: RateBudget, priority: int) -> None:
+        """Wait until the budget dispatches a request of this priority.
+
+        Raises:
+            RateLimitExceeded: If the budget does not dispatch the request
+                within ``max_wait``.
+        """
+        now = self._clock()
+        delay = self._delay(budget, priority, now)
+        if delay > self.max_wait:
+            raise RateLimitExceeded(now + delay)
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(budget.waiters, (priority, next(self._order), waiter))
+        self._dispatch(budget)
+        if waiter.done():
+            return
+
+        GITHUB_REQUESTS_DELAYED.inc()
+        try:
+            # Budgets blocked or drained while queued can push the wait past
+            # its initial estimate
+            await asyncio.wait_for(waiter, self.max_wait)
+        except TimeoutError:
+            now = self._clock()
+            raise RateLimitExceeded(now + self._delay(budget, priority, now)) from None
+        except asyncio.CancelledError:
+            if not waiter.cancelled():
+                # Dispatched just as the caller was cancelled
+                self._release(budget)
+            raise
+
+    def _release(self, budget: RateBudget) -> None:
+        """Free a request's concurrency slot and dispatch the next waiter."""
+        budget.in_flight -= 1
+        self._dispatch(budget)
+
+    def _dispatch(self, budget: RateBudget) -> None:
+        """Dispatch waiters in priority order while the budget allows."""
+        if budget.timer is not None:
+            budget.timer.cancel()
+            budget.timer = None
+
+        now = self._clock()
+        while budget.waiters:
+            priority, _, waiter = budget.waiters[0]
+            if waiter.done():
+                heapq.heappop(budget.waiters)
+                continue
+            if budget.in_flight >= self.max_concurrent:
+                return
+            delay = self._delay(budget, priority, now)
+            if delay > 0:
+                budget.timer = asyncio.get_running_loop().call_later(
+                    delay, self._dispatch, budget
+                )
+                return
+
+            heapq.heappop(budget.waiters)
+            budget.in_flight += 1
+            if budget.remaining is not None:
+                budget.remaining -= 1
+            waiter.set_result(None)
+
+    def _delay(self, budget: RateBudget, priority: int, now: float) -> float:
+        """Seconds until the budget allows a request of this priority."""
+        if budget.blocked_until > now:
+            return budget.blocked_until - now
+        if budget.remaining is None:
+            return 0.0
+        if budget.reset_at <= now:
+            # A new window; GitHub reports its size with the next response
+            budget.remaining = None
+            return 0.0
+
+        reserve = 0
+        if priority != PRIORITY_INTERACTIVE and budget.limit:
+            reserve = math.ceil(budget.limit * self.reserve)
+        if budget.remaining > reserve:
+            return 0.0
+        return budget.reset_at - now
+
+    def _record(self, budget: RateBudget, response: httpx.Response) -> bool:
+        """Update the budget from a response.
+
+        Returns:
+            Whether the response was refused by a rate limit.
+        """
+        headers = response.headers
+        now = self._clock()
+        remaining = _number(headers.get("X-RateLimit-Remaining"))
+        reset_at = _number(headers.get("X-RateLimit-Reset"))
+        if remaining is not None and reset_at is not None:
+            budget.remaining = int(remaining)
+            budget.reset_at = reset_at
+            if (limit := _number(headers.get("X-RateLimit-Limit"))) is not None:
+                budget.limit = int(limit)
+
+        if response.status_code not in (403, 429):
+            return False
+        if (retry_after := _number(headers.get("Retry-After"))) is not None:
+            blocked_until = now + retry_after
+        elif remaining == 0 and reset_at is not None:
+            blocked_until = reset_at
+        elif response.status_code == 429 or "rate limit" in response.text.lower():
+            # Secondary limits without Retry-After: GitHub asks for a pause
+            blocked_until = now + self.secondary_backoff
+        else:
+            # Forbidden for another reason
+            return False
+
+        GITHUB_REQUESTS_RATE_LIMITED.inc()
+        budget.blocked_until = max(budget.blocked_until, blocked_until)
+        return True
+
+
+def _number(value: str | None) -> float | None:
+    """Parse a numeric header, or None if it is absent or not a number."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_scheduler: GitHubScheduler | None = None
+
+
+def get_github_scheduler() -> GitHubScheduler:
+    """Get or create the global GitHub request scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = GitHubScheduler(
+            max_concurrent=settings.github_max_concurrent_requests,
+            reserve=settings.github_rate_limit_reserve,
+            max_wait=settings.github_rate_limit_max_wait_seconds,
+            max_retries=settings.github_rate_limit_max_retries,
+            secondary_backoff=settings.github_secondary_rate_limit_backoff_seconds,
+        )
+    return _scheduler
@@ -0,0 +1,61 @@
+"""Shared HTTP client for calls to GitHub.
+
+One pooled ``httpx.AsyncClient`` lives for the lifetime of the application,
+so requests to github.com and api.github.com reuse kept-alive connections
+instead of paying a TCP and TLS handshake each. HTTP/2 needs the optional
+``h2`` package (``pip install 'httpx[http2]'``); without it the client
+falls back to HTTP/1.1.
+"""
+
+import logging
+
+import httpx
+
+from app.config import Settings
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+else:
+    HTTP2_AVAILABLE = True
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """Create the pooled client used for every GitHub request.
+
+    Args:
+        settings: Application settings with the connection pool options.
+
+    Returns:
+        The client; the caller closes it with ``aclose``.
+    """
+    http2 = settings.github_http2 and HTTP2_AVAILABLE
+    if settings.github_http2 and not http2:
+        logger.warning("GITHUB_HTTP2 is set but h2 is not installed; using HTTP/1.1")
+
+    timeouts = {
+        host: httpx.Timeout(seconds).as_dict()
+        for host, seconds in settings.github_http_timeouts_by_host.items()
+    }
+
+    async def apply_host_timeout(request: httpx.Request) -> None:
+        """Override the default timeout for hosts with their own."""
+        if timeout := timeouts.get(request.url.host):
+            request.extensions["timeout"] = timeout
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.github_http_max_connections,
+            max_keepalive_connections=settings.github_http_max_keepalive_connections,
+            keepalive_expiry=settings.github_http_keepalive_expiry_seconds,
+        ),
+        timeout=httpx.Timeout(
+            settings.github_http_timeout_seconds,
+            connect=settings.github_http_connect_timeout_seconds,
+        ),
+        event_hooks={"request": [apply_host_timeout]} if timeouts else None,
+    )
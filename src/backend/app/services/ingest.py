@@ -0,0 +1,328 @@
+"""Webhook ingest: event storage, per-type handlers and queue workers."""
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+from app.db.engine import AnySession, session_scope
+from app.services.event_writer import EventWriter
+from app.services.github import GitHubService
+from app.services.ingest_queue import IngestQueue, QueuedDelivery
+from app.services.response_cache import get_response_cache
+from app.services.token_cache import get_installation_token_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WebhookDelivery:
+    """A verified webhook delivery whose body is parsed on first use.
+
+    The body is kept as the exact bytes GitHub signed and is stored as-is;
+    the payload is decoded at most once, when routing fields or an event
+    handler first need it.
+    """
+
+    delivery_id: str
+    event_type: str
+    body: bytes
+
+    @cached_property
+    def payload(self) -> dict[str, Any]:
+        """The decoded webhook payload.
+
+        Raises:
+            ValueError: If the body is not a JSON object.
+        """
+        payload = json.loads(self.body)
+        if not isinstance(payload, dict):
+            raise ValueError("Webhook payload must be a JSON object")
+        return payload
+
+    @property
+    def action(self) -> str | None:
+        """The event action, if present."""
+        return self.payload.get("action")
+
+    @property
+    def github_installation_id(self) -> int | None:
+        """The GitHub installation ID the delivery belongs to, if present."""
+        return (self.payload.get("installation") or {}).get("id")
+
+    @property
+    def github_repository_id(self) -> int | None:
+        """The GitHub repository ID the delivery refers to, if present."""
+        return (self.payload.get("repository") or {}).get("id")
+
+
+async def process_webhook(
+    github_service: GitHubService,
+    delivery: WebhookDelivery,
+    event_writer: EventWriter | None = None,
+) -> str:
+    """Store a verified webhook delivery and run its event handler.
+
+    Events with a handler are marked processed once it has run. A duplicate
+    whose stored event is not processed yet was stored by an attempt that
+    failed before handling it (e.g. a worker crash), so its handler runs now.
+
+    Args:
+        github_service: The GitHub service.
+        delivery: The verified delivery.
+        event_writer: Group-commit writer to store the event through, if any.
+
+    Returns:
+        "accepted" if the event was stored, "duplicate" if already seen.
+    """
+    # Resolve the installation the delivery belongs to
+    installation_id = None
+    if delivery.github_installation_id:
+        installation = await github_service.get_installation_by_github_id(
+            delivery.github_installation_id
+        )
+        if installation:
+            installation_id = installation.id
+
+    # Resolve the repository the delivery refers to
+    repository_id = None
+    if delivery.github_repository_id:
+        repo = await github_service.get_repository_by_github_id(
+            delivery.github_repository_id
+        )
+        if repo:
+            repository_id = repo.id
+
+    # Store the body verbatim; a conflicting delivery ID means a redelivery
+    insert = event_writer.submit if event_writer else github_service.insert_event
+    event_id = await insert(
+        delivery_id=delivery.delivery_id,
+        event_type=delivery.event_type,
+        payload=delivery.body,
+        action=delivery.action,
+        repository_id=repository_id,
+        installation_id=installation_id,
+    )
+    handler = _EVENT_HANDLERS.get(delivery.event_type)
+    status = "accepted"
+    if event_id is None:
+        status = "duplicate"
+        stored = None
+        if handler:
+            stored = await github_service.get_event_by_delivery_id(delivery.delivery_id)
+        if stored is None or stored.processed or stored.id is None:
+            return status
+        event_id = stored.id
+
+    # Handlers only set state from the payload, so rerunning one is harmless
+    if handler:
+        await handler(delivery.payload, github_service)
+        await github_service.mark_event_processed(event_id)
+
+    return status
+
+
+async def _handle_installation_event(
+    payload: dict[str, Any], github_service: GitHubService
+) -> None:
+    """Handle installation webhook events.
+
+    Args:
+        payload: The webhook payload.
+        github_service: The GitHub service.
+    """
+    action = payload.get("action")
+    installation = payload.get("installation", {})
+    github_installation_id = installation.get("id")
+
+    if not github_installation_id:
+        return
+
+    if action == "suspend":
+        sender = payload.get("sender", {}).get("login", "unknown")
+        await github_service.suspend_installation(github_installation_id, sender)
+        get_installation_token_cache().invalidate(github_installation_id)
+        await get_response_cache().invalidate(github_installation_id)
+    elif action == "unsuspend":
+        await github_service.unsuspend_installation(github_installation_id)
+        # The cached installation still describes it as suspended
+        await get_response_cache().invalidate(github_installation_id)
+    elif action == "deleted":
+        await github_service.delete_installation(github_installation_id)
+        get_installation_token_cache().invalidate(github_installation_id)
+        await get_response_cache().invalidate(github_installation_id)
+
+
+async def _handle_installation_repositories_event(
+    payload: dict[str, Any], github_service: GitHubService
+) -> None:
+    """Handle installation_repositories webhook events.
+
+    Args:
+        payload: The webhook payload.
+        github_service: The GitHub service.
+    """
+    action = payload.get("action")
+    installation_data = payload.get("installation", {})
+    github_installation_id = installation_data.get("id")
+
+    if not github_installation_id:
+        return
+
+    # The cached repository list no longer matches
+    await get_response_cache().invalidate(github_installation_id)
+
+    installation = await github_service.get_installation_by_github_id(
+        github_installation_id
+    )
+    if not installation:
+        return
+
+    if action == "added":
+        repos_added = payload.get("repositories_added", [])
+        for repo_data in repos_added:
+            await github_service.create_or_update_repository(
+                installation=installation,
+                github_repo_id=repo_data["id"],
+                full_name=repo_data["full_name"],
+                owner=repo_data["full_name"].split("/")[0],
+                name=repo_data["name"],
+                private=repo_data.get("private", False),
+            )
+
+
+# Handlers of event types that change installation or repository state
+_EVENT_HANDLERS: dict[
+    str, Callable[[dict[str, Any], GitHubService], Awaitable[None]]
+] = {
+    "installation": _handle_installation_event,
+    "installation_repositories": _handle_installation_repositories_event,
+}
+
+
+class IngestWorkerPool:
+    """Pool of async workers draining the ingest queue into the database."""
+
+    def __init__(
+        self,
+        queue: IngestQueue,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AnySession]
+        ] = session_scope,
+        workers: int = 4,
+        poll_interval: float = 0.5,
+        event_writer: EventWriter | None = None,
+    ) -> None:
+        """Initialize the worker pool.
+
+        Args:
+            queue: The durable ingest queue.
+            session_factory: Callable returning a context manager that opens
+                a database session.
+            workers: Number of concurrent workers.
+            poll_interval: Seconds an idle worker waits before polling again.
+            event_writer: Group-commit writer shared by the workers, if any.
+        """
+        self.queue = queue
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.event_writer = event_writer
+        self._tasks: list[asyncio.Task[None]] = []
+        self._stopping = asyncio.Event()
+
+    async def start(self) -> None:
+        """Recover interrupted deliveries and start the workers."""
+        recovered = await asyncio.to_thread(self.queue.recover)
+        if recovered:
+            logger.info("Re-queued %d interrupted webhook deliveries", recovered)
+
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"ingest-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the workers, letting in-flight deliveries finish."""
+        self._stopping.set()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def drain(self) -> int:
+        """Process queued deliveries until none are available.
+
+        Returns:
+            The number of deliveries processed.
+        """
+        processed = 0
+        while await self.process_next():
+            processed += 1
+        return processed
+
+    async def process_next(self) -> bool:
+        """Claim and process a single delivery.
+
+        Returns:
+            True if a delivery was claimed, False if the queue was empty.
+        """
+        delivery = await asyncio.to_thread(self.queue.claim)
+        if delivery is None:
+            return False
+
+        await self._process(delivery)
+        return True
+
+    async def _run(self) -> None:
+        """Worker loop: process deliveries until asked to stop."""
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.process_next()
+            except Exception:
+                logger.exception("Ingest worker failed to claim a delivery")
+                claimed = False
+
+            if not claimed:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=self.poll_interval
+                    )
+
+    async def _process(self, delivery: QueuedDelivery) -> None:
+        """Store one claimed delivery and acknowledge or fail it.
+
+        Args:
+            delivery: The claimed delivery.
+        """
+        webhook = WebhookDelivery(
+            delivery.delivery_id, delivery.event_type, delivery.body
+        )
+        try:
+            webhook.payload  # noqa: B018 - parse once to reject malformed bodies
+        except ValueError as e:
+            logger.warning("Dead-lettering delivery %s: %s", delivery.delivery_id, e)
+            await asyncio.to_thread(
+                self.queue.fail, delivery.id, f"Invalid JSON payload: {e}", False
+            )
+            return
+
+        try:
+            async with self.session_factory() as session:
+                await process_webhook(
+                    GitHubService(session),
+                    webhook,
+                    event_writer=self.event_writer,
+                )
+        except Exception as e:
+            logger.exception("Failed to ingest delivery %s", delivery.delivery_id)
+            await asyncio.to_thread(self.queue.fail, delivery.id, str(e))
+            return
+
+        await asyncio.to_thread(self.queue.ack, delivery.id)
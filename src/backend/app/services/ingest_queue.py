@@ -0,0 +1,253 @@
+"""Durable local queue for acknowledged-but-unprocessed webhook deliveries.
+
+The queue is a single SQLite file, so ack-first ingest needs no external
+broker. Deliveries are appended by the webhook handler and claimed by the
+ingest workers in FIFO order.
+
+A claim leases the delivery to its worker for ``lease_seconds``. Several
+processes can share one queue file: a delivery is only reclaimed once its
+lease has lapsed, i.e. when the worker holding it died or hung.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.config import get_settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    delivery_id TEXT NOT NULL UNIQUE,
+    event_type TEXT NOT NULL,
+    body BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    enqueued_at REAL NOT NULL,
+    -- When the delivery may next be claimed; for one being processed, when
+    -- its lease lapses
+    available_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_deliveries_status_available
+    ON deliveries (status, available_at, id);
+"""
+
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_DEAD = "dead"
+
+
+@dataclass(frozen=True)
+class QueuedDelivery:
+    """A webhook delivery claimed from the ingest queue."""
+
+    id: int
+    delivery_id: str
+    event_type: str
+    body: bytes
+    attempts: int
+
+
+class IngestQueue:
+    """SQLite-backed FIFO queue of raw webhook deliveries.
+
+    All methods are blocking; async callers should run them in a thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 5,
+        retry_backoff_seconds: float = 2.0,
+        lease_seconds: float = 300.0,
+    ) -> None:
+        """Open (and create if needed) the queue database.
+
+        Args:
+            path: Filesystem path of the queue database, or ":memory:".
+            max_attempts: Attempts before a delivery is dead-lettered.
+            retry_backoff_seconds: Base delay before a failed delivery is retried.
+            lease_seconds: How long a claimed delivery stays reserved for its
+                worker; it must outlast processing one delivery.
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Deliveries are acknowledged to GitHub once enqueued, so keep fsync.
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, delivery_id: str, event_type: str, body: bytes) -> bool:
+        """Durably append a delivery to the queue.
+
+        A dead-lettered delivery is queued again with fresh attempts, so a
+        manual redelivery from GitHub retries it instead of being dropped.
+
+        Args:
+            delivery_id: The GitHub delivery ID.
+            event_type: The GitHub event type.
+            body: The raw, signature-verified request body.
+
+        Returns:
+            True if the delivery was queued, False if it is already queued.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO deliveries "
+                "(delivery_id, event_type, body, enqueued_at, available_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (delivery_id) DO UPDATE SET "
+                "  event_type = excluded.event_type, body = excluded.body, "
+                "  status = ?, attempts = 0, last_error = NULL, "
+                "  enqueued_at = excluded.enqueued_at, "
+                "  available_at = excluded.available_at "
+                "WHERE status = ?",
+                (delivery_id, event_type, body, now, now, STATUS_PENDING, STATUS_DEAD),
+            )
+        return cursor.rowcount == 1
+
+    def claim(self) -> QueuedDelivery | None:
+        """Claim the oldest available delivery for processing.
+
+        Deliveries whose lease lapsed while being processed are available
+        again.
+
+        Returns:
+            The claimed delivery, or None if nothing is available.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE deliveries SET status = ?, attempts = attempts + 1, "
+                "  available_at = ? "
+                "WHERE id = ("
+                "  SELECT id FROM deliveries "
+                "  WHERE status IN (?, ?) AND available_at <= ? "
+                "  ORDER BY id LIMIT 1"
+                ") RETURNING id, delivery_id, event_type, body, attempts",
+                (
+                    STATUS_PROCESSING,
+                    now + self.lease_seconds,
+                    STATUS_PENDING,
+                    STATUS_PROCESSING,
+                    now,
+                ),
+            ).fetchone()
+
+        if row is None:
+            return None
+        return QueuedDelivery(
+            id=row[0],
+            delivery_id=row[1],
+            event_type=row[2],
+            body=bytes(row[3]),
+            attempts=row[4],
+        )
+
+    def ack(self, queued_id: int) -> None:
+        """Remove a successfully processed delivery from the queue.
+
+        Args:
+            queued_id: The queue row ID of the delivery.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM deliveries WHERE id = ?", (queued_id,))
+
+    def fail(self, queued_id: int, error: str, retryable: bool = True) -> None:
+        """Record a failed processing attempt.
+
+        The delivery is rescheduled with exponential backoff, or moved to the
+        dead-letter state once it is not retryable or out of attempts.
+
+        Args:
+            queued_id: The queue row ID of the delivery.
+            error: Description of the failure.
+            retryable: Whether the delivery may be attempted again.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM deliveries WHERE id = ?", (queued_id,)
+            ).fetchone()
+            if row is None:
+                return
+
+            attempts = row[0]
+            if not retryable or attempts >= self.max_attempts:
+                self._conn.execute(
+                    "UPDATE deliveries SET status = ?, last_error = ? WHERE id = ?",
+                    (STATUS_DEAD, error, queued_id),
+                )
+                return
+
+            delay = self.retry_backoff_seconds * (2 ** (attempts - 1))
+            self._conn.execute(
+                "UPDATE deliveries SET status = ?, last_error = ?, available_at = ? "
+                "WHERE id = ?",
+                (STATUS_PENDING, error, time.time() + delay, queued_id),
+            )
+
+    def recover(self) -> int:
+        """Return deliveries whose lease lapsed to the queue.
+
+        Deliveries still leased, possibly to a worker in another process
+        sharing the queue file, are left alone.
+
+        Returns:
+            The number of deliveries recovered.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE deliveries SET status = ? "
+                "WHERE status = ? AND available_at <= ?",
+                (STATUS_PENDING, STATUS_PROCESSING, time.time()),
+            )
+        return cursor.rowcount
+
+    def depth(self, status: str = STATUS_PENDING) -> int:
+        """Count deliveries in the given state.
+
+        Args:
+            status: Queue state to count.
+
+        Returns:
+            Number of deliveries in that state.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM deliveries WHERE status = ?", (status,)
+            ).fetchone()
+        return int(row[0])
+
+
+# Global queue instance (lazy initialization)
+_queue: IngestQueue | None = None
+
+
+def get_ingest_queue() -> IngestQueue:
+    """Get or create the global ingest queue (FastAPI dependency)."""
+    global _queue
+    if _queue is None:
+        settings = get_settings()
+        _queue = IngestQueue(
+            settings.ingest_queue_path,
+            max_attempts=settings.ingest_max_attempts,
+            lease_seconds=settings.ingest_lease_seconds,
+        )
+    return _queue
@@ -0,0 +1,81 @@
+"""Keyset pagination cursors for event listings.
+
+Events are listed newest first, ordered by ``(created_at, id)``. A cursor
+records the key of the row a page ended (or started) at and the direction
+to continue in, so the next page is a bounded index range scan regardless
+of depth and does not shift when new events arrive. Search results are
+ordered by ``(rank, id)`` instead, so their cursors also carry the rank.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.db.models.event import Event
+
+# Continue towards older events / newer events
+NEXT = "next"
+PREV = "prev"
+
+
+@dataclass(frozen=True)
+class EventCursor:
+    """Position in an event listing."""
+
+    created_at: datetime
+    id: int
+    direction: str = NEXT
+    # Search relevance of the row; None outside search results
+    rank: float | None = None
+
+    def encode(self) -> str:
+        """Serialize the cursor into an opaque URL-safe token."""
+        key = [self.created_at.isoformat(), self.id, self.direction]
+        if self.rank is not None:
+            key.append(self.rank)
+        data = json.dumps(key, separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "EventCursor":
+        """Parse a token produced by ``encode``.
+
+        Args:
+            token: The opaque cursor token.
+
+        Returns:
+            The cursor.
+
+        Raises:
+            ValueError: If the token is malformed.
+        """
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            created_at, event_id, direction, *rank = json.loads(
+                base64.urlsafe_b64decode(padded)
+            )
+            if len(rank) > 1:
+                raise ValueError("Too many cursor fields")
+            cursor = cls(
+                datetime.fromisoformat(created_at),
+                int(event_id),
+                direction,
+                float(rank[0]) if rank else None,
+            )
+        except (binascii.Error, TypeError, ValueError) as e:
+            raise ValueError("Invalid pagination cursor") from e
+
+        if cursor.direction not in (NEXT, PREV):
+            raise ValueError("Invalid pagination cursor")
+        return cursor
+
+
+@dataclass
+class EventPage:
+    """One page of an event listing with cursors to its neighbours."""
+
+    events: list[Event]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
@@ -0,0 +1,251 @@
+"""Compression codecs for stored webhook payloads.
+
+Every event row records the codec its payload was written with, so rows
+written with different codecs (or before compression existed) can be read
+side by side. ``zstd`` needs the optional ``zstandard`` package; ``zlib`` is
+always available and uses its preset-dictionary support for the same effect.
+"""
+
+import re
+import zlib
+from collections import Counter
+from collections.abc import Sequence
+from typing import Protocol, cast
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+IDENTITY = "identity"
+ZLIB = "zlib"
+ZSTD = "zstd"
+AUTO = "auto"
+
+# zlib only looks back 32 KiB, so longer preset dictionaries are wasted
+ZLIB_MAX_DICTIONARY_SIZE = 32 * 1024
+
+# A JSON member: a quoted key followed by a string or scalar value
+_JSON_MEMBER = re.compile(
+    rb'"(?:[^"\\]|\\.)*"\s*:\s*(?:"(?:[^"\\]|\\.)*"|[^,{}\[\]"]+|[{\[])'
+)
+
+
+class Decompressor(Protocol):
+    """Incremental decompressor, as returned by ``PayloadCodec.decompressor``."""
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress the next chunk of stored bytes."""
+        ...
+
+    def flush(self) -> bytes:
+        """Return any remaining output once all input has been given."""
+        ...
+
+
+class _Passthrough:
+    """Decompressor for uncompressed payloads."""
+
+    def decompress(self, data: bytes) -> bytes:
+        """Return the chunk unchanged."""
+        return data
+
+    def flush(self) -> bytes:
+        """Return no remaining output."""
+        return b""
+
+
+class PayloadCodec:
+    """Identity codec: payloads are stored uncompressed."""
+
+    name = IDENTITY
+
+    def compress(self, data: bytes, dictionary: bytes | None = None) -> bytes:
+        """Compress a payload.
+
+        Args:
+            data: The payload bytes.
+            dictionary: Trained dictionary to compress with, if any.
+
+        Returns:
+            The compressed bytes.
+        """
+        return data
+
+    def decompress(self, data: bytes, dictionary: bytes | None = None) -> bytes:
+        """Decompress a stored payload.
+
+        Args:
+            data: The stored bytes.
+            dictionary: The dictionary the payload was compressed with, if any.
+
+        Returns:
+            The original payload bytes.
+        """
+        return data
+
+    def decompressor(self, dictionary: bytes | None = None) -> Decompressor:
+        """Create an incremental decompressor for streaming reads.
+
+        Args:
+            dictionary: The dictionary the payload was compressed with, if any.
+
+        Returns:
+            A decompressor fed the stored bytes chunk by chunk.
+        """
+        return _Passthrough()
+
+    def train(self, samples: Sequence[bytes], size: int) -> bytes:
+        """Train a compression dictionary from sample payloads.
+
+        Args:
+            samples: Sample payloads of one event type.
+            size: Target dictionary size in bytes.
+
+        Returns:
+            The dictionary bytes.
+
+        Raises:
+            ValueError: If the codec does not support dictionaries or the
+                samples are insufficient.
+        """
+        raise ValueError(f"Codec {self.name!r} does not use dictionaries")
+
+
+class ZlibCodec(PayloadCodec):
+    """DEFLATE compression with an optional preset dictionary."""
+
+    name = ZLIB
+
+    def __init__(self, level: int = 6) -> None:
+        """Initialize the codec.
+
+        Args:
+            level: zlib compression level.
+        """
+        self.level = level
+
+    def compress(self, data: bytes, dictionary: bytes | None = None) -> bytes:
+        """Compress a payload."""
+        if dictionary:
+            compressor = zlib.compressobj(self.level, zdict=dictionary)
+        else:
+            compressor = zlib.compressobj(self.level)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes, dictionary: bytes | None = None) -> bytes:
+        """Decompress a stored payload."""
+        decompressor = self.decompressor(dictionary)
+        return decompressor.decompress(data) + decompressor.flush()
+
+    def decompressor(self, dictionary: bytes | None = None) -> Decompressor:
+        """Create an incremental decompressor for streaming reads."""
+        if dictionary:
+            return zlib.decompressobj(zdict=dictionary)
+        return zlib.decompressobj()
+
+    def train(self, samples: Sequence[bytes], size: int) -> bytes:
+        """Build a preset dictionary from JSON members shared by the samples.
+
+        Members that occur in more than one sample are ranked by the bytes
+        they would save; the most valuable go last, where DEFLATE reaches
+        them with the shortest distances.
+        """
+        if len(samples) < 2:
+            raise ValueError("At least two samples are needed to train")
+
+        frequency: Counter[bytes] = Counter()
+        for sample in samples:
+            frequency.update(set(_JSON_MEMBER.findall(sample)))
+
+        shared = [member for member, count in frequency.items() if count > 1]
+        shared.sort(key=lambda member: frequency[member] * len(member), reverse=True)
+
+        budget = min(size, ZLIB_MAX_DICTIONARY_SIZE)
+        chosen: list[bytes] = []
+        for member in shared:
+            if len(member) > budget:
+                continue
+            chosen.append(member)
+            budget -= len(member)
+
+        if not chosen:
+            raise ValueError("Samples share no content to build a dictionary")
+        return b"".join(reversed(chosen))
+
+
+class ZstdCodec(PayloadCodec):
+    """Zstandard compression with trained dictionaries."""
+
+    name = ZSTD
+
+    def __init__(self, level: int = 3) -> None:
+        """Initialize the codec.
+
+        Args:
+            level: Zstandard compression level.
+        """
+        self.level = level
+
+    def compress(self, data: bytes, dictionary: bytes | None = None) -> bytes:
+        """Compress a payload."""
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+        return cast(bytes, compressor.compress(data))
+
+    def decompress(self, data: bytes, dictionary: bytes | None = None) -> bytes:
+        """Decompress a stored payload."""
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return cast(bytes, decompressor.decompress(data))
+
+    def decompressor(self, dictionary: bytes | None = None) -> Decompressor:
+        """Create an incremental decompressor for streaming reads."""
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return cast(Decompressor, decompressor.decompressobj())
+
+    def train(self, samples: Sequence[bytes], size: int) -> bytes:
+        """Train a Zstandard dictionary from the samples."""
+        try:
+            trained = zstandard.train_dictionary(size, list(samples))
+            return cast(bytes, trained.as_bytes())
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Dictionary training failed: {e}") from e
+
+
+def available_codecs() -> list[str]:
+    """List the codecs usable in this environment."""
+    codecs = [IDENTITY, ZLIB]
+    if zstandard is not None:
+        codecs.append(ZSTD)
+    return codecs
+
+
+def get_codec(name: str) -> PayloadCodec:
+    """Get a codec by name.
+
+    Args:
+        name: Codec name, or "auto" for the best available codec.
+
+    Returns:
+        The codec.
+
+    Raises:
+        ValueError: If the codec is unknown or its package is not installed.
+    """
+    if name == AUTO:
+        name = ZSTD if zstandard is not None else ZLIB
+
+    if name == IDENTITY:
+        return PayloadCodec()
+    if name == ZLIB:
+        return ZlibCodec()
+    if name == ZSTD:
+        if zstandard is None:
+            raise ValueError(
+                "The zstd payload codec requires the 'zstandard' package "
+                "(install the 'compression' extra)"
+            )
+        return ZstdCodec()
+    raise ValueError(f"Unknown payload codec: {name!r}")
@@ -0,0 +1,602 @@
+"""Compressed, content-addressed storage for webhook payloads.
+
+Embedded objects that repeat across events (``repository``, ``sender``, ...)
+are cut out of each body and stored once in ``payload_blobs`` under their
+SHA-256; the event row keeps the remaining bytes plus the offsets where the
+blobs go back in. The remainder is compressed with the configured codec,
+using the newest dictionary trained for its event type when one exists.
+The codec, dictionary and blob references are recorded on each event row,
+so reads reassemble the exact original bytes from any mix of formats.
+"""
+
+import hashlib
+import json
+import re
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Collection, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm import Session
+from sqlmodel import col, select
+
+from app.config import get_settings
+from app.db.engine import AnySession
+from app.db.models.event import Event
+from app.db.models.payload_blob import PayloadBlob
+from app.db.models.payload_dictionary import PayloadDictionary
+from app.services.base import DatabaseService
+from app.services.payload_codec import IDENTITY, get_codec
+
+# How long a process trusts its view of the newest dictionary per event type
+ACTIVE_DICTIONARY_TTL_SECONDS = 60.0
+
+# Sub-objects smaller than this stay inline; a reference would not pay off
+MIN_INTERNED_SIZE = 64
+
+# Decoded blobs kept in memory; blobs are content-addressed, so entries
+# are valid for every database
+BLOB_CACHE_SIZE = 1024
+
+# Blob hashes remembered per database as already stored
+KNOWN_BLOBS_SIZE = 16384
+
+# Stored bytes fed to the decompressor per chunk when streaming a body
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def split_subobjects(
+    body: bytes, keys: Collection[str], min_size: int = MIN_INTERNED_SIZE
+) -> tuple[bytes, list[tuple[int, bytes]]]:
+    """Cut top-level object members out of a JSON body.
+
+    Only the bytes of each value are cut, so splicing them back in at the
+    returned offsets restores the body byte for byte.
+
+    Args:
+        body: The JSON body.
+        keys: Top-level member names whose object values are cut out.
+        min_size: Smallest value, in bytes, worth cutting out.
+
+    Returns:
+        The remaining bytes and a list of (offset in remainder, value bytes).
+        Bodies that are not a JSON object are returned whole.
+    """
+    try:
+        text = body.decode()
+        spans = _object_member_spans(text, keys)
+    except ValueError:
+        return body, []
+
+    remainder: list[bytes] = []
+    parts: list[tuple[int, bytes]] = []
+    offset = 0
+    previous = 0
+    for start, end in spans:
+        value = text[start:end].encode()
+        if len(value) < min_size:
+            continue
+        prefix = text[previous:start].encode()
+        remainder.append(prefix)
+        offset += len(prefix)
+        parts.append((offset, value))
+        previous = end
+    remainder.append(text[previous:].encode())
+    return b"".join(remainder), parts
+
+
+def join_subobjects(remainder: bytes, parts: list[tuple[int, bytes]]) -> bytes:
+    """Splice cut-out values back into a remainder.
+
+    Args:
+        remainder: The remaining bytes.
+        parts: (offset in remainder, value bytes), in offset order.
+
+    Returns:
+        The original body.
+    """
+    pieces: list[bytes] = []
+    previous = 0
+    for offset, value in parts:
+        pieces.append(remainder[previous:offset])
+        pieces.append(value)
+        previous = offset
+    pieces.append(remainder[previous:])
+    return b"".join(pieces)
+
+
+def iter_joined(
+    chunks: Iterator[bytes], parts: list[tuple[int, bytes]]
+) -> Iterator[bytes]:
+    """Splice cut-out values back into a remainder arriving in chunks.
+
+    Args:
+        chunks: The remaining bytes, in order.
+        parts: (offset in remainder, value bytes), in offset order.
+
+    Yields:
+        The original body, piece by piece.
+    """
+    pending = iter(parts)
+    part = next(pending, None)
+    position = 0
+    for chunk in chunks:
+        end = position + len(chunk)
+        start = position
+        while part is not None and part[0] <= end:
+            offset, value = part
+            if offset > start:
+                yield chunk[start - position : offset - position]
+            yield value
+            start = offset
+            part = next(pending, None)
+        if end > start:
+            yield chunk[start - position :]
+        position = end
+    # Values at the very end of the remainder (none for JSON objects)
+    while part is not None:
+        yield part[1]
+        part = next(pending, None)
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    """Get the index of the first non-whitespace character from an index."""
+    match = _WHITESPACE.match(text, index)
+    return match.end() if match else index
+
+
+def _object_member_spans(text: str, keys: Collection[str]) -> list[tuple[int, int]]:
+    """Find the value spans of selected members of a top-level JSON object.
+
+    Raises:
+        ValueError: If the text is not a JSON object.
+    """
+    index = _skip_whitespace(text, 0)
+    if text[index : index + 1] != "{":
+        raise ValueError("Not a JSON object")
+    index = _skip_whitespace(text, index + 1)
+    if text[index : index + 1] == "}":
+        return []
+
+    spans = []
+    while True:
+        key, index = _decoder.raw_decode(text, index)
+        index = _skip_whitespace(text, index)
+        if text[index : index + 1] != ":":
+            raise ValueError("Expected ':' after object key")
+        start = _skip_whitespace(text, index + 1)
+        value, index = _decoder.raw_decode(text, start)
+        if key in keys and isinstance(value, dict):
+            spans.append((start, index))
+
+        index = _skip_whitespace(text, index)
+        delimiter = text[index : index + 1]
+        if delimiter == "}":
+            return spans
+        if delimiter != ",":
+            raise ValueError("Expected ',' or '}' in object")
+        index = _skip_whitespace(text, index + 1)
+
+
+@dataclass
+class _StoreCache:
+    """Dictionaries and blob hashes already seen in one database."""
+
+    # Dictionary ID -> dictionary bytes; dictionaries never change
+    dictionaries: dict[int, bytes] = field(default_factory=dict)
+    # (event type, codec) -> (newest dictionary ID, monotonic load time)
+    active: dict[tuple[str, str], tuple[int | None, float]] = field(
+        default_factory=dict
+    )
+    # Blob hashes known to be stored, least recently used first
+    known_blobs: OrderedDict[str, None] = field(default_factory=OrderedDict)
+
+
+# Dictionary IDs and stored blobs are per database, so cache per engine
+_caches: "weakref.WeakKeyDictionary[Engine | Connection, _StoreCache]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Blob hash -> decoded blob bytes, least recently used first
+_blob_cache: OrderedDict[str, bytes] = OrderedDict()
+
+# Session.info key of the blobs inserted in the session's open transaction,
+# as (known blobs of the database, hashes) pairs
+_PENDING_BLOBS = "payload_store_pending_blobs"
+
+
+@listens_for(Session, "after_commit")
+def _remember_committed_blobs(session: Session) -> None:
+    """Record the blobs a committed transaction inserted as stored."""
+    for known, hashes in session.info.pop(_PENDING_BLOBS, ()):
+        for sha256 in hashes:
+            known[sha256] = None
+        while len(known) > KNOWN_BLOBS_SIZE:
+            known.popitem(last=False)
+
+
+@listens_for(Session, "after_rollback")
+def _forget_rolled_back_blobs(session: Session) -> None:
+    """Forget the blobs a rolled back transaction inserted."""
+    session.info.pop(_PENDING_BLOBS, None)
+
+
+class PayloadStore(DatabaseService):
+    """Encodes payloads for storage and decodes them on read."""
+
+    def __init__(
+        self,
+        db: AnySession,
+        codec: str | None = None,
+        interned_keys: Collection[str] | None = None,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            db: The database session.
+            codec: Codec for new payloads; defaults to the configured codec.
+            interned_keys: Top-level members stored as shared blobs; defaults
+                to the configured keys.
+        """
+        super().__init__(db)
+        settings = get_settings()
+        self.codec = get_codec(codec or settings.payload_codec)
+        self.interned_keys = frozenset(
+            settings.payload_interned_keys if interned_keys is None else interned_keys
+        )
+
+    @property
+    def _cache(self) -> _StoreCache:
+        """The cache of the session's database."""
+        engine = self.db.get_bind()
+        cache = _caches.get(engine)
+        if cache is None:
+            cache = _caches[engine] = _StoreCache()
+        return cache
+
+    async def encode(self, event_type: str, body: bytes) -> dict[str, Any]:
+        """Encode a webhook body for storage.
+
+        New sub-object blobs are written in the session's transaction, so
+        they commit together with the event row the caller inserts.
+
+        Args:
+            event_type: The event type, selecting the dictionary.
+            body: The raw webhook body.
+
+        Returns:
+            The ``payload``, ``payload_codec``, ``payload_dictionary_id``,
+            ``payload_refs`` and ``payload_sha256`` column values.
+        """
+        remainder, parts = split_subobjects(body, self.interned_keys)
+        refs = []
+        if parts:
+            blobs = {hashlib.sha256(value).hexdigest(): value for _, value in parts}
+            await self._store_blobs(blobs)
+            refs = [
+                [offset, hashlib.sha256(value).hexdigest()] for offset, value in parts
+            ]
+
+        return {
+            **await self._compress(event_type, remainder),
+            "payload_refs": json.dumps(refs) if refs else None,
+            "payload_sha256": hashlib.sha256(body).hexdigest(),
+        }
+
+    async def decode(self, event: Event) -> bytes:
+        """Reassemble the original webhook body of an event.
+
+        Args:
+            event: The event.
+
+        Returns:
+            The webhook body exactly as received.
+        """
+        remainder = await self._decompress(
+            event.payload, event.payload_codec, event.payload_dictionary_id
+        )
+        if not event.payload_refs:
+            return remainder
+
+        refs = json.loads(event.payload_refs)
+        blobs = await self.get_blobs({sha256 for _, sha256 in refs})
+        return join_subobjects(
+            remainder, [(offset, blobs[sha256]) for offset, sha256 in refs]
+        )
+
+    async def open_stream(
+        self, event: Event, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Prepare a streaming read of the original webhook body of an event.
+
+        The dictionary and blobs are loaded up front, so the returned
+        iterator needs no database access and can outlive the session. It
+        decompresses the stored bytes chunk by chunk and never builds (or
+        parses) the whole body.
+
+        Args:
+            event: The event, with its payload columns loaded.
+            chunk_size: Stored bytes decompressed per step.
+
+        Returns:
+            An iterator over the body exactly as received.
+        """
+        dictionary = (
+            await self._dictionary(event.payload_dictionary_id)
+            if event.payload_dictionary_id
+            else None
+        )
+        parts = []
+        if event.payload_refs:
+            refs = json.loads(event.payload_refs)
+            blobs = await self.get_blobs({sha256 for _, sha256 in refs})
+            parts = [(offset, blobs[sha256]) for offset, sha256 in refs]
+
+        decompressor = get_codec(event.payload_codec).decompressor(dictionary)
+        stored = event.payload
+
+        def remainder() -> Iterator[bytes]:
+            for start in range(0, len(stored), chunk_size):
+                chunk = decompressor.decompress(stored[start : start + chunk_size])
+                if chunk:
+                    yield chunk
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+
+        return iter_joined(remainder(), parts)
+
+    async def get_blobs(self, hashes: Collection[str]) -> dict[str, bytes]:
+        """Load shared sub-object blobs by content hash.
+
+        Args:
+            hashes: The SHA-256 hex digests.
+
+        Returns:
+            Mapping of hash to blob bytes.
+
+        Raises:
+            ValueError: If a blob is missing.
+        """
+        found = {}
+        missing = []
+        for sha256 in hashes:
+            if sha256 in _blob_cache:
+                _blob_cache.move_to_end(sha256)
+                found[sha256] = _blob_cache[sha256]
+            else:
+                missing.append(sha256)
+
+        if missing:
+            statement = select(PayloadBlob).where(col(PayloadBlob.sha256).in_(missing))
+            for blob in (await self._exec(statement)).all():
+                data = get_codec(blob.codec).decompress(blob.data)
+                found[blob.sha256] = data
+                _blob_cache[blob.sha256] = data
+            while len(_blob_cache) > BLOB_CACHE_SIZE:
+                _blob_cache.popitem(last=False)
+
+        if len(found) < len(hashes):
+            lost = sorted(set(hashes) - found.keys())
+            raise ValueError(f"Missing payload blobs: {', '.join(lost)}")
+        return found
+
+    async def train_dictionary(
+        self,
+        event_type: str,
+        size: int | None = None,
+        max_samples: int | None = None,
+    ) -> PayloadDictionary:
+        """Train a new dictionary version from stored events of one type.
+
+        Dictionaries are trained on payload remainders, i.e. the bytes the
+        codec compresses once shared sub-objects are cut out.
+
+        Args:
+            event_type: The event type to train on.
+            size: Target dictionary size; defaults to the configured size.
+            max_samples: Most recent payloads to sample; defaults to the
+                configured sample count.
+
+        Returns:
+            The stored dictionary.
+
+        Raises:
+            ValueError: If the codec has no dictionaries or the samples
+                are insufficient.
+        """
+        settings = get_settings()
+        size = size or settings.payload_dictionary_size
+        max_samples = max_samples or settings.payload_dictionary_samples
+
+        statement = (
+            select(Event)
+            .where(Event.event_type == event_type)
+            .order_by(col(Event.id).desc())
+            .limit(max_samples)
+        )
+        samples = [
+            split_subobjects(await self.decode(event), self.interned_keys)[0]
+            for event in (await self._exec(statement)).all()
+        ]
+        data = self.codec.train(samples, size)
+
+        latest = (
+            await self._exec(
+                select(func.max(PayloadDictionary.version)).where(
+                    PayloadDictionary.event_type == event_type,
+                    PayloadDictionary.codec == self.codec.name,
+                )
+            )
+        ).one()
+        dictionary = PayloadDictionary(
+            event_type=event_type,
+            codec=self.codec.name,
+            version=(latest or 0) + 1,
+            data=data,
+            sample_count=len(samples),
+        )
+        self.db.add(dictionary)
+        await self._commit()
+        await self._refresh(dictionary)
+        if dictionary.id is None:
+            raise ValueError("Payload dictionary was not stored")
+
+        self._cache.dictionaries[dictionary.id] = data
+        self._cache.active[(event_type, self.codec.name)] = (
+            dictionary.id,
+            time.monotonic(),
+        )
+        return dictionary
+
+    async def recompress(self, event_type: str, batch_size: int = 500) -> int:
+        """Re-encode stored events of one type with the current settings.
+
+        Events are rewritten in ID order, one transaction per batch; events
+        already stored as they would be encoded now are left alone.
+
+        Args:
+            event_type: The event type to recompress.
+            batch_size: Events per batch.
+
+        Returns:
+            The number of events rewritten.
+        """
+        rewritten = 0
+        last_id: int | None = 0
+
+        while True:
+            statement = (
+                select(Event)
+                .where(Event.event_type == event_type, col(Event.id) > last_id)
+                .order_by(col(Event.id))
+                .limit(batch_size)
+            )
+            events = (await self._exec(statement)).all()
+            if not events:
+                return rewritten
+
+            for event in events:
+                last_id = event.id
+                encoded = await self.encode(event_type, await self.decode(event))
+                if all(getattr(event, column) == v for column, v in encoded.items()):
+                    continue
+                for column, value in encoded.items():
+                    setattr(event, column, value)
+                rewritten += 1
+            await self._commit()
+
+    async def get_event_types(self) -> list[str]:
+        """List the event types that have stored events."""
+        statement = select(Event.event_type).distinct().order_by(Event.event_type)
+        return list((await self._exec(statement)).all())
+
+    async def _compress(self, event_type: str, data: bytes) -> dict[str, Any]:
+        """Compress a payload remainder, keeping it as-is if it does not shrink."""
+        if self.codec.name != IDENTITY:
+            dictionary_id = await self._active_dictionary_id(event_type)
+            dictionary = (
+                await self._dictionary(dictionary_id) if dictionary_id else None
+            )
+            compressed = self.codec.compress(data, dictionary)
+            if len(compressed) < len(data):
+                return {
+                    "payload": compressed,
+                    "payload_codec": self.codec.name,
+                    "payload_dictionary_id": dictionary_id,
+                }
+
+        return {
+            "payload": data,
+            "payload_codec": IDENTITY,
+            "payload_dictionary_id": None,
+        }
+
+    async def _decompress(
+        self, data: bytes, codec: str, dictionary_id: int | None
+    ) -> bytes:
+        """Decompress stored payload bytes."""
+        dictionary = await self._dictionary(dictionary_id) if dictionary_id else None
+        return get_codec(codec).decompress(data, dictionary)
+
+    async def _store_blobs(self, blobs: dict[str, bytes]) -> None:
+        """Insert blobs not yet known to be stored.
+
+        They become known once the caller's transaction commits; until then
+        a rollback could still undo them.
+        """
+        known = self._cache.known_blobs
+        new = {sha256: data for sha256, data in blobs.items() if sha256 not in known}
+        for sha256 in blobs.keys() - new.keys():
+            known.move_to_end(sha256)
+        if not new:
+            return
+
+        rows = []
+        for sha256, data in new.items():
+            compressed = self.codec.compress(data)
+            stored_compressed = len(compressed) < len(data)
+            rows.append(
+                {
+                    "sha256": sha256,
+                    "codec": self.codec.name if stored_compressed else IDENTITY,
+                    "data": compressed if stored_compressed else data,
+                    "size": len(data),
+                }
+            )
+        statement = (
+            self._insert(PayloadBlob)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["sha256"])
+        )
+        await self._execute(statement)
+        self.db.info.setdefault(_PENDING_BLOBS, []).append((known, list(new)))
+
+    async def _dictionary(self, dictionary_id: int) -> bytes:
+        """Load dictionary bytes by ID.
+
+        Raises:
+            ValueError: If the dictionary does not exist.
+        """
+        cache = self._cache
+        if dictionary_id not in cache.dictionaries:
+            dictionary = (
+                await self._exec(
+                    select(PayloadDictionary.data).where(
+                        PayloadDictionary.id == dictionary_id
+                    )
+                )
+            ).first()
+            if dictionary is None:
+                raise ValueError(f"Unknown payload dictionary: {dictionary_id}")
+            cache.dictionaries[dictionary_id] = dictionary
+        return cache.dictionaries[dictionary_id]
+
+    async def _active_dictionary_id(self, event_type: str) -> int | None:
+        """Get the newest dictionary for an event type and the current codec."""
+        cache = self._cache
+        key = (event_type, self.codec.name)
+        cached = cache.active.get(key)
+        if cached and time.monotonic() - cached[1] < ACTIVE_DICTIONARY_TTL_SECONDS:
+            return cached[0]
+
+        statement = (
+            select(PayloadDictionary.id)
+            .where(
+                PayloadDictionary.event_type == event_type,
+                PayloadDictionary.codec == self.codec.name,
+            )
+            .order_by(col(PayloadDictionary.version).desc())
+            .limit(1)
+        )
+        dictionary_id: int | None = (await self._exec(statement)).first()
+        cache.active[key] = (dictionary_id, time.monotonic())
+        return dictionary_id
@@ -0,0 +1,300 @@
+"""Conditional-request cache of GitHub API responses.
+
+GitHub answers a request carrying ``If-None-Match`` or ``If-Modified-Since``
+with ``304 Not Modified`` when nothing changed, and 304s don't count against
+the rate limit. The cache keeps the body, ``ETag`` and ``Last-Modified`` of
+each response per (installation, URL, query parameters): entries younger
+than ``ttl`` are served without a request, older ones are revalidated.
+Entries live in a bounded in-memory LRU and, optionally, in a SQLite file so
+they survive restarts.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from app.config import get_settings
+from app.metrics import Counter
+
+RESPONSE_CACHE_HITS = Counter(
+    "github_response_cache_hits", "GitHub responses served fresh from the cache"
+)
+RESPONSE_CACHE_REVALIDATIONS = Counter(
+    "github_response_cache_revalidations",
+    "Cached GitHub responses GitHub confirmed unchanged (304)",
+)
+RESPONSE_CACHE_MISSES = Counter(
+    "github_response_cache_misses", "GitHub responses fetched in full"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    installation_id INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_responses_installation
+    ON responses (installation_id);
+CREATE INDEX IF NOT EXISTS ix_responses_stored_at ON responses (stored_at);
+"""
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A GitHub response body with its validators."""
+
+    installation_id: int
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    stored_at: datetime
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers asking GitHub for the response only if it changed."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cache_key(installation_id: int, url: str, params: Mapping[str, Any]) -> str:
+    """Build the cache key of a request.
+
+    Args:
+        installation_id: The GitHub installation the request is made for.
+        url: The request URL, without query string.
+        params: The query parameters.
+
+    Returns:
+        The key; equal parameters in any order give the same key.
+    """
+    return f"{installation_id} {url}?{urlencode(sorted(params.items()))}"
+
+
+class ResponseStore:
+    """SQLite persistence tier of the response cache.
+
+    All methods are blocking; async callers should run them in a thread.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10_000) -> None:
+        """Open (and create if needed) the store.
+
+        Args:
+            path: Filesystem path of the store database, or ":memory:".
+            max_entries: Entries kept; the oldest are dropped beyond it.
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Losing recent entries on a crash only costs a refetch
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Read an entry.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The entry, or None if there is none.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT installation_id, body, etag, last_modified, stored_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(
+            installation_id=row[0],
+            body=bytes(row[1]),
+            etag=row[2],
+            last_modified=row[3],
+            stored_at=datetime.fromtimestamp(row[4], UTC),
+        )
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """Write an entry, dropping the oldest beyond ``max_entries``.
+
+        Args:
+            key: The cache key.
+            entry: The entry.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, installation_id, body, etag, last_modified, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.installation_id,
+                    entry.body,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.stored_at.timestamp(),
+                ),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "  SELECT key FROM responses ORDER BY stored_at DESC "
+                "  LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entries,),
+            )
+
+    def invalidate(self, installation_id: int) -> None:
+        """Drop every entry of an installation.
+
+        Args:
+            installation_id: The GitHub installation ID.
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM responses WHERE installation_id = ?", (installation_id,)
+            )
+
+
+class ResponseCache:
+    """In-memory LRU of GitHub responses over an optional SQLite store."""
+
+    def __init__(
+        self,
+        ttl: timedelta = timedelta(seconds=60),
+        max_entries: int = 1024,
+        store: ResponseStore | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: How long an entry is served without revalidating it.
+            max_entries: Entries kept in memory; the least recently used are
+                evicted beyond it.
+            store: Persistence tier consulted on in-memory misses.
+            clock: Source of the current time.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.store = store
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of entries in memory."""
+        return len(self._entries)
+
+    def now(self) -> datetime:
+        """The current time on the cache's clock."""
+        return self._clock()
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Whether an entry may be served without revalidating it.
+
+        Args:
+            entry: The entry.
+
+        Returns:
+            True if it is younger than ``ttl``.
+        """
+        return self._clock() - entry.stored_at < self.ttl
+
+    async def get(self, key: str) -> CachedResponse | None:
+        """Look up an entry, in memory first and then in the store.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The entry, fresh or not, or None if there is none.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self.store is None:
+            return None
+        entry = await asyncio.to_thread(self.store.get, key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: CachedResponse) -> None:
+        """Store an entry in memory and in the store.
+
+        Args:
+            key: The cache key.
+            entry: The entry.
+        """
+        self._remember(key, entry)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.put, key, entry)
+
+    async def invalidate(self, installation_id: int) -> None:
+        """Drop every entry of an installation.
+
+        Args:
+            installation_id: The GitHub installation ID.
+        """
+        for key in [
+            key
+            for key, entry in self._entries.items()
+            if entry.installation_id == installation_id
+        ]:
+            del self._entries[key]
+        if self.store is not None:
+            await asyncio.to_thread(self.store.invalidate, installation_id)
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        """Add an entry to the LRU, evicting the least recently used."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the global GitHub response cache."""
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        store = None
+        if settings.github_response_cache_path:
+            store = ResponseStore(
+                settings.github_response_cache_path,
+                max_entries=settings.github_response_cache_persistent_entries,
+            )
+        _response_cache = ResponseCache(
+            ttl=timedelta(seconds=settings.github_response_cache_ttl_seconds),
+            max_entries=settings.github_response_cache_max_entries,
+            store=store,
+        )
+    return _response_cache
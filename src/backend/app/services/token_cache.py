@@ -0,0 +1,148 @@
+"""Process-wide cache of GitHub App installation access tokens.
+
+Installation tokens are valid for an hour, so minting one per API call
+wastes a round trip and counts against the App's rate limit. The cache
+keeps one token per installation until ``refresh_margin`` before it
+expires. Concurrent callers that miss share a single in-flight refresh, and
+an installation's token is dropped when it is suspended or deleted.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from app.config import get_settings
+
+
+@dataclass(frozen=True)
+class InstallationToken:
+    """An installation access token and when GitHub expires it."""
+
+    token: str
+    expires_at: datetime
+
+
+class InstallationTokenCache:
+    """Installation tokens by GitHub installation ID, with single-flight refresh."""
+
+    def __init__(
+        self,
+        refresh_margin: timedelta = timedelta(minutes=5),
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            refresh_margin: How long before expiry a token is refreshed.
+            clock: Source of the current time.
+        """
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self._tokens: dict[int, InstallationToken] = {}
+        self._refreshes: dict[int, asyncio.Future[InstallationToken]] = {}
+        # Bumped on invalidation so in-flight refreshes are not cached
+        self._generations: dict[int, int] = {}
+
+    def peek(self, installation_id: int) -> InstallationToken | None:
+        """Get an installation's token if it is cached and still fresh.
+
+        Args:
+            installation_id: The GitHub installation ID.
+
+        Returns:
+            The token, or None if it must be refreshed.
+        """
+        token = self._tokens.get(installation_id)
+        if token and token.expires_at - self.refresh_margin > self._clock():
+            return token
+        return None
+
+    async def get(
+        self,
+        installation_id: int,
+        mint: Callable[[], Awaitable[InstallationToken]],
+    ) -> str:
+        """Get an installation's token, minting one if none is fresh.
+
+        Only one ``mint`` runs per installation at a time; callers arriving
+        while it runs wait for its token (or its error) instead.
+
+        Args:
+            installation_id: The GitHub installation ID.
+            mint: Requests a new token from GitHub.
+
+        Returns:
+            The access token.
+        """
+        while True:
+            if token := self.peek(installation_id):
+                return token.token
+
+            refresh = self._refreshes.get(installation_id)
+            if refresh is None:
+                return (await self._refresh(installation_id, mint)).token
+            try:
+                return (await asyncio.shield(refresh)).token
+            except asyncio.CancelledError:
+                if not refresh.cancelled():
+                    raise
+                # The caller refreshing was cancelled; take over from it
+
+    async def _refresh(
+        self,
+        installation_id: int,
+        mint: Callable[[], Awaitable[InstallationToken]],
+    ) -> InstallationToken:
+        """Mint a token, sharing it with the callers waiting for it."""
+        refresh = asyncio.get_running_loop().create_future()
+        self._refreshes[installation_id] = refresh
+        generation = self._generations.get(installation_id, 0)
+        try:
+            token = await mint()
+        except asyncio.CancelledError:
+            refresh.cancel()
+            raise
+        except Exception as e:
+            refresh.set_exception(e)
+            # Waiters re-raise it; don't warn if there were none
+            refresh.exception()
+            raise
+        finally:
+            del self._refreshes[installation_id]
+
+        if self._generations.get(installation_id, 0) == generation:
+            self._tokens[installation_id] = token
+        refresh.set_result(token)
+        return token
+
+    def invalidate(self, installation_id: int) -> None:
+        """Drop an installation's token, including one being refreshed.
+
+        Args:
+            installation_id: The GitHub installation ID.
+        """
+        self._tokens.pop(installation_id, None)
+        self._generations[installation_id] = (
+            self._generations.get(installation_id, 0) + 1
+        )
+
+    def clear(self) -> None:
+        """Drop every cached token."""
+        for installation_id in set(self._tokens) | set(self._refreshes):
+            self.invalidate(installation_id)
+
+
+_token_cache: InstallationTokenCache | None = None
+
+
+def get_installation_token_cache() -> InstallationTokenCache:
+    """Get or create the global installation token cache."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = InstallationTokenCache(
+            refresh_margin=timedelta(
+                seconds=get_settings().github_token_refresh_margin_seconds
+            )
+        )
+    return _token_cache
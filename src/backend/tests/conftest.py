@@ -8,12 +8,16 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 from unittest.mock import AsyncMock
 
+import httpx
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 from httpx import ASGITransport, AsyncClient
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
-from app.db.engine import get_session
+from app.config import Settings
+from app.db.engine import get_read_session, get_session
 from app.db.models.event import Event
 from app.db.models.installation import Installation
 from app.db.models.repository import Repository
@@ -55,7 +59,7 @@ def fixture_session(engine):
 @pytest.fixture(name="app")
 def fixture_app(engine, webhook_secret):
     """Create a test FastAPI application with test database."""
-    from app.config import Settings, get_settings
+    from app.config import get_settings
 
     app = create_app()
 
@@ -73,6 +77,7 @@ def fixture_app(engine, webhook_secret):
         return test_settings
 
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
     app.dependency_overrides[get_settings] = get_settings_override
     return app
 
@@ -398,6 +403,30 @@ def fixture_mock_github_api() -> AsyncMock:
     return mock
 
 
+@pytest.fixture(name="github_app_private_key", scope="session")
+def fixture_github_app_private_key() -> str:
+    """Generate a GitHub App private key (PEM) once per test session."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+@pytest.fixture(name="http_client")
+async def fixture_http_client() -> AsyncGenerator[httpx.AsyncClient, None]:
+    """HTTP client for service calls to (mocked) GitHub."""
+    async with httpx.AsyncClient() as client:
+        yield client
+
+
+@pytest.fixture(name="github_app_settings")
+def fixture_github_app_settings(github_app_private_key) -> Settings:
+    """Settings with GitHub App credentials for API client tests."""
+    return Settings(github_app_id="424242", github_private_key=github_app_private_key)
+
+
 # =============================================================================
 # Time Fixtures
 # =============================================================================
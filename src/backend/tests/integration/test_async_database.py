@@ -0,0 +1,110 @@
+"""Tests for the native async database path (AsyncEngine/AsyncSession).
+
+These tests run the API against an aiosqlite database file.
+"""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.db.models.session import Session as UserSession
+from app.db.models.user import User
+from app.services.crypto import generate_session_token, hash_token
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture(name="async_app")
+async def fixture_async_app(tmp_path, monkeypatch, webhook_secret):
+    """Create a test application configured for the async database path."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    import app.db.engine as db_engine
+    from app.config import Settings, get_settings
+    from app.main import create_app
+
+    database_file = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{database_file}")
+    SQLModel.metadata.create_all(sync_engine)
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_file}")
+    monkeypatch.setattr(db_engine, "_async_engine", async_engine)
+
+    settings = Settings(
+        github_webhook_secret="",
+        database_url=f"sqlite+aiosqlite:///{database_file}",
+    )
+    app = create_app()
+    app.dependency_overrides[get_settings] = lambda: settings
+
+    yield app, sync_engine
+
+    await async_engine.dispose()
+    sync_engine.dispose()
+
+
+class TestAsyncDatabasePath:
+    """API behaviour with an AsyncSession-backed database."""
+
+    @pytest.mark.integration
+    async def test_webhook_stored_through_async_session(self, async_app):
+        """AC: Webhooks are stored and deduplicated on the async path."""
+        app, _ = async_app
+        payload = json.dumps({"action": "opened", "number": 1}).encode()
+        headers = {
+            "X-GitHub-Event": "issues",
+            "X-GitHub-Delivery": "async-delivery-1",
+            "Content-Type": "application/json",
+        }
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            first = await client.post(
+                "/api/webhooks/github", content=payload, headers=headers
+            )
+            second = await client.post(
+                "/api/webhooks/github", content=payload, headers=headers
+            )
+
+        assert first.json()["status"] == "accepted"
+        assert second.json()["status"] == "duplicate"
+
+    @pytest.mark.integration
+    async def test_authenticated_request_through_async_session(self, async_app):
+        """AC: Session lookup and user reads work on the async path."""
+        app, sync_engine = async_app
+        token = generate_session_token()
+        with Session(sync_engine) as session:
+            user = User(
+                github_id=424242,
+                github_login="asyncuser",
+                access_token_hash=hash_token("token"),
+            )
+            session.add(user)
+            session.commit()
+            session.refresh(user)
+            session.add(
+                UserSession(
+                    user_id=user.id,
+                    token_hash=hash_token(token),
+                    expires_at=datetime.now(UTC) + timedelta(hours=1),
+                )
+            )
+            session.commit()
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+            cookies={"session_token": token},
+        ) as client:
+            me = await client.get("/api/auth/me")
+            events = await client.get("/api/events")
+
+        assert me.status_code == 200
+        assert me.json()["github_login"] == "asyncuser"
+        assert events.status_code == 200
+        assert events.json()["total"] == 0
@@ -0,0 +1,154 @@
+"""Tests for the installation-scoped, indexed event access path."""
+
+import pytest
+from sqlalchemy import event as sa_event
+
+from app.db.models.event import Event
+from app.db.models.installation import Installation
+from app.services.github import GitHubService
+
+
+@pytest.fixture(name="second_installation")
+def fixture_second_installation(session, test_user) -> Installation:
+    """Create a second installation owned by the test user."""
+    installation = Installation(
+        github_installation_id=67890,
+        user_id=test_user.id,
+        account_type="Organization",
+        account_login="testorg",
+        account_id=87654321,
+    )
+    session.add(installation)
+    session.commit()
+    session.refresh(installation)
+    return installation
+
+
+async def explain(engine, listing) -> str:
+    """Run a listing and return SQLite's query plan for its last statement."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    sa_event.listen(engine, "before_cursor_execute", capture)
+    try:
+        await listing
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+class TestInstallationScopedAccess:
+    """Tests for listing events by the caller's installations."""
+
+    @pytest.mark.integration
+    async def test_lists_events_of_all_user_installations(
+        self, session, test_user, test_installation, second_installation
+    ):
+        """AC: A multi-installation user sees the events of every installation."""
+        github_service = GitHubService(session)
+        for delivery_id, installation in (
+            ("a-1", test_installation),
+            ("a-2", second_installation),
+        ):
+            await github_service.insert_event(
+                delivery_id=delivery_id,
+                event_type="push",
+                payload=b"{}",
+                installation_id=installation.id,
+            )
+
+        installation_ids = await github_service.get_user_installation_ids(test_user.id)
+        page = await github_service.get_event_page(installation_ids)
+
+        assert sorted(installation_ids) == [
+            test_installation.id,
+            second_installation.id,
+        ]
+        assert [event.delivery_id for event in page.events] == ["a-2", "a-1"]
+        assert await github_service.count_events(installation_id=installation_ids) == 2
+
+    @pytest.mark.integration
+    async def test_deleted_installations_are_excluded(
+        self, session, test_user, test_installation, second_installation
+    ):
+        """Events of deleted installations are no longer listed."""
+        github_service = GitHubService(session)
+        await github_service.delete_installation(
+            second_installation.github_installation_id
+        )
+
+        assert await github_service.get_user_installation_ids(test_user.id) == [
+            test_installation.id
+        ]
+
+    @pytest.mark.integration
+    async def test_events_are_not_matched_by_user_alone(
+        self, session, test_user, test_installation
+    ):
+        """Events outside the user's installations are not listed."""
+        github_service = GitHubService(session)
+        session.add(
+            Event(
+                delivery_id="u-1", event_type="push", user_id=test_user.id, payload="{}"
+            )
+        )
+        session.commit()
+
+        page = await github_service.get_event_page_by_user(test_user.id)
+
+        assert page.events == []
+
+
+class TestEventListIndexes:
+    """EXPLAIN-based tests that event listings are index range scans."""
+
+    @pytest.mark.integration
+    async def test_installation_listing_uses_index(
+        self, engine, session, test_installation
+    ):
+        """AC: Listing one installation reads the index in order, without a sort."""
+        plan = await explain(
+            engine, GitHubService(session).get_event_page([test_installation.id])
+        )
+
+        assert "USING INDEX ix_events_installation_id_created_at_desc_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.integration
+    async def test_multi_installation_listing_uses_index(
+        self, engine, session, test_installation, second_installation
+    ):
+        """AC: Several installations are read in one indexed query."""
+        plan = await explain(
+            engine,
+            GitHubService(session).get_event_page(
+                [test_installation.id, second_installation.id]
+            ),
+        )
+
+        assert "USING INDEX ix_events_installation_id_created_at_desc_id" in plan
+        assert "SCAN events" not in plan
+
+    @pytest.mark.integration
+    async def test_repository_listing_uses_index(
+        self, engine, session, test_installation, second_installation, test_repository
+    ):
+        """AC: Listing a repository reads the repository index in order."""
+        plan = await explain(
+            engine,
+            GitHubService(session).get_event_page(
+                [test_installation.id, second_installation.id],
+                repository_id=test_repository.id,
+            ),
+        )
+
+        assert "USING INDEX ix_events_repository_id_created_at_desc_id" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,225 @@
+"""Tests for archiving expired events to segment files."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlmodel import select
+
+from app.config import clear_settings_cache
+from app.db.models.archived_event import ArchivedEvent
+from app.db.models.event import Event
+from app.services.event_archive import EventArchive
+from app.services.github import GitHubService
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture(name="archive_dir")
+def fixture_archive_dir(tmp_path, monkeypatch):
+    """Point the configured archive directory at a temporary directory."""
+    monkeypatch.setenv("ARCHIVE_DIR", str(tmp_path / "archive"))
+    clear_settings_cache()
+    yield tmp_path / "archive"
+    clear_settings_cache()
+
+
+@pytest.fixture(name="aged_events")
+def fixture_aged_events(session, test_installation, test_repository):
+    """Store events of two types at different ages."""
+    github_service = GitHubService(session)
+    ages = {"push-40": ("push", 40), "issues-40": ("issues", 40)}
+    ages |= {"issues-100": ("issues", 100), "push-1": ("push", 1)}
+    for delivery_id, (event_type, days) in ages.items():
+        session.add(
+            Event(
+                delivery_id=delivery_id,
+                event_type=event_type,
+                installation_id=test_installation.id,
+                repository_id=test_repository.id,
+                payload=f'{{"delivery": "{delivery_id}"}}',
+                created_at=NOW - timedelta(days=days),
+            )
+        )
+        session.commit()
+    return github_service
+
+
+def archive(session, archive_dir) -> EventArchive:
+    """Create an archive keeping pushes 30 days and other events 90."""
+    return EventArchive(
+        session,
+        directory=archive_dir,
+        retention_days=90,
+        retention_days_by_type={"push": 30},
+    )
+
+
+class TestEventArchive:
+    """Tests for moving events past their retention into segments."""
+
+    @pytest.mark.integration
+    async def test_archive_applies_retention_per_event_type(
+        self, session, archive_dir, aged_events
+    ):
+        """AC: Events past their type's retention move to monthly segments."""
+        archived = await archive(session, archive_dir).archive(now=NOW)
+
+        assert archived == {"events-2026-05.seg": 1, "events-2026-03.seg": 1}
+        remaining = session.exec(select(Event.delivery_id)).all()
+        assert sorted(remaining) == ["issues-40", "push-1"]
+        assert sorted(p.name for p in archive_dir.iterdir()) == sorted(archived)
+        assert sorted(session.exec(select(ArchivedEvent.delivery_id)).all()) == [
+            "issues-100",
+            "push-40",
+        ]
+
+    @pytest.mark.integration
+    async def test_archive_uncounts_archived_events(
+        self, session, archive_dir, aged_events, test_installation
+    ):
+        """Counters drop the events deleted from the database."""
+        await archive(session, archive_dir).archive(now=NOW, batch_size=1)
+
+        assert await aged_events.count_events(installation_id=test_installation.id) == 2
+        assert await aged_events.count_events(event_type="push") == 1
+
+    @pytest.mark.integration
+    async def test_archive_appends_to_segments(self, session, archive_dir, aged_events):
+        """A later run appends to an existing month's segment."""
+        await archive(session, archive_dir).archive(now=NOW)
+        segment = archive_dir / "events-2026-05.seg"
+        size = segment.stat().st_size
+
+        archived = await archive(session, archive_dir).archive(
+            now=NOW + timedelta(days=55)
+        )
+
+        assert archived == {"events-2026-05.seg": 1, "events-2026-06.seg": 1}
+        assert segment.stat().st_size > size
+        for delivery_id in ("push-40", "issues-40"):
+            event = await aged_events.get_event_by_delivery_id(delivery_id)
+            assert await aged_events.get_event_payload(event) == {
+                "delivery": delivery_id
+            }
+
+    @pytest.mark.integration
+    async def test_archive_without_retention_keeps_events(
+        self, session, archive_dir, aged_events
+    ):
+        """With no retention configured nothing is archived."""
+        archived = await EventArchive(
+            session, directory=archive_dir, retention_days=0, retention_days_by_type={}
+        ).archive(now=NOW)
+
+        assert archived == {}
+        assert len(session.exec(select(Event)).all()) == 4
+
+    @pytest.mark.integration
+    async def test_archived_events_read_through_service(
+        self, session, archive_dir, aged_events, test_user, test_installation
+    ):
+        """AC: Archived events stay readable through GitHubService."""
+        event_id = event_id_of(session, "push-40")
+        await archive(session, archive_dir).archive(now=NOW)
+
+        event = await aged_events.get_event_by_delivery_id("push-40")
+        assert event.id == event_id
+        assert event.event_type == "push"
+        assert event.installation_id == test_installation.id
+        assert event.created_at.replace(tzinfo=None) == (
+            (NOW - timedelta(days=40)).replace(tzinfo=None)
+        )
+        assert await aged_events.get_event_payload(event) == {"delivery": "push-40"}
+
+        owned = await aged_events.get_user_event(test_user.id, event_id)
+        assert owned.delivery_id == "push-40"
+        assert await aged_events.get_user_event(test_user.id + 1, event_id) is None
+
+    @pytest.mark.integration
+    async def test_archived_event_served_by_api(
+        self, session, archive_dir, aged_events, authenticated_client
+    ):
+        """Event lookups and payload downloads fall back to the archive."""
+        event_id = event_id_of(session, "issues-100")
+        await archive(session, archive_dir).archive(now=NOW)
+
+        response = await authenticated_client.get(f"/api/events/{event_id}")
+        payload = await authenticated_client.get(f"/api/events/{event_id}/payload")
+
+        assert response.status_code == 200
+        assert response.json()["delivery_id"] == "issues-100"
+        assert payload.content == b'{"delivery": "issues-100"}'
+
+    @pytest.mark.integration
+    async def test_redelivered_archived_event_not_archived_twice(
+        self, session, archive_dir, aged_events, test_installation
+    ):
+        """A delivery stored again after archiving doesn't break later runs."""
+        await archive(session, archive_dir).archive(now=NOW)
+        assert await aged_events.insert_event(
+            delivery_id="push-40",
+            event_type="push",
+            payload=b'{"delivery": "redelivered"}',
+            installation_id=test_installation.id,
+        )
+
+        later = datetime.now(UTC) + timedelta(days=365)
+        await archive(session, archive_dir).archive(now=later)
+        await archive(session, archive_dir).archive(now=later)
+
+        assert session.exec(select(Event)).all() == []
+        archived = session.exec(
+            select(ArchivedEvent).where(ArchivedEvent.delivery_id == "push-40")
+        ).all()
+        assert len(archived) == 1
+        event = await aged_events.get_event_by_delivery_id("push-40")
+        assert await aged_events.get_event_payload(event) == {"delivery": "push-40"}
+        assert await aged_events.count_events(event_type="push") == 0
+
+    @pytest.mark.integration
+    async def test_event_ids_not_reused_after_archiving_all(
+        self, session, archive_dir, aged_events, test_user, test_installation
+    ):
+        """An event stored after all were archived gets an ID of its own."""
+        later = datetime.now(UTC) + timedelta(days=365)
+        ids = {
+            delivery_id: event_id_of(session, delivery_id)
+            for delivery_id in session.exec(select(Event.delivery_id)).all()
+        }
+        await archive(session, archive_dir).archive(now=later)
+        assert await aged_events.insert_event(
+            delivery_id="new-1",
+            event_type="push",
+            payload=b'{"delivery": "new-1"}',
+            installation_id=test_installation.id,
+        )
+        ids["new-1"] = event_id_of(session, "new-1")
+
+        await archive(session, archive_dir).archive(now=later + timedelta(days=365))
+
+        assert len(set(ids.values())) == len(ids)
+        for delivery_id, event_id in ids.items():
+            event = await aged_events.get_user_event(test_user.id, event_id)
+            assert event.delivery_id == delivery_id
+
+    @pytest.mark.integration
+    async def test_failed_batch_leaves_segments_untouched(
+        self, session, archive_dir, aged_events, monkeypatch
+    ):
+        """Records are appended only after the batch's database writes succeed."""
+
+        async def fail(statement, params=None):
+            raise RuntimeError("database unavailable")
+
+        events_archive = archive(session, archive_dir)
+        monkeypatch.setattr(events_archive, "_execute", fail)
+
+        with pytest.raises(RuntimeError):
+            await events_archive.archive(now=NOW)
+
+        assert list(archive_dir.iterdir()) == []
+
+
+def event_id_of(session, delivery_id: str) -> int:
+    """Get the ID of a stored event."""
+    return session.exec(select(Event.id).where(Event.delivery_id == delivery_id)).one()
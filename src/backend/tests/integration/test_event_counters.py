@@ -0,0 +1,115 @@
+"""Tests for incrementally maintained event counters."""
+
+import pytest
+from sqlmodel import select
+
+from app.db.models.event import Event
+from app.db.models.event_counter import EventCounter
+from app.services.github import GitHubService
+
+
+class TestEventCounters:
+    """Tests for counter maintenance and counter-backed totals."""
+
+    @pytest.mark.integration
+    async def test_insert_counts_new_events_only(self, session, test_installation):
+        """AC: Inserts update counters in the same transaction; duplicates don't."""
+        github_service = GitHubService(session)
+
+        for delivery_id in ("c-1", "c-2", "c-1"):
+            await github_service.insert_event(
+                delivery_id=delivery_id,
+                event_type="issues",
+                action="opened",
+                payload=b"{}",
+                installation_id=test_installation.id,
+            )
+
+        counter = session.exec(select(EventCounter)).one()
+        assert counter.installation_id == test_installation.id
+        assert (counter.repository_id, counter.user_id) == (0, 0)
+        assert (counter.event_type, counter.action, counter.count) == (
+            "issues",
+            "opened",
+            2,
+        )
+
+    @pytest.mark.integration
+    async def test_batch_insert_counts_each_delivery_once(self, session):
+        """Group-commit batches count every stored delivery exactly once."""
+        github_service = GitHubService(session)
+
+        await github_service.insert_events(
+            [
+                {"delivery_id": "b-1", "event_type": "push", "payload": b"{}"},
+                {"delivery_id": "b-2", "event_type": "push", "payload": b"{}"},
+                {"delivery_id": "b-2", "event_type": "push", "payload": b"{}"},
+            ]
+        )
+
+        assert await github_service.count_events(event_type="push") == 2
+
+    @pytest.mark.integration
+    async def test_orm_inserts_and_deletes_are_counted(self, session, test_user):
+        """Events added or deleted through the session update counters too."""
+        github_service = GitHubService(session)
+        event = Event(
+            delivery_id="orm-1", event_type="push", user_id=test_user.id, payload="{}"
+        )
+        session.add(event)
+        session.commit()
+        assert await github_service.count_events(user_id=test_user.id) == 1
+
+        session.delete(event)
+        session.commit()
+        assert await github_service.count_events(user_id=test_user.id) == 0
+
+    @pytest.mark.integration
+    async def test_counter_totals_match_count_star(
+        self, session, test_user, test_repository
+    ):
+        """AC: Counter totals agree with the COUNT(*) fallback."""
+        github_service = GitHubService(session)
+        for i, (event_type, repository_id) in enumerate(
+            [
+                ("push", test_repository.id),
+                ("push", None),
+                ("issues", test_repository.id),
+            ]
+        ):
+            await github_service.insert_event(
+                delivery_id=f"m-{i}",
+                event_type=event_type,
+                payload=b"{}",
+                repository_id=repository_id,
+                user_id=test_user.id,
+            )
+
+        for filters in (
+            {"user_id": test_user.id},
+            {"user_id": test_user.id, "event_type": "push"},
+            {"repository_id": test_repository.id},
+        ):
+            # processed=False is not a counter dimension, forcing COUNT(*)
+            assert await github_service.count_events(
+                **filters
+            ) == await github_service.count_events(**filters, processed=False)
+
+    @pytest.mark.integration
+    async def test_rebuild_recomputes_counters(self, session, test_user):
+        """Rebuilding restores counters lost or never written."""
+        github_service = GitHubService(session)
+        for i in range(3):
+            await github_service.insert_event(
+                delivery_id=f"r-{i}",
+                event_type="push",
+                payload=b"{}",
+                user_id=test_user.id,
+            )
+        for counter in session.exec(select(EventCounter)).all():
+            session.delete(counter)
+        session.commit()
+        assert await github_service.count_events(user_id=test_user.id) == 0
+
+        assert await github_service.rebuild_event_counters() == 1
+        assert await github_service.count_events(user_id=test_user.id) == 3
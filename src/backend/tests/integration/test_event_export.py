@@ -0,0 +1,138 @@
+"""Tests for the streaming NDJSON event export."""
+
+import gzip
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.db.models.event import Event
+from app.services import event_export
+from app.services.github import GitHubService
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture(name="exportable_events")
+def fixture_exportable_events(session, test_installation, test_repository):
+    """Store a week of push and issue events, one per day."""
+    for day in range(7):
+        session.add(
+            Event(
+                delivery_id=f"event-{day}",
+                event_type="push" if day % 2 else "issues",
+                installation_id=test_installation.id,
+                repository_id=test_repository.id if day < 4 else None,
+                payload=json.dumps({"day": day}, indent=2).encode(),
+                created_at=NOW + timedelta(days=day),
+            )
+        )
+    session.commit()
+    return GitHubService(session)
+
+
+def read_lines(content: bytes) -> list[dict]:
+    """Parse an NDJSON export."""
+    return [json.loads(line) for line in content.splitlines()]
+
+
+class TestEventExport:
+    """Tests for exporting event ranges."""
+
+    @pytest.mark.integration
+    async def test_export_streams_every_event_oldest_first(
+        self, authenticated_client, exportable_events
+    ):
+        """AC: The export holds every event with its payload, one per line."""
+        response = await authenticated_client.get("/api/events/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = read_lines(response.content)
+        assert [line["delivery_id"] for line in lines] == [
+            f"event-{day}" for day in range(7)
+        ]
+        assert lines[3]["payload"] == {"day": 3}
+        assert lines[3]["event_type"] == "push"
+
+    @pytest.mark.integration
+    async def test_export_filters(
+        self, authenticated_client, test_repository, exportable_events
+    ):
+        """AC: Exports filter by repository, type and stored time range."""
+        response = await authenticated_client.get(
+            "/api/events/export",
+            params={
+                "event_type": "push",
+                "created_after": (NOW + timedelta(days=1)).isoformat(),
+                "created_before": (NOW + timedelta(days=5)).isoformat(),
+            },
+        )
+        in_repository = await authenticated_client.get(
+            "/api/events/export",
+            params={"repository_id": test_repository.id},
+        )
+
+        assert [line["delivery_id"] for line in read_lines(response.content)] == [
+            "event-1",
+            "event-3",
+        ]
+        assert len(read_lines(in_repository.content)) == 4
+
+    @pytest.mark.integration
+    async def test_export_gzip(self, authenticated_client, exportable_events):
+        """AC: A gzipped export decompresses to the same NDJSON."""
+        plain = await authenticated_client.get("/api/events/export")
+        compressed = await authenticated_client.get(
+            "/api/events/export", params={"gzip": True}
+        )
+
+        assert compressed.headers["content-type"] == "application/gzip"
+        assert "events.ndjson.gz" in compressed.headers["content-disposition"]
+        assert gzip.decompress(compressed.content) == plain.content
+
+    @pytest.mark.integration
+    async def test_export_scoped_to_user_installations(
+        self, authenticated_client, test_installation, exportable_events
+    ):
+        """Exports of another installation are refused."""
+        own = await authenticated_client.get(
+            "/api/events/export", params={"installation_id": test_installation.id}
+        )
+        other = await authenticated_client.get(
+            "/api/events/export", params={"installation_id": test_installation.id + 1}
+        )
+
+        assert len(read_lines(own.content)) == 7
+        assert other.status_code == 404
+
+    @pytest.mark.integration
+    async def test_export_reads_in_batches(
+        self, session, test_installation, exportable_events
+    ):
+        """Events are read a batch at a time and released once exported."""
+        events = exportable_events.iter_events([test_installation.id], batch_size=2)
+        baseline = len(session.identity_map)
+
+        seen = []
+        async for event in events:
+            seen.append(event.delivery_id)
+            assert len(session.identity_map) <= baseline + 2
+
+        assert seen == [f"event-{day}" for day in range(7)]
+
+    @pytest.mark.integration
+    async def test_export_chunks_output(
+        self, monkeypatch, test_installation, exportable_events
+    ):
+        """Lines are gathered into chunks rather than sent one by one."""
+        monkeypatch.setattr(event_export, "CHUNK_SIZE", 300)
+        events = exportable_events.iter_events([test_installation.id])
+
+        chunks = [
+            chunk
+            async for chunk in event_export.export_events(exportable_events, events)
+        ]
+
+        assert 1 < len(chunks) < 7
+        assert len(read_lines(b"".join(chunks))) == 7
@@ -0,0 +1,181 @@
+"""Tests for filtering events by columns extracted at ingest."""
+
+import json
+
+import pytest
+from sqlalchemy import text, update
+from sqlmodel import select
+
+from app.db.models.event import Event
+from app.services.event_extraction import EXTRACTED_COLUMNS
+from app.services.github import GitHubService
+from tests.integration.test_event_access import explain
+
+
+def payload(**members) -> bytes:
+    """Encode a webhook body."""
+    return json.dumps(members).encode()
+
+
+@pytest.fixture(name="extracted_events")
+async def fixture_extracted_events(session, test_installation) -> GitHubService:
+    """Store pull request, issue and push events through both insert paths."""
+    github_service = GitHubService(session)
+    await github_service.insert_event(
+        delivery_id="pr-1234",
+        event_type="pull_request",
+        payload=payload(
+            pull_request={
+                "number": 1234,
+                "head": {"sha": "abc123", "ref": "fix-deadlock"},
+                "updated_at": "2026-06-01T10:00:00Z",
+            },
+            sender={"login": "alice"},
+        ),
+        installation_id=test_installation.id,
+    )
+    await github_service.insert_event(
+        delivery_id="issue-77",
+        event_type="issues",
+        payload=payload(
+            issue={"number": 77, "updated_at": "2026-06-03T10:00:00Z"},
+            sender={"login": "bob"},
+        ),
+        installation_id=test_installation.id,
+    )
+    await github_service.insert_events(
+        [
+            {
+                "delivery_id": "push-1",
+                "event_type": "push",
+                "payload": payload(
+                    ref="refs/heads/fix-deadlock",
+                    after="abc123",
+                    head_commit={"timestamp": "2026-06-02T10:00:00+00:00"},
+                    sender={"login": "alice"},
+                ),
+                "installation_id": test_installation.id,
+            }
+        ]
+    )
+    return github_service
+
+
+async def listed(client, **params) -> tuple[list[str], int]:
+    """List events and return their delivery IDs and total."""
+    data = (await client.get("/api/events", params=params)).json()
+    return [event["delivery_id"] for event in data["events"]], data["total"]
+
+
+class TestExtractedColumnFilters:
+    """Tests for the extracted-column filters of the event listing."""
+
+    @pytest.mark.integration
+    async def test_columns_extracted_on_every_write_path(
+        self, authenticated_client, extracted_events
+    ):
+        """AC: Events are stored with their actor and target columns."""
+        response = await authenticated_client.get("/api/events")
+        events = {event["delivery_id"]: event for event in response.json()["events"]}
+
+        assert events["pr-1234"]["actor_login"] == "alice"
+        assert events["pr-1234"]["target_kind"] == "pull_request"
+        assert events["pr-1234"]["target_number"] == 1234
+        assert events["pr-1234"]["head_sha"] == "abc123"
+        assert events["issue-77"]["target_number"] == 77
+        assert events["push-1"]["ref"] == "refs/heads/fix-deadlock"
+
+    @pytest.mark.integration
+    async def test_filter_by_each_column(self, authenticated_client, extracted_events):
+        """AC: The listing filters on each extracted column."""
+        client = authenticated_client
+
+        assert await listed(client, actor_login="alice") == (["push-1", "pr-1234"], 2)
+        assert await listed(client, target_kind="issue") == (["issue-77"], 1)
+        assert await listed(client, target_number=1234) == (["pr-1234"], 1)
+        assert await listed(client, head_sha="abc123") == (["push-1", "pr-1234"], 2)
+        assert await listed(client, ref="fix-deadlock") == (["pr-1234"], 1)
+        assert await listed(client, actor_login="alice", event_type="push") == (
+            ["push-1"],
+            1,
+        )
+
+    @pytest.mark.integration
+    async def test_filter_by_source_time(self, authenticated_client, extracted_events):
+        """Source times bound the listing, after inclusive and before exclusive."""
+        ids, total = await listed(
+            authenticated_client,
+            source_created_after="2026-06-02T10:00:00Z",
+            source_created_before="2026-06-03T10:00:00Z",
+        )
+
+        assert (ids, total) == (["push-1"], 1)
+
+    @pytest.mark.integration
+    async def test_filters_combine_with_search(
+        self, authenticated_client, extracted_events
+    ):
+        """Extracted-column filters narrow search results too."""
+        assert await listed(authenticated_client, q="alice", ref="fix-deadlock") == (
+            ["pr-1234"],
+            1,
+        )
+
+    @pytest.mark.integration
+    async def test_filter_is_served_by_its_index(
+        self, session, engine, test_installation, extracted_events
+    ):
+        """AC: A selective filter reads its column's index."""
+        await extracted_events.insert_events(
+            [
+                {
+                    "delivery_id": f"push-sha-{i}",
+                    "event_type": "push",
+                    "payload": payload(after=f"sha-{i}"),
+                    "installation_id": test_installation.id,
+                }
+                for i in range(50)
+            ]
+        )
+        session.exec(text("ANALYZE"))
+
+        plan = await explain(
+            engine,
+            extracted_events.get_events([test_installation.id], head_sha="sha-7"),
+        )
+
+        assert "ix_events_head_sha" in plan
+        assert "SCAN events" not in plan
+
+    @pytest.mark.integration
+    async def test_unknown_filter_rejected(self, test_installation, extracted_events):
+        """Filters on columns that are not extracted are programming errors."""
+        with pytest.raises(TypeError):
+            await extracted_events.get_events([test_installation.id], payload=b"")
+
+
+class TestBackfillExtractedColumns:
+    """Tests for extracting the columns of already stored events."""
+
+    @pytest.mark.integration
+    async def test_backfill_fills_existing_events(
+        self, session, test_installation, extracted_events
+    ):
+        """AC: The backfill extracts the columns of events stored without them."""
+        session.exec(update(Event).values(dict.fromkeys(EXTRACTED_COLUMNS)))
+        session.commit()
+        installation_ids = [test_installation.id]
+        assert (
+            await extracted_events.get_events(installation_ids, head_sha="abc123") == []
+        )
+
+        assert await extracted_events.backfill_extracted_columns(batch_size=2) == 3
+
+        events = await extracted_events.get_events(installation_ids, head_sha="abc123")
+        assert sorted(event.delivery_id for event in events) == ["pr-1234", "push-1"]
+        assert (
+            session.exec(
+                select(Event.actor_login).where(Event.delivery_id == "issue-77")
+            ).one()
+            == "bob"
+        )
@@ -0,0 +1,227 @@
+"""Tests for full-text search over event payloads."""
+
+import json
+
+import pytest
+
+from app.db.models.event import Event
+from app.db.models.installation import Installation
+from app.db.models.user import User
+from app.services.github import GitHubService
+from tests.integration.test_event_access import explain
+
+
+def payload(**members) -> bytes:
+    """Encode a webhook body."""
+    return json.dumps(members).encode()
+
+
+@pytest.fixture(name="searchable_events")
+async def fixture_searchable_events(session, test_installation) -> GitHubService:
+    """Store a mix of pull request, issue and push events."""
+    github_service = GitHubService(session)
+    bodies = {
+        "pr-1234": (
+            "pull_request",
+            payload(
+                number=1234,
+                pull_request={"title": "Fix deadlock in scheduler", "body": ""},
+                sender={"login": "alice"},
+            ),
+        ),
+        "issue-77": (
+            "issues",
+            payload(
+                issue={
+                    "number": 77,
+                    "title": "Deadlock when retrying",
+                    "body": "The scheduler deadlocks under load, deadlock again",
+                },
+                sender={"login": "bob"},
+            ),
+        ),
+        "push-1": (
+            "push",
+            payload(
+                ref="refs/heads/main",
+                head_commit={"message": "Bump version"},
+                sender={"login": "alice"},
+            ),
+        ),
+    }
+    for delivery_id, (event_type, body) in bodies.items():
+        await github_service.insert_event(
+            delivery_id=delivery_id,
+            event_type=event_type,
+            payload=body,
+            installation_id=test_installation.id,
+        )
+    return github_service
+
+
+class TestEventSearch:
+    """Tests for searching events through the index."""
+
+    @pytest.mark.integration
+    async def test_search_finds_pull_request_by_number(
+        self, authenticated_client, searchable_events
+    ):
+        """AC: q=#1234 finds the events mentioning PR #1234."""
+        response = await authenticated_client.get("/api/events", params={"q": "#1234"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [event["delivery_id"] for event in data["events"]] == ["pr-1234"]
+        assert data["total"] == 1
+
+    @pytest.mark.integration
+    async def test_search_by_actor(self, authenticated_client, searchable_events):
+        """AC: Searching a login finds everything by that actor."""
+        response = await authenticated_client.get("/api/events", params={"q": "alice"})
+
+        delivery_ids = {event["delivery_id"] for event in response.json()["events"]}
+        assert delivery_ids == {"pr-1234", "push-1"}
+
+    @pytest.mark.integration
+    async def test_results_ranked_by_relevance(
+        self, authenticated_client, searchable_events
+    ):
+        """Documents mentioning the terms more often rank first."""
+        response = await authenticated_client.get(
+            "/api/events", params={"q": "deadlock"}
+        )
+
+        assert [event["delivery_id"] for event in response.json()["events"]] == [
+            "issue-77",
+            "pr-1234",
+        ]
+
+    @pytest.mark.integration
+    async def test_search_combines_with_filters(
+        self, authenticated_client, searchable_events
+    ):
+        """Every term must match, together with the listing filters."""
+        response = await authenticated_client.get(
+            "/api/events", params={"q": "alice main", "event_type": "push"}
+        )
+        unmatched = await authenticated_client.get(
+            "/api/events", params={"q": "alice", "event_type": "issues"}
+        )
+
+        assert [event["delivery_id"] for event in response.json()["events"]] == [
+            "push-1"
+        ]
+        assert unmatched.json()["events"] == []
+        assert unmatched.json()["total"] == 0
+
+    @pytest.mark.integration
+    async def test_search_pages_by_keyset(
+        self, session, authenticated_client, test_installation
+    ):
+        """AC: Search cursors page through every match exactly once."""
+        github_service = GitHubService(session)
+        await github_service.insert_events(
+            [
+                {
+                    "delivery_id": f"flaky-{i}",
+                    "event_type": "issues",
+                    "payload": payload(issue={"title": "flaky " * (i + 1)}),
+                    "installation_id": test_installation.id,
+                }
+                for i in range(7)
+            ]
+        )
+
+        seen = []
+        params = {"q": "flaky", "limit": 3}
+        while True:
+            data = (await authenticated_client.get("/api/events", params=params)).json()
+            seen.extend(event["delivery_id"] for event in data["events"])
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        assert sorted(seen) == sorted(f"flaky-{i}" for i in range(7))
+        assert data["total"] == 7
+
+    @pytest.mark.integration
+    async def test_listing_cursor_rejected_for_search(
+        self, authenticated_client, searchable_events
+    ):
+        """A cursor from a plain listing cannot continue a search."""
+        listing = await authenticated_client.get("/api/events", params={"limit": 1})
+
+        response = await authenticated_client.get(
+            "/api/events",
+            params={"q": "alice", "cursor": listing.json()["next_cursor"]},
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.integration
+    async def test_search_scoped_to_user_installations(
+        self, session, authenticated_client, searchable_events
+    ):
+        """Matches in other users' installations are not returned."""
+        other_user = User(github_id=99, github_login="other", access_token_hash="x")
+        session.add(other_user)
+        session.commit()
+        other = Installation(
+            github_installation_id=54321,
+            user_id=other_user.id,
+            account_type="User",
+            account_login="other",
+            account_id=1,
+        )
+        session.add(other)
+        session.commit()
+        await searchable_events.insert_event(
+            delivery_id="other-1234",
+            event_type="issues",
+            payload=payload(issue={"number": 1234}),
+            installation_id=other.id,
+        )
+
+        response = await authenticated_client.get("/api/events", params={"q": "1234"})
+
+        assert [event["delivery_id"] for event in response.json()["events"]] == [
+            "pr-1234"
+        ]
+
+    @pytest.mark.integration
+    async def test_search_is_served_by_the_index(
+        self, engine, test_installation, searchable_events
+    ):
+        """AC: Searches read the FTS index, not the events table."""
+        plan = await explain(
+            engine,
+            searchable_events.search_event_page([test_installation.id], "deadlock"),
+        )
+
+        assert "VIRTUAL TABLE INDEX" in plan
+        assert "SCAN events" not in plan
+
+    @pytest.mark.integration
+    async def test_rebuild_indexes_existing_events(
+        self, session, test_installation, searchable_events
+    ):
+        """Events stored without the index become searchable after a rebuild."""
+        session.add(
+            Event(
+                delivery_id="legacy-1",
+                event_type="issues",
+                installation_id=test_installation.id,
+                payload=b'{"number": 9}',
+            )
+        )
+        session.commit()
+        installation_ids = [test_installation.id]
+        assert await searchable_events.count_search_results(installation_ids, "9") == 0
+
+        assert await searchable_events.rebuild_search_index(batch_size=2) == 4
+
+        assert await searchable_events.count_search_results(installation_ids, "9") == 1
+        assert (
+            await searchable_events.count_search_results(installation_ids, "deadlock")
+            == 2
+        )
@@ -0,0 +1,132 @@
+"""Tests for the group-commit event writer."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlmodel import Session, select
+
+from app.db.models.event import Event
+from app.services.event_writer import EventWriter
+
+
+@pytest.fixture(name="session_factory")
+def fixture_session_factory(engine):
+    """Session factory for the writer bound to the test database."""
+
+    @asynccontextmanager
+    async def factory():
+        with Session(engine) as session:
+            yield session
+
+    return factory
+
+
+class TestEventWriter:
+    """Tests for batching, duplicate handling and metrics."""
+
+    @pytest.mark.integration
+    async def test_concurrent_events_written_in_one_batch(
+        self, session_factory, session
+    ):
+        """AC: Concurrent submissions share one multi-row commit."""
+        writer = EventWriter(session_factory, batch_size=10, max_linger_ms=50)
+
+        ids = await asyncio.gather(
+            *(
+                writer.submit(
+                    delivery_id=f"batch-{i}", event_type="push", payload=b"{}"
+                )
+                for i in range(5)
+            )
+        )
+        await writer.stop()
+
+        assert all(event_id is not None for event_id in ids)
+        assert len(set(ids)) == 5
+        assert writer.batch_sizes.count == 1
+        assert writer.batch_sizes.sum == 5
+        assert writer.linger_seconds.count == 1
+        stored = session.exec(select(Event)).all()
+        assert {event.delivery_id for event in stored} == {
+            f"batch-{i}" for i in range(5)
+        }
+
+    @pytest.mark.integration
+    async def test_batch_size_caps_rows_per_commit(self, session_factory):
+        """AC: A full batch is written without waiting for the linger time."""
+        writer = EventWriter(session_factory, batch_size=2, max_linger_ms=1000)
+
+        await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    writer.submit(
+                        delivery_id=f"cap-{i}", event_type="push", payload=b"{}"
+                    )
+                    for i in range(4)
+                )
+            ),
+            timeout=1,
+        )
+        await writer.stop()
+
+        assert writer.batch_sizes.count == 2
+
+    @pytest.mark.integration
+    async def test_duplicates_resolve_to_none(self, session_factory):
+        """AC: Stored and in-batch duplicate deliveries report None."""
+        writer = EventWriter(session_factory, batch_size=10, max_linger_ms=20)
+
+        first = await writer.submit(
+            delivery_id="dup-1", event_type="push", payload=b"{}"
+        )
+        again, in_batch_a, in_batch_b = await asyncio.gather(
+            writer.submit(delivery_id="dup-1", event_type="push", payload=b"{}"),
+            writer.submit(delivery_id="dup-2", event_type="push", payload=b"{}"),
+            writer.submit(delivery_id="dup-2", event_type="push", payload=b"{}"),
+        )
+        await writer.stop()
+
+        assert first is not None
+        assert again is None
+        assert in_batch_a is not None
+        assert in_batch_b is None
+
+    @pytest.mark.integration
+    async def test_metrics_endpoint_exposes_writer_histograms(
+        self, client, session_factory
+    ):
+        """AC: Batch size and linger histograms are served by /metrics."""
+        writer = EventWriter(session_factory, max_linger_ms=1)
+        await writer.submit(delivery_id="metrics-1", event_type="push", payload=b"{}")
+        await writer.stop()
+
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["event_writer_batch_size"]["count"] == 1
+        assert data["event_writer_linger_seconds"]["type"] == "histogram"
+
+    @pytest.mark.integration
+    async def test_webhook_stored_through_writer(
+        self, app, client, session_factory, session
+    ):
+        """AC: Webhook deliveries are stored via the writer when enabled."""
+        from app.api.deps import get_optional_event_writer
+        from app.config import Settings, get_settings
+
+        writer = EventWriter(session_factory, max_linger_ms=1)
+        app.dependency_overrides[get_settings] = lambda: Settings(
+            github_webhook_secret="", database_url="sqlite://"
+        )
+        app.dependency_overrides[get_optional_event_writer] = lambda: writer
+        headers = {"X-GitHub-Event": "push", "X-GitHub-Delivery": "writer-hook-1"}
+
+        first = await client.post("/api/webhooks/github", json={}, headers=headers)
+        second = await client.post("/api/webhooks/github", json={}, headers=headers)
+        await writer.stop()
+
+        assert first.json()["status"] == "accepted"
+        assert second.json()["status"] == "duplicate"
+        assert writer.batch_sizes.count == 2
@@ -3,11 +3,15 @@
 These tests verify webhook event storage, querying, and user isolation.
 """
 
+import hashlib
 import json
 
 import pytest
+from sqlmodel import Session
 
+from app.db.engine import get_read_session
 from app.db.models.event import Event
+from app.db.models.installation import Installation
 
 
 class TestEventStorage:
@@ -70,6 +74,37 @@ class TestEventStorage:
         with pytest.raises(IntegrityError):
             session.commit()
 
+    @pytest.mark.integration
+    async def test_insert_event_reports_accepted_then_duplicate(
+        self,
+        session,
+        test_installation,
+    ):
+        """AC: A single upsert reports new vs duplicate deliveries."""
+        from app.services.github import GitHubService
+
+        github_service = GitHubService(session)
+
+        event_id = await github_service.insert_event(
+            delivery_id="upsert-test-123",
+            event_type="push",
+            payload=b'{"ref": "refs/heads/main"}',
+            installation_id=test_installation.id,
+        )
+        duplicate_id = await github_service.insert_event(
+            delivery_id="upsert-test-123",
+            event_type="push",
+            payload=b'{"ref": "refs/heads/main"}',
+        )
+
+        assert event_id is not None
+        assert duplicate_id is None
+        stored = await github_service.get_event_by_delivery_id("upsert-test-123")
+        assert stored.id == event_id
+        assert stored.installation_id == test_installation.id
+        assert stored.processed is False
+        assert stored.created_at is not None
+
 
 class TestEventRetrieval:
     """Tests for event retrieval and filtering."""
@@ -96,6 +131,7 @@ class TestEventRetrieval:
         authenticated_client,
         session,
         test_user,
+        test_installation,
     ):
         """AC: Events can be filtered by type."""
         # Create events of different types
@@ -103,6 +139,7 @@ class TestEventRetrieval:
             event = Event(
                 delivery_id=f"filter-{event_type}-test",
                 event_type=event_type,
+                installation_id=test_installation.id,
                 user_id=test_user.id,
                 payload="{}",
             )
@@ -125,12 +162,14 @@ class TestEventRetrieval:
         session,
         test_user,
         test_repository,
+        test_installation,
     ):
         """AC: Events can be filtered by repository."""
         event = Event(
             delivery_id="repo-filter-test",
             event_type="push",
             repository_id=test_repository.id,
+            installation_id=test_installation.id,
             user_id=test_user.id,
             payload="{}",
         )
@@ -152,6 +191,7 @@ class TestEventRetrieval:
         authenticated_client,
         session,
         test_user,
+        test_installation,
     ):
         """AC: Events are paginated correctly."""
         # Create 10 events
@@ -159,6 +199,7 @@ class TestEventRetrieval:
             event = Event(
                 delivery_id=f"pagination-test-{i}",
                 event_type="push",
+                installation_id=test_installation.id,
                 user_id=test_user.id,
                 payload="{}",
             )
@@ -200,6 +241,248 @@ class TestEventRetrieval:
         assert data["id"] == test_event.id
         assert data["delivery_id"] == test_event.delivery_id
 
+    @pytest.mark.integration
+    async def test_event_reads_use_read_session(
+        self,
+        app,
+        engine,
+        authenticated_client,
+        test_event,
+    ):
+        """AC: Event listings and lookups are served by the read engine."""
+        opened = []
+
+        def get_read_session_override():
+            with Session(engine) as session:
+                opened.append(session)
+                yield session
+
+        app.dependency_overrides[get_read_session] = get_read_session_override
+
+        assert (await authenticated_client.get("/api/events")).status_code == 200
+        assert (
+            await authenticated_client.get(f"/api/events/{test_event.id}")
+        ).status_code == 200
+        assert len(opened) == 2
+
+    @pytest.mark.integration
+    async def test_get_event_is_one_query(
+        self,
+        engine,
+        session,
+        test_user,
+        test_event,
+    ):
+        """AC: An event is looked up by primary key with its access check."""
+        from sqlalchemy import event as sa_event
+
+        from app.services.github import GitHubService
+
+        user_id, event_id = test_user.id, test_event.id
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        session.expunge_all()
+        sa_event.listen(engine, "before_cursor_execute", capture)
+        try:
+            event = await GitHubService(session).get_user_event(user_id, event_id)
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", capture)
+
+        assert event.id == event_id
+        assert len(statements) == 1
+        assert "JOIN installations" in statements[0]
+
+    @pytest.mark.integration
+    async def test_get_missing_event_returns_404(self, authenticated_client):
+        """An unknown event ID returns 404."""
+        response = await authenticated_client.get("/api/events/999999")
+
+        assert response.status_code == 404
+
+    @pytest.mark.integration
+    async def test_get_event_payload_streams_raw_body(
+        self,
+        authenticated_client,
+        session,
+        test_installation,
+    ):
+        """AC: The raw payload endpoint returns the body exactly as received."""
+        from app.services.github import GitHubService
+
+        body = b'{ "action" : "opened",\n  "number": 42 }'
+        event_id = await GitHubService(session).insert_event(
+            delivery_id="raw-payload-test",
+            event_type="issues",
+            payload=body,
+            installation_id=test_installation.id,
+        )
+
+        response = await authenticated_client.get(f"/api/events/{event_id}/payload")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == body
+        assert response.headers["etag"] == f'"{hashlib.sha256(body).hexdigest()}"'
+
+    @pytest.mark.integration
+    async def test_list_query_does_not_load_payloads(
+        self,
+        engine,
+        session,
+        test_user,
+        test_event,
+    ):
+        """AC: Listing events selects metadata columns only."""
+        from sqlalchemy import event as sa_event
+        from sqlalchemy.exc import InvalidRequestError
+
+        from app.services.github import GitHubService
+
+        user_id, event_id = test_user.id, test_event.id
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        sa_event.listen(engine, "before_cursor_execute", capture)
+        try:
+            session.expunge_all()
+            events = await GitHubService(session).get_events_by_user(user_id)
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", capture)
+
+        assert [event.id for event in events] == [event_id]
+        assert "events.payload," not in statements[-1]
+        assert "events.payload_refs" not in statements[-1]
+        with pytest.raises(InvalidRequestError):
+            _ = events[0].payload
+
+
+class TestEventCursorPagination:
+    """Tests for keyset (cursor) pagination of event listings."""
+
+    @pytest.fixture(name="many_events")
+    def fixture_many_events(self, session, test_user, test_installation):
+        """Create events, several sharing a timestamp."""
+        from datetime import UTC, datetime, timedelta
+
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        for i in range(7):
+            session.add(
+                Event(
+                    delivery_id=f"cursor-{i}",
+                    event_type="push",
+                    installation_id=test_installation.id,
+                    user_id=test_user.id,
+                    payload="{}",
+                    created_at=base + timedelta(minutes=i // 2),
+                )
+            )
+        session.commit()
+
+    @pytest.mark.integration
+    async def test_cursor_pages_cover_all_events_once(
+        self, authenticated_client, many_events
+    ):
+        """AC: Following next_cursor visits every event exactly once, in order."""
+        response = await authenticated_client.get("/api/events", params={"limit": 3})
+        data = response.json()
+        assert data["prev_cursor"] is None
+        seen = [event["delivery_id"] for event in data["events"]]
+
+        while data["next_cursor"]:
+            response = await authenticated_client.get(
+                "/api/events", params={"limit": 3, "cursor": data["next_cursor"]}
+            )
+            assert response.status_code == 200
+            data = response.json()
+            seen += [event["delivery_id"] for event in data["events"]]
+
+        assert seen == [f"cursor-{i}" for i in reversed(range(7))]
+
+    @pytest.mark.integration
+    async def test_prev_cursor_returns_previous_page(
+        self, authenticated_client, many_events
+    ):
+        """AC: prev_cursor leads back to the page before."""
+        first = (
+            await authenticated_client.get("/api/events", params={"limit": 3})
+        ).json()
+        second = (
+            await authenticated_client.get(
+                "/api/events", params={"limit": 3, "cursor": first["next_cursor"]}
+            )
+        ).json()
+
+        back = (
+            await authenticated_client.get(
+                "/api/events", params={"limit": 3, "cursor": second["prev_cursor"]}
+            )
+        ).json()
+
+        assert back["events"] == first["events"]
+        assert back["next_cursor"] is not None
+
+    @pytest.mark.integration
+    async def test_new_events_do_not_shift_cursor_pages(
+        self, authenticated_client, session, test_user, test_installation, many_events
+    ):
+        """Events inserted while paging do not repeat rows on later pages."""
+        first = (
+            await authenticated_client.get("/api/events", params={"limit": 3})
+        ).json()
+        session.add(
+            Event(
+                delivery_id="cursor-new",
+                event_type="push",
+                installation_id=test_installation.id,
+                user_id=test_user.id,
+                payload="{}",
+            )
+        )
+        session.commit()
+
+        second = (
+            await authenticated_client.get(
+                "/api/events", params={"limit": 3, "cursor": first["next_cursor"]}
+            )
+        ).json()
+
+        assert [event["delivery_id"] for event in second["events"]] == [
+            "cursor-3",
+            "cursor-2",
+            "cursor-1",
+        ]
+
+    @pytest.mark.integration
+    async def test_offset_mode_still_supported(self, authenticated_client, many_events):
+        """Offset pages keep working and also return cursors."""
+        response = await authenticated_client.get(
+            "/api/events", params={"limit": 3, "offset": 3}
+        )
+
+        data = response.json()
+        assert [event["delivery_id"] for event in data["events"]] == [
+            "cursor-3",
+            "cursor-2",
+            "cursor-1",
+        ]
+        assert data["offset"] == 3
+        assert data["next_cursor"] is not None
+        assert data["prev_cursor"] is not None
+
+    @pytest.mark.integration
+    async def test_invalid_cursor_rejected(self, authenticated_client):
+        """A malformed cursor returns 400."""
+        response = await authenticated_client.get(
+            "/api/events", params={"cursor": "garbage"}
+        )
+
+        assert response.status_code == 400
+
 
 class TestEventUserIsolation:
     """Tests for event user isolation."""
@@ -253,8 +536,10 @@ class TestEventUserIsolation:
             cookies={"session_token": token},
         ) as client:
             response = await client.get(f"/api/events/{test_event.id}")
+            payload_response = await client.get(f"/api/events/{test_event.id}/payload")
 
         assert response.status_code == 404
+        assert payload_response.status_code == 404
 
     @pytest.mark.integration
     async def test_events_list_only_shows_user_events(
@@ -262,6 +547,7 @@ class TestEventUserIsolation:
         app,
         session,
         test_user,
+        test_installation,
     ):
         """AC: Event list only shows current user's events."""
         from datetime import UTC, datetime, timedelta
@@ -276,6 +562,7 @@ class TestEventUserIsolation:
         event1 = Event(
             delivery_id="user1-event",
             event_type="push",
+            installation_id=test_installation.id,
             user_id=test_user.id,
             payload="{}",
         )
@@ -292,9 +579,21 @@ class TestEventUserIsolation:
         session.commit()
         session.refresh(other_user)
 
+        other_installation = Installation(
+            github_installation_id=54321,
+            user_id=other_user.id,
+            account_type="User",
+            account_login="otheruser3",
+            account_id=77777777,
+        )
+        session.add(other_installation)
+        session.commit()
+        session.refresh(other_installation)
+
         event2 = Event(
             delivery_id="user2-event",
             event_type="push",
+            installation_id=other_installation.id,
             user_id=other_user.id,
             payload="{}",
         )
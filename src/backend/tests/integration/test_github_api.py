@@ -0,0 +1,402 @@
+"""Tests for the GitHub API client against mocked GitHub endpoints."""
+
+import json
+from datetime import timedelta
+
+import httpx
+import pytest
+import respx
+
+from app.services.crypto import compute_webhook_signature
+from app.services.github_api import GitHubAPIClient, GitHubAPIError
+from app.services.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    ResponseStore,
+    cache_key,
+    get_response_cache,
+)
+from app.services.token_cache import (
+    InstallationTokenCache,
+    get_installation_token_cache,
+)
+
+API = "https://api.github.com"
+INSTALLATION_ID = 12345
+
+
+def token_response(token: str) -> httpx.Response:
+    """Build an access-token response valid for an hour."""
+    return httpx.Response(
+        201, json={"token": token, "expires_at": "2099-01-01T00:00:00Z"}
+    )
+
+
+@pytest.fixture(name="github")
+def fixture_github():
+    """Mock the token and repository endpoints of an installation."""
+    with respx.mock(base_url=API, assert_all_called=False) as router:
+        router.post(f"/app/installations/{INSTALLATION_ID}/access_tokens").mock(
+            side_effect=[token_response("ghs_1"), token_response("ghs_2")]
+        )
+        router.get("/installation/repositories", name="repositories").mock(
+            return_value=httpx.Response(
+                200, json={"total_count": 0, "repositories": []}
+            )
+        )
+        yield router
+
+
+@pytest.fixture(name="uncached")
+def fixture_uncached():
+    """A response cache revalidating every call, so each reaches GitHub."""
+    return ResponseCache(ttl=timedelta(0))
+
+
+class TestInstallationTokens:
+    """Tests for reusing installation access tokens."""
+
+    @pytest.mark.integration
+    async def test_token_minted_once_across_requests(
+        self, github, github_app_settings, http_client, uncached
+    ):
+        """AC: Repository listings reuse the installation token."""
+        api_client = GitHubAPIClient(
+            github_app_settings, http_client, InstallationTokenCache(), uncached
+        )
+
+        for _ in range(3):
+            await api_client.list_installation_repositories(INSTALLATION_ID)
+
+        assert github.calls.call_count == 4
+        requests = [call.request for call in github["repositories"].calls]
+        assert {r.headers["Authorization"] for r in requests} == {"Bearer ghs_1"}
+
+    @pytest.mark.integration
+    async def test_revoked_token_replaced(
+        self, github, github_app_settings, http_client, uncached
+    ):
+        """A token rejected with 401 is dropped and re-minted next time."""
+        github["repositories"].mock(
+            side_effect=[
+                httpx.Response(401, json={"message": "Bad credentials"}),
+                httpx.Response(200, json={"total_count": 0, "repositories": []}),
+            ]
+        )
+        api_client = GitHubAPIClient(
+            github_app_settings, http_client, InstallationTokenCache(), uncached
+        )
+
+        with pytest.raises(GitHubAPIError):
+            await api_client.list_installation_repositories(INSTALLATION_ID)
+        await api_client.list_installation_repositories(INSTALLATION_ID)
+
+        authorization = github["repositories"].calls.last.request.headers[
+            "Authorization"
+        ]
+        assert authorization == "Bearer ghs_2"
+
+    @pytest.mark.integration
+    async def test_suspend_webhook_invalidates_token(
+        self,
+        github,
+        github_app_settings,
+        http_client,
+        uncached,
+        client,
+        test_installation,
+        webhook_secret,
+    ):
+        """AC: Suspending an installation drops its cached token."""
+        token_cache = get_installation_token_cache()
+        api_client = GitHubAPIClient(
+            github_app_settings, http_client, response_cache=uncached
+        )
+        await api_client.list_installation_repositories(
+            test_installation.github_installation_id
+        )
+        assert token_cache.peek(test_installation.github_installation_id)
+
+        body = json.dumps(
+            {
+                "action": "suspend",
+                "installation": {"id": test_installation.github_installation_id},
+                "sender": {"login": "admin"},
+            }
+        ).encode()
+        response = await client.post(
+            "/api/webhooks/github",
+            content=body,
+            headers={
+                "X-GitHub-Event": "installation",
+                "X-GitHub-Delivery": "suspend-token-1",
+                "X-Hub-Signature-256": compute_webhook_signature(body, webhook_secret),
+            },
+        )
+
+        assert response.status_code == 200
+        assert token_cache.peek(test_installation.github_installation_id) is None
+
+
+class TestAppJWT:
+    """Tests for reusing the App JWT across App-authenticated calls."""
+
+    @pytest.mark.integration
+    async def test_app_jwt_reused_across_calls(
+        self, github, github_app_settings, http_client, uncached
+    ):
+        """AC: Installation lookups reuse one signed App JWT."""
+        installation = github.get(f"/app/installations/{INSTALLATION_ID}").mock(
+            return_value=httpx.Response(200, json={"id": INSTALLATION_ID})
+        )
+        api_client = GitHubAPIClient(
+            github_app_settings, http_client, InstallationTokenCache(), uncached
+        )
+
+        await api_client.get_installation(INSTALLATION_ID)
+        await api_client.get_installation(INSTALLATION_ID)
+        await api_client.get_installation_access_token(INSTALLATION_ID)
+
+        authorizations = {
+            call.request.headers["Authorization"] for call in github.calls
+        }
+        assert len(authorizations) == 1
+        assert installation.call_count == 2
+
+    @pytest.mark.integration
+    async def test_app_jwt_counters_exposed(self, client):
+        """AC: The JWT cache hit and miss counters are served as metrics."""
+        response = await client.get("/metrics")
+
+        assert {"github_app_jwt_cache_hits", "github_app_jwt_cache_misses"} <= set(
+            response.json()
+        )
+
+
+class TestResponseCache:
+    """Tests for conditional requests through the response cache."""
+
+    @pytest.fixture(name="api_client")
+    def fixture_api_client(self, github_app_settings, http_client):
+        """A client whose responses are fresh for a minute."""
+        return GitHubAPIClient(
+            github_app_settings,
+            http_client,
+            InstallationTokenCache(),
+            ResponseCache(ttl=timedelta(minutes=1)),
+        )
+
+    @pytest.mark.integration
+    async def test_fresh_response_served_without_request(self, github, api_client):
+        """AC: Within the TTL a listing is served without calling GitHub."""
+        first = await api_client.list_installation_repositories(INSTALLATION_ID)
+        second = await api_client.list_installation_repositories(INSTALLATION_ID)
+
+        assert first == second == {"total_count": 0, "repositories": []}
+        assert github["repositories"].call_count == 1
+
+    @pytest.mark.integration
+    async def test_fresh_response_needs_no_token(self, github, api_client):
+        """A fresh cached listing is served without minting a token."""
+        await api_client.response_cache.put(
+            cache_key(
+                INSTALLATION_ID,
+                f"{API}/installation/repositories",
+                {"page": 1, "per_page": 30},
+            ),
+            CachedResponse(
+                installation_id=INSTALLATION_ID,
+                body=b'{"total_count": 0}',
+                etag=None,
+                last_modified=None,
+                stored_at=api_client.response_cache.now(),
+            ),
+        )
+
+        data = await api_client.list_installation_repositories(INSTALLATION_ID)
+
+        assert data == {"total_count": 0}
+        assert github.calls.call_count == 0
+
+    @pytest.mark.integration
+    async def test_stale_response_revalidated(self, github, api_client):
+        """AC: Stale entries are revalidated, and a 304 reuses the stored body."""
+        api_client.response_cache.ttl = timedelta(0)
+        github["repositories"].mock(
+            side_effect=[
+                httpx.Response(
+                    200,
+                    json={"total_count": 1, "repositories": [{"id": 1}]},
+                    headers={
+                        "ETag": '"v1"',
+                        "Last-Modified": "Mon, 15 Jun 2026 12:00:00 GMT",
+                    },
+                ),
+                httpx.Response(304, headers={"ETag": '"v1"'}),
+            ]
+        )
+
+        first = await api_client.list_installation_repositories(INSTALLATION_ID)
+        second = await api_client.list_installation_repositories(INSTALLATION_ID)
+
+        assert second == first
+        request = github["repositories"].calls.last.request
+        assert request.headers["If-None-Match"] == '"v1"'
+        assert request.headers["If-Modified-Since"] == "Mon, 15 Jun 2026 12:00:00 GMT"
+
+    @pytest.mark.integration
+    async def test_changed_response_replaces_entry(self, github, api_client):
+        """A 200 to a conditional request replaces the stored response."""
+        api_client.response_cache.ttl = timedelta(0)
+        github["repositories"].mock(
+            side_effect=[
+                httpx.Response(200, json={"total_count": 0}, headers={"ETag": '"a"'}),
+                httpx.Response(200, json={"total_count": 1}, headers={"ETag": '"b"'}),
+                httpx.Response(304),
+            ]
+        )
+
+        for _ in range(3):
+            data = await api_client.list_installation_repositories(INSTALLATION_ID)
+
+        assert data == {"total_count": 1}
+        request = github["repositories"].calls.last.request
+        assert request.headers["If-None-Match"] == '"b"'
+
+    @pytest.mark.integration
+    async def test_cached_per_installation_and_parameters(self, github, api_client):
+        """AC: Responses are keyed by installation, URL and parameters."""
+        installation = github.get(f"/app/installations/{INSTALLATION_ID}").mock(
+            return_value=httpx.Response(200, json={"id": INSTALLATION_ID})
+        )
+
+        await api_client.list_installation_repositories(INSTALLATION_ID, page=1)
+        await api_client.list_installation_repositories(INSTALLATION_ID, page=2)
+        await api_client.list_installation_repositories(INSTALLATION_ID, page=1)
+        await api_client.get_installation(INSTALLATION_ID)
+        await api_client.get_installation(INSTALLATION_ID)
+
+        pages = [
+            call.request.url.params["page"] for call in github["repositories"].calls
+        ]
+        assert pages == ["1", "2"]
+        assert installation.call_count == 1
+
+    @pytest.mark.integration
+    async def test_persisted_responses_revalidated_after_restart(
+        self, github, github_app_settings, http_client, tmp_path
+    ):
+        """AC: With the SQLite tier a new process revalidates instead of refetching."""
+        github["repositories"].mock(
+            side_effect=[
+                httpx.Response(200, json={"total_count": 0}, headers={"ETag": '"v1"'}),
+                httpx.Response(304),
+            ]
+        )
+        path = str(tmp_path / "responses.db")
+
+        for _ in range(2):
+            api_client = GitHubAPIClient(
+                github_app_settings,
+                http_client,
+                InstallationTokenCache(),
+                ResponseCache(ttl=timedelta(0), store=ResponseStore(path)),
+            )
+            data = await api_client.list_installation_repositories(INSTALLATION_ID)
+
+        assert data == {"total_count": 0}
+        request = github["repositories"].calls.last.request
+        assert request.headers["If-None-Match"] == '"v1"'
+
+    @pytest.mark.integration
+    async def test_counters_exposed(self, github, api_client, client):
+        """AC: Hit, revalidation and miss counts are served as metrics."""
+        before = (await client.get("/metrics")).json()
+
+        await api_client.list_installation_repositories(INSTALLATION_ID)
+        await api_client.list_installation_repositories(INSTALLATION_ID)
+
+        after = (await client.get("/metrics")).json()
+        for name, delta in (
+            ("github_response_cache_misses", 1),
+            ("github_response_cache_hits", 1),
+            ("github_response_cache_revalidations", 0),
+        ):
+            assert after[name]["value"] - before[name]["value"] == delta
+
+    @pytest.mark.integration
+    async def test_repositories_webhook_invalidates_listing(
+        self, client, test_installation, webhook_secret
+    ):
+        """Repositories added to an installation drop its cached listing."""
+        installation_id = test_installation.github_installation_id
+        response_cache = get_response_cache()
+        key = cache_key(installation_id, f"{API}/installation/repositories", {})
+        await response_cache.put(
+            key,
+            CachedResponse(
+                installation_id=installation_id,
+                body=b"{}",
+                etag=None,
+                last_modified=None,
+                stored_at=response_cache.now(),
+            ),
+        )
+
+        body = json.dumps(
+            {
+                "action": "added",
+                "installation": {"id": installation_id},
+                "repositories_added": [],
+                "repositories_removed": [],
+            }
+        ).encode()
+        response = await client.post(
+            "/api/webhooks/github",
+            content=body,
+            headers={
+                "X-GitHub-Event": "installation_repositories",
+                "X-GitHub-Delivery": "repositories-cache-1",
+                "X-Hub-Signature-256": compute_webhook_signature(body, webhook_secret),
+            },
+        )
+
+        assert response.status_code == 200
+        assert await response_cache.get(key) is None
+
+    @pytest.mark.integration
+    async def test_unsuspend_webhook_invalidates_installation(
+        self, client, test_installation, webhook_secret
+    ):
+        """Unsuspending an installation drops its cached details."""
+        installation_id = test_installation.github_installation_id
+        response_cache = get_response_cache()
+        key = cache_key(
+            installation_id, f"{API}/app/installations/{installation_id}", {}
+        )
+        await response_cache.put(
+            key,
+            CachedResponse(
+                installation_id=installation_id,
+                body=b'{"suspended_at": "2026-06-15T12:00:00Z"}',
+                etag=None,
+                last_modified=None,
+                stored_at=response_cache.now(),
+            ),
+        )
+
+        body = json.dumps(
+            {"action": "unsuspend", "installation": {"id": installation_id}}
+        ).encode()
+        response = await client.post(
+            "/api/webhooks/github",
+            content=body,
+            headers={
+                "X-GitHub-Event": "installation",
+                "X-GitHub-Delivery": "unsuspend-cache-1",
+                "X-Hub-Signature-256": compute_webhook_signature(body, webhook_secret),
+            },
+        )
+
+        assert response.status_code == 200
+        assert await response_cache.get(key) is None
@@ -0,0 +1,252 @@
+"""Tests for rate-limit-aware scheduling against a fake GitHub server."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, Response
+
+from app.services.github_api import GitHubAPIClient, GitHubAPIError
+from app.services.github_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    GitHubScheduler,
+)
+from app.services.response_cache import ResponseCache
+from app.services.token_cache import InstallationTokenCache
+
+
+@dataclass
+class FakeInstallation:
+    """Rate limit state the fake server keeps for an installation."""
+
+    limit: int = 5000
+    window: float = 3600.0
+    used: int = 0
+    reset_at: float = 0.0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    # Responses served ahead of the normal ones, e.g. secondary limits
+    scripted: list[Response] = field(default_factory=list)
+    served: list[tuple[float, int, str]] = field(default_factory=list)
+
+
+class FakeGitHub:
+    """In-process GitHub enforcing per-installation rate limits."""
+
+    def __init__(self, latency: float = 0.02) -> None:
+        self.latency = latency
+        self.installations: dict[int, FakeInstallation] = {}
+        self.app = FastAPI()
+        self.app.post("/app/installations/{installation_id}/access_tokens")(
+            self.access_token
+        )
+        self.app.get("/installation/repositories")(self.repositories)
+
+    def installation(self, installation_id: int) -> FakeInstallation:
+        return self.installations.setdefault(installation_id, FakeInstallation())
+
+    async def access_token(self, installation_id: int) -> Response:
+        return Response(
+            status_code=201,
+            media_type="application/json",
+            content=(
+                f'{{"token": "ghs_{installation_id}", '
+                '"expires_at": "2099-01-01T00:00:00Z"}'
+            ),
+        )
+
+    async def repositories(self, request: Request) -> Response:
+        installation_id = int(request.headers["Authorization"].split("_")[-1])
+        state = self.installation(installation_id)
+        now = time.time()
+        if state.reset_at <= now:
+            state.used = 0
+            state.reset_at = now + state.window
+
+        state.in_flight += 1
+        state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            state.in_flight -= 1
+
+        if state.scripted:
+            response = state.scripted.pop(0)
+        elif state.used >= state.limit:
+            response = Response(
+                status_code=403,
+                content='{"message": "API rate limit exceeded"}',
+            )
+        else:
+            state.used += 1
+            response = Response(
+                content='{"total_count": 0, "repositories": []}',
+                media_type="application/json",
+            )
+        response.headers.update(
+            {
+                "X-RateLimit-Limit": str(state.limit),
+                "X-RateLimit-Remaining": str(state.limit - state.used),
+                "X-RateLimit-Reset": str(state.reset_at),
+            }
+        )
+        state.served.append(
+            (now, response.status_code, request.query_params.get("page", ""))
+        )
+        return response
+
+
+@pytest.fixture(name="fake_github")
+def fixture_fake_github():
+    """A fake GitHub server."""
+    return FakeGitHub()
+
+
+@pytest.fixture(name="make_client")
+async def fixture_make_client(fake_github, github_app_settings):
+    """Build API clients talking to the fake server through one scheduler."""
+    http_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake_github.app),
+        base_url=GitHubAPIClient.BASE_URL,
+    )
+    token_cache = InstallationTokenCache()
+
+    def make_client(
+        scheduler: GitHubScheduler, priority: int = PRIORITY_INTERACTIVE
+    ) -> GitHubAPIClient:
+        return GitHubAPIClient(
+            github_app_settings,
+            http_client,
+            token_cache,
+            ResponseCache(ttl=timedelta(0)),
+            scheduler,
+            priority,
+        )
+
+    yield make_client
+    await http_client.aclose()
+
+
+class TestGitHubScheduler:
+    """Tests for throttling requests per installation."""
+
+    @pytest.mark.integration
+    async def test_concurrency_capped_per_installation(self, fake_github, make_client):
+        """AC: No installation has more requests in flight than its cap."""
+        api_client = make_client(GitHubScheduler(max_concurrent=2))
+
+        await asyncio.gather(
+            *(
+                api_client.list_installation_repositories(installation_id, page=page)
+                for installation_id in (1, 2)
+                for page in range(6)
+            )
+        )
+
+        assert fake_github.installation(1).max_in_flight == 2
+        assert fake_github.installation(2).max_in_flight == 2
+
+    @pytest.mark.integration
+    async def test_exhausted_budget_delays_instead_of_failing(
+        self, fake_github, make_client
+    ):
+        """AC: Requests beyond the rate limit wait for the reset."""
+        fake_github.installation(1).limit = 3
+        fake_github.installation(1).window = 0.3
+        api_client = make_client(GitHubScheduler(max_concurrent=1))
+
+        for page in range(5):
+            await api_client.list_installation_repositories(1, page=page)
+
+        served = fake_github.installation(1).served
+        assert [status for _, status, _ in served] == [200] * 5
+        # The fourth request waited for the window to reset
+        assert served[3][0] - served[0][0] >= 0.25
+
+    @pytest.mark.integration
+    async def test_exhausted_installation_does_not_delay_others(
+        self, fake_github, make_client
+    ):
+        """AC: One tenant running out of budget doesn't slow the others."""
+        fake_github.installation(1).limit = 1
+        fake_github.installation(1).window = 0.5
+        api_client = make_client(GitHubScheduler())
+        await api_client.list_installation_repositories(1)
+
+        throttled = asyncio.create_task(api_client.list_installation_repositories(1))
+        started = time.monotonic()
+        await api_client.list_installation_repositories(2)
+        elapsed = time.monotonic() - started
+        await throttled
+
+        assert elapsed < 0.25
+
+    @pytest.mark.integration
+    async def test_retry_after_honoured(self, fake_github, make_client):
+        """AC: A secondary rate limit pauses the installation, then retries."""
+        fake_github.installation(1).scripted.append(
+            Response(
+                status_code=429,
+                content='{"message": "You have exceeded a secondary rate limit"}',
+                headers={"Retry-After": "0.2"},
+            )
+        )
+        api_client = make_client(GitHubScheduler())
+
+        data = await api_client.list_installation_repositories(1)
+
+        assert data == {"total_count": 0, "repositories": []}
+        (limited, _, _), (retried, status, _) = fake_github.installation(1).served
+        assert status == 200
+        assert retried - limited >= 0.2
+
+    @pytest.mark.integration
+    async def test_interactive_requests_go_first(self, fake_github, make_client):
+        """AC: Queued interactive reads are sent before queued background work."""
+        scheduler = GitHubScheduler(max_concurrent=1)
+        interactive = make_client(scheduler)
+        background = make_client(scheduler, PRIORITY_BACKGROUND)
+        await interactive.list_installation_repositories(1, page=0)
+
+        requests = [
+            asyncio.create_task(background.list_installation_repositories(1, page=1))
+        ]
+        await asyncio.sleep(0)
+        requests += [
+            asyncio.create_task(background.list_installation_repositories(1, page=2)),
+            asyncio.create_task(background.list_installation_repositories(1, page=3)),
+        ]
+        await asyncio.sleep(0)
+        requests.append(
+            asyncio.create_task(interactive.list_installation_repositories(1, page=9))
+        )
+        await asyncio.gather(*requests)
+
+        pages = [page for _, _, page in fake_github.installation(1).served]
+        assert pages == ["0", "1", "9", "2", "3"]
+
+    @pytest.mark.integration
+    async def test_long_wait_fails_fast(self, fake_github, make_client):
+        """A budget exhausted for longer than requests wait fails with 429."""
+        fake_github.installation(1).limit = 1
+        api_client = make_client(GitHubScheduler(max_wait=0.1))
+        await api_client.list_installation_repositories(1)
+
+        with pytest.raises(GitHubAPIError) as exc_info:
+            await api_client.list_installation_repositories(1)
+
+        assert exc_info.value.status_code == 429
+        assert len(fake_github.installation(1).served) == 1
+
+    @pytest.mark.integration
+    async def test_scheduler_counters_exposed(self, client):
+        """Delayed and rate-limited request counts are served as metrics."""
+        response = await client.get("/metrics")
+
+        assert {"github_requests_delayed", "github_requests_rate_limited"} <= set(
+            response.json()
+        )
@@ -0,0 +1,115 @@
+"""Tests for the shared GitHub HTTP client and its lifespan."""
+
+import httpx
+import pytest
+import respx
+
+from app import main
+from app.config import Settings, clear_settings_cache
+from app.services.http_client import create_http_client
+
+
+def captured_timeouts(router: respx.MockRouter) -> dict[str, dict]:
+    """Get the timeout each mocked host was requested with."""
+    return {
+        call.request.url.host: call.request.extensions["timeout"]
+        for call in router.calls
+    }
+
+
+@pytest.fixture(name="lifespan_app")
+def fixture_lifespan_app(monkeypatch):
+    """Create an application whose lifespan starts no database workers."""
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    clear_settings_cache()
+    monkeypatch.setattr(main, "check_schema_version", lambda engine: None)
+    monkeypatch.setattr(main, "get_global_engine", lambda: None)
+    yield main.create_app()
+    clear_settings_cache()
+
+
+class TestHTTPClient:
+    """Tests for configuring the pooled client."""
+
+    @pytest.mark.integration
+    async def test_pool_limits_from_settings(self):
+        """AC: Connection limits and keep-alive expiry are configurable."""
+        settings = Settings(
+            github_http_max_connections=7,
+            github_http_max_keepalive_connections=3,
+            github_http_keepalive_expiry_seconds=12.5,
+        )
+
+        async with create_http_client(settings) as client:
+            pool = client._transport._pool
+
+            assert pool._max_connections == 7
+            assert pool._max_keepalive_connections == 3
+            assert pool._keepalive_expiry == 12.5
+
+    @pytest.mark.integration
+    async def test_timeouts_per_host(self):
+        """AC: Hosts with their own timeout override the default."""
+        settings = Settings(
+            github_http_timeout_seconds=10,
+            github_http_connect_timeout_seconds=2,
+            github_http_timeouts_by_host={"github.com": 30},
+        )
+
+        with respx.mock as router:
+            router.get(host__in=["github.com", "api.github.com"]).mock(
+                return_value=httpx.Response(200)
+            )
+            async with create_http_client(settings) as client:
+                await client.get("https://github.com/login")
+                await client.get("https://api.github.com/user")
+            timeouts = captured_timeouts(router)
+
+        assert timeouts["github.com"]["read"] == 30
+        assert timeouts["github.com"]["connect"] == 30
+        assert timeouts["api.github.com"]["read"] == 10
+        assert timeouts["api.github.com"]["connect"] == 2
+
+    @pytest.mark.integration
+    async def test_http2_falls_back_without_h2(self, monkeypatch):
+        """HTTP/2 is only negotiated when h2 is installed."""
+        monkeypatch.setattr("app.services.http_client.HTTP2_AVAILABLE", False)
+
+        async with create_http_client(Settings(github_http2=True)) as client:
+            assert client._transport._pool._http2 is False
+
+
+class TestLifespan:
+    """Tests for the application lifespan."""
+
+    @pytest.mark.integration
+    async def test_lifespan_opens_and_closes_shared_client(self, lifespan_app):
+        """AC: One client is opened on startup and closed on shutdown."""
+        app = lifespan_app
+
+        async with app.router.lifespan_context(app):
+            client = app.state.http_client
+            assert not client.is_closed
+
+        assert client.is_closed
+
+    @pytest.mark.integration
+    async def test_malformed_app_key_fails_startup(self, lifespan_app, monkeypatch):
+        """A malformed GitHub App private key stops the application starting."""
+        monkeypatch.setenv("GITHUB_APP_ID", "1")
+        monkeypatch.setenv("GITHUB_PRIVATE_KEY", "not a key")
+        clear_settings_cache()
+        app = main.create_app()
+
+        with pytest.raises(ValueError):
+            async with app.router.lifespan_context(app):
+                pass
+
+    @pytest.mark.integration
+    async def test_requests_share_one_client(self, app, client):
+        """Every request is served by the application's client."""
+        await client.get("/api/installations")
+        shared = app.state.http_client
+        await client.get("/api/installations")
+
+        assert app.state.http_client is shared
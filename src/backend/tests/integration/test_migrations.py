@@ -0,0 +1,265 @@
+"""Tests for versioned schema migrations."""
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.db.migrations import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    SchemaVersionError,
+    applied_revisions,
+    check_schema_version,
+    get_schema_version,
+    upgrade,
+)
+from app.db.models import SEARCH_TABLE, Installation, Repository, User
+from app.db.models import Session as UserSession
+from app.services.github import GitHubService
+
+# Tables as created by the first release, before any migration existed
+BASELINE_DDL = (
+    """
+    CREATE TABLE repositories (
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        id INTEGER NOT NULL PRIMARY KEY,
+        github_repo_id INTEGER NOT NULL UNIQUE,
+        installation_id INTEGER NOT NULL REFERENCES installations (id),
+        full_name VARCHAR NOT NULL,
+        owner VARCHAR NOT NULL,
+        name VARCHAR NOT NULL,
+        private BOOLEAN NOT NULL,
+        default_branch VARCHAR NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE events (
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        id INTEGER NOT NULL PRIMARY KEY,
+        delivery_id VARCHAR NOT NULL UNIQUE,
+        event_type VARCHAR NOT NULL,
+        action VARCHAR,
+        repository_id INTEGER REFERENCES repositories (id),
+        installation_id INTEGER REFERENCES installations (id),
+        user_id INTEGER REFERENCES users (id),
+        payload VARCHAR NOT NULL,
+        processed BOOLEAN NOT NULL,
+        processed_at DATETIME,
+        error VARCHAR
+    )
+    """,
+    "CREATE INDEX ix_events_installation_id ON events (installation_id)",
+    "CREATE INDEX ix_events_repository_id ON events (repository_id)",
+    """
+    INSERT INTO users (created_at, updated_at, id, github_id, github_login,
+        access_token_hash)
+    VALUES ('2025-01-01', '2025-01-01', 1, 1, 'octocat', 'x')
+    """,
+    """
+    INSERT INTO installations (created_at, updated_at, id,
+        github_installation_id, user_id, account_type, account_login, account_id,
+        target_type, permissions, events, status)
+    VALUES ('2025-01-01', '2025-01-01', 1, 12345, 1, 'User', 'octocat', 1,
+        'all', '{}', '[]', 'active')
+    """,
+    """
+    INSERT INTO repositories VALUES ('2025-01-01', '2025-01-01', 1, 99, 1,
+        'octocat/hello', 'octocat', 'hello', 0, 'main')
+    """,
+    """
+    INSERT INTO events (created_at, updated_at, id, delivery_id, event_type,
+        action, repository_id, installation_id, payload, processed)
+    VALUES
+        ('2025-01-01 10:00:00', '2025-01-01', 1, 'old-1', 'push', NULL, 1, 1,
+            '{"ref": "main"}', 0),
+        ('2025-01-02 10:00:00', '2025-01-02', 2, 'old-2', 'issues', 'opened', 1, 1,
+            '{"action": "opened"}', 0)
+    """,
+)
+
+
+@pytest.fixture(name="baseline_engine")
+def fixture_baseline_engine(tmp_path):
+    """Create a database in the shape of the first release, holding events."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[User.__table__, UserSession.__table__, Installation.__table__],
+    )
+    with engine.begin() as connection:
+        for statement in BASELINE_DDL:
+            connection.execute(text(statement))
+    yield engine
+    engine.dispose()
+
+
+def event_indexes(engine) -> set[str]:
+    """Get the names of the indexes on the events table."""
+    return {index["name"] for index in inspect(engine).get_indexes("events")}
+
+
+def table_shape(engine, table: str) -> tuple:
+    """Get the columns and indexes of a table."""
+    inspector = inspect(engine)
+    columns = {
+        column["name"]: (str(column["type"]), column["nullable"])
+        for column in inspector.get_columns(table)
+    }
+    indexes = {
+        (index["name"], tuple(index["column_names"]), bool(index["unique"]))
+        for index in inspector.get_indexes(table)
+    }
+    return columns, indexes
+
+
+class TestMigrations:
+    """Tests for migrating existing and new databases."""
+
+    @pytest.mark.integration
+    async def test_upgrade_retrofits_existing_database(self, baseline_engine):
+        """AC: Migrations bring a populated first-release database up to date."""
+        assert upgrade(baseline_engine) == [m.revision for m in MIGRATIONS]
+
+        indexes = event_indexes(baseline_engine)
+        assert SEARCH_TABLE in inspect(baseline_engine).get_table_names()
+        assert "ix_events_installation_id_created_at_desc_id" in indexes
+        assert "ix_events_repository_id_created_at_desc_id" in indexes
+        assert "ix_events_installation_id" not in indexes
+        assert {"ix_events_actor_login", "ix_events_head_sha"} <= indexes
+
+        with Session(baseline_engine) as session:
+            github_service = GitHubService(session)
+            event = await github_service.get_event_by_delivery_id("old-2")
+            repository = session.get(Repository, 1)
+
+            assert event.payload_codec == "identity"
+            assert await github_service.get_event_body(event) == (
+                b'{"action": "opened"}'
+            )
+            assert await github_service.count_events(installation_id=1) == 2
+            assert await github_service.count_events(event_type="push") == 1
+            assert repository.last_event_at == event.created_at
+            assert set(await github_service.get_repository_event_markers(1)) == {
+                "push",
+                "issues",
+            }
+            assert await github_service.backfill_extracted_columns() == 2
+            pushes = await github_service.get_events([1], ref="main")
+            assert [event.delivery_id for event in pushes] == ["old-1"]
+
+    @pytest.mark.integration
+    def test_upgrade_runs_each_migration_once(self, baseline_engine):
+        """Applied revisions are recorded and not applied again."""
+        upgrade(baseline_engine)
+
+        assert applied_revisions(baseline_engine) == {m.revision for m in MIGRATIONS}
+        assert upgrade(baseline_engine) == []
+
+    @pytest.mark.integration
+    def test_migrated_tables_match_models(self, baseline_engine, tmp_path):
+        """Tables and columns added by migrations match the current models."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+        upgrade(engine)
+        upgrade(baseline_engine)
+
+        for table in (
+            "payload_dictionaries",
+            "payload_blobs",
+            "event_counters",
+            "repository_event_markers",
+            "archived_events",
+        ):
+            assert table_shape(baseline_engine, table) == table_shape(engine, table)
+        migrated_columns, migrated_indexes = table_shape(baseline_engine, "events")
+        columns, indexes = table_shape(engine, "events")
+        # The first release stored payloads as text, which SQLite keeps
+        assert migrated_columns | {"payload": columns["payload"]} == columns
+        assert migrated_indexes == indexes
+        engine.dispose()
+
+    @pytest.mark.integration
+    def test_event_ids_not_reused_after_archiving(self, baseline_engine):
+        """New events get IDs past both live and archived events."""
+        with baseline_engine.begin() as connection:
+            for migration in MIGRATIONS[:-1]:
+                migration.upgrade(connection)
+            connection.execute(
+                text(
+                    "INSERT INTO archived_events VALUES "
+                    "(7, 'old-7', 'push', 1, '2025-01-01', 'events-2025-01.seg', 0, 1)"
+                )
+            )
+            connection.execute(text("DELETE FROM events"))
+            MIGRATIONS[-1].upgrade(connection)
+            connection.execute(
+                text(
+                    "INSERT INTO events (created_at, updated_at, delivery_id, "
+                    "event_type, payload, payload_codec, processed) VALUES "
+                    "('2025-02-01', '2025-02-01', 'new-1', 'push', '{}', "
+                    "'identity', 0)"
+                )
+            )
+
+            event_id = connection.execute(
+                text("SELECT id FROM events WHERE delivery_id = 'new-1'")
+            ).scalar_one()
+        assert event_id == 8
+
+    @pytest.mark.integration
+    def test_upgrade_of_empty_database_creates_current_schema(self, tmp_path):
+        """An empty database gets every table and is recorded as current."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+
+        upgrade(engine)
+
+        tables = set(inspect(engine).get_table_names())
+        assert tables >= set(SQLModel.metadata.tables) | {SEARCH_TABLE}
+        assert get_schema_version(engine) == SCHEMA_VERSION
+        engine.dispose()
+
+
+class TestSchemaVersionCheck:
+    """Tests for the startup schema version check."""
+
+    @pytest.mark.integration
+    def test_unmigrated_database_rejected(self, baseline_engine):
+        """AC: Startup refuses a database that has not been migrated."""
+        assert get_schema_version(baseline_engine) is None
+
+        with pytest.raises(SchemaVersionError, match="run 'copilot-orchestrator"):
+            check_schema_version(baseline_engine)
+
+    @pytest.mark.integration
+    def test_outdated_database_rejected(self, baseline_engine):
+        """A database behind the code's schema version is rejected."""
+        upgrade(baseline_engine)
+        with baseline_engine.begin() as connection:
+            connection.execute(
+                text("DELETE FROM schema_migrations WHERE revision = :revision"),
+                {"revision": SCHEMA_VERSION},
+            )
+
+        with pytest.raises(SchemaVersionError, match="expected"):
+            check_schema_version(baseline_engine)
+
+    @pytest.mark.integration
+    def test_migrated_database_accepted_with_one_query(self, baseline_engine):
+        """AC: The startup check is a single query and touches no metadata."""
+        from sqlalchemy import event as sa_event
+
+        upgrade(baseline_engine)
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        sa_event.listen(baseline_engine, "before_cursor_execute", capture)
+        try:
+            check_schema_version(baseline_engine)
+        finally:
+            sa_event.remove(baseline_engine, "before_cursor_execute", capture)
+
+        assert len(statements) == 1
+        assert "schema_migrations" in statements[0]
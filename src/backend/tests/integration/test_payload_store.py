@@ -0,0 +1,233 @@
+"""Tests for compressed payload storage."""
+
+import hashlib
+import json
+
+import pytest
+from sqlmodel import select
+
+from app.db.models.event import Event
+from app.db.models.payload_blob import PayloadBlob
+from app.db.models.payload_dictionary import PayloadDictionary
+from app.services.github import GitHubService
+from app.services.payload_codec import IDENTITY, ZLIB
+from app.services.payload_store import PayloadStore
+
+
+def _issue_payload(n: int) -> bytes:
+    """Build an issues payload sharing its repository and sender objects."""
+    return json.dumps(
+        {
+            "action": "opened",
+            "issue": {"number": n, "title": f"Issue {n}", "state": "open"},
+            "repository": {
+                "id": 123456,
+                "full_name": "octo-org/octo-repo",
+                "html_url": "https://github.com/octo-org/octo-repo",
+                "description": "An example repository",
+                "default_branch": "main",
+            },
+            "sender": {
+                "login": "octocat",
+                "id": 1,
+                "html_url": "https://github.com/octocat",
+                "type": "User",
+            },
+        },
+        separators=(",", ":"),
+    ).encode()
+
+
+class TestPayloadStore:
+    """Tests for compression, dictionary training and transparent reads."""
+
+    @pytest.mark.integration
+    async def test_payload_compressed_and_read_back(self, session):
+        """AC: Stored payloads are compressed and decoded on read."""
+        github_service = GitHubService(session)
+        github_service.payloads = PayloadStore(session, codec=ZLIB)
+        body = _issue_payload(1)
+
+        await github_service.insert_event(
+            delivery_id="compressed-1", event_type="issues", payload=body
+        )
+
+        event = await github_service.get_event_by_delivery_id("compressed-1")
+        assert event.payload_codec == ZLIB
+        assert len(event.payload) < len(body)
+        assert await github_service.get_event_body(event) == body
+
+    @pytest.mark.integration
+    async def test_streamed_body_matches_decoded_body(self, session):
+        """Streaming reassembles compressed, interned payloads byte for byte."""
+        github_service = GitHubService(session)
+        github_service.payloads = PayloadStore(session, codec=ZLIB)
+        await github_service.insert_event(
+            delivery_id="stream-1", event_type="issues", payload=_issue_payload(1)
+        )
+        event = await github_service.get_event_by_delivery_id("stream-1")
+
+        chunks = list(await github_service.payloads.open_stream(event, chunk_size=16))
+
+        assert len(chunks) > 1
+        assert b"".join(chunks) == _issue_payload(1)
+
+    @pytest.mark.integration
+    async def test_incompressible_payload_stored_as_is(self, session):
+        """Payloads that would not shrink keep the identity codec."""
+        github_service = GitHubService(session)
+        github_service.payloads = PayloadStore(session, codec=ZLIB)
+
+        await github_service.insert_event(
+            delivery_id="tiny-1", event_type="ping", payload=b"{}"
+        )
+
+        event = await github_service.get_event_by_delivery_id("tiny-1")
+        assert event.payload_codec == IDENTITY
+        assert event.payload == b"{}"
+
+    @pytest.mark.integration
+    async def test_trained_dictionaries_are_versioned(self, session):
+        """AC: Retraining adds a new dictionary version per event type."""
+        github_service = GitHubService(session)
+        store = github_service.payloads = PayloadStore(session, codec=ZLIB)
+        for n in range(20):
+            await github_service.insert_event(
+                delivery_id=f"train-{n}", event_type="issues", payload=_issue_payload(n)
+            )
+
+        first = await store.train_dictionary("issues", size=4096)
+        second = await store.train_dictionary("issues", size=4096)
+
+        assert (first.version, second.version) == (1, 2)
+        assert first.codec == ZLIB
+        assert first.sample_count == 20
+        versions = session.exec(
+            select(PayloadDictionary.version).where(
+                PayloadDictionary.event_type == "issues"
+            )
+        ).all()
+        assert sorted(versions) == [1, 2]
+
+    @pytest.mark.integration
+    async def test_new_events_use_dictionary_and_old_rows_stay_readable(self, session):
+        """AC: Rows with and without a dictionary decode side by side."""
+        github_service = GitHubService(session)
+        store = github_service.payloads = PayloadStore(session, codec=ZLIB)
+        for n in range(20):
+            await github_service.insert_event(
+                delivery_id=f"before-{n}",
+                event_type="issues",
+                payload=_issue_payload(n),
+            )
+        dictionary = await store.train_dictionary("issues", size=4096)
+
+        await github_service.insert_event(
+            delivery_id="after-1", event_type="issues", payload=_issue_payload(100)
+        )
+
+        before = await github_service.get_event_by_delivery_id("before-0")
+        after = await github_service.get_event_by_delivery_id("after-1")
+        assert before.payload_dictionary_id is None
+        assert after.payload_dictionary_id == dictionary.id
+        assert await github_service.get_event_body(before) == _issue_payload(0)
+        assert await github_service.get_event_body(after) == _issue_payload(100)
+
+    @pytest.mark.integration
+    async def test_recompress_rewrites_old_rows(self, session):
+        """Recompression moves stored events onto the newest dictionary."""
+        github_service = GitHubService(session)
+        github_service.payloads = PayloadStore(session, codec=IDENTITY)
+        for n in range(20):
+            await github_service.insert_event(
+                delivery_id=f"old-{n}", event_type="issues", payload=_issue_payload(n)
+            )
+        store = PayloadStore(session, codec=ZLIB)
+        dictionary = await store.train_dictionary("issues", size=4096)
+
+        assert await store.recompress("issues", batch_size=7) == 20
+        assert await store.recompress("issues", batch_size=7) == 0
+
+        events = session.exec(select(Event).order_by(Event.id)).all()
+        assert {event.payload_dictionary_id for event in events} == {dictionary.id}
+        assert [await store.decode(event) for event in events] == [
+            _issue_payload(n) for n in range(20)
+        ]
+
+
+class TestPayloadInterning:
+    """Tests for content-addressed storage of shared sub-objects."""
+
+    @pytest.mark.integration
+    async def test_shared_subobjects_stored_once(self, session):
+        """AC: Repository and sender objects are stored once across events."""
+        github_service = GitHubService(session)
+        for n in range(3):
+            await github_service.insert_event(
+                delivery_id=f"interned-{n}",
+                event_type="issues",
+                payload=_issue_payload(n),
+            )
+
+        blobs = session.exec(select(PayloadBlob)).all()
+        assert len(blobs) == 2
+        for n in range(3):
+            event = await github_service.get_event_by_delivery_id(f"interned-{n}")
+            assert len(json.loads(event.payload_refs)) == 2
+            assert await github_service.get_event_body(event) == _issue_payload(n)
+
+    @pytest.mark.integration
+    async def test_event_records_payload_reference(self, session):
+        """AC: Each event carries a content hash of its original payload."""
+        github_service = GitHubService(session)
+        body = _issue_payload(7)
+
+        await github_service.insert_event(
+            delivery_id="ref-1", event_type="issues", payload=body
+        )
+
+        event = await github_service.get_event_by_delivery_id("ref-1")
+        assert event.payload_ref == f"sha256:{hashlib.sha256(body).hexdigest()}"
+
+    @pytest.mark.integration
+    async def test_interning_disabled_stores_whole_payload(self, session):
+        """With no interned keys the payload is stored without references."""
+        github_service = GitHubService(session)
+        github_service.payloads = PayloadStore(
+            session, codec=IDENTITY, interned_keys=()
+        )
+        body = _issue_payload(1)
+
+        await github_service.insert_event(
+            delivery_id="whole-1", event_type="issues", payload=body
+        )
+
+        event = await github_service.get_event_by_delivery_id("whole-1")
+        assert event.payload_refs is None
+        assert event.payload == body
+        assert session.exec(select(PayloadBlob)).all() == []
+
+    @pytest.mark.integration
+    async def test_blobs_commit_with_their_event(self, session):
+        """AC: Encoding leaves blobs in the caller's transaction, uncommitted."""
+        store = PayloadStore(session)
+
+        await store.encode("issues", _issue_payload(1))
+        session.rollback()
+
+        assert session.exec(select(PayloadBlob)).all() == []
+
+    @pytest.mark.integration
+    async def test_rolled_back_blobs_stored_again(self, session):
+        """Blobs a rolled back transaction inserted aren't assumed stored."""
+        github_service = GitHubService(session)
+        await github_service.payloads.encode("issues", _issue_payload(1))
+        session.rollback()
+
+        await github_service.insert_event(
+            delivery_id="after-rollback-1",
+            event_type="issues",
+            payload=_issue_payload(1),
+        )
+
+        assert len(session.exec(select(PayloadBlob)).all()) == 2
@@ -0,0 +1,131 @@
+"""Tests for denormalized repository last-event markers."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event as sa_event
+
+from app.db.models.event import Event
+from app.db.models.repository import Repository
+from app.services.github import GitHubService
+
+
+class TestRepositoryMarkers:
+    """Tests for last_event_at maintenance and batched lookups."""
+
+    @pytest.mark.integration
+    async def test_ingest_advances_last_event_markers(self, session, test_repository):
+        """AC: Storing events updates last_event_at and per-type markers."""
+        github_service = GitHubService(session)
+
+        for delivery_id, event_type in (("m-1", "push"), ("m-2", "issues")):
+            await github_service.insert_event(
+                delivery_id=delivery_id,
+                event_type=event_type,
+                payload=b"{}",
+                repository_id=test_repository.id,
+            )
+
+        session.refresh(test_repository)
+        markers = await github_service.get_repository_event_markers(test_repository.id)
+        issues = await github_service.get_event_by_delivery_id("m-2")
+        assert set(markers) == {"push", "issues"}
+        assert markers["issues"] == issues.created_at
+        assert test_repository.last_event_at == issues.created_at
+
+    @pytest.mark.integration
+    async def test_older_events_do_not_move_markers_back(
+        self, session, test_repository
+    ):
+        """Markers only move forward."""
+        newest = datetime(2026, 5, 1, tzinfo=UTC)
+        for delivery_id, created_at in (
+            ("late", newest),
+            ("early", newest - timedelta(days=1)),
+        ):
+            session.add(
+                Event(
+                    delivery_id=delivery_id,
+                    event_type="push",
+                    repository_id=test_repository.id,
+                    payload="{}",
+                    created_at=created_at,
+                )
+            )
+            session.commit()
+
+        session.refresh(test_repository)
+        markers = await GitHubService(session).get_repository_event_markers(
+            test_repository.id
+        )
+        assert test_repository.last_event_at.replace(tzinfo=None) == newest.replace(
+            tzinfo=None
+        )
+        assert markers["push"].replace(tzinfo=None) == newest.replace(tzinfo=None)
+
+    @pytest.mark.integration
+    async def test_repository_page_is_one_query(
+        self, engine, session, test_installation, test_repository
+    ):
+        """AC: Last-event times for a page of repositories take one query."""
+        github_service = GitHubService(session)
+        repos = [test_repository]
+        for i in range(1, 100):
+            repo = Repository(
+                github_repo_id=1000 + i,
+                installation_id=test_installation.id,
+                full_name=f"testuser/repo-{i}",
+                owner="testuser",
+                name=f"repo-{i}",
+            )
+            session.add(repo)
+            repos.append(repo)
+        session.commit()
+        await github_service.insert_event(
+            delivery_id="page-1",
+            event_type="push",
+            payload=b"{}",
+            repository_id=test_repository.id,
+        )
+        github_ids = [repo.github_repo_id for repo in repos]
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        sa_event.listen(engine, "before_cursor_execute", capture)
+        try:
+            result = await github_service.get_last_event_at_for_repositories(github_ids)
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", capture)
+
+        assert len(statements) == 1
+        assert result[test_repository.github_repo_id] is not None
+        assert sum(value is not None for value in result.values()) == 1
+
+    @pytest.mark.integration
+    async def test_fallback_and_rebuild_for_unmarked_repositories(
+        self, session, test_repository
+    ):
+        """Repositories without a marker fall back to their newest event."""
+        github_service = GitHubService(session)
+        await github_service.insert_event(
+            delivery_id="fallback-1",
+            event_type="push",
+            payload=b"{}",
+            repository_id=test_repository.id,
+        )
+        event = await github_service.get_event_by_delivery_id("fallback-1")
+        test_repository.last_event_at = None
+        session.add(test_repository)
+        session.commit()
+
+        result = await github_service.get_last_event_at_for_repositories(
+            [test_repository.github_repo_id]
+        )
+        assert result[test_repository.github_repo_id] == event.created_at
+
+        assert await github_service.rebuild_repository_markers() == 1
+        session.refresh(test_repository)
+        assert test_repository.last_event_at == event.created_at
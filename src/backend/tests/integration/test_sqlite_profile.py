@@ -0,0 +1,221 @@
+"""Tests for the SQLite high-throughput profile."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event as sa_event
+from sqlalchemy import func, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+from sqlmodel import SQLModel, create_engine, select
+
+from app.config import Settings
+from app.db.models.user import User
+from app.db.sqlite import Checkpointer, RoutingSession, apply_sqlite_profile
+from app.services.base import DatabaseService
+
+
+@pytest.fixture(name="profile_engines")
+def fixture_profile_engines(tmp_path):
+    """Create a writer engine and a reader pool on one database file."""
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    settings = Settings()
+    writer = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    reader = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=4,
+        max_overflow=0,
+    )
+    apply_sqlite_profile(writer, settings)
+    apply_sqlite_profile(reader, settings, read_only=True)
+    SQLModel.metadata.create_all(writer)
+    yield writer, reader, tmp_path / "profile.db"
+    writer.dispose()
+    reader.dispose()
+
+
+def pragma(engine, name):
+    """Read a PRAGMA value on a pooled connection."""
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def add_user(session, github_id):
+    """Add and commit a user."""
+    session.add(
+        User(
+            github_id=github_id,
+            github_login=f"user{github_id}",
+            access_token_hash="hash",
+        )
+    )
+    session.commit()
+
+
+class TestSqliteProfile:
+    """Tests for pragmas, read/write routing and checkpoints."""
+
+    @pytest.mark.integration
+    def test_connections_use_profile_pragmas(self, profile_engines):
+        """AC: WAL, synchronous=NORMAL, cache, mmap, busy timeout, temp store."""
+        writer, reader, _ = profile_engines
+
+        for engine in (writer, reader):
+            assert pragma(engine, "journal_mode") == "wal"
+            assert pragma(engine, "synchronous") == 1
+            assert pragma(engine, "busy_timeout") == 5000
+            assert pragma(engine, "cache_size") == -64 * 1024
+            assert pragma(engine, "temp_store") == 2
+        assert pragma(writer, "query_only") == 0
+        assert pragma(reader, "query_only") == 1
+
+    @pytest.mark.integration
+    def test_reader_connections_cannot_write(self, profile_engines):
+        """Reader pool connections are query-only."""
+        _, reader, _ = profile_engines
+
+        with reader.connect() as connection, pytest.raises(OperationalError):
+            connection.exec_driver_sql("DELETE FROM users")
+
+    @pytest.mark.integration
+    def test_writes_go_to_writer_and_reads_to_readers(self, profile_engines):
+        """AC: Reads use the reader pool; a writing transaction stays on the writer."""
+        writer, reader, _ = profile_engines
+        used = []
+        sa_event.listen(writer, "before_cursor_execute", lambda *a: used.append("w"))
+        sa_event.listen(reader, "before_cursor_execute", lambda *a: used.append("r"))
+
+        with RoutingSession(writer=writer, reader=reader) as session:
+            session.exec(select(User)).all()
+            assert used == ["r"]
+
+            session.add(User(github_id=1, github_login="one", access_token_hash="h"))
+            session.flush()
+            count = session.exec(select(func.count()).select_from(User)).one()
+            assert count == 1
+            assert used[1:] == ["w", "w"]
+
+            session.commit()
+            used.clear()
+            session.exec(select(User)).all()
+            assert used == ["r"]
+
+    @pytest.mark.integration
+    def test_concurrent_writers_do_not_hit_locked_database(self, profile_engines):
+        """AC: Concurrent writers queue for the writer connection."""
+        writer, reader, _ = profile_engines
+
+        def write(worker):
+            for i in range(20):
+                with RoutingSession(writer=writer, reader=reader) as session:
+                    add_user(session, worker * 100 + i)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(write, range(8)))
+
+        with RoutingSession(writer=writer, reader=reader) as session:
+            assert session.exec(select(func.count()).select_from(User)).one() == 160
+
+    @pytest.mark.integration
+    async def test_waiting_for_writer_does_not_block_event_loop(self, profile_engines):
+        """A sync session holding the writer across an await still releases it."""
+        writer, reader, _ = profile_engines
+
+        async def write(github_id, pause):
+            with RoutingSession(writer=writer, reader=reader) as session:
+                service = DatabaseService(session)
+                await service._execute(
+                    insert(User).values(
+                        github_id=github_id,
+                        github_login=f"user{github_id}",
+                        access_token_hash="hash",
+                    )
+                )
+                await asyncio.sleep(pause)
+                await service._commit()
+
+        await asyncio.wait_for(asyncio.gather(write(1, 0.05), write(2, 0)), timeout=5)
+
+        with RoutingSession(writer=writer, reader=reader) as session:
+            assert session.exec(select(func.count()).select_from(User)).one() == 2
+
+    @pytest.mark.integration
+    async def test_checkpointer_truncates_wal_on_stop(self, profile_engines):
+        """AC: The background checkpointer keeps the WAL from growing."""
+        writer, reader, database_file = profile_engines
+        checkpointer = Checkpointer(writer, interval=0.01)
+        await checkpointer.start()
+
+        with RoutingSession(writer=writer, reader=reader) as session:
+            for i in range(10):
+                add_user(session, i)
+        await asyncio.sleep(0.05)
+        await checkpointer.stop()
+
+        wal = database_file.with_name(database_file.name + "-wal")
+        assert wal.stat().st_size == 0
+
+    @pytest.mark.integration
+    def test_sessions_route_for_sqlite_file_databases(self, tmp_path, monkeypatch):
+        """Sessions for a SQLite file database use the profile's engines."""
+        import app.db.engine as db_engine
+        from app.config import clear_settings_cache
+
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'app.db'}")
+        for name in ("_engine", "_read_engine"):
+            monkeypatch.setattr(db_engine, name, None)
+        clear_settings_cache()
+        try:
+            with db_engine.new_session() as session:
+                assert isinstance(session, RoutingSession)
+                assert session.writer.pool.size() == 1
+                assert pragma(session.reader, "query_only") == 1
+        finally:
+            clear_settings_cache()
+            db_engine.get_global_engine().dispose()
+            db_engine.get_global_read_engine().dispose()
+
+
+class TestReadReplica:
+    """Tests for routing read-only work to DATABASE_READ_URL."""
+
+    @pytest.mark.integration
+    def test_read_sessions_use_read_url(self, tmp_path, monkeypatch):
+        """Read sessions use the replica; sessions that write use the primary."""
+        import app.db.engine as db_engine
+        from app.config import clear_settings_cache
+
+        replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+        replica_setup = create_engine(replica_url)
+        SQLModel.metadata.create_all(replica_setup)
+        replica_setup.dispose()
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'primary.db'}")
+        monkeypatch.setenv("DATABASE_READ_URL", replica_url)
+        for name in ("_engine", "_read_engine"):
+            monkeypatch.setattr(db_engine, name, None)
+        clear_settings_cache()
+        try:
+            primary = db_engine.get_global_engine()
+            replica = db_engine.get_global_read_engine()
+            SQLModel.metadata.create_all(primary)
+
+            with db_engine.new_session() as session:
+                add_user(session, 1)
+            with db_engine.new_read_session() as session:
+                assert session.get_bind() is replica
+                assert session.exec(select(func.count(User.id))).one() == 0
+                with pytest.raises(OperationalError, match="readonly"):
+                    add_user(session, 2)
+        finally:
+            clear_settings_cache()
+            db_engine.get_global_engine().dispose()
+            db_engine.get_global_read_engine().dispose()
@@ -216,6 +216,70 @@ class TestWebhookIdempotency:
         data = response2.json()
         assert data["status"] == "duplicate"
 
+    @pytest.mark.integration
+    async def test_redelivery_handles_event_stored_before_crash(
+        self, session, test_installation
+    ):
+        """A redelivery runs the handler an earlier attempt stored but never ran."""
+        from app.services.github import GitHubService
+        from app.services.ingest import WebhookDelivery, process_webhook
+
+        github_service = GitHubService(session)
+        delivery = WebhookDelivery(
+            delivery_id="crashed-suspend-1",
+            event_type="installation",
+            body=json.dumps(
+                {
+                    "action": "suspend",
+                    "installation": {"id": test_installation.github_installation_id},
+                    "sender": {"login": "admin"},
+                }
+            ).encode(),
+        )
+        # The first attempt stored the event, then died before handling it
+        await github_service.insert_event(
+            delivery_id=delivery.delivery_id,
+            event_type=delivery.event_type,
+            payload=delivery.body,
+            action=delivery.action,
+        )
+
+        status = await process_webhook(github_service, delivery)
+
+        assert status == "duplicate"
+        session.refresh(test_installation)
+        assert test_installation.status == "suspended"
+        event = await github_service.get_event_by_delivery_id(delivery.delivery_id)
+        assert event.processed
+
+    @pytest.mark.integration
+    async def test_redelivery_of_handled_event_not_rerun(
+        self, session, test_installation
+    ):
+        """A redelivery of a handled event doesn't undo later state changes."""
+        from app.services.github import GitHubService
+        from app.services.ingest import WebhookDelivery, process_webhook
+
+        github_service = GitHubService(session)
+
+        def delivery(delivery_id: str, action: str) -> WebhookDelivery:
+            body = {
+                "action": action,
+                "installation": {"id": test_installation.github_installation_id},
+                "sender": {"login": "admin"},
+            }
+            return WebhookDelivery(
+                delivery_id, "installation", json.dumps(body).encode()
+            )
+
+        await process_webhook(github_service, delivery("suspend-1", "suspend"))
+        await process_webhook(github_service, delivery("unsuspend-1", "unsuspend"))
+        status = await process_webhook(github_service, delivery("suspend-1", "suspend"))
+
+        assert status == "duplicate"
+        session.refresh(test_installation)
+        assert test_installation.status == "active"
+
 
 class TestWebhookPayloadValidation:
     """Tests for webhook payload validation."""
@@ -253,6 +317,40 @@ class TestWebhookPayloadValidation:
 
         assert response.status_code == 400
 
+    @pytest.mark.integration
+    async def test_payload_stored_verbatim(
+        self,
+        client,
+        session,
+        webhook_secret,
+    ):
+        """AC: The stored payload is the exact signed request body."""
+        from app.services.github import GitHubService
+
+        body = b'{ "zen": "Keep it logically awesome.",\n  "action" : "created",\n  "hook_id": 1 }'
+        signature = (
+            "sha256="
+            + hmac.new(webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+        )
+
+        response = await client.post(
+            "/api/webhooks/github",
+            content=body,
+            headers={
+                "X-GitHub-Event": "ping",
+                "X-GitHub-Delivery": "verbatim-body-test",
+                "X-Hub-Signature-256": signature,
+                "Content-Type": "application/json",
+            },
+        )
+
+        assert response.status_code == 200
+        github_service = GitHubService(session)
+        event = await github_service.get_event_by_delivery_id("verbatim-body-test")
+        assert await github_service.get_event_body(event) == body
+        assert event.action == "created"
+        assert (await github_service.get_event_payload(event))["hook_id"] == 1
+
 
 class TestWebhookEventTypes:
     """Tests for supported webhook event types."""
@@ -346,3 +444,114 @@ class TestHMACVerificationUnit:
         """
         source = inspect.getsource(verify_webhook_signature)
         assert "compare_digest" in source
+
+
+class TestWebhookQueueIngest:
+    """Tests for ack-first ingest through the durable queue."""
+
+    @pytest.fixture(name="queue_app")
+    def fixture_queue_app(self, app, webhook_secret, tmp_path):
+        """Switch the test app to queue ingest mode."""
+        from app.api.deps import get_optional_ingest_queue
+        from app.config import Settings, get_settings
+        from app.services.ingest_queue import IngestQueue
+
+        queue = IngestQueue(str(tmp_path / "queue.db"))
+        settings = Settings(
+            github_webhook_secret=webhook_secret,
+            database_url="sqlite://",
+            webhook_ingest_mode="queue",
+        )
+        app.dependency_overrides[get_settings] = lambda: settings
+        app.dependency_overrides[get_optional_ingest_queue] = lambda: queue
+        yield app, queue
+        queue.close()
+
+    @pytest.fixture(name="session_factory")
+    def fixture_session_factory(self, engine):
+        """Session factory for ingest workers bound to the test database."""
+        from contextlib import asynccontextmanager
+
+        from sqlmodel import Session
+
+        @asynccontextmanager
+        async def factory():
+            with Session(engine) as session:
+                yield session
+
+        return factory
+
+    @pytest.mark.integration
+    async def test_queued_delivery_acknowledged_then_stored(
+        self,
+        queue_app,
+        session_factory,
+        session,
+        valid_webhook_payload,
+        webhook_secret,
+    ):
+        """AC: Verified delivery returns 202 and a worker stores it later."""
+        from httpx import ASGITransport, AsyncClient
+
+        from app.services.github import GitHubService
+        from app.services.ingest import IngestWorkerPool
+
+        app, queue = queue_app
+        payload_bytes = json.dumps(valid_webhook_payload).encode()
+        signature = (
+            "sha256="
+            + hmac.new(
+                webhook_secret.encode(), payload_bytes, hashlib.sha256
+            ).hexdigest()
+        )
+        headers = {
+            "X-GitHub-Event": "pull_request",
+            "X-GitHub-Delivery": "queued-delivery-1",
+            "X-Hub-Signature-256": signature,
+            "Content-Type": "application/json",
+        }
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.post(
+                "/api/webhooks/github", content=payload_bytes, headers=headers
+            )
+            duplicate = await client.post(
+                "/api/webhooks/github", content=payload_bytes, headers=headers
+            )
+
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+        assert duplicate.json()["status"] == "duplicate"
+        assert await GitHubService(session).event_exists("queued-delivery-1") is False
+
+        pool = IngestWorkerPool(queue, session_factory=session_factory)
+        assert await pool.drain() == 1
+
+        assert await GitHubService(session).event_exists("queued-delivery-1") is True
+        assert queue.depth() == 0
+
+    @pytest.mark.integration
+    async def test_queued_invalid_json_dead_lettered(self, queue_app, session_factory):
+        """AC: Malformed queued payloads are dead-lettered, not retried."""
+        from app.services.ingest import IngestWorkerPool
+        from app.services.ingest_queue import STATUS_DEAD
+
+        _, queue = queue_app
+        queue.enqueue("bad-json-delivery", "push", b'{"invalid json')
+
+        pool = IngestWorkerPool(queue, session_factory=session_factory)
+        await pool.drain()
+
+        assert queue.depth(STATUS_DEAD) == 1
+
+    @pytest.mark.integration
+    def test_unknown_ingest_mode_rejected(self):
+        """A mistyped ingest mode fails at startup instead of ingesting inline."""
+        from pydantic import ValidationError
+
+        from app.config import Settings
+
+        with pytest.raises(ValidationError):
+            Settings(webhook_ingest_mode="queued")
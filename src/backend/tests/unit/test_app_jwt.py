@@ -0,0 +1,91 @@
+"""Unit tests for the cached GitHub App JWT."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import jwt
+import pytest
+
+from app.services import app_jwt
+from app.services.app_jwt import APP_JWT_HITS, APP_JWT_MISSES, GitHubAppJWT
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture(name="clock")
+def fixture_clock():
+    """A settable clock starting at NOW."""
+    now = [NOW]
+
+    def clock() -> datetime:
+        return now[0]
+
+    clock.now = now
+    return clock
+
+
+def claims(token: str) -> dict:
+    """Decode a JWT's claims without verifying it."""
+    return jwt.decode(token, options={"verify_signature": False})
+
+
+class TestGitHubAppJWT:
+    """Tests for reusing the signed App JWT."""
+
+    @pytest.mark.unit
+    async def test_jwt_reused_until_refresh_margin(self, github_app_private_key, clock):
+        """AC: The JWT is reused until shortly before its 10-minute expiry."""
+        cache = GitHubAppJWT("1", github_app_private_key, clock=clock)
+        hits, misses = APP_JWT_HITS.value, APP_JWT_MISSES.value
+
+        first = await cache.get()
+        clock.now[0] = NOW + timedelta(minutes=8, seconds=59)
+        assert await cache.get() == first
+        clock.now[0] = NOW + timedelta(minutes=9)
+        second = await cache.get()
+
+        assert second != first
+        assert claims(second)["iat"] == int(clock.now[0].timestamp()) - 60
+        assert (APP_JWT_HITS.value - hits, APP_JWT_MISSES.value - misses) == (1, 2)
+
+    @pytest.mark.unit
+    async def test_jwt_signed_with_app_key(self, github_app_private_key, clock):
+        """The JWT is RS256-signed by the App with GitHub's claims."""
+        token = await GitHubAppJWT("1", github_app_private_key, clock=clock).get()
+
+        assert jwt.get_unverified_header(token)["alg"] == "RS256"
+        assert claims(token)["iss"] == "1"
+        assert claims(token)["exp"] == int((NOW + timedelta(minutes=10)).timestamp())
+
+    @pytest.mark.unit
+    async def test_concurrent_misses_sign_once(
+        self, github_app_private_key, clock, monkeypatch
+    ):
+        """AC: Concurrent misses share one signing; the key is parsed once."""
+        loads = []
+        load = app_jwt.load_github_app_key
+        monkeypatch.setattr(
+            app_jwt, "load_github_app_key", lambda pem: loads.append(pem) or load(pem)
+        )
+        cache = GitHubAppJWT("1", github_app_private_key, clock=clock)
+
+        tokens = await asyncio.gather(*(cache.get() for _ in range(5)))
+        clock.now[0] = NOW + timedelta(minutes=30)
+        await cache.get()
+
+        assert len(set(tokens)) == 1
+        assert len(loads) == 1
+
+    @pytest.mark.unit
+    def test_invalid_key_raised_on_construction(self, clock):
+        """AC: A key that is not a PEM RSA key fails before any signing."""
+        with pytest.raises(ValueError):
+            GitHubAppJWT("1", "not a key", clock=clock)
+
+    @pytest.mark.unit
+    def test_global_cache_follows_credentials(self, github_app_private_key):
+        """The process-wide cache is replaced when the credentials change."""
+        cache = app_jwt.get_github_app_jwt("1", github_app_private_key)
+
+        assert app_jwt.get_github_app_jwt("1", github_app_private_key) is cache
+        assert app_jwt.get_github_app_jwt("2", github_app_private_key) is not cache
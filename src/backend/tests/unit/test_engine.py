@@ -0,0 +1,104 @@
+"""Unit tests for database engine helpers."""
+
+import pytest
+
+from app.config import Settings
+from app.db.engine import engine_options, is_async_url, sync_database_url
+from app.db.sqlite import is_sqlite_file_url, sqlite_pragmas
+
+
+class TestDatabaseUrls:
+    """Tests for async driver detection and sync URL mapping."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("sqlite:///./orchestrator.db", False),
+            ("sqlite+aiosqlite:///./orchestrator.db", True),
+            ("postgresql://user:pw@db/app", False),
+            ("postgresql+asyncpg://user:pw@db/app", True),
+        ],
+    )
+    def test_is_async_url(self, url, expected):
+        """Only aiosqlite and asyncpg URLs select the async path."""
+        assert is_async_url(url) is expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("sqlite+aiosqlite:///./app.db", "sqlite:///./app.db"),
+            ("postgresql+asyncpg://u:p@db/app", "postgresql+psycopg://u:p@db/app"),
+            ("sqlite:///./app.db", "sqlite:///./app.db"),
+        ],
+    )
+    def test_sync_database_url(self, url, expected):
+        """Async driver URLs map to their sync counterparts."""
+        assert sync_database_url(url) == expected
+
+
+class TestSqliteProfile:
+    """Tests for selecting and configuring the SQLite profile."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("sqlite:///./orchestrator.db", True),
+            ("sqlite+aiosqlite:////var/lib/app.db", True),
+            ("sqlite://", False),
+            ("sqlite:///:memory:", False),
+            ("postgresql://user:pw@db/app", False),
+        ],
+    )
+    def test_is_sqlite_file_url(self, url, expected):
+        """Only SQLite file databases get the profile."""
+        assert is_sqlite_file_url(url) is expected
+
+    @pytest.mark.unit
+    def test_pragmas_follow_settings(self):
+        """PRAGMAs are built from the settings; readers are query-only."""
+        settings = Settings(sqlite_cache_size_kib=1024, sqlite_synchronous="FULL")
+
+        writer = sqlite_pragmas(settings)
+        reader = sqlite_pragmas(settings, read_only=True)
+
+        assert "PRAGMA journal_mode=WAL" in writer
+        assert "PRAGMA synchronous=FULL" in writer
+        assert "PRAGMA cache_size=-1024" in writer
+        assert "PRAGMA query_only=ON" not in writer
+        assert reader[-1] == "PRAGMA query_only=ON"
+
+
+class TestEngineOptions:
+    """Tests for connection pool options."""
+
+    @pytest.mark.unit
+    def test_server_databases_use_pool_settings(self):
+        """PostgreSQL engines are pooled as configured."""
+        settings = Settings(
+            database_pool_size=20,
+            database_max_overflow=5,
+            database_pool_timeout_seconds=2.5,
+            database_pool_recycle_seconds=600,
+            database_pool_pre_ping=False,
+        )
+
+        options = engine_options(settings, "postgresql+psycopg://u:p@db/app")
+
+        assert options["pool_size"] == 20
+        assert options["max_overflow"] == 5
+        assert options["pool_timeout"] == 2.5
+        assert options["pool_recycle"] == 600
+        assert options["pool_pre_ping"] is False
+
+    @pytest.mark.unit
+    def test_sqlite_profile_pools_one_writer_and_readers(self):
+        """SQLite file databases keep one writer and a reader pool."""
+        settings = Settings(sqlite_reader_pool_size=3, database_pool_size=20)
+        url = "sqlite:///./app.db"
+
+        assert engine_options(settings, url)["pool_size"] == 1
+        assert engine_options(settings, url, read_only=True)["pool_size"] == 3
+        assert "pool_pre_ping" not in engine_options(settings, url)
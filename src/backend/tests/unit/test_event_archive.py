@@ -0,0 +1,68 @@
+"""Unit tests for archive segment records."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.db.models.event import Event
+from app.services.event_archive import (
+    append_records,
+    decode_record,
+    encode_record,
+    read_record,
+    segment_name,
+)
+
+
+def make_event(**fields) -> Event:
+    """Build an event as it is stored."""
+    return Event(
+        id=7,
+        delivery_id="d-7",
+        event_type="issues",
+        action="opened",
+        installation_id=3,
+        payload=b"",
+        created_at=datetime(2026, 1, 31, 23, 59, tzinfo=UTC),
+        **fields,
+    )
+
+
+class TestSegmentRecords:
+    """Tests for encoding, appending and reading segment records."""
+
+    @pytest.mark.unit
+    def test_record_round_trips_event_and_body(self):
+        """Records keep the metadata and the webhook body byte for byte."""
+        body = b'{"action": "opened",\n "issue": {"number": 1}}'
+
+        event = decode_record(encode_record(make_event(), body))
+
+        assert event.id == 7
+        assert event.delivery_id == "d-7"
+        assert event.action == "opened"
+        assert event.repository_id is None
+        assert event.created_at == datetime(2026, 1, 31, 23, 59, tzinfo=UTC)
+        assert event.payload == body
+        assert event.payload_codec == "identity"
+
+    @pytest.mark.unit
+    def test_corrupt_record_rejected(self):
+        """Bytes that are not a whole record are rejected."""
+        record = encode_record(make_event(), b"{}")
+
+        with pytest.raises(ValueError, match="record"):
+            decode_record(record[:-1])
+
+    @pytest.mark.unit
+    def test_records_read_back_from_segment(self, tmp_path):
+        """Appended records are read at their offsets through a memory map."""
+        path = tmp_path / segment_name(datetime(2026, 1, 31, tzinfo=UTC))
+        records = [encode_record(make_event(), body) for body in (b"[1]", b"[2]")]
+
+        first = append_records(path, records[:1])
+        second = append_records(path, records[1:])
+
+        assert path.name == "events-2026-01.seg"
+        assert second[0][0] == first[0][1]
+        assert read_record(path, *second[0]) == records[1]
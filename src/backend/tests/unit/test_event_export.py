@@ -0,0 +1,48 @@
+"""Unit tests for encoding events as NDJSON export lines."""
+
+import json
+from datetime import UTC, datetime
+
+import pytest
+
+from app.db.models.event import Event
+from app.services.event_export import export_line
+
+
+class TestExportLine:
+    """Tests for encoding one event per line."""
+
+    @pytest.mark.unit
+    def test_line_holds_metadata_and_payload(self):
+        """The body is embedded as the payload member of the metadata."""
+        event = Event(
+            id=7,
+            delivery_id="abc",
+            event_type="push",
+            payload=b"",
+            created_at=datetime(2026, 6, 1, tzinfo=UTC),
+        )
+
+        line = export_line(event, b'{"ref": "main"}')
+
+        assert line.endswith(b"}\n")
+        assert json.loads(line) == {
+            "id": 7,
+            "delivery_id": "abc",
+            "event_type": "push",
+            "processed": False,
+            "created_at": "2026-06-01T00:00:00+00:00",
+            "payload": {"ref": "main"},
+        }
+
+    @pytest.mark.unit
+    def test_pretty_printed_body_stays_on_one_line(self):
+        """Line breaks between tokens are dropped; escaped ones are kept."""
+        body = json.dumps({"message": "a\\nb", "lines": [1, 2]}, indent=2).encode()
+        body = body.replace(b"\n", b"\r\n")
+        event = Event(id=1, delivery_id="x", event_type="push", payload=b"")
+
+        line = export_line(event, body)
+
+        assert line.count(b"\n") == 1
+        assert json.loads(line)["payload"] == {"message": "a\\nb", "lines": [1, 2]}
@@ -0,0 +1,98 @@
+"""Unit tests for extracting indexed columns from event payloads."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.services.event_extraction import (
+    EXTRACTED_COLUMNS,
+    extract_columns,
+    parse_payload,
+    resolve_pointer,
+)
+
+
+class TestResolvePointer:
+    """Tests for resolving JSON pointers in payloads."""
+
+    @pytest.mark.unit
+    def test_resolves_nested_members_and_items(self):
+        """Pointers walk objects by key and arrays by index."""
+        payload = {"a": {"b": [{"c": 1}]}, "x/y": 2}
+
+        assert resolve_pointer(payload, "/a/b/0/c") == 1
+        assert resolve_pointer(payload, "/x~1y") == 2
+
+    @pytest.mark.unit
+    def test_missing_member_resolves_to_none(self):
+        """Pointers through absent members or scalars resolve to None."""
+        payload = {"a": {"b": 1}}
+
+        assert resolve_pointer(payload, "/a/c") is None
+        assert resolve_pointer(payload, "/a/b/c") is None
+        assert resolve_pointer({"a": []}, "/a/0") is None
+
+
+class TestExtractColumns:
+    """Tests for the per-event-type extraction table."""
+
+    @pytest.mark.unit
+    def test_pull_request_columns(self):
+        """Pull requests yield actor, number, head SHA, ref and update time."""
+        payload = {
+            "number": 1234,
+            "pull_request": {
+                "number": 1234,
+                "head": {"sha": "abc123", "ref": "fix-deadlock"},
+                "updated_at": "2026-06-01T10:00:00Z",
+            },
+            "sender": {"login": "alice"},
+        }
+
+        assert extract_columns("pull_request", payload) == {
+            "actor_login": "alice",
+            "target_kind": "pull_request",
+            "target_number": 1234,
+            "head_sha": "abc123",
+            "ref": "fix-deadlock",
+            "source_created_at": datetime(2026, 6, 1, 10, tzinfo=UTC),
+        }
+
+    @pytest.mark.unit
+    def test_later_pointers_are_fallbacks(self):
+        """The first pointer that resolves wins."""
+        payload = {"after": None, "head_commit": {"id": "def456"}, "ref": "refs/x"}
+
+        columns = extract_columns("push", payload)
+
+        assert columns["head_sha"] == "def456"
+        assert columns["ref"] == "refs/x"
+        assert columns["target_kind"] == "commit"
+
+    @pytest.mark.unit
+    def test_unknown_event_type_extracts_actor_only(self):
+        """Types without rules still get the default actor pointer."""
+        columns = extract_columns("star", {"sender": {"login": "bob"}})
+
+        assert columns == dict.fromkeys(EXTRACTED_COLUMNS) | {"actor_login": "bob"}
+
+    @pytest.mark.unit
+    def test_values_of_the_wrong_type_are_dropped(self):
+        """Non-integer numbers, objects and bad timestamps are not stored."""
+        payload = {
+            "issue": {"number": "12", "updated_at": "yesterday"},
+            "sender": {"login": {"nested": True}},
+        }
+
+        columns = extract_columns("issues", payload)
+
+        assert columns["target_number"] is None
+        assert columns["source_created_at"] is None
+        assert columns["actor_login"] is None
+
+    @pytest.mark.unit
+    def test_non_object_bodies_parse_empty(self):
+        """Bodies that are not JSON objects extract nothing."""
+        assert parse_payload(b"[1, 2]") == {}
+        assert parse_payload(b"not json") == {}
+        assert parse_payload(b'{"a": 1}') == {"a": 1}
@@ -0,0 +1,76 @@
+"""Unit tests for event search documents and query terms."""
+
+import json
+
+import pytest
+
+from app.services.event_extraction import parse_payload
+from app.services.event_search import (
+    MAX_DOCUMENT_LENGTH,
+    search_document,
+    search_terms,
+)
+
+
+class TestSearchDocument:
+    """Tests for extracting search documents from payloads."""
+
+    @pytest.mark.unit
+    def test_document_holds_searchable_members(self):
+        """Numbers, titles, logins and commit messages are indexed."""
+        payload = parse_payload(
+            json.dumps(
+                {
+                    "number": 1234,
+                    "pull_request": {"title": "Fix it", "user": {"login": "alice"}},
+                    "commits": [{"message": "first"}, {"message": "second"}],
+                    "installation": {"id": 99},
+                    "draft": True,
+                }
+            ).encode()
+        )
+
+        document = search_document("pull_request", "opened", payload)
+
+        assert document.split() == [
+            "pull_request",
+            "opened",
+            "1234",
+            "Fix",
+            "it",
+            "alice",
+            "first",
+            "second",
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("body", [b"not json", b"[1, 2]"])
+    def test_document_of_non_object_body(self, body):
+        """Bodies that are not JSON objects index their type and action."""
+        assert search_document("ping", None, parse_payload(body)) == "ping"
+
+    @pytest.mark.unit
+    def test_document_is_bounded(self):
+        """Long bodies are truncated."""
+        payload = {"issue": {"body": "x" * 100_000}}
+
+        document = search_document("issues", "opened", payload)
+
+        assert len(document) == MAX_DOCUMENT_LENGTH
+
+
+class TestSearchTerms:
+    """Tests for splitting queries into terms."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("PR #1234", ["PR", "1234"]),
+            ('alice" OR *', ["alice", "OR"]),
+            ("  ", []),
+        ],
+    )
+    def test_punctuation_is_dropped(self, query, expected):
+        """Queries become word terms, never search syntax."""
+        assert search_terms(query) == expected
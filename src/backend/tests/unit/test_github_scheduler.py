@@ -0,0 +1,152 @@
+"""Unit tests for the rate-limit-aware GitHub request scheduler."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.github_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    GitHubScheduler,
+    RateLimitExceeded,
+)
+
+
+class Sender:
+    """Sends canned responses, recording each call."""
+
+    def __init__(self, *responses: httpx.Response) -> None:
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def __call__(self) -> httpx.Response:
+        self.calls += 1
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        return self.responses[0]
+
+
+def limited(remaining: int, limit: int = 10) -> httpx.Response:
+    """Build a response reporting the remaining budget of an hour's window."""
+    return httpx.Response(
+        200,
+        headers={
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(time.time() + 3600),
+        },
+    )
+
+
+class TestGitHubScheduler:
+    """Tests for rate budgets, retries and priorities."""
+
+    @pytest.mark.unit
+    async def test_budget_follows_response_headers(self):
+        """AC: Budgets track X-RateLimit-Limit, -Remaining and -Reset."""
+        scheduler = GitHubScheduler()
+
+        await scheduler.request(1, Sender(limited(7)))
+
+        budget = scheduler.budget(1)
+        assert (budget.limit, budget.remaining) == (10, 7)
+        assert budget.reset_at > time.time()
+        assert scheduler.budget(2).remaining is None
+
+    @pytest.mark.unit
+    async def test_background_leaves_reserve_for_interactive(self):
+        """AC: Background requests stop short of the interactive reserve."""
+        scheduler = GitHubScheduler(reserve=0.2, max_wait=0.05)
+        await scheduler.request(1, Sender(limited(2)))
+
+        with pytest.raises(RateLimitExceeded):
+            await scheduler.request(1, Sender(limited(1)), PRIORITY_BACKGROUND)
+        await scheduler.request(1, Sender(limited(1)), PRIORITY_INTERACTIVE)
+
+    @pytest.mark.unit
+    async def test_secondary_limit_without_retry_after_backs_off(self):
+        """A 403 secondary limit without Retry-After pauses for the backoff."""
+        scheduler = GitHubScheduler(secondary_backoff=0.1)
+        send = Sender(
+            httpx.Response(403, json={"message": "secondary rate limit"}),
+            httpx.Response(200),
+        )
+
+        started = time.monotonic()
+        response = await scheduler.request(1, send)
+
+        assert response.status_code == 200
+        assert send.calls == 2
+        assert time.monotonic() - started >= 0.1
+
+    @pytest.mark.unit
+    async def test_forbidden_not_retried(self):
+        """A 403 that isn't a rate limit is returned as is."""
+        scheduler = GitHubScheduler()
+        send = Sender(httpx.Response(403, json={"message": "Resource not accessible"}))
+
+        response = await scheduler.request(1, send)
+
+        assert response.status_code == 403
+        assert send.calls == 1
+
+    @pytest.mark.unit
+    async def test_retries_bounded(self):
+        """A request still rate limited after its retries returns the response."""
+        scheduler = GitHubScheduler(max_retries=1)
+        send = Sender(httpx.Response(429, headers={"Retry-After": "0"}))
+
+        response = await scheduler.request(1, send)
+
+        assert response.status_code == 429
+        assert send.calls == 2
+
+    @pytest.mark.unit
+    async def test_cancelled_waiter_frees_its_place(self):
+        """A caller cancelled while queued doesn't hold up the queue."""
+        scheduler = GitHubScheduler(max_concurrent=1)
+        release = asyncio.Event()
+
+        async def slow() -> httpx.Response:
+            await release.wait()
+            return httpx.Response(200)
+
+        holder = asyncio.create_task(scheduler.request(1, slow))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(
+            scheduler.request(1, Sender(httpx.Response(200)))
+        )
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        release.set()
+        await holder
+
+        response = await asyncio.wait_for(
+            scheduler.request(1, Sender(httpx.Response(200))), timeout=1
+        )
+        assert response.status_code == 200
+        assert scheduler.budget(1).in_flight == 0
+
+    @pytest.mark.unit
+    async def test_queued_request_gives_up_after_max_wait(self):
+        """AC: A request queued behind a budget blocked meanwhile stops waiting."""
+        scheduler = GitHubScheduler(max_concurrent=1, max_wait=0.05)
+        release = asyncio.Event()
+
+        async def blocked() -> httpx.Response:
+            await release.wait()
+            return httpx.Response(429, headers={"Retry-After": "3600"})
+
+        holder = asyncio.create_task(scheduler.request(1, blocked))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(scheduler.request(1, Sender(httpx.Response(200))))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert (await holder).status_code == 429
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await asyncio.wait_for(queued, timeout=1)
+        assert exc_info.value.retry_at > time.time() + 3000
+        assert scheduler.budget(1).in_flight == 0
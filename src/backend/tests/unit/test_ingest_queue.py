@@ -0,0 +1,122 @@
+"""Unit tests for the durable webhook ingest queue."""
+
+import time
+
+import pytest
+
+from app.services.ingest_queue import STATUS_DEAD, IngestQueue
+
+
+@pytest.fixture(name="queue")
+def fixture_queue(tmp_path):
+    """Create a file-backed ingest queue in a temporary directory."""
+    queue = IngestQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    yield queue
+    queue.close()
+
+
+class TestIngestQueue:
+    """Tests for enqueue, claim, ack and failure handling."""
+
+    @pytest.mark.unit
+    def test_enqueue_and_claim_in_fifo_order(self, queue):
+        """Deliveries are claimed in the order they were enqueued."""
+        assert queue.enqueue("d-1", "push", b'{"n": 1}') is True
+        assert queue.enqueue("d-2", "push", b'{"n": 2}') is True
+
+        first = queue.claim()
+        second = queue.claim()
+
+        assert first.delivery_id == "d-1"
+        assert first.body == b'{"n": 1}'
+        assert first.attempts == 1
+        assert second.delivery_id == "d-2"
+        assert queue.claim() is None
+
+    @pytest.mark.unit
+    def test_duplicate_delivery_not_queued_twice(self, queue):
+        """A delivery ID already in the queue is rejected."""
+        assert queue.enqueue("d-1", "push", b"{}") is True
+        assert queue.enqueue("d-1", "push", b"{}") is False
+        assert queue.depth() == 1
+
+    @pytest.mark.unit
+    def test_ack_removes_delivery(self, queue):
+        """Acknowledged deliveries leave the queue."""
+        queue.enqueue("d-1", "push", b"{}")
+        delivery = queue.claim()
+
+        queue.ack(delivery.id)
+
+        assert queue.depth() == 0
+        assert queue.depth("processing") == 0
+
+    @pytest.mark.unit
+    def test_failed_delivery_is_retried_then_dead_lettered(self, queue):
+        """Failures back off, then dead-letter after max attempts."""
+        queue.retry_backoff_seconds = 0
+        queue.enqueue("d-1", "push", b"{}")
+
+        queue.fail(queue.claim().id, "db down")
+        retried = queue.claim()
+        assert retried.attempts == 2
+
+        queue.fail(retried.id, "db down")
+        assert queue.claim() is None
+        assert queue.depth(STATUS_DEAD) == 1
+
+    @pytest.mark.unit
+    def test_non_retryable_failure_dead_letters_immediately(self, queue):
+        """Non-retryable failures skip the retry schedule."""
+        queue.enqueue("d-1", "push", b"not json")
+
+        queue.fail(queue.claim().id, "invalid", retryable=False)
+
+        assert queue.depth(STATUS_DEAD) == 1
+
+    @pytest.mark.unit
+    def test_redelivery_revives_dead_letter(self, queue):
+        """A dead-lettered delivery enqueued again is retried from scratch."""
+        queue.enqueue("d-1", "push", b"not json")
+        queue.fail(queue.claim().id, "invalid", retryable=False)
+
+        assert queue.enqueue("d-1", "push", b"{}") is True
+
+        assert queue.depth(STATUS_DEAD) == 0
+        revived = queue.claim()
+        assert revived.body == b"{}"
+        assert revived.attempts == 1
+        assert queue.enqueue("d-1", "push", b"{}") is False
+
+    @pytest.mark.unit
+    def test_recover_requeues_deliveries_with_lapsed_lease(self, tmp_path):
+        """Deliveries claimed before a crash are re-queued once their lease lapses."""
+        path = str(tmp_path / "crash.db")
+        queue = IngestQueue(path, lease_seconds=0)
+        queue.enqueue("d-1", "push", b"{}")
+        queue.claim()
+        queue.close()
+
+        reopened = IngestQueue(path)
+        assert reopened.recover() == 1
+        assert reopened.claim().delivery_id == "d-1"
+        reopened.close()
+
+    @pytest.mark.unit
+    def test_leased_delivery_not_reclaimed_by_other_process(self, tmp_path):
+        """AC: A process starting up leaves deliveries other workers hold."""
+        path = str(tmp_path / "shared.db")
+        worker = IngestQueue(path, lease_seconds=0.2)
+        starting = IngestQueue(path)
+        worker.enqueue("d-1", "push", b"{}")
+        worker.claim()
+
+        assert starting.recover() == 0
+        assert starting.claim() is None
+
+        time.sleep(0.2)
+        reclaimed = starting.claim()
+        assert reclaimed.delivery_id == "d-1"
+        assert reclaimed.attempts == 2
+        worker.close()
+        starting.close()
@@ -0,0 +1,32 @@
+"""Unit tests for in-process metrics."""
+
+import pytest
+
+from app.metrics import Counter, Histogram, snapshot
+
+
+class TestMetrics:
+    """Tests for counters, histograms and the registry."""
+
+    @pytest.mark.unit
+    def test_counter_increments(self):
+        """Counters accumulate increments."""
+        counter = Counter("test_counter_increments")
+        counter.inc()
+        counter.inc(2)
+
+        assert counter.value == 3
+        assert snapshot()["test_counter_increments"]["value"] == 3
+
+    @pytest.mark.unit
+    def test_histogram_buckets_are_cumulative(self):
+        """Histogram buckets count observations at or below each bound."""
+        histogram = Histogram("test_histogram_buckets", buckets=(1, 5, 10))
+        for value in (0.5, 1, 3, 7, 50):
+            histogram.observe(value)
+
+        data = histogram.snapshot()
+
+        assert data["count"] == 5
+        assert data["sum"] == 61.5
+        assert data["buckets"] == {"1": 2, "5": 3, "10": 4, "+Inf": 5}
@@ -0,0 +1,45 @@
+"""Unit tests for keyset pagination cursors."""
+
+from datetime import datetime
+
+import pytest
+
+from app.services.pagination import NEXT, PREV, EventCursor
+
+
+class TestEventCursor:
+    """Tests for cursor encoding and validation."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("direction", [NEXT, PREV])
+    def test_round_trip(self, direction):
+        """A decoded cursor equals the encoded one."""
+        cursor = EventCursor(datetime(2026, 1, 2, 3, 4, 5, 678), 42, direction)
+
+        token = cursor.encode()
+
+        assert "=" not in token
+        assert EventCursor.decode(token) == cursor
+
+    @pytest.mark.unit
+    def test_search_cursor_keeps_rank(self):
+        """Search cursors carry the rank of their row."""
+        cursor = EventCursor(
+            datetime(2026, 1, 2), 42, NEXT, rank=-1.2125984251968504e-06
+        )
+
+        assert EventCursor.decode(cursor.encode()) == cursor
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "token",
+        [
+            "not-a-cursor",
+            "",
+            EventCursor(datetime(2026, 1, 1), 1, "sideways").encode(),
+        ],
+    )
+    def test_malformed_cursor_rejected(self, token):
+        """Malformed tokens raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            EventCursor.decode(token)
@@ -0,0 +1,96 @@
+"""Unit tests for payload compression codecs."""
+
+import json
+
+import pytest
+
+from app.services.payload_codec import (
+    IDENTITY,
+    ZLIB,
+    ZlibCodec,
+    available_codecs,
+    get_codec,
+)
+
+
+def _push_payload(n: int) -> bytes:
+    """Build a push-like payload sharing its repository and sender objects."""
+    return json.dumps(
+        {
+            "ref": f"refs/heads/feature-{n}",
+            "after": f"{n:040x}",
+            "repository": {
+                "id": 123456,
+                "full_name": "octo-org/octo-repo",
+                "html_url": "https://github.com/octo-org/octo-repo",
+                "default_branch": "main",
+            },
+            "sender": {"login": "octocat", "id": 1, "type": "User"},
+        },
+        separators=(",", ":"),
+    ).encode()
+
+
+class TestPayloadCodecs:
+    """Tests for codec lookup, round trips and dictionary training."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("name", available_codecs())
+    def test_round_trip(self, name):
+        """Every available codec restores the exact bytes."""
+        codec = get_codec(name)
+        body = _push_payload(1)
+
+        assert codec.decompress(codec.compress(body)) == body
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("name", available_codecs())
+    def test_incremental_decompression(self, name):
+        """Feeding stored bytes in small chunks restores the exact bytes."""
+        codec = get_codec(name)
+        body = _push_payload(1)
+        stored = codec.compress(body)
+
+        decompressor = codec.decompressor()
+        chunks = [
+            decompressor.decompress(stored[i : i + 7]) for i in range(0, len(stored), 7)
+        ]
+
+        assert b"".join(chunks) + decompressor.flush() == body
+
+    @pytest.mark.unit
+    def test_auto_resolves_to_a_compressing_codec(self):
+        """The auto codec compresses."""
+        assert get_codec("auto").name != IDENTITY
+
+    @pytest.mark.unit
+    def test_unknown_codec_rejected(self):
+        """An unknown codec name raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown payload codec"):
+            get_codec("lz4")
+
+    @pytest.mark.unit
+    def test_identity_codec_has_no_dictionaries(self):
+        """Training with the identity codec raises ValueError."""
+        with pytest.raises(ValueError):
+            get_codec(IDENTITY).train([b"{}", b"{}"], 1024)
+
+    @pytest.mark.unit
+    def test_zlib_dictionary_shrinks_payloads(self):
+        """A dictionary trained on similar payloads improves compression."""
+        codec = ZlibCodec()
+        samples = [_push_payload(n) for n in range(50)]
+        dictionary = codec.train(samples, 4096)
+        body = _push_payload(99)
+
+        with_dictionary = codec.compress(body, dictionary)
+
+        assert len(with_dictionary) < len(codec.compress(body))
+        assert codec.decompress(with_dictionary, dictionary) == body
+        assert get_codec(ZLIB).name == ZLIB
+
+    @pytest.mark.unit
+    def test_zlib_training_needs_shared_content(self):
+        """Samples with nothing in common cannot produce a dictionary."""
+        with pytest.raises(ValueError):
+            ZlibCodec().train([b'{"a":1}', b'{"b":2}'], 4096)
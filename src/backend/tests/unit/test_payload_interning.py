@@ -0,0 +1,69 @@
+"""Unit tests for splitting shared sub-objects out of payloads."""
+
+import json
+
+import pytest
+
+from app.services.payload_store import iter_joined, join_subobjects, split_subobjects
+
+KEYS = {"repository", "sender"}
+
+
+class TestSubobjectSplitting:
+    """Tests for byte-exact split and join of payload sub-objects."""
+
+    @pytest.mark.unit
+    def test_split_and_join_restore_exact_bytes(self):
+        """Whitespace, key order and unicode survive the round trip."""
+        body = (
+            '{ "action":"opened" ,\n "repository" : {"id": 1, "name": "r\\u00e9po",'
+            ' "description": "déjà vu, with padding to be interned"},'
+            ' "sender": {"login": "octocat", "id": 1, "type": "User", "x": [1, 2]} }'
+        ).encode()
+
+        remainder, parts = split_subobjects(body, KEYS, min_size=8)
+
+        assert len(parts) == 2
+        assert b"octocat" not in remainder
+        assert json.loads(parts[1][1])["login"] == "octocat"
+        assert join_subobjects(remainder, parts) == body
+
+    @pytest.mark.unit
+    def test_small_and_non_object_members_stay_inline(self):
+        """Members below the size threshold or not objects are not cut."""
+        body = b'{"repository": {"id": 1}, "sender": "octocat"}'
+
+        remainder, parts = split_subobjects(body, KEYS, min_size=64)
+
+        assert parts == []
+        assert remainder == body
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("body", [b"[1, 2]", b"not json", b"{}", b"\xff\xfe"])
+    def test_non_object_bodies_returned_whole(self, body):
+        """Bodies that are not JSON objects are stored whole."""
+        assert split_subobjects(body, KEYS, min_size=1) == (body, [])
+
+    @pytest.mark.unit
+    def test_nested_members_not_cut(self):
+        """Only top-level members are interned."""
+        body = json.dumps(
+            {"pull_request": {"repository": {"id": 1, "name": "x" * 100}}}
+        ).encode()
+
+        assert split_subobjects(body, KEYS, min_size=8) == (body, [])
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [1, 5, 17, 4096])
+    def test_join_from_chunks_matches_join(self, chunk_size):
+        """Splicing into a chunked remainder yields the same bytes."""
+        body = (
+            b'{"action":"opened","repository":{"id":1,"name":"repo"},'
+            b'"sender":{"login":"octocat","id":1}}'
+        )
+        remainder, parts = split_subobjects(body, KEYS, min_size=8)
+        chunks = (
+            remainder[i : i + chunk_size] for i in range(0, len(remainder), chunk_size)
+        )
+
+        assert b"".join(iter_joined(chunks, parts)) == body
@@ -0,0 +1,148 @@
+"""Unit tests for the GitHub response cache."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.services.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    ResponseStore,
+    cache_key,
+)
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=UTC)
+
+
+def entry(installation_id: int = 1, body: bytes = b"{}", **fields) -> CachedResponse:
+    """Build an entry stored at NOW."""
+    return CachedResponse(
+        installation_id=installation_id,
+        body=body,
+        etag=fields.get("etag", '"v1"'),
+        last_modified=fields.get("last_modified"),
+        stored_at=fields.get("stored_at", NOW),
+    )
+
+
+@pytest.fixture(name="clock")
+def fixture_clock():
+    """A settable clock starting at NOW."""
+    now = [NOW]
+
+    def clock() -> datetime:
+        return now[0]
+
+    clock.now = now
+    return clock
+
+
+class TestCacheKey:
+    """Tests for keying requests."""
+
+    @pytest.mark.unit
+    def test_parameter_order_ignored(self):
+        """Equal parameters in any order share a key."""
+        assert cache_key(1, "/x", {"page": 1, "per_page": 30}) == cache_key(
+            1, "/x", {"per_page": 30, "page": 1}
+        )
+
+    @pytest.mark.unit
+    def test_installation_and_parameters_distinguish(self):
+        """AC: Keys differ per installation, URL and parameters."""
+        keys = {
+            cache_key(1, "/x", {"page": 1}),
+            cache_key(2, "/x", {"page": 1}),
+            cache_key(1, "/y", {"page": 1}),
+            cache_key(1, "/x", {"page": 2}),
+        }
+        assert len(keys) == 4
+
+
+class TestResponseCache:
+    """Tests for the in-memory LRU tier."""
+
+    @pytest.mark.unit
+    def test_fresh_within_ttl(self, clock):
+        """AC: Entries are fresh until the TTL has passed."""
+        cache = ResponseCache(ttl=timedelta(seconds=60), clock=clock)
+
+        clock.now[0] = NOW + timedelta(seconds=59)
+        assert cache.is_fresh(entry())
+        clock.now[0] = NOW + timedelta(seconds=60)
+        assert not cache.is_fresh(entry())
+
+    @pytest.mark.unit
+    def test_conditional_headers(self):
+        """AC: Revalidation sends the stored ETag and Last-Modified date."""
+        cached = entry(last_modified="Mon, 15 Jun 2026 12:00:00 GMT")
+
+        assert cached.conditional_headers() == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 15 Jun 2026 12:00:00 GMT",
+        }
+        assert entry(etag=None).conditional_headers() == {}
+
+    @pytest.mark.unit
+    async def test_least_recently_used_evicted(self):
+        """AC: The in-memory tier is bounded, evicting the least recently used."""
+        cache = ResponseCache(max_entries=2)
+        await cache.put("a", entry())
+        await cache.put("b", entry())
+        await cache.get("a")
+        await cache.put("c", entry())
+
+        assert len(cache) == 2
+        assert await cache.get("a") is not None
+        assert await cache.get("b") is None
+
+    @pytest.mark.unit
+    async def test_invalidate_installation(self):
+        """Invalidating an installation drops only its entries."""
+        cache = ResponseCache()
+        await cache.put("a", entry(installation_id=1))
+        await cache.put("b", entry(installation_id=2))
+
+        await cache.invalidate(1)
+
+        assert await cache.get("a") is None
+        assert await cache.get("b") is not None
+
+
+class TestResponseStore:
+    """Tests for the SQLite persistence tier."""
+
+    @pytest.mark.unit
+    async def test_entries_survive_restart(self, tmp_path):
+        """AC: Entries in the SQLite tier outlive the in-memory cache."""
+        path = str(tmp_path / "responses.db")
+        store = ResponseStore(path)
+        await ResponseCache(store=store).put("a", entry(body=b'{"a": 1}'))
+        store.close()
+
+        reopened = ResponseCache(store=ResponseStore(path))
+
+        assert await reopened.get("a") == entry(body=b'{"a": 1}')
+        assert len(reopened) == 1
+
+    @pytest.mark.unit
+    def test_oldest_dropped_beyond_max_entries(self):
+        """The SQLite tier keeps only its newest entries."""
+        store = ResponseStore(":memory:", max_entries=2)
+        for minutes, key in enumerate("abc"):
+            store.put(key, entry(stored_at=NOW + timedelta(minutes=minutes)))
+
+        assert store.get("a") is None
+        assert store.get("b") is not None
+        assert store.get("c") is not None
+
+    @pytest.mark.unit
+    async def test_invalidate_installation(self):
+        """Invalidating an installation also drops its stored entries."""
+        store = ResponseStore(":memory:")
+        cache = ResponseCache(store=store)
+        await cache.put("a", entry(installation_id=1))
+
+        await cache.invalidate(1)
+
+        assert store.get("a") is None
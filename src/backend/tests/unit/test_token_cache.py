@@ -0,0 +1,129 @@
+"""Unit tests for the installation access-token cache."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.services.token_cache import InstallationToken, InstallationTokenCache
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=UTC)
+
+
+class Minter:
+    """Mints numbered tokens valid for an hour, optionally slowly."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self) -> InstallationToken:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return InstallationToken(f"token-{self.calls}", NOW + timedelta(hours=1))
+
+
+@pytest.fixture(name="clock")
+def fixture_clock():
+    """A settable clock starting at NOW."""
+    now = [NOW]
+
+    def clock() -> datetime:
+        return now[0]
+
+    clock.now = now
+    return clock
+
+
+class TestInstallationTokenCache:
+    """Tests for caching and refreshing installation tokens."""
+
+    @pytest.mark.unit
+    async def test_token_reused_until_refresh_margin(self, clock):
+        """AC: A token is reused until the margin before it expires."""
+        cache = InstallationTokenCache(timedelta(minutes=5), clock=clock)
+        mint = Minter()
+
+        assert await cache.get(1, mint) == "token-1"
+        clock.now[0] = NOW + timedelta(minutes=54)
+        assert await cache.get(1, mint) == "token-1"
+        clock.now[0] = NOW + timedelta(minutes=55)
+        assert await cache.get(1, mint) == "token-2"
+        assert mint.calls == 2
+
+    @pytest.mark.unit
+    async def test_tokens_cached_per_installation(self, clock):
+        """Each installation has its own token."""
+        cache = InstallationTokenCache(clock=clock)
+        mint = Minter()
+
+        assert await cache.get(1, mint) == "token-1"
+        assert await cache.get(2, mint) == "token-2"
+        assert await cache.get(1, mint) == "token-1"
+
+    @pytest.mark.unit
+    async def test_concurrent_callers_share_one_refresh(self, clock):
+        """AC: Concurrent misses wait for a single mint."""
+        cache = InstallationTokenCache(clock=clock)
+        mint = Minter(delay=0.01)
+
+        tokens = await asyncio.gather(*(cache.get(1, mint) for _ in range(10)))
+
+        assert tokens == ["token-1"] * 10
+        assert mint.calls == 1
+
+    @pytest.mark.unit
+    async def test_failed_refresh_raised_to_every_waiter(self, clock):
+        """A failed mint fails its waiters and is not cached."""
+        cache = InstallationTokenCache(clock=clock)
+
+        async def fail() -> InstallationToken:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("GitHub down")
+
+        results = await asyncio.gather(
+            *(cache.get(1, fail) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await cache.get(1, Minter()) == "token-1"
+
+    @pytest.mark.unit
+    async def test_invalidate_drops_token(self, clock):
+        """AC: Invalidated installations mint a new token."""
+        cache = InstallationTokenCache(clock=clock)
+        mint = Minter()
+        await cache.get(1, mint)
+
+        cache.invalidate(1)
+
+        assert cache.peek(1) is None
+        assert await cache.get(1, mint) == "token-2"
+
+    @pytest.mark.unit
+    async def test_invalidate_during_refresh_not_cached(self, clock):
+        """A token minted while its installation was invalidated is not kept."""
+        cache = InstallationTokenCache(clock=clock)
+        mint = Minter(delay=0.01)
+
+        refresh = asyncio.create_task(cache.get(1, mint))
+        await asyncio.sleep(0)
+        cache.invalidate(1)
+
+        assert await refresh == "token-1"
+        assert cache.peek(1) is None
+
+    @pytest.mark.unit
+    async def test_cancelled_refresh_taken_over_by_waiter(self, clock):
+        """Waiters mint themselves if the caller refreshing is cancelled."""
+        cache = InstallationTokenCache(clock=clock)
+        mint = Minter(delay=0.01)
+
+        first = asyncio.create_task(cache.get(1, mint))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get(1, mint))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "token-2"
+        assert first.cancelled()